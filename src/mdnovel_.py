@@ -26,9 +26,12 @@ from mdnvlib.configuration.nv_configuration import NvConfiguration
 from mdnvlib.controller.nv_controller import NvController
 from mdnvlib.nv_globals import prefs
 from mdnvlib.model.nv_work_file import NvWorkFile
+from mdnvlib.profiler import TRACE_VARIABLE
+from mdnvlib.profiler import profiler
 
 SETTINGS = dict(
     arcs_width=55,
+    auto_export='',
     color_1st_edit='DarkGoldenrod4',
     color_2nd_edit='DarkGoldenrod3',
     color_arc='maroon',
@@ -58,6 +61,7 @@ SETTINGS = dict(
     import_mode='0',
     index_card_height=13,
     last_open='',
+    max_resident_rows=2000,
     middle_frame_width=400,
     nt_width=20,
     points_width=300,
@@ -66,10 +70,14 @@ SETTINGS = dict(
     right_frame_width=350,
     root_geometry='1200x800',
     scene_width=40,
+    snapshots_keep_daily=7,
+    snapshots_keep_last=20,
+    snapshots_keep_weekly=8,
     status_width=100,
     tags_width=100,
     time_width=40,
     title_width=400,
+    trace_file='',
     vp_width=100,
     wc_width=50,
     )
@@ -77,8 +85,11 @@ OPTIONS = dict(
     ask_doc_open=True,
     detach_prop_win=False,
     enable_hovertips=True,
+    enable_profiling=False,
     large_icons=False,
+    lazy_tree=False,
     localize_date=True,
+    save_snapshots=True,
     show_auto_numbering=False,
     show_ch_links=False,
     show_contents=True,
@@ -134,6 +145,10 @@ def main():
     prefs.update(configuration.settings)
     prefs.update(configuration.options)
 
+    #--- Set up profiling.
+    traceFile = os.environ.get(TRACE_VARIABLE, prefs['trace_file'])
+    profiler.enabled = prefs['enable_profiling'] or bool(traceFile)
+
     #--- Instantiate the app object.
     app = NvController('mdnovel @release', tempDir)
     ui = app.get_view()
@@ -156,6 +171,13 @@ def main():
     #--- Run the GUI application.
     ui.start()
 
+    #--- Write the session trace, if requested.
+    if traceFile:
+        try:
+            profiler.write_trace(traceFile)
+        except OSError:
+            pass
+
     #--- Save project specific configuration
     for keyword in prefs:
         if keyword in configuration.options:
@@ -0,0 +1,146 @@
+"""Export mdnovel projects in batch mode without a GUI.
+
+usage: mdnovel_batch.py [-h] [-s SUFFIX] [-j JOBS] [--list]
+                        [--fragment-cache FILE]
+                        [--serve ADDRESS | --server ADDRESS] [--shutdown]
+                        [project ...]
+
+Each project is exported to the document types given by their file name
+suffixes. Project paths may contain wildcards.
+A JSON record is written to stdout for each job.
+
+With --serve, the script runs as a resident export server, keeping the
+projects read in memory. With --server, the export jobs are sent to a
+running server instead of being processed locally.
+
+With --fragment-cache, the rendered chapters and sections are kept in
+a file, so that the next export renders only what has changed.
+This applies to projects processed in the script's own process,
+i.e. a single project, or several projects with "-j 1".
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import argparse
+import glob
+import json
+import sys
+
+from mdnvlib.lazy_class import LazyClass
+from mdnvlib.novx_globals import Error
+
+BatchConverter = LazyClass('mdnvlib.converter.batch_converter', 'BatchConverter')
+ExportClient = LazyClass('mdnvlib.converter.export_client', 'ExportClient')
+ExportServer = LazyClass('mdnvlib.converter.export_server', 'ExportServer')
+FragmentCache = LazyClass('mdnvlib.file.fragment_cache', 'FragmentCache')
+# imported on first use, so that the client starts fast
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Export mdnovel projects in batch mode.',
+        epilog='A JSON record is written to stdout for each job.',
+        )
+    parser.add_argument(
+        'projects',
+        nargs='*',
+        metavar='project',
+        help='Project file path, optionally with wildcards.',
+        )
+    parser.add_argument(
+        '-s', '--suffix',
+        action='append',
+        dest='suffixes',
+        help='Target file name suffix, e.g. "_chapters". Use "" for the manuscript. Can be repeated.',
+        )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=None,
+        help='Number of worker processes. Default: number of CPUs.',
+        )
+    parser.add_argument(
+        '--fragment-cache',
+        metavar='FILE',
+        help='Keep the rendered chapters and sections in FILE for the next export.',
+        )
+    parser.add_argument(
+        '--list',
+        action='store_true',
+        help='List the available suffixes and exit.',
+        )
+    serverMode = parser.add_mutually_exclusive_group()
+    serverMode.add_argument(
+        '--serve',
+        metavar='ADDRESS',
+        help='Run as export server, listening on a Unix socket path or named pipe address.',
+        )
+    serverMode.add_argument(
+        '--server',
+        metavar='ADDRESS',
+        help='Send the export jobs to the server listening on ADDRESS.',
+        )
+    parser.add_argument(
+        '--shutdown',
+        action='store_true',
+        help='Stop the server given by --server after the jobs are done.',
+        )
+    args = parser.parse_args()
+    if args.serve:
+        try:
+            ExportServer().serve(args.serve)
+        except (OSError, Error) as ex:
+            print_error(ex)
+            return 1
+
+        return 0
+
+    if args.list:
+        for fileClass in BatchConverter.EXPORT_TARGET_CLASSES:
+            print(f'"{fileClass.SUFFIX}"\t{fileClass.DESCRIPTION}')
+        return 0
+
+    sourcePaths = []
+    for pattern in args.projects:
+        if glob.has_magic(pattern):
+            sourcePaths.extend(sorted(glob.glob(pattern, recursive=True)))
+        else:
+            sourcePaths.append(pattern)
+    suffixes = args.suffixes
+    if suffixes is None:
+        suffixes = ['']
+    if args.server:
+        client = ExportClient(args.server)
+        try:
+            records = client.export(sourcePaths, suffixes)
+            if args.shutdown:
+                client.shutdown()
+        except (OSError, Error) as ex:
+            print_error(ex)
+            return 1
+
+    else:
+        converter = BatchConverter()
+        if args.fragment_cache:
+            converter.fragmentCache = FragmentCache()
+            converter.fragmentCache.read(args.fragment_cache)
+        records = converter.run(sourcePaths, suffixes, workers=args.jobs)
+    exitCode = 0
+    for record in records:
+        if record['error'] is not None:
+            exitCode = 1
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+    if args.fragment_cache and not args.server:
+        converter.fragmentCache.write(args.fragment_cache)
+    return exitCode
+
+
+def print_error(ex):
+    """Write a job record with the error message to stdout, like the local export does."""
+    record = dict(project=None, suffix=None, target=None, seconds=0.0, error=str(ex), fragments=None)
+    print(json.dumps(record, ensure_ascii=False), flush=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,14 +6,19 @@ License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
 import os
 import sys
+from threading import Thread
 from tkinter import filedialog
 
 from apptk.controller.controller_base import ControllerBase
 from mdnvlib.controller.link_processor import LinkProcessor
+from mdnvlib.exporter.nv_auto_exporter import NvAutoExporter
 from mdnvlib.exporter.nv_doc_exporter import NvDocExporter
 from mdnvlib.exporter.nv_html_reporter import NvHtmlReporter
+from mdnvlib.file.backup_store import BackupStore
+from mdnvlib.file.fragment_cache import FragmentCache
 from mdnvlib.importer.nv_doc_importer import NvDocImporter
 from mdnvlib.json.json_file import JsonFile
+from mdnvlib.lazy_class import LazyClass
 from mdnvlib.mdnov.mdnov_file import MdnovFile
 from mdnvlib.model.novel import Novel
 from mdnvlib.model.nv_model import NvModel
@@ -41,6 +46,14 @@ from mdnvlib.view.nv_view import NvView
 from mdnvlib.md.md_file import MdFile
 from mdnvlib.controller.clipboard_manager import ClipboardManager
 
+SqliteFile = LazyClass(
+    'mdnvlib.sqlite.sqlite_file',
+    'SqliteFile',
+    DESCRIPTION=_('mdnovel database'),
+    EXTENSION='.mdnvdb',
+    )
+# imported on first use
+
 
 class NvController(ControllerBase):
     """Controller for the mdnovel application."""
@@ -49,10 +62,12 @@ class NvController(ControllerBase):
     FILE_TYPES = [
         STANDARD_FILE_TYPE,
         MdnovFile,
+        SqliteFile,
     ]
     IMPORT_FILETYPES = [
         MdFile,
     ]
+    _AUTO_EXPORT_POLL_INTERVAL = 200
 
     def __init__(self, title, tempDir):
         """Initialize the model, set up the application's user interface, and load plugins.
@@ -89,6 +104,11 @@ class NvController(ControllerBase):
 
         #--- Initialize internal services.
         self.clipboardManager = ClipboardManager(self._mdl, self._ui, self)
+        self._autoExporter = NvAutoExporter(self._mdl)
+        self._isPollingAutoExport = False
+        self._fragmentCache = FragmentCache()
+        # rendered chapters and sections of the documents exported, so that
+        # exporting again renders only what has changed
 
         #--- Initialize the plugins.
         self.plugins = NvPluginCollection(self._mdl, self._ui, self)
@@ -427,6 +447,7 @@ class NvController(ControllerBase):
 
         self._ui.propertiesView._view_nothing()
         self._mdl.close_project()
+        self._fragmentCache.clear()
         self._ui.tv.reset_view()
         self._ui.contentsView.reset_view()
         self._ui.root.title(self._ui.title)
@@ -446,6 +467,8 @@ class NvController(ControllerBase):
         
         Optional arguments:
             elements: list of IDs of the elements to delete.        
+
+        The elements confirmed before a deletion is declined are deleted together.
         """
         if elements is None:
             try:
@@ -453,6 +476,7 @@ class NvController(ControllerBase):
             except:
                 return
 
+        confirmed = []
         for  elemId in elements:
             if elemId.startswith(SECTION_PREFIX):
                 if self._mdl.novel.sections[elemId].scType < 2:
@@ -474,16 +498,21 @@ class NvController(ControllerBase):
             elif elemId.startswith(PRJ_NOTE_PREFIX):
                 candidate = f'{_("Project note")} "{self._mdl.novel.projectNotes[elemId].title}"'
             else:
-                return
+                break
 
             if not self._ui.ask_yes_no(_('Delete {}?').format(candidate)):
-                return
+                break
 
-            if self._ui.tv.tree.prev(elemId):
-                self._view_new_element(self._ui.tv.tree.prev(elemId))
-            else:
-                self._view_new_element(self._ui.tv.tree.parent(elemId))
-            self._mdl.delete_element(elemId)
+            confirmed.append(elemId)
+        if not confirmed:
+            return
+
+        elemId = confirmed[0]
+        if self._ui.tv.tree.prev(elemId):
+            self._view_new_element(self._ui.tv.tree.prev(elemId))
+        else:
+            self._view_new_element(self._ui.tv.tree.parent(elemId))
+        self._mdl.delete_elements(confirmed)
 
     def export_document(self, suffix, **kwargs):
         """Export a document.
@@ -501,7 +530,7 @@ class NvController(ControllerBase):
                     # Do not export a document from an unsaved project.
                     return
 
-            exporter = NvDocExporter(self._ui)
+            exporter = NvDocExporter(self._ui, fragmentCache=self._fragmentCache)
             try:
                 self._ui.set_status(exporter.run(self._mdl.prjFile, suffix, **kwargs))
             except Error as ex:
@@ -511,6 +540,13 @@ class NvController(ControllerBase):
         """Return the global preferences dictionary."""
         return prefs
 
+    def get_snapshots(self):
+        """Return a list of snapshot descriptions of the project, newest first."""
+        if self._mdl.prjFile is None or self._mdl.prjFile.filePath is None:
+            return []
+
+        return BackupStore(self._mdl.prjFile.filePath).get_snapshots()
+
     def import_md(self, event=None, sourcePath=None, defaultExtension='.md'):
         """Update or create the project from a Markdown-formatted document.
         
@@ -620,6 +656,7 @@ class NvController(ControllerBase):
         try:
             if self._mdl.prjFile is not None:
                 self.close_project()
+            self._autoExporter.wait()
             super().on_quit()
         except Exception as ex:
             self._ui.show_error(str(ex), title='ERROR: Unhandled exception on exit')
@@ -725,12 +762,18 @@ class NvController(ControllerBase):
         prefs['last_open'] = filePath
 
         try:
-            self._mdl.open_project(filePath)
+            prjFile = self._read_project(filePath)
         except Error as ex:
             self.close_project(doNotSave=doNotSave)
             self._ui.set_status(f'!{str(ex)}')
             return False
 
+        if prjFile is None:
+            self._ui.set_status(f'!{_("Action canceled by user")}.')
+            return False
+
+        self._mdl.load_project(prjFile)
+
         self._ui.show_path(f'{norm_path(self._mdl.prjFile.filePath)}')
         self.enable_menu()
 
@@ -738,7 +781,12 @@ class NvController(ControllerBase):
         self._ui.show_path(_('{0} (last saved on {1})').format(norm_path(self._mdl.prjFile.filePath), self._mdl.prjFile.fileDate))
         self.show_status()
         self._ui.contentsView.view_text()
-        self._ui.tv.show_branch(CH_ROOT)
+        if self._ui.tv.tree.lazyBranches:
+            # Keep the sections out of the tree widget.
+            self._ui.tv.go_to_node(CH_ROOT)
+            self._ui.tv.show_chapter_level()
+        else:
+            self._ui.tv.show_branch(CH_ROOT)
 
         if extension != self.STANDARD_FILE_TYPE.EXTENSION:
             self._ui.show_info(
@@ -807,10 +855,28 @@ class NvController(ControllerBase):
         if self._mdl.prjFile.has_changed_on_disk() and not self._ui.ask_yes_no(_('File has changed on disk. Reload anyway?')):
             return 'break'
 
-        # this is to avoid saving when closing the project
-        if self.open_project(filePath=self._mdl.prjFile.filePath, doNotSave=True):
-            # includes closing
-            self._ui.set_status(_('Project successfully restored from disk.'))
+        self._ui.restore_status()
+        try:
+            prjFile = self._read_project(self._mdl.prjFile.filePath)
+        except Error as ex:
+            self._ui.set_status(f'!{str(ex)}')
+            return 'break'
+
+        if prjFile is None:
+            self._ui.set_status(f'!{_("Action canceled by user")}.')
+            return 'break'
+
+        # Discard the changes; only the elements that differ from the file are replaced.
+        self._ui.propertiesView._view_nothing()
+        self.plugins.on_close()
+        changedElements = self._mdl.reload_project(prjFile)
+        self.refresh_views()
+        self._ui.show_path(_('{0} (last saved on {1})').format(norm_path(self._mdl.prjFile.filePath), self._mdl.prjFile.fileDate))
+        self.show_status()
+        selection = self._ui.tv.tree.selection()
+        if selection:
+            self._ui.propertiesView.show_properties(selection[0])
+        self._ui.set_status(_('Project successfully restored from disk ({} elements changed).').format(changedElements))
         return 'break'
 
     def reset_tree(self, event=None):
@@ -844,6 +910,31 @@ class NvController(ControllerBase):
                 self._ui.set_status(_('Latest backup successfully restored.'))
         return 'break'
 
+    def restore_snapshot(self, snapshotId):
+        """Discard changes and restore a snapshot of the project.
+        
+        Positional arguments:
+            snapshotId: str -- ID of the snapshot to restore.
+        """
+        if self._mdl.prjFile is None:
+            return
+
+        if self._mdl.isModified:
+            if not self._ui.ask_yes_no(_('Discard changes and restore the snapshot?')):
+                return
+
+        elif not self._ui.ask_yes_no(_('Restore the snapshot?')):
+            return
+
+        try:
+            BackupStore(self._mdl.prjFile.filePath).restore(snapshotId)
+        except Error as ex:
+            self._ui.set_status(f'!{str(ex)}')
+        else:
+            if self.open_project(filePath=self._mdl.prjFile.filePath, doNotSave=True):
+                # Includes closing
+                self._ui.set_status(_('Snapshot successfully restored.'))
+
     def save_as(self, event=None):
         """Rename the project file and save it to disk.
         
@@ -872,6 +963,8 @@ class NvController(ControllerBase):
                     self._ui.show_path(f'{norm_path(self._mdl.prjFile.filePath)} ({_("last saved on")} {self._mdl.prjFile.fileDate})')
                     self._ui.restore_status()
                     prefs['last_open'] = self._mdl.prjFile.filePath
+                    self._take_snapshot()
+                    self._auto_export()
                     return True
 
         return False
@@ -900,6 +993,8 @@ class NvController(ControllerBase):
         self._ui.show_path(f'{norm_path(self._mdl.prjFile.filePath)} ({_("last saved on")} {self._mdl.prjFile.fileDate})')
         self._ui.restore_status()
         prefs['last_open'] = self._mdl.prjFile.filePath
+        self._take_snapshot()
+        self._auto_export()
         return True
 
     def select_project(self, fileName):
@@ -1023,6 +1118,21 @@ class NvController(ControllerBase):
             self.wordCount = wordCount
         self._ui.show_status(message)
 
+    def _auto_export(self):
+        """Start updating the documents to keep up to date, if configured.
+        
+        The documents are exported in the background;
+        the results are shown at the status bar when done.
+        """
+        suffixes = NvAutoExporter.get_suffixes(prefs['auto_export'])
+        if not suffixes:
+            return
+
+        self._autoExporter.run(self._mdl.prjFile, suffixes)
+        if not self._isPollingAutoExport:
+            self._isPollingAutoExport = True
+            self._poll_auto_export()
+
     def _convert_legacy_file(self, root, extension, filePath):
         """Convert a legacy file."""
         for fileType in self.FILE_TYPES:
@@ -1036,8 +1146,72 @@ class NvController(ControllerBase):
         legacyFile.read()
         prjFile = self.STANDARD_FILE_TYPE(filePath)
         prjFile.novel = legacyFile.novel
+        prjFile.wcLog = legacyFile.wcLog
         prjFile.write()
 
+    def _poll_auto_export(self):
+        """Show the auto export results, and keep polling while exporting."""
+        isBusy = self._autoExporter.is_busy()
+        for message in self._autoExporter.get_messages():
+            self._ui.set_status(message)
+        if isBusy:
+            self._ui.root.after(self._AUTO_EXPORT_POLL_INTERVAL, self._poll_auto_export)
+        else:
+            self._isPollingAutoExport = False
+
+    def _read_project(self, filePath):
+        """Read a project file in a worker thread.
+        
+        Positional arguments:
+            filePath: str -- Path of the project file.
+
+        The file is parsed into a headless tree, 
+        while the user interface remains responsive. 
+        Return the project file instance, or None if the user has stopped waiting.
+        In this case, the parser keeps running in the background until the 
+        file is read, and then its result is discarded; the model is not touched.
+        Re-raise exceptions from the worker thread.
+        """
+
+        def read_project():
+            try:
+                result['prjFile'] = self._mdl.read_project(filePath)
+            except Exception as ex:
+                result['exception'] = ex
+
+        result = {}
+        worker = Thread(target=read_project, daemon=True)
+        worker.start()
+        if not self._ui.wait_for_thread(worker, f'{_("Loading project")} "{norm_path(filePath)}" ...'):
+            return None
+
+        if 'exception' in result:
+            raise result['exception']
+
+        return result['prjFile']
+
+    def _take_snapshot(self):
+        """Record the saved project in the snapshot store, if configured.
+        
+        Apply the retention rules afterwards. 
+        A failure is reported, but does not affect the saved project.
+        """
+        if not prefs['save_snapshots']:
+            return
+
+        backupStore = BackupStore(self._mdl.prjFile.filePath)
+        try:
+            backupStore.take_snapshot()
+            backupStore.compact(
+                keepLast=int(prefs['snapshots_keep_last']),
+                keepDaily=int(prefs['snapshots_keep_daily']),
+                keepWeekly=int(prefs['snapshots_keep_weekly']),
+                )
+        except Error as ex:
+            self._ui.set_status(f'!{str(ex)}')
+        except OSError as ex:
+            self._ui.set_status(f'!{_("Cannot write snapshot")}: {str(ex)}')
+
     def _view_new_element(self, newNode):
         """View the element with ID newNode.
         
@@ -0,0 +1,183 @@
+"""Provide a class for headless batch export of mdnovel projects.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+import os
+from time import perf_counter
+
+from mdnvlib.converter.export_source_factory import ExportSourceFactory
+from mdnvlib.converter.export_target_factory import ExportTargetFactory
+from mdnvlib.csv.csv_charlist import CsvCharList
+from mdnvlib.csv.csv_grid import CsvGrid
+from mdnvlib.csv.csv_itemlist import CsvItemList
+from mdnvlib.csv.csv_loclist import CsvLocList
+from mdnvlib.csv.csv_sectionlist import CsvSectionList
+from mdnvlib.csv.csv_statistics import CsvStatistics
+from mdnvlib.json.json_file import JsonFile
+from mdnvlib.md.md_brief_synopsis import MdBriefSynopsis
+from mdnvlib.md.md_chapterdesc import MdChapterDesc
+from mdnvlib.md.md_characters import MdCharacters
+from mdnvlib.md.md_export import MdExport
+from mdnvlib.md.md_items import MdItems
+from mdnvlib.md.md_locations import MdLocations
+from mdnvlib.md.md_partdesc import MdPartDesc
+from mdnvlib.md.md_plotlines import MdPlotlines
+from mdnvlib.md.md_sectiondesc import MdSectionDesc
+from mdnvlib.md.md_stages import MdStages
+from mdnvlib.mdnov.mdnov_file import MdnovFile
+from mdnvlib.model.novel import Novel
+from mdnvlib.model.nv_tree import NvTree
+from mdnvlib.novx_globals import Error
+from mdnvlib.novx_globals import _
+from mdnvlib.novx_globals import norm_path
+from mdnvlib.sqlite.sqlite_file import SqliteFile
+
+
+class BatchConverter:
+    """Headless converter for exporting many projects at once.
+
+    Public methods:
+        export_project(sourcePath, suffixes, workers) -- Export one project to several targets.
+        run(sourcePaths, suffixes, workers) -- Export the projects in parallel.
+
+    Public instance variables:
+        fragmentCache: FragmentCache -- Rendered fragments shared by the exports in this process, or None.
+
+    The projects are distributed across a process pool.
+    Each project is read once, and then written to all requested targets.
+    A single project is exported with its chapters rendered in parallel instead.
+    This module does not depend on tkinter.
+    """
+    EXPORT_SOURCE_CLASSES = [
+        JsonFile,
+        MdnovFile,
+        SqliteFile,
+    ]
+    EXPORT_TARGET_CLASSES = [
+        MdExport,
+        CsvCharList,
+        CsvGrid,
+        CsvItemList,
+        CsvLocList,
+        CsvSectionList,
+        MdBriefSynopsis,
+        MdChapterDesc,
+        MdCharacters,
+        MdItems,
+        MdLocations,
+        MdPartDesc,
+        MdPlotlines,
+        MdSectionDesc,
+        MdStages,
+        CsvStatistics,
+        ]
+
+    def __init__(self):
+        """Create strategy class instances."""
+        self.exportSourceFactory = ExportSourceFactory(self.EXPORT_SOURCE_CLASSES)
+        self.exportTargetFactory = ExportTargetFactory(self.EXPORT_TARGET_CLASSES)
+        self.fragmentCache = None
+
+    def export_project(self, sourcePath, suffixes, workers=1):
+        """Export one project to several targets.
+
+        Positional arguments:
+            sourcePath: str -- Path of the project file.
+            suffixes: list of str -- Target file name suffixes.
+
+        Optional arguments:
+            workers: int -- Number of processes rendering the chapters of each target.
+
+        Return a list of job records, one for reading the project,
+        and one for each target. A record is a dictionary with the keys:
+            project: str -- Path of the project file.
+            suffix: str -- Target file name suffix, or None for reading.
+            target: str -- Path of the written file, or None.
+            seconds: float -- Processing time.
+            error: str -- Error message, or None on success.
+            fragments: list -- Numbers of cached and rendered fragments, or None.
+        """
+        records = []
+        startTime = perf_counter()
+        record = dict(project=sourcePath, suffix=None, target=None, seconds=0.0, error=None, fragments=None)
+        records.append(record)
+        try:
+            if not os.path.isfile(sourcePath):
+                raise Error(f'{_("File not found")}: "{norm_path(sourcePath)}".')
+
+            novel = self._read_project(sourcePath)
+        except Exception as ex:
+            record['error'] = str(ex)
+            record['seconds'] = perf_counter() - startTime
+            return records
+
+        record['seconds'] = perf_counter() - startTime
+        for suffix in suffixes:
+            startTime = perf_counter()
+            record = dict(project=sourcePath, suffix=suffix, target=None, seconds=0.0, error=None, fragments=None)
+            records.append(record)
+            try:
+                __, target = self.exportTargetFactory.make_file_objects(sourcePath, suffix=suffix)
+                target.novel = novel
+                target.workers = workers
+                target.fragmentCache = self.fragmentCache
+                target.write()
+                record['target'] = target.filePath
+                if target.fragmentStatistics is not None:
+                    record['fragments'] = list(target.fragmentStatistics)
+            except Exception as ex:
+                record['error'] = str(ex)
+            record['seconds'] = perf_counter() - startTime
+        return records
+
+    def run(self, sourcePaths, suffixes, workers=None):
+        """Export the projects in parallel.
+
+        Positional arguments:
+            sourcePaths: list of str -- Paths of the project files.
+            suffixes: list of str -- Target file name suffixes.
+
+        Optional arguments:
+            workers: int -- Number of worker processes. Default: number of CPUs.
+              If 1, the projects are processed in the current process.
+              A single project is exported by this number of processes rendering its chapters;
+              by default, its chapters are rendered in the current process.
+              The fragment cache is used only when the projects are processed in the current process.
+
+        Generate the job records in the order of completion.
+        """
+        if workers == 1 or len(sourcePaths) < 2:
+            for sourcePath in sourcePaths:
+                yield from self.export_project(sourcePath, suffixes, workers=workers or 1)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(export_project, sourcePath, suffixes): sourcePath
+                for sourcePath in sourcePaths
+            }
+            for future in as_completed(futures):
+                try:
+                    yield from future.result()
+                except Exception as ex:
+                    # The worker process failed.
+                    yield dict(project=futures[future], suffix=None, target=None, seconds=0.0, error=str(ex), fragments=None)
+
+    def _read_project(self, sourcePath):
+        """Return a Novel instance with the project read from sourcePath."""
+        source, __ = self.exportSourceFactory.make_file_objects(sourcePath)
+        source.novel = Novel(tree=NvTree())
+        source.read()
+        return source.novel
+
+
+def export_project(sourcePath, suffixes):
+    """Export one project to several targets in a worker process.
+
+    Return a list of job records (see BatchConverter.export_project).
+    """
+    return BatchConverter().export_project(sourcePath, suffixes)
@@ -0,0 +1,74 @@
+"""Provide a class for sending requests to the export server.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import json
+from multiprocessing.connection import Client
+import os
+
+from mdnvlib.novx_globals import Error
+
+
+class ExportClient:
+    """Client for the resident export server.
+
+    Public methods:
+        drop(projects) -- Remove projects from the server's cache.
+        export(projects, suffixes) -- Export projects, and return the job records.
+        request(request) -- Send a request, and return the response.
+        shutdown() -- Stop the server.
+        status() -- Return the server's cache entries.
+
+    Each request uses a new connection.
+    Relative project paths are made absolute, since the server
+    may have a different working directory.
+    """
+
+    def __init__(self, address):
+        """Set the server address.
+
+        Positional arguments:
+            address: str -- Socket path, or named pipe address on Windows.
+        """
+        self.address = address
+
+    def drop(self, projects):
+        """Remove projects from the server's cache."""
+        self.request(dict(command='drop', projects=[os.path.abspath(p) for p in projects]))
+
+    def export(self, projects, suffixes):
+        """Export projects, and return the job records.
+
+        Positional arguments:
+            projects: list of str -- Project paths.
+            suffixes: list of str -- Target file name suffixes.
+        """
+        response = self.request(dict(command='export', projects=[os.path.abspath(p) for p in projects], suffixes=suffixes))
+        return response['records']
+
+    def request(self, request):
+        """Send a request, and return the response.
+
+        Positional arguments:
+            request: dict -- Request as described in ExportServer.
+
+        Raise Error if the server reports an error.
+        Raise OSError if the server cannot be reached.
+        """
+        with Client(self.address) as connection:
+            connection.send_bytes(json.dumps(request, ensure_ascii=False).encode('utf-8'))
+            response = json.loads(connection.recv_bytes().decode('utf-8'))
+        if response['error'] is not None:
+            raise Error(response['error'])
+
+        return response
+
+    def shutdown(self):
+        """Stop the server."""
+        self.request(dict(command='shutdown'))
+
+    def status(self):
+        """Return the server's cache entries."""
+        return self.request(dict(command='status'))['records']
@@ -0,0 +1,207 @@
+"""Provide a class for a resident export server with a project cache.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import hashlib
+import json
+from multiprocessing.connection import Client
+from multiprocessing.connection import Listener
+import os
+from stat import S_ISSOCK
+from time import perf_counter
+
+from mdnvlib.converter.batch_converter import BatchConverter
+from mdnvlib.file.fragment_cache import FragmentCache
+from mdnvlib.novx_globals import Error
+from mdnvlib.novx_globals import _
+from mdnvlib.novx_globals import norm_path
+
+
+class ExportServer(BatchConverter):
+    """Long-running export service keeping the projects read in memory.
+
+    Public methods:
+        handle_request(request) -- Process a request, and return the response.
+        serve(address) -- Accept requests until a shutdown request arrives.
+
+    Public instance variables:
+        cache: dict -- key: normalized project path; value: CacheEntry.
+
+    The requests are exchanged as JSON documents over a
+    multiprocessing connection, i.e. a Unix domain socket,
+    or a named pipe on Windows (address starting with "\\\\.\\pipe\\").
+    Requests are processed one after another.
+
+    Request keys:
+        command: str -- "export", "status", "drop", or "shutdown".
+        projects: list of str -- Project paths (export, drop).
+        suffixes: list of str -- Target file name suffixes (export).
+
+    Response keys:
+        records: list of dict -- Job records (export), or cache entries (status).
+        seconds: float -- Processing time on the server.
+        error: str -- Error message, or None on success.
+
+    A project is read again only if its file has changed.
+    The file's modification time and size are checked first;
+    if they differ, the content hash decides.
+    The rendered chapters and sections are kept in a fragment cache,
+    so a changed project is exported by rendering only what has changed.
+    """
+    COMMANDS = ('export', 'status', 'drop', 'shutdown')
+
+    def __init__(self):
+        """Extends the superclass constructor."""
+        super().__init__()
+        self.cache = {}
+        self._cacheHit = False
+        self.fragmentCache = FragmentCache()
+
+    def export_project(self, sourcePath, suffixes, workers=1):
+        """Export one project to several targets.
+
+        Extends the superclass method by adding the key
+        "cached" to the reading record.
+        """
+        self._cacheHit = False
+        records = super().export_project(sourcePath, suffixes, workers=workers)
+        records[0]['cached'] = self._cacheHit
+        return records
+
+    def handle_request(self, request):
+        """Process a request, and return the response.
+
+        Positional arguments:
+            request: dict -- Request as described in the class docstring.
+        """
+        startTime = perf_counter()
+        response = dict(records=[], seconds=0.0, error=None)
+        try:
+            command = request.get('command', None)
+            if command not in self.COMMANDS:
+                raise Error(f'{_("Unknown command")}: "{command}".')
+
+            if command == 'export':
+                suffixes = request.get('suffixes', None)
+                if not suffixes:
+                    suffixes = ['']
+                for sourcePath in request.get('projects', []):
+                    response['records'].extend(self.export_project(sourcePath, suffixes))
+            elif command == 'status':
+                for cachePath, entry in self.cache.items():
+                    response['records'].append(dict(project=cachePath, sha256=entry.digest, words=entry.wordCount))
+            elif command == 'drop':
+                for sourcePath in request.get('projects', []):
+                    self.cache.pop(os.path.realpath(sourcePath), None)
+        except Exception as ex:
+            response['error'] = str(ex)
+        response['seconds'] = perf_counter() - startTime
+        return response
+
+    def serve(self, address):
+        """Accept requests until a shutdown request arrives.
+
+        Positional arguments:
+            address: str -- Socket path, or named pipe address on Windows.
+
+        A stale socket file left by a previous server is removed.
+        Raise the "Error" exception if the address is taken by 
+        another file, or by a running server.
+        """
+        if os.path.exists(address):
+            self._remove_stale_socket(address)
+        with Listener(address) as listener:
+            while True:
+                with listener.accept() as connection:
+                    try:
+                        request = json.loads(connection.recv_bytes().decode('utf-8'))
+                        if not isinstance(request, dict):
+                            raise ValueError(_('The request is not a JSON object.'))
+
+                    except (EOFError, OSError):
+                        continue
+
+                    except ValueError as ex:
+                        request = {}
+                        response = dict(records=[], seconds=0.0, error=str(ex))
+                    else:
+                        response = self.handle_request(request)
+                    try:
+                        connection.send_bytes(json.dumps(response, ensure_ascii=False).encode('utf-8'))
+                    except OSError:
+                        pass
+                if request.get('command', None) == 'shutdown':
+                    return
+
+    def _read_project(self, sourcePath):
+        """Return a Novel instance with the project read from sourcePath.
+
+        Overrides the superclass method, returning the cached
+        Novel instance if the project file has not changed.
+        """
+        cachePath = os.path.realpath(sourcePath)
+        stat = os.stat(cachePath)
+        entry = self.cache.get(cachePath, None)
+        if entry is not None:
+            if (entry.mtime, entry.size) == (stat.st_mtime_ns, stat.st_size):
+                self._cacheHit = True
+                return entry.novel
+
+            digest = self._get_digest(cachePath)
+            if digest == entry.digest:
+                entry.mtime = stat.st_mtime_ns
+                entry.size = stat.st_size
+                self._cacheHit = True
+                return entry.novel
+
+        else:
+            digest = self._get_digest(cachePath)
+        novel = super()._read_project(sourcePath)
+        self.cache[cachePath] = CacheEntry(novel, stat.st_mtime_ns, stat.st_size, digest)
+        return novel
+
+    def _get_digest(self, filePath):
+        with open(filePath, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def _remove_stale_socket(self, address):
+        """Remove the socket file of a server that is no longer running.
+        
+        Raise the "Error" exception if address is not a socket,
+        or if a server is listening on it.
+        """
+        if not S_ISSOCK(os.stat(address).st_mode):
+            raise Error(f'{_("Not a socket")}: "{norm_path(address)}".')
+
+        try:
+            Client(address).close()
+        except OSError:
+            # Nobody is listening, so the socket is stale.
+            os.remove(address)
+            return
+
+        raise Error(f'{_("Export server already running")}: "{norm_path(address)}".')
+
+
+class CacheEntry:
+    """A project read by the export server.
+
+    Public instance variables:
+        novel: Novel -- The project data.
+        mtime: int -- Modification time of the project file in nanoseconds.
+        size: int -- Size of the project file in bytes.
+        digest: str -- SHA-256 hash of the project file.
+        wordCount: int -- Total number of words in normal sections.
+    """
+
+    def __init__(self, novel, mtime, size, digest):
+        self.novel = novel
+        self.mtime = mtime
+        self.size = size
+        self.digest = digest
+        self.wordCount = 0
+        for section in novel.sections.values():
+            if section.scType == 0:
+                self.wordCount += section.wordCount
@@ -7,13 +7,16 @@ License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 import os
 
 from mdnvlib.converter.file_factory import FileFactory
-from mdnvlib.md.md_import import MdImport
-from mdnvlib.md.md_outline import MdOutline
+from mdnvlib.lazy_class import LazyClass
 from mdnvlib.novx_globals import Error
 from mdnvlib.novx_globals import _
 from mdnvlib.novx_globals import norm_path
 from mdnvlib.mdnov.mdnov_file import MdnovFile
 
+MdImport = LazyClass('mdnvlib.md.md_import', 'MdImport')
+MdOutline = LazyClass('mdnvlib.md.md_outline', 'MdOutline')
+# The Markdown parsers are loaded when the first document is imported.
+
 
 class NewProjectFactory(FileFactory):
     """A factory class that instantiates a document object to read, 
@@ -43,13 +46,19 @@ class NewProjectFactory(FileFactory):
         targetFile = MdnovFile(f'{fileName}{MdnovFile.EXTENSION}', **kwargs)
         if sourcePath.endswith('.md'):
             # The source file might be an outline or a "work in progress".
+            # Stop reading at the first outline heading.
+            isOutline = False
             try:
                 with open(sourcePath, 'r') as f:
-                    content = f.read()
+                    for line in f:
+                        if '### ' in line:
+                            isOutline = True
+                            break
+
             except:
                 raise Error(f'{_("Cannot read file")}: "{norm_path(sourcePath)}".')
 
-            if '### ' in content:
+            if isOutline:
                 sourceFile = MdOutline(sourcePath, **kwargs)
             else:
                 sourceFile = MdImport(sourcePath, **kwargs)
@@ -16,6 +16,7 @@ from mdnvlib.novx_globals import PL_ROOT
 from mdnvlib.novx_globals import Error
 from mdnvlib.novx_globals import _
 from mdnvlib.novx_globals import norm_path
+from mdnvlib.profiler import profiler
 
 
 class CsvFile(FileExport):
@@ -30,7 +31,8 @@ class CsvFile(FileExport):
         Return a message in case of success.
         Raise the "Error" exception in case of error. 
         """
-        csvRows = self._get_text()
+        with profiler.span(f'{type(self).__name__}._get_text'):
+            csvRows = self._get_text()
         backedUp = False
         if os.path.isfile(self.filePath):
             try:
@@ -0,0 +1,118 @@
+"""Provide a class for csv text statistics export.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from mdnvlib.csv.csv_file import CsvFile
+from mdnvlib.model.section import Section
+from mdnvlib.model.text_statistics import TextStatistics
+from mdnvlib.novx_globals import CH_ROOT
+from mdnvlib.novx_globals import CR_ROOT
+from mdnvlib.novx_globals import STATISTICS_SUFFIX
+from mdnvlib.novx_globals import _
+
+
+class CsvStatistics(CsvFile):
+    """csv text statistics writer.
+
+    Write a row per "normal" section, a row per viewpoint character,
+    and a row with the totals.
+    """
+
+    DESCRIPTION = _('Text statistics')
+    SUFFIX = STATISTICS_SUFFIX
+
+    def __init__(self, filePath, **kwargs):
+        """Initialize instance variables.
+
+        Extends the superclass constructor.
+        """
+        super().__init__(filePath, **kwargs)
+        self.textStatistics = TextStatistics()
+
+    def _get_header_columns(self):
+        """Return a list with all column records of a headline.
+
+        Overrides the superclass method
+        """
+        columns = []
+        columns.append('ID')
+        columns.append(_("Chapter"))
+        columns.append(_("Title"))
+        columns.append(_("Viewpoint"))
+        columns.append(_("Status"))
+        columns.append(_("Words"))
+        columns.append(f'{_("Share")} (%)')
+        columns.append(_("Sentences"))
+        columns.append(_("Paragraphs"))
+        columns.append(_("Words per sentence"))
+        columns.append(_("Reading ease"))
+        columns.append(_("Grade level"))
+        columns.append(f'{_("Dialogue")} (%)')
+        columns.append(_("Adverbs per 1000 words"))
+        lowerLimit = 1
+        for upperLimit in TextStatistics.SENTENCE_LENGTH_BINS:
+            columns.append(f'{_("Sentences")} {lowerLimit}-{upperLimit}')
+            lowerLimit = upperLimit + 1
+        columns.append(f'{_("Sentences")} >{lowerLimit - 1}')
+        return columns
+
+    def _get_statistics_columns(self, statistics, wordsTotal):
+        """Return a list with the metric columns of a row."""
+        columns = []
+        columns.append(statistics['words'])
+        if wordsTotal:
+            columns.append(f"{statistics['words'] / wordsTotal * 100:.1f}")
+        else:
+            columns.append('')
+        columns.append(statistics['sentences'])
+        columns.append(statistics['paragraphs'])
+        columns.append(f"{statistics['meanSentenceLength']:.1f}")
+        columns.append(f"{statistics['readingEase']:.1f}")
+        columns.append(f"{statistics['gradeLevel']:.1f}")
+        columns.append(f"{statistics['dialogueRatio'] * 100:.1f}")
+        columns.append(f"{statistics['adverbDensity']:.1f}")
+        columns.extend(statistics['sentenceLengths'])
+        return columns
+
+    def _get_text(self):
+        """Return a list with the csv rows.
+
+        Overrides the superclass method.
+        """
+        self.textStatistics.update(self.novel)
+        total = self.textStatistics.get_statistics()
+        csvRows = [self._get_header_columns()]
+        chapterIds = {}
+        # key: section ID; value: chapter ID
+        for chId in self.novel.tree.get_children(CH_ROOT):
+            for scId in self.novel.tree.get_children(chId):
+                chapterIds[scId] = chId
+        for scId in self.textStatistics.get_sections():
+            section = self.novel.sections[scId]
+            chId = chapterIds[scId]
+            if section.characters:
+                viewpoint = self.novel.characters[section.characters[0]].title
+            else:
+                viewpoint = ''
+            columns = [
+                scId,
+                self.novel.chapters[chId].title,
+                section.title,
+                viewpoint,
+                Section.STATUS[section.status],
+            ]
+            columns.extend(self._get_statistics_columns(self.textStatistics.get_section_statistics(scId), total['words']))
+            csvRows.append(columns)
+        for crId in self.novel.tree.get_children(CR_ROOT):
+            if not self.textStatistics.get_sections(viewpoint=crId):
+                continue
+
+            columns = [crId, '', '', self.novel.characters[crId].title, '']
+            columns.extend(self._get_statistics_columns(self.textStatistics.get_statistics(viewpoint=crId), total['words']))
+            csvRows.append(columns)
+        columns = ['', '', _('Total'), '', '']
+        columns.extend(self._get_statistics_columns(total, total['words']))
+        csvRows.append(columns)
+        return csvRows
@@ -16,6 +16,9 @@ class ChAcFilter:
 
     def __init__(self, plId):
         self._plId = plId
+        self._novel = None
+        self._chIds = None
+        # IDs of the accepted elements, looked up once per novel
 
     def accept(self, source, chId):
         """Check whether an entity matches the filter criteria.
@@ -27,14 +30,10 @@ class ChAcFilter:
         Return True if the plId matches an arc that at least
         one section in the chapter is assigned to.
         """
-        for scId in source.novel.tree.get_children(chId):
-            try:
-                if self._plId in source.novel.sections[scId].scPlotLines:
-                    return True
-
-            except:
-                pass
-        return False
+        if source.novel is not self._novel:
+            self._novel = source.novel
+            self._chIds = set(source.novel.query.get_chapters(plotLine=self._plId))
+        return chId in self._chIds
 
     def get_message(self, source):
         """Return a message about how the document exported from source is filtered."""
@@ -16,6 +16,9 @@ class ChVpFilter:
 
     def __init__(self, crId):
         self._crId = crId
+        self._novel = None
+        self._chIds = None
+        # IDs of the accepted elements, looked up once per novel
 
     def accept(self, source, chId):
         """Check whether an entity matches the filter criteria.
@@ -27,14 +30,10 @@ class ChVpFilter:
         Return True if the crId matches a viewpoint character of 
         at least one section of the chapter.
         """
-        for scId in source.novel.tree.get_children(chId):
-            try:
-                if self._crId == source.novel.sections[scId].characters[0]:
-                    return True
-
-            except:
-                pass
-        return False
+        if source.novel is not self._novel:
+            self._novel = source.novel
+            self._chIds = set(source.novel.query.get_chapters(viewpoint=self._crId))
+        return chId in self._chIds
 
     def get_message(self, source):
         """Return a message about how the document exported from source is filtered."""
@@ -0,0 +1,301 @@
+"""Provide a class for keeping exported documents up to date.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from threading import Lock
+from threading import Thread
+
+from mdnvlib.converter.export_target_factory import ExportTargetFactory
+from mdnvlib.exporter.nv_doc_exporter import NvDocExporter
+from mdnvlib.exporter.nv_html_reporter import NvHtmlReporter
+from mdnvlib.file.fragment_cache import FragmentCache
+from mdnvlib.novx_globals import BRF_SYNOPSIS_SUFFIX
+from mdnvlib.novx_globals import CHAPTERS_SUFFIX
+from mdnvlib.novx_globals import CHAPTER_PREFIX
+from mdnvlib.novx_globals import CHARACTERS_SUFFIX
+from mdnvlib.novx_globals import CHARACTER_PREFIX
+from mdnvlib.novx_globals import CHARACTER_REPORT_SUFFIX
+from mdnvlib.novx_globals import CHARLIST_SUFFIX
+from mdnvlib.novx_globals import CH_ROOT
+from mdnvlib.novx_globals import CR_ROOT
+from mdnvlib.novx_globals import Error
+from mdnvlib.novx_globals import GRID_SUFFIX
+from mdnvlib.novx_globals import ITEMLIST_SUFFIX
+from mdnvlib.novx_globals import ITEMS_SUFFIX
+from mdnvlib.novx_globals import ITEM_PREFIX
+from mdnvlib.novx_globals import ITEM_REPORT_SUFFIX
+from mdnvlib.novx_globals import IT_ROOT
+from mdnvlib.novx_globals import LC_ROOT
+from mdnvlib.novx_globals import LOCATIONS_SUFFIX
+from mdnvlib.novx_globals import LOCATION_PREFIX
+from mdnvlib.novx_globals import LOCATION_REPORT_SUFFIX
+from mdnvlib.novx_globals import LOCLIST_SUFFIX
+from mdnvlib.novx_globals import PARTS_SUFFIX
+from mdnvlib.novx_globals import PLOTLINES_SUFFIX
+from mdnvlib.novx_globals import PLOTLIST_SUFFIX
+from mdnvlib.novx_globals import PLOT_LINE_PREFIX
+from mdnvlib.novx_globals import PLOT_POINT_PREFIX
+from mdnvlib.novx_globals import PL_ROOT
+from mdnvlib.novx_globals import PN_ROOT
+from mdnvlib.novx_globals import PRJ_NOTE_PREFIX
+from mdnvlib.novx_globals import PROJECTNOTES_SUFFIX
+from mdnvlib.novx_globals import SECTIONLIST_SUFFIX
+from mdnvlib.novx_globals import SECTIONS_SUFFIX
+from mdnvlib.novx_globals import SECTION_PREFIX
+from mdnvlib.novx_globals import STAGES_SUFFIX
+from mdnvlib.novx_globals import STATISTICS_SUFFIX
+from mdnvlib.novx_globals import _
+
+
+class NvAutoExporter:
+    """Re-export documents affected by a project change in the background.
+
+    Public methods:
+        get_affected_targets(fileTree, filePath, suffixes) -- Return the suffixes of the outdated documents.
+        get_messages() -- Return and clear the messages of the finished exports.
+        get_setting(suffixes) -- Return the preference setting for a list of suffixes.
+        get_suffixes(setting) -- Return the list of suffixes of a preference setting.
+        is_busy() -- Return True if an export is running.
+        run(prjFile, suffixes) -- Start re-exporting the documents affected by the last save.
+        wait() -- Wait for the running export to finish.
+
+    Public instance variables:
+        revisions: dict -- key: tuple (project path, suffix); value: MerkleTree of the revision exported.
+
+    The project revisions are compared by their content hashes,
+    and a document is re-exported only if data it depends on has changed.
+    The documents are created from the saved project file,
+    which is read in a worker thread, so the model is not touched.
+    The chapters and sections unchanged since the previous export
+    are taken from a fragment cache instead of being rendered again.
+    If the project is saved again while exporting, only the latest
+    revision is exported afterwards.
+    """
+    TARGET_DEPENDENCIES = {
+        '': (CHAPTER_PREFIX, SECTION_PREFIX),
+        BRF_SYNOPSIS_SUFFIX: (CHAPTER_PREFIX, SECTION_PREFIX),
+        CHAPTERS_SUFFIX: (CHAPTER_PREFIX,),
+        CHARACTERS_SUFFIX: (CHARACTER_PREFIX,),
+        CHARACTER_REPORT_SUFFIX: (CHARACTER_PREFIX,),
+        CHARLIST_SUFFIX: (CHARACTER_PREFIX,),
+        GRID_SUFFIX: (
+            CHAPTER_PREFIX,
+            SECTION_PREFIX,
+            CHARACTER_PREFIX,
+            LOCATION_PREFIX,
+            ITEM_PREFIX,
+            PLOT_LINE_PREFIX,
+            PLOT_POINT_PREFIX,
+            ),
+        ITEMLIST_SUFFIX: (ITEM_PREFIX,),
+        ITEMS_SUFFIX: (ITEM_PREFIX,),
+        ITEM_REPORT_SUFFIX: (ITEM_PREFIX,),
+        LOCATIONS_SUFFIX: (LOCATION_PREFIX,),
+        LOCATION_REPORT_SUFFIX: (LOCATION_PREFIX,),
+        LOCLIST_SUFFIX: (LOCATION_PREFIX,),
+        PARTS_SUFFIX: (CHAPTER_PREFIX,),
+        PLOTLINES_SUFFIX: (SECTION_PREFIX, PLOT_LINE_PREFIX, PLOT_POINT_PREFIX),
+        PLOTLIST_SUFFIX: (CHAPTER_PREFIX, SECTION_PREFIX, PLOT_LINE_PREFIX, PLOT_POINT_PREFIX),
+        PROJECTNOTES_SUFFIX: (PRJ_NOTE_PREFIX,),
+        SECTIONLIST_SUFFIX: (CHAPTER_PREFIX, SECTION_PREFIX, CHARACTER_PREFIX, LOCATION_PREFIX, ITEM_PREFIX),
+        SECTIONS_SUFFIX: (CHAPTER_PREFIX, SECTION_PREFIX),
+        STAGES_SUFFIX: (CHAPTER_PREFIX, SECTION_PREFIX),
+        STATISTICS_SUFFIX: (CHAPTER_PREFIX, SECTION_PREFIX, CHARACTER_PREFIX),
+    }
+    # key: target file name suffix; value: prefixes of the element IDs the document depends on.
+    # All documents depend on the project data.
+
+    _CHILD_PREFIXES = {
+        CH_ROOT: CHAPTER_PREFIX,
+        CR_ROOT: CHARACTER_PREFIX,
+        LC_ROOT: LOCATION_PREFIX,
+        IT_ROOT: ITEM_PREFIX,
+        PL_ROOT: PLOT_LINE_PREFIX,
+        PN_ROOT: PRJ_NOTE_PREFIX,
+        CHAPTER_PREFIX: SECTION_PREFIX,
+        PLOT_LINE_PREFIX: PLOT_POINT_PREFIX,
+    }
+    # key: root ID or parent element ID prefix; value: prefix of the child IDs
+
+    _MANUSCRIPT_KEY = 'manuscript'
+    # Preference setting entry for the manuscript, which has no suffix.
+
+    def __init__(self, model):
+        """Set up the export targets.
+
+        Positional arguments:
+            model: NvModel -- Reads the saved project in the worker thread.
+        """
+        self._mdl = model
+        self._exportTargetFactory = ExportTargetFactory(
+            NvDocExporter.EXPORT_TARGET_CLASSES + NvHtmlReporter.EXPORT_TARGET_CLASSES
+            )
+        self.revisions = {}
+        self._fragmentCache = FragmentCache()
+        # used by the worker thread only
+        self._lock = Lock()
+        self._request = None
+        self._messages = []
+        self._worker = None
+        self._isRunning = False
+
+    def get_affected_targets(self, fileTree, filePath, suffixes):
+        """Return the suffixes of the outdated documents.
+
+        Positional arguments:
+            fileTree: MerkleTree -- Content hashes of the saved project.
+            filePath: str -- Path of the project file.
+            suffixes: list of str -- File name suffixes of the documents to keep up to date.
+        """
+        affected = []
+        changes = {}
+        # key: ID of an exported revision; value: set of changed ID prefixes, or None for all
+        for suffix in suffixes:
+            revision = self.revisions.get((filePath, suffix), None)
+            if revision is None:
+                affected.append(suffix)
+                continue
+
+            if not id(revision) in changes:
+                changes[id(revision)] = self._get_changed_prefixes(fileTree, revision)
+            changedPrefixes = changes[id(revision)]
+            if changedPrefixes is None or changedPrefixes.intersection(self.TARGET_DEPENDENCIES[suffix]):
+                affected.append(suffix)
+        return affected
+
+    def get_messages(self):
+        """Return and clear the messages of the finished exports."""
+        with self._lock:
+            messages = self._messages
+            self._messages = []
+        return messages
+
+    @staticmethod
+    def get_setting(suffixes):
+        """Return the preference setting for a list of suffixes.
+
+        Positional arguments:
+            suffixes: list of str -- File name suffixes of the documents to keep up to date.
+        """
+        return ';'.join(suffix or NvAutoExporter._MANUSCRIPT_KEY for suffix in suffixes)
+
+    @staticmethod
+    def get_suffixes(setting):
+        """Return the list of suffixes of a preference setting.
+
+        Positional arguments:
+            setting: str -- Semicolon-separated suffixes, with "manuscript" for the manuscript.
+        """
+        suffixes = []
+        for entry in setting.split(';'):
+            if entry == NvAutoExporter._MANUSCRIPT_KEY:
+                suffixes.append('')
+            elif entry:
+                suffixes.append(entry)
+        return suffixes
+
+    def is_busy(self):
+        """Return True if an export is running."""
+        return self._isRunning
+
+    def run(self, prjFile, suffixes):
+        """Start re-exporting the documents affected by the last save.
+
+        Positional arguments:
+            prjFile: NvWorkFile -- The project file just written.
+            suffixes: list of str -- File name suffixes of the documents to keep up to date.
+        """
+        suffixes = [suffix for suffix in suffixes if suffix in self.TARGET_DEPENDENCIES]
+        if not suffixes or prjFile.fileTree is None:
+            return
+
+        with self._lock:
+            self._request = (prjFile.filePath, prjFile.fileTree, suffixes)
+            if self._isRunning:
+                # The worker picks up the request when done.
+                return
+
+            self._isRunning = True
+            self._worker = Thread(target=self._export, daemon=True)
+            self._worker.start()
+
+    def wait(self):
+        """Wait for the running export to finish."""
+        if self._worker is not None:
+            self._worker.join()
+
+    def _export(self):
+        """Process the export requests until there are none left.
+        
+        Errors are reported as messages, so the worker keeps running.
+        Should the thread end anyway, the next run() starts a new one.
+        """
+        try:
+            while True:
+                with self._lock:
+                    if self._request is None:
+                        self._isRunning = False
+                        return
+
+                    filePath, fileTree, suffixes = self._request
+                    self._request = None
+                try:
+                    self._export_revision(filePath, fileTree, suffixes)
+                except Exception as ex:
+                    with self._lock:
+                        self._messages.append(f'!{_("Automatic export failed")}: {str(ex)}')
+        except BaseException:
+            with self._lock:
+                self._isRunning = False
+            raise
+
+    def _export_revision(self, filePath, fileTree, suffixes):
+        """Export the documents affected by a saved project revision."""
+        affected = self.get_affected_targets(fileTree, filePath, suffixes)
+        if not affected:
+            return
+
+        try:
+            prjFile = self._mdl.read_project(filePath)
+        except Exception as ex:
+            # Probably the file is being written; then a new request will follow.
+            with self._lock:
+                self._messages.append(f'!{_("Automatic export failed")}: {str(ex)}')
+            return
+
+        if prjFile.fileTree.rootHash != fileTree.rootHash:
+            # The file has been saved again in the meantime.
+            return
+
+        descriptions = []
+        for suffix in affected:
+            try:
+                __, target = self._exportTargetFactory.make_file_objects(filePath, suffix=suffix)
+                target.novel = prjFile.novel
+                target.fragmentCache = self._fragmentCache
+                target.write()
+            except Error as ex:
+                with self._lock:
+                    self._messages.append(f'!{str(ex)}')
+            except Exception as ex:
+                with self._lock:
+                    self._messages.append(f'!{_("Automatic export failed")} ({suffix or self._MANUSCRIPT_KEY}): {str(ex)}')
+            else:
+                descriptions.append(target.DESCRIPTION)
+                self.revisions[(filePath, suffix)] = fileTree
+        if descriptions:
+            with self._lock:
+                self._messages.append(f'{_("Updated")}: {", ".join(descriptions)}.')
+
+    def _get_changed_prefixes(self, fileTree, revision):
+        """Return the set of changed ID prefixes, or None if the project data changed."""
+        projectChanged, elemIds, branchIds = fileTree.diff(revision)
+        if projectChanged:
+            return None
+
+        changedPrefixes = {elemId[:2] for elemId in elemIds}
+        for branchId in branchIds:
+            changedPrefixes.add(self._CHILD_PREFIXES.get(branchId, self._CHILD_PREFIXES.get(branchId[:2], None)))
+        return changedPrefixes
@@ -8,24 +8,25 @@ from datetime import datetime
 import os
 
 from mdnvlib.converter.export_target_factory import ExportTargetFactory
-from mdnvlib.csv.csv_charlist import CsvCharList
-from mdnvlib.csv.csv_grid import CsvGrid
-from mdnvlib.csv.csv_itemlist import CsvItemList
-from mdnvlib.csv.csv_loclist import CsvLocList
-from mdnvlib.csv.csv_sectionlist import CsvSectionList
 from mdnvlib.exporter.filter_factory import FilterFactory
 from mdnvlib.file.doc_open import open_document
-from mdnvlib.md.md_brief_synopsis import MdBriefSynopsis
-from mdnvlib.md.md_chapterdesc import MdChapterDesc
-from mdnvlib.md.md_characters import MdCharacters
-from mdnvlib.md.md_export import MdExport
-from mdnvlib.md.md_items import MdItems
-from mdnvlib.md.md_locations import MdLocations
-from mdnvlib.md.md_partdesc import MdPartDesc
-from mdnvlib.md.md_plotlines import MdPlotlines
-from mdnvlib.md.md_sectiondesc import MdSectionDesc
-from mdnvlib.md.md_stages import MdStages
+from mdnvlib.lazy_class import LazyClass
+from mdnvlib.novx_globals import BRF_SYNOPSIS_SUFFIX
+from mdnvlib.novx_globals import CHAPTERS_SUFFIX
+from mdnvlib.novx_globals import CHARACTERS_SUFFIX
+from mdnvlib.novx_globals import CHARLIST_SUFFIX
 from mdnvlib.novx_globals import Error
+from mdnvlib.novx_globals import GRID_SUFFIX
+from mdnvlib.novx_globals import ITEMLIST_SUFFIX
+from mdnvlib.novx_globals import ITEMS_SUFFIX
+from mdnvlib.novx_globals import LOCATIONS_SUFFIX
+from mdnvlib.novx_globals import LOCLIST_SUFFIX
+from mdnvlib.novx_globals import PARTS_SUFFIX
+from mdnvlib.novx_globals import PLOTLINES_SUFFIX
+from mdnvlib.novx_globals import SECTIONLIST_SUFFIX
+from mdnvlib.novx_globals import SECTIONS_SUFFIX
+from mdnvlib.novx_globals import STAGES_SUFFIX
+from mdnvlib.novx_globals import STATISTICS_SUFFIX
 from mdnvlib.novx_globals import _
 from mdnvlib.novx_globals import norm_path
 from mdnvlib.nv_globals import prefs
@@ -35,29 +36,39 @@ from mdnvlib.view.widgets.nv_simpledialog import SimpleDialog
 class NvDocExporter:
     """Converter class for document export."""
     EXPORT_TARGET_CLASSES = [
-        MdExport,
-        CsvCharList,
-        CsvGrid,
-        CsvItemList,
-        CsvLocList,
-        CsvSectionList,
-        MdBriefSynopsis,
-        MdChapterDesc,
-        MdCharacters,
-        MdItems,
-        MdLocations,
-        MdPartDesc,
-        MdPlotlines,
-        MdSectionDesc,
-        MdStages,
+        LazyClass('mdnvlib.md.md_export', 'MdExport', SUFFIX=''),
+        LazyClass('mdnvlib.csv.csv_charlist', 'CsvCharList', SUFFIX=CHARLIST_SUFFIX),
+        LazyClass('mdnvlib.csv.csv_grid', 'CsvGrid', SUFFIX=GRID_SUFFIX),
+        LazyClass('mdnvlib.csv.csv_itemlist', 'CsvItemList', SUFFIX=ITEMLIST_SUFFIX),
+        LazyClass('mdnvlib.csv.csv_loclist', 'CsvLocList', SUFFIX=LOCLIST_SUFFIX),
+        LazyClass('mdnvlib.csv.csv_sectionlist', 'CsvSectionList', SUFFIX=SECTIONLIST_SUFFIX),
+        LazyClass('mdnvlib.md.md_brief_synopsis', 'MdBriefSynopsis', SUFFIX=BRF_SYNOPSIS_SUFFIX),
+        LazyClass('mdnvlib.md.md_chapterdesc', 'MdChapterDesc', SUFFIX=CHAPTERS_SUFFIX),
+        LazyClass('mdnvlib.md.md_characters', 'MdCharacters', SUFFIX=CHARACTERS_SUFFIX),
+        LazyClass('mdnvlib.md.md_items', 'MdItems', SUFFIX=ITEMS_SUFFIX),
+        LazyClass('mdnvlib.md.md_locations', 'MdLocations', SUFFIX=LOCATIONS_SUFFIX),
+        LazyClass('mdnvlib.md.md_partdesc', 'MdPartDesc', SUFFIX=PARTS_SUFFIX),
+        LazyClass('mdnvlib.md.md_plotlines', 'MdPlotlines', SUFFIX=PLOTLINES_SUFFIX),
+        LazyClass('mdnvlib.md.md_sectiondesc', 'MdSectionDesc', SUFFIX=SECTIONS_SUFFIX),
+        LazyClass('mdnvlib.md.md_stages', 'MdStages', SUFFIX=STAGES_SUFFIX),
+        LazyClass('mdnvlib.csv.csv_statistics', 'CsvStatistics', SUFFIX=STATISTICS_SUFFIX),
         ]
+    # The target modules are imported when a document of their type is exported.
 
-    def __init__(self, ui):
-        """Create strategy class instances."""
+    def __init__(self, ui, fragmentCache=None):
+        """Create strategy class instances.
+        
+        Positional arguments:
+            ui -- reference to the user interface.
+        
+        Optional arguments:
+            fragmentCache: FragmentCache -- Rendered chapters and sections kept between exports.
+        """
         self._ui = ui
         self.exportTargetFactory = ExportTargetFactory(self.EXPORT_TARGET_CLASSES)
         self._source = None
         self._target = None
+        self._fragmentCache = fragmentCache
 
     def run(self, source, suffix, **kwargs):
         """Create a target object and run conversion.
@@ -119,6 +130,7 @@ class NvDocExporter:
         self._target.sectionFilter = FilterFactory.get_section_filter(filterElementId)
         self._target.chapterFilter = FilterFactory.get_chapter_filter(filterElementId)
         self._target.novel = self._source.novel
+        self._target.fragmentCache = self._fragmentCache
         self._target.write()
         self._targetFileDate = datetime.now().replace(microsecond=0).isoformat(sep=' ')
         if kwargs.get('show', True):
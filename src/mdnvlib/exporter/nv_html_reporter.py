@@ -8,11 +8,12 @@ import os
 
 from mdnvlib.converter.export_target_factory import ExportTargetFactory
 from mdnvlib.file.doc_open import open_document
-from mdnvlib.html.html_characters import HtmlCharacters
-from mdnvlib.html.html_items import HtmlItems
-from mdnvlib.html.html_locations import HtmlLocations
-from mdnvlib.html.html_plot_list import HtmlPlotList
-from mdnvlib.html.html_project_notes import HtmlProjectNotes
+from mdnvlib.lazy_class import LazyClass
+from mdnvlib.novx_globals import CHARACTER_REPORT_SUFFIX
+from mdnvlib.novx_globals import ITEM_REPORT_SUFFIX
+from mdnvlib.novx_globals import LOCATION_REPORT_SUFFIX
+from mdnvlib.novx_globals import PLOTLIST_SUFFIX
+from mdnvlib.novx_globals import PROJECTNOTES_SUFFIX
 
 
 class NvHtmlReporter:
@@ -23,11 +24,11 @@ class NvHtmlReporter:
     Otherwise, the project directory is used. 
     """
     EXPORT_TARGET_CLASSES = [
-        HtmlCharacters,
-        HtmlLocations,
-        HtmlItems,
-        HtmlPlotList,
-        HtmlProjectNotes,
+        LazyClass('mdnvlib.html.html_characters', 'HtmlCharacters', SUFFIX=CHARACTER_REPORT_SUFFIX),
+        LazyClass('mdnvlib.html.html_locations', 'HtmlLocations', SUFFIX=LOCATION_REPORT_SUFFIX),
+        LazyClass('mdnvlib.html.html_items', 'HtmlItems', SUFFIX=ITEM_REPORT_SUFFIX),
+        LazyClass('mdnvlib.html.html_plot_list', 'HtmlPlotList', SUFFIX=PLOTLIST_SUFFIX),
+        LazyClass('mdnvlib.html.html_project_notes', 'HtmlProjectNotes', SUFFIX=PROJECTNOTES_SUFFIX),
         ]
 
     def __init__(self):
@@ -16,6 +16,9 @@ class ScAcFilter:
 
     def __init__(self, plId):
         self._plId = plId
+        self._novel = None
+        self._scIds = None
+        # IDs of the accepted elements, looked up once per novel
 
     def accept(self, source, scId):
         """Check whether an entity matches the filter criteria.
@@ -26,13 +29,10 @@ class ScAcFilter:
         
         Return True if the plId matches an arc the section is assigned to.
         """
-        try:
-            if self._plId in source.novel.sections[scId].scPlotLines:
-                return True
-
-        except:
-            pass
-        return False
+        if source.novel is not self._novel:
+            self._novel = source.novel
+            self._scIds = set(source.novel.query.get_sections(plotLine=self._plId))
+        return scId in self._scIds
 
     def get_message(self, source):
         """Return a message about how the document exported from source is filtered."""
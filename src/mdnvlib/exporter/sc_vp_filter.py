@@ -16,6 +16,9 @@ class ScVpFilter:
 
     def __init__(self, crId):
         self._crId = crId
+        self._novel = None
+        self._scIds = None
+        # IDs of the accepted elements, looked up once per novel
 
     def accept(self, source, scId):
         """Check whether an entity matches the filter criteria.
@@ -26,13 +29,10 @@ class ScVpFilter:
         
         Return True if the crId matches the section's viewpoint character.
         """
-        try:
-            if self._crId == source.novel.sections[scId].characters[0]:
-                return True
-
-        except:
-            pass
-        return False
+        if source.novel is not self._novel:
+            self._novel = source.novel
+            self._scIds = set(source.novel.query.get_sections(viewpoint=self._crId))
+        return scId in self._scIds
 
     def get_message(self, source):
         """Return a message about how the document exported from source is filtered."""
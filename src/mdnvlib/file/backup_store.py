@@ -0,0 +1,338 @@
+"""Provide a class for a content-addressed project snapshot store.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from datetime import datetime
+from datetime import timedelta
+import hashlib
+import json
+import os
+import zlib
+
+from mdnvlib.novx_globals import Error
+from mdnvlib.novx_globals import _
+from mdnvlib.novx_globals import norm_path
+
+
+class BackupStore:
+    """Versioned snapshots of a JSON project file.
+
+    Public methods:
+        compact(keepLast, keepDaily, keepWeekly) -- Apply the retention rules and remove unused blobs.
+        get_snapshots() -- Return a list of snapshot descriptions, newest first.
+        load(snapshotId) -- Return the project data of a snapshot.
+        restore(snapshotId) -- Overwrite the project file with a snapshot.
+        take_snapshot() -- Record the saved project file.
+
+    The store is a directory next to the project file.
+    Each project element is a blob, keyed by the SHA-256 hash of its content.
+    Each collection (e.g. the chapters, or the sections of a chapter) is a tree blob
+    listing the element IDs with the hashes of the element blob and the child tree.
+    A snapshot is a small manifest file referring to the tree hashes,
+    so a save costs only the blobs that have changed since the previous snapshot.
+    """
+    DIRECTORY_SUFFIX = '.snapshots'
+    ROOT = 'mdnovel'
+    COLLECTIONS = {
+        'CHAPTERS': 'SECTIONS',
+        'CHARACTERS': None,
+        'LOCATIONS': None,
+        'ITEMS': None,
+        'ARCS': 'POINTS',
+        'PROJECTNOTES': None,
+    }
+    # key: JSON collection; value: JSON sub-collection of each element, if any.
+    _TIME_FORMAT = '%Y%m%d-%H%M%S'
+    _ID_FORMAT = f'{_TIME_FORMAT}-%f'
+    # Snapshots of earlier versions have IDs without microseconds.
+
+    def __init__(self, filePath):
+        """Set the paths.
+
+        Positional arguments:
+            filePath: str -- Path of the JSON project file.
+        """
+        self.filePath = filePath
+        self._storeDir = f'{filePath}{self.DIRECTORY_SUFFIX}'
+        self._objectDir = os.path.join(self._storeDir, 'objects')
+        self._snapshotDir = os.path.join(self._storeDir, 'snapshots')
+        self._newObjects = 0
+        self._newBytes = 0
+
+    def compact(self, keepLast=20, keepDaily=7, keepWeekly=8):
+        """Apply the retention rules and remove the blobs no longer referenced.
+
+        Optional arguments:
+            keepLast: int -- Number of most recent snapshots to keep.
+            keepDaily: int -- Number of days for which the latest snapshot is kept.
+            keepWeekly: int -- Number of weeks for which the latest snapshot is kept.
+
+        Return a tuple (number of removed snapshots, number of removed blobs).
+        """
+        snapshotIds = self._get_snapshot_ids()
+        keep = set(snapshotIds[:keepLast])
+        for get_period, number in (
+            (lambda created: created.date(), keepDaily),
+            (lambda created: created.isocalendar()[:2], keepWeekly),
+            ):
+            periods = set()
+            for snapshotId in snapshotIds:
+                period = get_period(datetime.strptime(snapshotId[:15], self._TIME_FORMAT))
+                if period in periods:
+                    continue
+
+                if len(periods) == number:
+                    break
+
+                periods.add(period)
+                keep.add(snapshotId)
+        removedSnapshots = 0
+        for snapshotId in snapshotIds:
+            if not snapshotId in keep:
+                os.remove(self._get_manifest_path(snapshotId))
+                removedSnapshots += 1
+        if not removedSnapshots:
+            return 0, 0
+
+        # Mark the blobs reachable from the remaining snapshots, and sweep the others.
+        reachable = set()
+        for snapshotId in keep:
+            self._mark(self._read_manifest(snapshotId), reachable)
+        removedBlobs = 0
+        for prefix in os.listdir(self._objectDir):
+            prefixDir = os.path.join(self._objectDir, prefix)
+            for rest in os.listdir(prefixDir):
+                if not f'{prefix}{rest}' in reachable:
+                    os.remove(os.path.join(prefixDir, rest))
+                    removedBlobs += 1
+            if not os.listdir(prefixDir):
+                os.rmdir(prefixDir)
+        return removedSnapshots, removedBlobs
+
+    def get_snapshots(self):
+        """Return a list of snapshot descriptions, newest first.
+
+        Each description is a dictionary with the keys
+        "id", "created", "newObjects", and "newBytes".
+        """
+        snapshots = []
+        for snapshotId in self._get_snapshot_ids():
+            manifest = self._read_manifest(snapshotId)
+            snapshots.append(dict(
+                id=snapshotId,
+                created=manifest['created'],
+                newObjects=manifest['newObjects'],
+                newBytes=manifest['newBytes'],
+                ))
+        return snapshots
+
+    def load(self, snapshotId):
+        """Return the project data of a snapshot, as read from the JSON file.
+
+        Positional arguments:
+            snapshotId: str -- ID of the snapshot to load.
+
+        Raise the "Error" exception in case of error.
+        """
+        try:
+            manifest = self._read_manifest(snapshotId)
+            jsonRoot = {'version': manifest['version']}
+            if manifest['project'] is not None:
+                jsonRoot['PROJECT'] = self._read_blob(manifest['project'])
+            for collection, treeHash in manifest['collections'].items():
+                jsonRoot[collection] = self._load_tree(treeHash, self.COLLECTIONS[collection])
+            if manifest['progress']:
+                jsonRoot['PROGRESS'] = {}
+                for chunkHash in manifest['progress']:
+                    jsonRoot['PROGRESS'].update(self._read_blob(chunkHash))
+        except Exception as ex:
+            raise Error(f'{_("Cannot read snapshot")}: {snapshotId} ({str(ex)}).')
+
+        return {self.ROOT: jsonRoot}
+
+    def restore(self, snapshotId):
+        """Overwrite the project file with a snapshot.
+
+        Positional arguments:
+            snapshotId: str -- ID of the snapshot to restore.
+
+        The replaced project file is kept as backup file.
+        Raise the "Error" exception in case of error.
+        """
+        jsonData = self.load(snapshotId)
+        tempPath = f'{self.filePath}.tmp'
+        try:
+            with open(tempPath, 'w', encoding='utf-8') as f:
+                json.dump(jsonData, f, indent=2, ensure_ascii=False)
+        except:
+            raise Error(f'{_("Cannot write file")}: "{norm_path(self.filePath)}".')
+
+        # The project file is replaced only when the snapshot has been written completely.
+        backupPath = f'{self.filePath}.bak'
+        if os.path.isfile(self.filePath):
+            try:
+                os.replace(self.filePath, backupPath)
+            except:
+                raise Error(f'{_("Cannot overwrite file")}: "{norm_path(self.filePath)}".')
+
+        try:
+            os.replace(tempPath, self.filePath)
+        except:
+            if os.path.isfile(backupPath):
+                os.replace(backupPath, self.filePath)
+            raise Error(f'{_("Cannot write file")}: "{norm_path(self.filePath)}".')
+
+    def take_snapshot(self):
+        """Record the saved project file.
+
+        Return the snapshot ID, or None if nothing has changed since the latest snapshot.
+        Raise the "Error" exception in case of error.
+        """
+        try:
+            with open(self.filePath, 'r', encoding='utf-8') as f:
+                jsonRoot = json.load(f)[self.ROOT]
+        except Exception as ex:
+            raise Error(f'{_("Cannot read file")}: "{norm_path(self.filePath)}" ({str(ex)}).')
+
+        self._newObjects = 0
+        self._newBytes = 0
+        try:
+            manifest = self._store_project(jsonRoot)
+            snapshotIds = self._get_snapshot_ids()
+            if snapshotIds and self._is_same_state(manifest, self._read_manifest(snapshotIds[0])):
+                return None
+
+            now = datetime.now()
+            snapshotId = now.strftime(self._ID_FORMAT)
+            while os.path.isfile(self._get_manifest_path(snapshotId)):
+                # Never overwrite a snapshot, even if the clock has been set back.
+                now += timedelta(microseconds=1)
+                snapshotId = now.strftime(self._ID_FORMAT)
+            manifest['created'] = now.isoformat(sep=' ', timespec='seconds')
+            manifest['newObjects'] = self._newObjects
+            manifest['newBytes'] = self._newBytes
+            self._write_file(
+                self._get_manifest_path(snapshotId),
+                json.dumps(manifest, indent=1).encode('utf-8'),
+                )
+        except OSError as ex:
+            raise Error(f'{_("Cannot write snapshot")}: "{norm_path(self._storeDir)}" ({str(ex)}).')
+
+        return snapshotId
+
+    def _get_manifest_path(self, snapshotId):
+        return os.path.join(self._snapshotDir, f'{snapshotId}.json')
+
+    def _get_object_path(self, blobHash):
+        return os.path.join(self._objectDir, blobHash[:2], blobHash[2:])
+
+    def _get_snapshot_ids(self):
+        """Return the list of snapshot IDs, newest first."""
+        if not os.path.isdir(self._snapshotDir):
+            return []
+
+        snapshotIds = []
+        for fileName in os.listdir(self._snapshotDir):
+            snapshotId, extension = os.path.splitext(fileName)
+            if extension == '.json':
+                snapshotIds.append(snapshotId)
+        snapshotIds.sort(reverse=True)
+        return snapshotIds
+
+    def _is_same_state(self, manifest, reference):
+        for key in ('version', 'project', 'collections', 'progress'):
+            if manifest[key] != reference[key]:
+                return False
+
+        return True
+
+    def _load_tree(self, treeHash, subCollection):
+        """Return a JSON collection rebuilt from a tree blob."""
+        jsonCollection = {}
+        for elemId, elemHash, childHash in self._read_blob(treeHash):
+            jsonCollection[elemId] = self._read_blob(elemHash)
+            if childHash:
+                jsonCollection[elemId][subCollection] = self._load_tree(childHash, None)
+        return jsonCollection
+
+    def _mark(self, manifest, reachable):
+        """Add the hashes of all blobs referenced by manifest to the reachable set."""
+
+        def mark_tree(treeHash):
+            if treeHash in reachable:
+                return
+
+            reachable.add(treeHash)
+            for __, elemHash, childHash in self._read_blob(treeHash):
+                reachable.add(elemHash)
+                if childHash:
+                    mark_tree(childHash)
+
+        if manifest['project'] is not None:
+            reachable.add(manifest['project'])
+        for treeHash in manifest['collections'].values():
+            mark_tree(treeHash)
+        reachable.update(manifest['progress'])
+
+    def _read_blob(self, blobHash):
+        with open(self._get_object_path(blobHash), 'rb') as f:
+            return json.loads(zlib.decompress(f.read()).decode('utf-8'))
+
+    def _read_manifest(self, snapshotId):
+        with open(self._get_manifest_path(snapshotId), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _store_blob(self, value):
+        """Store a JSON value, if not already present, and return its hash."""
+        data = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        blobHash = hashlib.sha256(data).hexdigest()
+        objectPath = self._get_object_path(blobHash)
+        if not os.path.isfile(objectPath):
+            data = zlib.compress(data)
+            self._write_file(objectPath, data)
+            self._newObjects += 1
+            self._newBytes += len(data)
+        return blobHash
+
+    def _store_project(self, jsonRoot):
+        """Store the blobs of a JSON project, and return a manifest without time stamp."""
+        manifest = dict(
+            version=jsonRoot.get('version', ''),
+            project=None,
+            collections={},
+            progress=[],
+            )
+        if 'PROJECT' in jsonRoot:
+            manifest['project'] = self._store_blob(jsonRoot['PROJECT'])
+        for collection, subCollection in self.COLLECTIONS.items():
+            if collection in jsonRoot:
+                manifest['collections'][collection] = self._store_tree(jsonRoot[collection], subCollection)
+
+        # Split the word count log by year, so that only the current year's chunk changes.
+        chunks = {}
+        for isoDate, counts in jsonRoot.get('PROGRESS', {}).items():
+            chunks.setdefault(isoDate[:4], {})[isoDate] = counts
+        for year in sorted(chunks):
+            manifest['progress'].append(self._store_blob(chunks[year]))
+        return manifest
+
+    def _store_tree(self, jsonCollection, subCollection):
+        """Store the elements of a JSON collection, and return the tree hash."""
+        tree = []
+        for elemId, jsonElement in jsonCollection.items():
+            childHash = ''
+            if subCollection is not None and subCollection in jsonElement:
+                jsonElement = jsonElement.copy()
+                childHash = self._store_tree(jsonElement.pop(subCollection), None)
+            tree.append([elemId, self._store_blob(jsonElement), childHash])
+        return self._store_blob(tree)
+
+    def _write_file(self, filePath, data):
+        """Write data to a temporary file, and then move it into place."""
+        os.makedirs(os.path.dirname(filePath), exist_ok=True)
+        tempPath = f'{filePath}.tmp'
+        with open(tempPath, 'wb') as f:
+            f.write(data)
+        os.replace(tempPath, filePath)
@@ -16,6 +16,7 @@ from mdnvlib.model.section import Section
 from mdnvlib.novx_globals import CHARACTERS_SUFFIX
 from mdnvlib.novx_globals import CH_ROOT
 from mdnvlib.novx_globals import CR_ROOT
+from mdnvlib.novx_globals import CURRENT_LANGUAGE
 from mdnvlib.novx_globals import Error
 from mdnvlib.novx_globals import ITEMS_SUFFIX
 from mdnvlib.novx_globals import IT_ROOT
@@ -29,12 +30,28 @@ from mdnvlib.novx_globals import WEEKDAYS
 from mdnvlib.novx_globals import _
 from mdnvlib.novx_globals import list_to_string
 from mdnvlib.novx_globals import norm_path
+from mdnvlib.profiler import profiler
+
+_exporter = None
+# FileExport instance rendering chapters in forked worker processes
 
 
 class FileExport(File):
     """Abstract mdnovel project file exporter representation.
     
+    Public instance variables:
+        workers: int -- Number of processes rendering the chapters. Default: 1.
+          The worker processes are forked, so more than one is meant for
+          the batch and command line tools, not for the GUI with its threads.
+        fragmentCache: FragmentCache -- Rendered chapter and section fragments, or None.
+        fragmentStatistics: tuple -- Numbers of fragments taken from the cache and rendered by the last export.
+    
     This class is generic and contains no conversion algorithm and no templates.
+    With more than one worker, the chapters are rendered in parallel
+    by forked worker processes, where the platform supports it;
+    the output is the same as with a single worker.
+    With a fragment cache, only the chapter headings and sections that have changed
+    since a previous export are rendered, in the current process.
     """
     SUFFIX = ''
     _assocSectionTemplate = ''
@@ -82,6 +99,10 @@ class FileExport(File):
         self.itemFilter = Filter()
         self.plotlineFilter = Filter()
         self.turningPointFilter = Filter()
+        self.workers = 1
+        self.fragmentCache = None
+        self.fragmentStatistics = None
+        self._fragmentContext = None
 
     def write(self):
         """Write instance variables to the export file.
@@ -90,7 +111,8 @@ class FileExport(File):
         Return a message in case of success.
         Raise the "Error" exception in case of error. 
         """
-        text = self._get_text()
+        with profiler.span(f'{type(self).__name__}._get_text'):
+            text = self._get_text()
         backedUp = False
         if os.path.isfile(self.filePath):
             try:
@@ -261,46 +283,116 @@ class FileExport(File):
         Return a list of strings.
         This is a template method that can be extended or overridden by subclasses.
         """
+        chapters = self._get_chapter_numbering()
+        if self.fragmentCache is not None:
+            self.fragmentCache.reset_statistics()
+            self._fragmentContext = self._get_fragment_context()
+            blocks = [self._get_chapter_block(*chapter) for chapter in chapters]
+            self.fragmentStatistics = (self.fragmentCache.hits, self.fragmentCache.misses)
+            profiler.count('FragmentCache.hits', self.fragmentCache.hits)
+            profiler.count('FragmentCache.misses', self.fragmentCache.misses)
+        elif self.workers > 1 and len(chapters) > 1:
+            blocks = self._render_in_parallel(chapters)
+        else:
+            blocks = [self._get_chapter_block(*chapter) for chapter in chapters]
         lines = []
+        for block in blocks:
+            lines.extend(block)
+        return lines
+
+    def _get_chapter_block(self, chId, dispNumber, sectionNumber, wordsTotal):
+        """Process a chapter and its sections.
+        
+        Positional arguments:
+            chId: str -- chapter ID.
+            dispNumber: int -- chapter number to be displayed, or 0.
+            sectionNumber: int -- number of the sections processed before the chapter.
+            wordsTotal: int -- accumulated wordcount of the sections before the chapter.
+        
+        Return a list of strings.
+        """
+        lines = []
+
+        # The order counts; be aware that "Todo" and "Notes" chapters are
+        # always unused.
+        # Has the chapter only sections not to be exported?
+        template = None
+        if self.novel.chapters[chId].chType == 1:
+            # Chapter is "unused" type.
+            if self._unusedChapterTemplate:
+                template = Template(self._unusedChapterTemplate)
+        elif self.novel.chapters[chId].chLevel == 1 and self._partTemplate:
+            template = Template(self._partTemplate)
+        else:
+            template = Template(self._chapterTemplate)
+        if template is not None:
+            lines.append(
+                self._substitute(
+                    template,
+                    self._get_chapterMapping,
+                    chId,
+                    self.novel.chapters[chId],
+                    dict(ChapterNumber=dispNumber),
+                    )
+                )
+
+        #--- Process sections.
+        sectionLines, __, __ = self._get_sections(chId, sectionNumber, wordsTotal)
+        lines.extend(sectionLines)
+
+        #--- Process chapter ending.
+        template = None
+        if self.novel.chapters[chId].chType == 1:
+            if self._unusedChapterEndTemplate:
+                template = Template(self._unusedChapterEndTemplate)
+        elif self._chapterEndTemplate:
+            template = Template(self._chapterEndTemplate)
+        if template is not None:
+            lines.append(
+                self._substitute(
+                    template,
+                    self._get_chapterMapping,
+                    chId,
+                    self.novel.chapters[chId],
+                    dict(ChapterNumber=dispNumber),
+                    )
+                )
+        return lines
+
+    def _get_chapter_numbering(self):
+        """Return the running numbers of the chapters to be processed.
+        
+        Return a list of tuples (chapter ID, chapter number to be displayed or 0,
+        number of the sections before the chapter, accumulated wordcount
+        of the sections before the chapter), in the order of processing.
+        The numbers are counted like in _get_chapter_block() and _get_sections(),
+        without rendering anything, so the chapters can be processed independently.
+        """
+        chapters = []
         chapterNumber = 0
         sectionNumber = 0
         wordsTotal = 0
         for chId in self.novel.tree.get_children(CH_ROOT):
-            dispNumber = 0
             if not self.chapterFilter.accept(self, chId):
                 continue
 
-            # The order counts; be aware that "Todo" and "Notes" chapters are
-            # always unused.
-            # Has the chapter only sections not to be exported?
-            template = None
-            if self.novel.chapters[chId].chType == 1:
-                # Chapter is "unused" type.
-                if self._unusedChapterTemplate:
-                    template = Template(self._unusedChapterTemplate)
-            elif self.novel.chapters[chId].chLevel == 1 and self._partTemplate:
-                template = Template(self._partTemplate)
-            else:
-                template = Template(self._chapterTemplate)
+            dispNumber = 0
+            chapter = self.novel.chapters[chId]
+            if chapter.chType != 1 and not (chapter.chLevel == 1 and self._partTemplate):
                 chapterNumber += 1
                 dispNumber = chapterNumber
-            if template is not None:
-                lines.append(template.safe_substitute(self._get_chapterMapping(chId, dispNumber)))
+            chapters.append((chId, dispNumber, sectionNumber, wordsTotal))
+            if chapter.chType == 1:
+                continue
 
-            #--- Process sections.
-            sectionLines, sectionNumber, wordsTotal = self._get_sections(chId, sectionNumber, wordsTotal)
-            lines.extend(sectionLines)
+            for scId in self.novel.tree.get_children(chId):
+                if not self.sectionFilter.accept(self, scId):
+                    continue
 
-            #--- Process chapter ending.
-            template = None
-            if self.novel.chapters[chId].chType == 1:
-                if self._unusedChapterEndTemplate:
-                    template = Template(self._unusedChapterEndTemplate)
-            elif self._chapterEndTemplate:
-                template = Template(self._chapterEndTemplate)
-            if template is not None:
-                lines.append(template.safe_substitute(self._get_chapterMapping(chId, dispNumber)))
-        return lines
+                if self.novel.sections[scId].scType == 0:
+                    sectionNumber += 1
+                    wordsTotal += self.novel.sections[scId].wordCount
+        return chapters
 
     def _get_characterMapping(self, crId):
         """Return a mapping dictionary for a character section.
@@ -431,6 +523,33 @@ class FileExport(File):
         )
         return fileHeaderMapping
 
+    def _get_fragment_context(self):
+        """Return a hash of the rendering inputs shared by all chapters and sections.
+        
+        These are the target class, the user interface language, the project name and path,
+        the novel's settings, and the elements that the chapters and sections may refer to.
+        """
+        cache = self.fragmentCache
+        elements = []
+        for collection in (
+            self.novel.characters,
+            self.novel.locations,
+            self.novel.items,
+            self.novel.plotLines,
+            self.novel.plotPoints,
+            self.novel.projectNotes,
+            ):
+            elements.append([(elemId, cache.get_fingerprint(element)) for elemId, element in collection.items()])
+        return cache.get_key(
+            type(self).__module__,
+            type(self).__qualname__,
+            CURRENT_LANGUAGE,
+            self.projectName,
+            self.projectPath,
+            cache.get_fingerprint(self.novel),
+            elements,
+            )
+
     def _get_itemMapping(self, itId):
         """Return a mapping dictionary for an item section.
         
@@ -611,17 +730,17 @@ class FileExport(File):
             sectionItems = ''
 
         #--- Date or day.
-        if self.novel.sections[scId].date is not None and self.novel.sections[scId].date != Section.NULL_DATE:
+        sectionStart = self.novel.storyTime.get_start(scId)
+        if sectionStart is not None and self.novel.sections[scId].date is not None:
+            # The date has been parsed by the story time index.
             scDay = ''
             isoDate = self.novel.sections[scId].date
             cmbDate = self.novel.sections[scId].localeDate
-            yearStr, monthStr, dayStr = isoDate.split('-')
-            dtMonth = MONTHS[int(monthStr) - 1]
-            try:
-                dtWeekday = WEEKDAYS[self.novel.sections[scId].weekDay]
-            except TypeError:
-                dtWeekday = ''
-            # this is for Timeline conversion
+            yearStr = f'{sectionStart.year:04}'
+            monthStr = f'{sectionStart.month:02}'
+            dayStr = f'{sectionStart.day:02}'
+            dtMonth = MONTHS[sectionStart.month - 1]
+            dtWeekday = WEEKDAYS[sectionStart.weekday()]
 
         else:
             isoDate = ''
@@ -787,12 +906,13 @@ class FileExport(File):
                 lines.append(self._sectionDivider)
             if template is not None:
                 lines.append(
-                    template.safe_substitute(
-                        self._get_sectionMapping(
-                            scId, dispNumber,
-                            wordsTotal,
-                            firstInChapter=firstSectionInChapter,
-                            )
+                    self._substitute(
+                        template,
+                        self._get_sectionMapping,
+                        scId,
+                        self.novel.sections[scId],
+                        dict(SectionNumber=dispNumber, WordsTotal=wordsTotal),
+                        firstInChapter=firstSectionInChapter,
                         )
                     )
             if self.novel.sections[scId].scType < 2:
@@ -848,3 +968,72 @@ class FileExport(File):
         lines.extend(self._get_fileFooter())
         return ''.join(lines)
 
+    def _render_in_parallel(self, chapters):
+        """Return the processed chapters as a list of line lists, rendered by worker processes.
+        
+        Positional arguments:
+            chapters: list of tuples -- Chapter numbering, as returned by _get_chapter_numbering().
+        
+        The workers are forked, so they share the project data without copying.
+        Section contents read on first access are loaded beforehand,
+        so the workers do not share file handles.
+        Where processes cannot be forked, the chapters are rendered in this process.
+        """
+        global _exporter
+
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import get_all_start_methods
+        from multiprocessing import get_context
+        # imported on first use
+
+        if not 'fork' in get_all_start_methods():
+            return [self._get_chapter_block(*chapter) for chapter in chapters]
+
+        for section in self.novel.sections.values():
+            section.sectionContent
+        chunkSize = max(1, len(chapters) // (self.workers * 4))
+        _exporter = self
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context('fork')) as executor:
+                return list(executor.map(_get_chapter_block, chapters, chunksize=chunkSize))
+
+        finally:
+            _exporter = None
+
+    def _substitute(self, template, get_mapping, elemId, element, numbering, **kwargs):
+        """Return a template with the placeholders substituted for a chapter or a section.
+        
+        Positional arguments:
+            template: Template -- Template to apply.
+            get_mapping -- Method returning the mapping dictionary.
+            elemId: str -- ID of the element.
+            element -- Chapter or Section instance.
+            numbering: dict -- Numbers passed to get_mapping, keyed by their placeholders.
+        
+        Optional arguments:
+            kwargs -- keyword arguments passed to get_mapping.
+        
+        With a fragment cache, the result is taken from the cache if the template,
+        the element's data, and the numbers shown by the template are unchanged.
+        """
+        if self.fragmentCache is None:
+            return template.safe_substitute(get_mapping(elemId, *numbering.values(), **kwargs))
+
+        key = self.fragmentCache.get_key(
+            self._fragmentContext,
+            template.template,
+            elemId,
+            self.fragmentCache.get_fingerprint(element),
+            [(placeholder, number) for placeholder, number in numbering.items() if placeholder in template.template],
+            kwargs,
+            )
+        fragment = self.fragmentCache.get(key)
+        if fragment is None:
+            fragment = template.safe_substitute(get_mapping(elemId, *numbering.values(), **kwargs))
+            self.fragmentCache.put(key, fragment)
+        return fragment
+
+
+def _get_chapter_block(chapter):
+    """Process a chapter in a worker process; see FileExport._get_chapter_block()."""
+    return _exporter._get_chapter_block(*chapter)
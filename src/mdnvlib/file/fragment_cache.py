@@ -0,0 +1,190 @@
+"""Provide a class for a bounded cache of rendered export fragments.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from collections import OrderedDict
+import hashlib
+import json
+
+from mdnvlib.model.section import Section
+
+
+class FragmentCache:
+    """Rendered chapter and section fragments, keyed by a hash of their inputs.
+
+    Public methods:
+        clear() -- Remove all fragments.
+        get(key) -- Return a cached fragment, or None.
+        get_fingerprint(element) -- Return a hash of the data of an element.
+        get_key(*inputs) -- Return the cache key for the rendering inputs.
+        put(key, fragment) -- Store a fragment.
+        read(filePath) -- Load fragments from a file.
+        reset_statistics() -- Set the hit and miss counters to zero.
+        write(filePath) -- Save the fragments to a file.
+
+    Public instance variables:
+        maxSize: int -- Maximum number of characters held.
+        size: int -- Number of characters held.
+        hits: int -- Number of fragments found since the last reset.
+        misses: int -- Number of fragments not found since the last reset.
+
+    The elements have no revision counter, so a fragment's key is
+    a hash of everything its rendering depends on: the element's data,
+    the template, and the numbering, if the template shows it.
+    When the size limit is exceeded, the least recently used fragments are evicted.
+    """
+    CACHE_VERSION = 1
+    MAX_SIZE = 16000000
+    _EXCLUDED = ('_sectionContent', '_contentBuffer')
+    # Attributes represented by the "sectionContent" property.
+    _SCALARS = (str, int, float, bool, type(None))
+
+    def __init__(self, maxSize=None):
+        """Initialize instance variables.
+
+        Optional arguments:
+            maxSize: int -- Maximum number of characters held. Default: MAX_SIZE.
+        """
+        if maxSize is None:
+            maxSize = self.MAX_SIZE
+        self.maxSize = maxSize
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._fragments = OrderedDict()
+        # key: hash of the rendering inputs; value: rendered text
+        self._excludedNames = {}
+        # key: element class; value: names of the attributes not hashed
+
+    def clear(self):
+        """Remove all fragments."""
+        self._fragments.clear()
+        self.size = 0
+
+    def get(self, key):
+        """Return the fragment stored with key, or None if not cached.
+
+        Positional arguments:
+            key: str -- Key returned by get_key().
+        """
+        fragment = self._fragments.get(key, None)
+        if fragment is None:
+            self.misses += 1
+            return None
+
+        self._fragments.move_to_end(key)
+        self.hits += 1
+        return fragment
+
+    def get_fingerprint(self, element):
+        """Return a hash of the data of an element.
+
+        Positional arguments:
+            element -- Novel, or any element of the novel.
+
+        Only plain data is included, i.e. no methods, no references to
+        other elements, and no indexes; the section content is included
+        whether or not it has already been loaded.
+        The attributes to leave out are determined once per element class.
+        """
+        excluded = self._excludedNames.get(type(element), None)
+        if excluded is None:
+            excluded = [name for name, value in vars(element).items() if not self._is_data(value)]
+            excluded.extend(self._EXCLUDED)
+            self._excludedNames[type(element)] = excluded
+        data = dict(vars(element))
+        for name in excluded:
+            data.pop(name, None)
+        hasher = hashlib.sha1(repr(data).encode('utf-8', 'surrogatepass'))
+        if isinstance(element, Section):
+            # The content is hashed without its representation, which is much faster.
+            hasher.update((element.sectionContent or '').encode('utf-8', 'surrogatepass'))
+        return hasher.hexdigest()
+
+    def get_key(self, *inputs):
+        """Return the cache key for the rendering inputs.
+
+        Positional arguments:
+            inputs -- strings, numbers, fingerprints, or other plain data.
+        """
+        return hashlib.sha1(repr(inputs).encode('utf-8', 'surrogatepass')).hexdigest()
+
+    def put(self, key, fragment):
+        """Store a fragment, evicting the least recently used ones, if necessary.
+
+        Positional arguments:
+            key: str -- Key returned by get_key().
+            fragment: str -- Rendered text.
+        """
+        oldFragment = self._fragments.pop(key, None)
+        if oldFragment is not None:
+            self.size -= len(oldFragment)
+        if len(fragment) > self.maxSize:
+            return
+
+        self._fragments[key] = fragment
+        self.size += len(fragment)
+        while self.size > self.maxSize:
+            __, evicted = self._fragments.popitem(last=False)
+            self.size -= len(evicted)
+
+    def read(self, filePath):
+        """Load fragments from a file written by write().
+
+        Positional arguments:
+            filePath: str -- Path of the cache file.
+
+        Return True on success, otherwise return False.
+        """
+        try:
+            with open(filePath, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('version') != self.CACHE_VERSION:
+                return False
+
+            for key, fragment in cache['fragments']:
+                self.put(key, fragment)
+        except:
+            return False
+
+        return True
+
+    def reset_statistics(self):
+        """Set the hit and miss counters to zero."""
+        self.hits = 0
+        self.misses = 0
+
+    def write(self, filePath):
+        """Save the fragments to a file, least recently used first.
+
+        Positional arguments:
+            filePath: str -- Path of the cache file.
+
+        Return True on success, otherwise return False.
+        """
+        try:
+            with open(filePath, 'w', encoding='utf-8') as f:
+                json.dump(
+                    {'version': self.CACHE_VERSION, 'fragments': list(self._fragments.items())},
+                    f,
+                    ensure_ascii=False,
+                    separators=(',', ':')
+                    )
+        except:
+            return False
+
+        return True
+
+    def _is_data(self, value):
+        """Return True if value is plain data that can be hashed by its representation."""
+        if type(value) in self._SCALARS:
+            return True
+
+        if isinstance(value, dict):
+            value = value.values()
+        elif not isinstance(value, (list, tuple)):
+            return False
+
+        return all(type(item) in self._SCALARS or self._is_data(item) for item in value)
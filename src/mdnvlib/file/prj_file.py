@@ -8,6 +8,7 @@ from datetime import date
 import os
 
 from mdnvlib.file.file import File
+from mdnvlib.model.word_count_log import WordCountLog
 from mdnvlib.novx_globals import CH_ROOT
 from mdnvlib.novx_globals import Error
 from mdnvlib.novx_globals import _
@@ -16,8 +17,11 @@ from mdnvlib.novx_globals import _
 class PrjFile(File):
     """Project file representation.
 
+    Public methods:
+        read_header() -- Read the project metadata and the word count log.
+
     Public instance variables:
-        wcLog: dict[str, list[str, str]] -- Daily word count logs.
+        wcLog: WordCountLog -- Daily word count logs.
         wcLogUpdate: dict[str, list[str, str]] -- Word counts missing in the log.
         timestamp: float -- Time of last file modification (number of seconds since the epoch).
     
@@ -25,6 +29,8 @@ class PrjFile(File):
     """
     DESCRIPTION = _('mdnovel project')
     SUFFIX = ''
+    HEADER_SIZE = 16384
+    # Number of bytes read at first from the file's beginning or end by read_header().
 
     def __init__(self, filePath, **kwargs):
         """Initialize instance variables.
@@ -40,9 +46,9 @@ class PrjFile(File):
         super().__init__(filePath)
         self.on_element_change = None
 
-        self.wcLog = {}
+        self.wcLog = WordCountLog()
         # key: str -- date (iso formatted)
-        # value: list -- [word count: str, with unused: str]
+        # value: list -- [word count: int, with unused: int]
 
         self.wcLogUpdate = {}
         # key: str -- date (iso formatted)
@@ -62,6 +68,14 @@ class PrjFile(File):
                 if self.novel.sections[scId].scType < self.novel.chapters[chId].chType:
                     self.novel.sections[scId].scType = self.novel.chapters[chId].chType
 
+    def read_header(self):
+        """Read the project metadata and the word count log, leaving the other data.
+        
+        Raise the "Error" exception in case of error. 
+        This reads the whole file; to be overridden by subclasses that can do it faster.
+        """
+        self.read()
+
     def _check_id(self, elemId, elemPrefix):
         """Raise an exception if elemId does not start with the correct prefix."""
         if not elemId.startswith(elemPrefix):
@@ -84,6 +98,32 @@ class PrjFile(File):
                             count += self.novel.sections[scId].wordCount
         return count, totalCount
 
+    def _get_file_end(self, separator):
+        """Return the end of the file, beginning with the last occurrence of separator.
+        
+        Positional arguments:
+            separator: str -- Text marking the beginning of the last part of the file.
+        
+        The file is read backwards in growing chunks until the separator is found.
+        Return an empty string if the file does not contain the separator.
+        """
+        with open(self.filePath, 'rb') as f:
+            fileSize = os.fstat(f.fileno()).st_size
+            chunkSize = self.HEADER_SIZE
+            while True:
+                start = max(0, fileSize - chunkSize)
+                f.seek(start)
+                text = f.read().decode('utf-8', errors='ignore').replace('\r\n', '\n')
+                # A character cut at the chunk's beginning is ignored.
+                position = text.rfind(separator)
+                if position >= 0:
+                    return text[position:]
+
+                if start == 0:
+                    return ''
+
+                chunkSize *= 4
+
     def _get_timestamp(self):
         try:
             self.timestamp = os.path.getmtime(self.filePath)
@@ -96,7 +136,7 @@ class PrjFile(File):
             return
 
         actualCount, actualTotalCount = self.count_words()
-        latestDate = list(self.wcLog)[-1]
+        latestDate = self.wcLog.latest()
         latestCount = self.wcLog[latestDate][0]
         latestTotalCount = self.wcLog[latestDate][1]
         if actualCount != latestCount or actualTotalCount != latestTotalCount:
@@ -112,7 +152,6 @@ class PrjFile(File):
             newCount, newTotalCount = self.count_words()
             todayIso = date.today().isoformat()
             self.wcLogUpdate[todayIso] = [newCount, newTotalCount]
-            for wcDate in self.wcLogUpdate:
-                self.wcLog[wcDate] = self.wcLogUpdate[wcDate]
+            self.wcLog.update(self.wcLogUpdate)
         self.wcLogUpdate = {}
 
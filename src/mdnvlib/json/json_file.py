@@ -5,11 +5,13 @@ For further information see https://github.com/peter88213/mdnovel
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
 import json
+import os
 
 from mdnvlib.file.prj_file import PrjFile
 from mdnvlib.json.basic_element_json import BasicElementJson
 from mdnvlib.json.chapter_json import ChapterJson
 from mdnvlib.json.character_json import CharacterJson
+from mdnvlib.json.merkle_tree import MerkleTree
 from mdnvlib.json.novel_json import NovelJson
 from mdnvlib.json.plot_line_json import PlotLineJson
 from mdnvlib.json.plot_point_json import PlotPointJson
@@ -40,10 +42,17 @@ from mdnvlib.novx_globals import SECTION_PREFIX
 from mdnvlib.novx_globals import _
 from mdnvlib.novx_globals import intersection
 from mdnvlib.novx_globals import norm_path
+from mdnvlib.profiler import profiler
 
 
 class JsonFile(PrjFile):
-    """JSON file representation."""
+    """JSON file representation.
+
+    Public methods:
+        get_json_data() -- Return the project data as JSON data structure.
+        get_merkle_tree() -- Return the content hashes of the project data.
+        read_header() -- Read the project metadata and the word count log.
+    """
     EXTENSION = '.json'
 
     ROOT = 'mdnovel'
@@ -70,7 +79,10 @@ class JsonFile(PrjFile):
         self.basicElementCnv = BasicElementJson()
         self.sectionCnv = SectionJson()
         self.plotPointCnv = PlotPointJson()
+        self._jsonWcLog = {}
+        # Cached word count log json data
 
+    @profiler.timed('JsonFile.read')
     def read(self):
         """Parse the file and get the instance variables.
         
@@ -96,7 +108,43 @@ class JsonFile(PrjFile):
 
         self._get_timestamp()
         self._keep_word_count()
+        self._update_file_tree(jsonRoot)
+
+    @profiler.timed('JsonFile.read_header')
+    def read_header(self):
+        """Read the project metadata and the word count log, leaving the other data.
+        
+        Only the beginning and the end of the file are decoded.
+        This relies on the layout written by the write() method:
+        The root element's entries are indented by four spaces,
+        the project data come first, and the word count log comes last.
+        A file with another layout is read entirely.
+        Raise the "Error" exception in case of error. 
+        Overrides the superclass method.
+        """
+        decoder = json.JSONDecoder()
+        try:
+            jsonRoot = self._get_header_root(decoder)
+            if jsonRoot is not None:
+                fileEnd = self._get_file_end('\n    "')
+                if fileEnd.startswith('\n    "PROGRESS": '):
+                    jsonRoot['PROGRESS'] = self._decode_root_value(decoder, fileEnd, 'PROGRESS')
+        except ValueError:
+            jsonRoot = None
+        if jsonRoot is None:
+            self.read()
+            return
+
+        try:
+            self._check_version({self.ROOT:jsonRoot})
+            self._read_project(jsonRoot)
+            self._read_word_count_log(jsonRoot)
+        except Exception as ex:
+            raise Error(f"{_('Corrupt project data')} ({str(ex)})")
+
+        self._get_timestamp()
 
+    @profiler.timed('JsonFile.write')
     def write(self):
         """Write instance variables to the file.
         
@@ -105,6 +153,33 @@ class JsonFile(PrjFile):
         """
         self._update_word_count_log()
         self.adjust_section_types()
+        jsonData = self.get_json_data()
+        jsonRoot = jsonData[self.ROOT]
+        self._build_word_count_log(jsonRoot)
+        backedUp = False
+        if os.path.isfile(self.filePath):
+            try:
+                os.replace(self.filePath, f'{self.filePath}.bak')
+            except:
+                raise Error(f'{_("Cannot overwrite file")}: "{norm_path(self.filePath)}".')
+            else:
+                backedUp = True
+        try:
+            with open(self.filePath, 'w', encoding='utf-8') as f:
+                json.dump(jsonData, f, indent=2, ensure_ascii=False)
+        except:
+            if backedUp:
+                os.replace(f'{self.filePath}.bak', self.filePath)
+            raise Error(f'{_("Cannot write file")}: "{norm_path(self.filePath)}".')
+
+        self._get_timestamp()
+        self._update_file_tree(jsonRoot)
+
+    def get_json_data(self):
+        """Return the project data as JSON data structure.
+        
+        The word count log is not included.
+        """
         jsonData = {
             self.ROOT:{
                 'version':f'{self.MAJOR_VERSION}.{self.MINOR_VERSION}',
@@ -118,10 +193,11 @@ class JsonFile(PrjFile):
         self._build_items(jsonRoot)
         self._build_plot_lines_and_points(jsonRoot)
         self._build_project_notes(jsonRoot)
-        self._build_word_count_log(jsonRoot)
-        with open(self.filePath, 'w', encoding='utf-8') as f:
-            json.dump(jsonData, f, indent=2, ensure_ascii=False)
-        self._get_timestamp()
+        return jsonData
+
+    def get_merkle_tree(self):
+        """Return a MerkleTree instance with the content hashes of the project data."""
+        return MerkleTree(self.get_json_data()[self.ROOT])
 
     def _build_project(self, root):
         root['PROJECT'] = {}
@@ -212,26 +288,31 @@ class JsonFile(PrjFile):
             root['PROJECTNOTES'] = jsonProjectNotes
 
     def _build_word_count_log(self, root):
+        """Add the word count log to the json element tree.
+        
+        Only the log entries added or changed since the last call are processed.
+        """
         if not self.wcLog:
             return
 
-        jsonWcLog = {}
-        wcLastCount = None
-        wcLastTotalCount = None
-        for wc in self.wcLog:
-            if self.novel.saveWordCount:
-                # Discard entries with unchanged word count.
-                if (
-                    self.wcLog[wc][0] == wcLastCount
-                    and self.wcLog[wc][1] == wcLastTotalCount
-                ):
-                    continue
-
-                wcLastCount = self.wcLog[wc][0]
-                wcLastTotalCount = self.wcLog[wc][1]
-                jsonWcLog[wc] = self.wcLog[wc]
-        if jsonWcLog:
-            root['PROGRESS'] = jsonWcLog
+        if not self.novel.saveWordCount:
+            return
+
+        start = self.wcLog.firstModified
+        if start == 0:
+            self._jsonWcLog = {}
+        elif start < len(self.wcLog):
+            # Remove the entries to be rebuilt.
+            startIso = self.wcLog.get_date(start).isoformat()
+            while self._jsonWcLog and next(reversed(self._jsonWcLog)) >= startIso:
+                self._jsonWcLog.popitem()
+
+        # Discard entries with unchanged word count.
+        for wcDate, wcCount, wcTotalCount in self.wcLog.get_changes(start):
+            self._jsonWcLog[wcDate] = [wcCount, wcTotalCount]
+        self.wcLog.clear_modified()
+        if self._jsonWcLog:
+            root['PROGRESS'] = self._jsonWcLog
 
     def _check_version(self, jsonData):
         """Raise an exception if the jsonData element is not compatible with the supported DTD."""
@@ -250,6 +331,55 @@ class JsonFile(PrjFile):
         elif minorVersion > self.MINOR_VERSION:
             raise Error(_('The project "{}" was created with a newer mdnovel version.').format(norm_path(self.filePath)))
 
+    def _decode_root_value(self, decoder, text, key):
+        """Return the value of a root element entry found in text.
+        
+        Positional arguments:
+            decoder: json.JSONDecoder
+            text: str -- Part of the file.
+            key: str -- Key of the entry.
+        
+        Raise ValueError if the entry is missing or incomplete.
+        """
+        marker = f'\n    "{key}": '
+        position = text.find(marker)
+        if position < 0:
+            raise ValueError(f'{key} not found')
+
+        value, __ = decoder.raw_decode(text, position + len(marker))
+        return value
+
+    def _get_header_root(self, decoder):
+        """Return the version and the project data from the beginning of the file.
+        
+        Positional arguments:
+            decoder: json.JSONDecoder
+        
+        The file is read in growing chunks until the project data are complete.
+        Return None if the file has not the expected layout.
+        """
+        chunkSize = self.HEADER_SIZE
+        with open(self.filePath, 'rb') as f:
+            while True:
+                f.seek(0)
+                data = f.read(chunkSize)
+                isComplete = len(data) < chunkSize
+                text = data.decode('utf-8', errors='ignore').replace('\r\n', '\n')
+                # A character cut at the chunk's end is ignored.
+                if not text.startswith(f'{{\n  "{self.ROOT}": {{'):
+                    return None
+
+                try:
+                    return {
+                        'version': self._decode_root_value(decoder, text, 'version'),
+                        'PROJECT': self._decode_root_value(decoder, text, 'PROJECT'),
+                    }
+                except ValueError:
+                    if isComplete:
+                        return None
+
+                chunkSize *= 4
+
     def _read_chapters_and_sections(self, root):
         """Read data at chapter level from the json element tree."""
         jsonChapters = root.get('CHAPTERS', None)
@@ -404,6 +534,16 @@ class JsonFile(PrjFile):
         self.novel.sections[scId].items = intersection(
             self.novel.sections[scId].items, self.novel.items)
 
+    def _update_file_tree(self, jsonRoot):
+        """Keep the content hashes of the data just read or written.
+        
+        Positional arguments:
+            jsonRoot: dict -- Project data below the JSON root element.
+
+        To be overridden by subclasses that check the file for changes.
+        """
+        pass
+
     def _read_word_count_log(self, jsonRoot):
         """Read the word count log from the json element tree."""
         jsonWclog = jsonRoot.get('PROGRESS', None)
@@ -411,4 +551,8 @@ class JsonFile(PrjFile):
             return
 
         for wc in jsonWclog:
-            self.wcLog[wc] = jsonWclog[wc]
+            try:
+                self.wcLog[wc] = jsonWclog[wc]
+            except (ValueError, TypeError, IndexError):
+                # Skip malformed entries rather than refusing the whole project.
+                continue
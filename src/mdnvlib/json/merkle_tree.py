@@ -0,0 +1,115 @@
+"""Provide a class for content hashes of a JSON project.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import hashlib
+import json
+
+from mdnvlib.novx_globals import CH_ROOT
+from mdnvlib.novx_globals import CR_ROOT
+from mdnvlib.novx_globals import IT_ROOT
+from mdnvlib.novx_globals import LC_ROOT
+from mdnvlib.novx_globals import PL_ROOT
+from mdnvlib.novx_globals import PN_ROOT
+
+
+class MerkleTree:
+    """Content hashes of a project, rolled up along the project tree.
+
+    Public instance variables:
+        projectHash: str -- Hash of the project level data.
+        elementHashes: dict -- key: element ID; value: hash of the element's own data.
+        branchHashes: dict -- key: root or parent element ID; value: hash of the branch.
+        children: dict -- key: root or parent element ID; value: list of child IDs.
+        rootHash: str -- Hash of the whole project.
+
+    Public methods:
+        diff(other) -- Return the differences to another Merkle tree.
+
+    A branch hash covers the IDs, element hashes, and branch hashes of the children,
+    so equal branch hashes mean equal subtrees.
+    The word count log is not included.
+    """
+    ROOTS = {
+        'CHAPTERS': (CH_ROOT, 'SECTIONS'),
+        'CHARACTERS': (CR_ROOT, None),
+        'LOCATIONS': (LC_ROOT, None),
+        'ITEMS': (IT_ROOT, None),
+        'ARCS': (PL_ROOT, 'POINTS'),
+        'PROJECTNOTES': (PN_ROOT, None),
+    }
+    # key: JSON collection; value: tuple (tree root, JSON sub-collection of each element)
+
+    def __init__(self, jsonRoot):
+        """Compute the hashes.
+
+        Positional arguments:
+            jsonRoot: dict -- Project data below the JSON root element.
+        """
+        self.elementHashes = {}
+        self.branchHashes = {}
+        self.children = {}
+        self.projectHash = self._get_hash(jsonRoot.get('PROJECT', {}))
+        rootEntries = [self.projectHash]
+        for collection, (root, subCollection) in self.ROOTS.items():
+            self._add_branch(root, jsonRoot.get(collection, {}), subCollection)
+            rootEntries.append([root, self.branchHashes[root]])
+        self.rootHash = self._get_hash(rootEntries)
+
+    def diff(self, other):
+        """Return the differences to another Merkle tree.
+
+        Positional arguments:
+            other: MerkleTree -- The tree to compare with.
+
+        Return a tuple with three elements:
+        - projectChanged: bool -- True if the project level data differ.
+        - elemIds: set -- IDs of the elements added, removed, or changed.
+        - branchIds: list -- Roots and parent elements whose list of children differs.
+
+        Only subtrees with different hashes are visited.
+        """
+        elemIds = set()
+        branchIds = []
+        if self.rootHash == other.rootHash:
+            return False, elemIds, branchIds
+
+        for root, __ in self.ROOTS.values():
+            self._diff_branch(other, root, elemIds, branchIds)
+        return self.projectHash != other.projectHash, elemIds, branchIds
+
+    def _add_branch(self, parentId, jsonCollection, subCollection):
+        """Hash the elements of a JSON collection, and return the branch hash."""
+        children = []
+        entries = []
+        for elemId, jsonElement in jsonCollection.items():
+            childBranchHash = ''
+            if subCollection is not None:
+                jsonElement = jsonElement.copy()
+                childBranchHash = self._add_branch(elemId, jsonElement.pop(subCollection, {}), None)
+            self.elementHashes[elemId] = self._get_hash(jsonElement)
+            children.append(elemId)
+            entries.append([elemId, self.elementHashes[elemId], childBranchHash])
+        self.children[parentId] = children
+        self.branchHashes[parentId] = self._get_hash(entries)
+        return self.branchHashes[parentId]
+
+    def _diff_branch(self, other, parentId, elemIds, branchIds):
+        if self.branchHashes.get(parentId, None) == other.branchHashes.get(parentId, None):
+            return
+
+        children = self.children.get(parentId, [])
+        otherChildren = other.children.get(parentId, [])
+        if children != otherChildren:
+            branchIds.append(parentId)
+        for elemId in set(children).union(otherChildren):
+            if self.elementHashes.get(elemId, None) != other.elementHashes.get(elemId, None):
+                elemIds.add(elemId)
+            if elemId in self.branchHashes or elemId in other.branchHashes:
+                self._diff_branch(other, elemId, elemIds, branchIds)
+
+    def _get_hash(self, value):
+        data = json.dumps(value, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(data.encode('ascii')).hexdigest()
@@ -0,0 +1,55 @@
+"""Provide a class for references to classes that are imported on first use.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from importlib import import_module
+
+
+class LazyClass:
+    """Reference to a class whose module is imported on first use.
+
+    Public methods:
+        load() -- Import the module and return the class.
+
+    Class attributes passed as keyword arguments are available
+    without importing the module, so that e.g. a factory can select
+    a file class by its suffix.
+    All other attributes are looked up in the imported class.
+    Calling the reference creates an instance of the class.
+    """
+
+    def __init__(self, moduleName, className, **attributes):
+        """Store the class location and its lightweight attributes.
+
+        Positional arguments:
+            moduleName: str -- Dotted name of the module defining the class.
+            className: str -- Name of the class.
+
+        Optional arguments:
+            Class attributes that can be read without importing the module.
+        """
+        self._moduleName = moduleName
+        self._className = className
+        self._class = None
+        self.__dict__.update(attributes)
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def __getattr__(self, name):
+        # Called only for attributes not set in the constructor.
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        return getattr(self.load(), name)
+
+    def __repr__(self):
+        return f'LazyClass({self._moduleName}.{self._className})'
+
+    def load(self):
+        """Import the module, if not yet done, and return the class."""
+        if self._class is None:
+            self._class = getattr(import_module(self._moduleName), self._className)
+        return self._class
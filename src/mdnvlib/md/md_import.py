@@ -4,10 +4,13 @@ Copyright (c) 2025 Peter Triesberger
 For further information see https://github.com/peter88213/mdnovel
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
+from time import perf_counter
+
 from mdnvlib.md.md_file import MdFile
 from mdnvlib.model.chapter import Chapter
-from mdnvlib.model.id_generator import create_id
+from mdnvlib.model.id_generator import id_sequence
 from mdnvlib.model.section import Section
+from mdnvlib.model.section import count_words
 from mdnvlib.novx_globals import CHAPTER_PREFIX
 from mdnvlib.novx_globals import CH_ROOT
 from mdnvlib.novx_globals import Error
@@ -20,81 +23,199 @@ class MdImport(MdFile):
     """Markdown work-in-progress reader.
 
     Public methods:
+        prescan() -- scan the file structure without building the model.
         read() -- parse the file and get the instance variables.
     """
+    LOW_WORDCOUNT = 10
+    # Defines the difference between "Outline" and "Draft"
 
-    def read(self):
-        """Parse the WIP file and create a project."""
-        LOW_WORDCOUNT = 10
-        # Defines the difference between "Outline" and "Draft"
-
-        def write_section_content(scId, lines):
-            if scId is not None:
-                text = '\n\n'.join(lines)
-                self.novel.sections[scId].sectionContent = text
-                if self.novel.sections[scId].wordCount < LOW_WORDCOUNT:
-                    self.novel.sections[scId].status = 1
-                else:
-                    self.novel.sections[scId].status = 2
+    def prescan(self):
+        """Scan the file structure without building the model.
 
-        chCount = 0
-        scCount = 0
-        lines = []
-        chId = None
-        scId = None
-        try:
-            with open(self.filePath, 'r', encoding='utf-8') as f:
-                mdText = f.read()
-        except(FileNotFoundError):
-            raise Error(f'{_("File not found")}: "{norm_path(self.filePath)}".')
+        Return a dictionary with the numbers of parts, chapters,
+        sections, words, and lines, and the scanning time in seconds.
+        Raise the "Error" exception in case of error.
+        """
+        startTime = perf_counter()
+        for encoding in ('utf-8', None):
+            result = dict(parts=0, chapters=0, sections=0, words=0, lines=0)
+            try:
+                for event in self._parse(self._read_lines(encoding), countOnly=True):
+                    if event[0] == 'chapter':
+                        if event[2] == 1:
+                            result['parts'] += 1
+                        else:
+                            result['chapters'] += 1
+                    else:
+                        result['sections'] += 1
+                        result['words'] += event[2]
+                        result['lines'] += event[1]
+            except UnicodeDecodeError:
+                # the file may be ANSI encoded.
+                continue
 
-        except:
+            break
+
+        else:
+            raise Error(f'{_("Cannot read file")}: "{norm_path(self.filePath)}".')
+
+        result['seconds'] = perf_counter() - startTime
+        return result
+
+    def read(self):
+        """Parse the WIP file and create a project.
+
+        The file is processed line by line, and the new elements
+        are added to the novel only after the whole file has been read.
+        Raise the "Error" exception in case of error.
+        """
+        for encoding in ('utf-8', None):
             try:
+                chapters, sections, srtSections = self._build_elements(encoding)
+            except UnicodeDecodeError:
                 # the file may be ANSI encoded.
-                with open(self.filePath, 'r') as f:
-                    mdText = f.read()
-            except:
-                raise Error(f'{_("Cannot read file")}: "{norm_path(self.filePath)}".')
+                continue
+
+            break
+
+        else:
+            raise Error(f'{_("Cannot read file")}: "{norm_path(self.filePath)}".')
+
+        self.novel.chapters.update(chapters)
+        self.novel.sections.update(sections)
+        for chId in srtSections:
+            self.novel.tree.append(CH_ROOT, chId)
+            for scId in srtSections[chId]:
+                self.novel.tree.append(chId, scId)
+
+    def _build_elements(self, encoding):
+        """Return chapters, sections, and section order read from the file.
+
+        Positional arguments:
+            encoding: str -- File encoding. If None, use the platform's default.
+
+        Return a tuple of three dictionaries:
+            chapters -- key: chapter ID, value: Chapter instance.
+            sections -- key: section ID, value: Section instance.
+            srtSections -- key: chapter ID, value: list of section IDs.
+        """
+        chapters = {}
+        sections = {}
+        srtSections = {}
+        chIds = id_sequence(self.novel.chapters, CHAPTER_PREFIX)
+        scIds = id_sequence(self.novel.sections, SECTION_PREFIX)
+        chId = None
+        scCount = 0
+        for event in self._parse(self._read_lines(encoding)):
+            if event[0] == 'chapter':
+                __, chTitle, chLevel = event
+                chId = next(chIds)
+                chapters[chId] = Chapter(
+                    title=chTitle,
+                    chType=0,
+                    chLevel=chLevel,
+                    )
+                srtSections[chId] = []
+                continue
+
+            __, lines, wordCount = event
+            if wordCount < self.LOW_WORDCOUNT:
+                status = 1
+            else:
+                status = 2
+            scCount += 1
+            scId = next(scIds)
+            sections[scId] = Section(
+                title=f'{_("Section")} {scCount}',
+                status=status,
+                scType=0,
+                scene=0,
+                sectionContent='\n\n'.join(lines),
+                wordCount=wordCount,
+                )
+            srtSections[chId].append(scId)
+        return chapters, sections, srtSections
+
+    def _parse(self, mdLines, countOnly=False):
+        """Generate structural events from an iterable of Markdown lines.
+
+        Positional arguments:
+            mdLines -- iterable of lines without line breaks.
 
-        cnvText = mdText
-        mdLines = cnvText.split('\n')
+        Optional arguments:
+            countOnly: bool -- If True, do not collect the section lines.
+
+        Yield tuples:
+            ('chapter', title: str, level: int) for each heading.
+            ('section', lines, word count: int) for each section.
+              lines is a list of strings, or the number of lines if countOnly is set.
+        """
+
+        def section_event():
+            if countOnly:
+                return ('section', lineCount, wordCount)
+
+            return ('section', lines, wordCount)
+
+        lines = []
+        lineCount = 0
+        wordCount = 0
+        inSection = False
+        chapterFound = False
         for mdLine in mdLines:
             if mdLine.startswith('#'):
+                if inSection:
+                    yield section_event()
+                    inSection = False
 
-                # Write previous section.
-                write_section_content(scId, lines)
-                scId = None
-
-                # Add a chapter.
-                chCount += 1
-                chId = create_id(self.novel.chapters, CHAPTER_PREFIX)
-                self.novel.chapters[chId] = Chapter()
                 chTitle = mdLine.split('# ')[1]
-                self.novel.chapters[chId].title = chTitle
-                self.novel.tree.append(CH_ROOT, chId)
-                self.novel.chapters[chId].chType = 0
                 if mdLine.startswith('# '):
-                    self.novel.chapters[chId].chLevel = 1
+                    chLevel = 1
                 else:
-                    self.novel.chapters[chId].chLevel = 0
+                    chLevel = 0
+                chapterFound = True
+                yield ('chapter', chTitle, chLevel)
             elif self.SECTION_DIVIDER in mdLine:
-                # Write previous section.
-                write_section_content(scId, lines)
-                scId = None
-            elif scId is not None:
-                if mdLine or lines:
-                    # skipping the first line if empty
+                if inSection:
+                    yield section_event()
+                    inSection = False
+            elif inSection:
+                wordCount += count_words(mdLine)
+                lineCount += 1
+                if not countOnly:
                     lines.append(mdLine)
-            elif mdLine and chId is not None:
-                # Add a section.
-                scCount += 1
-                scId = create_id(self.novel.sections, SECTION_PREFIX)
-                self.novel.sections[scId] = Section(
-                    status=1,
-                    scType=0,
-                    scene=0,
-                    )
-                self.novel.tree.append(chId, scId)
-                self.novel.sections[scId].title = f'{_("Section")} {scCount}'
-                lines = [mdLine]
-        write_section_content(scId, lines)
+            elif mdLine and chapterFound:
+                inSection = True
+                wordCount = count_words(mdLine)
+                lineCount = 1
+                if not countOnly:
+                    lines = [mdLine]
+        if inSection:
+            yield section_event()
+
+    def _read_lines(self, encoding):
+        """Generate the lines of the file without line breaks.
+
+        Positional arguments:
+            encoding: str -- File encoding. If None, use the platform's default.
+
+        Raise the "Error" exception if the file cannot be opened.
+        """
+        try:
+            f = open(self.filePath, 'r', encoding=encoding)
+        except(FileNotFoundError):
+            raise Error(f'{_("File not found")}: "{norm_path(self.filePath)}".')
+
+        except:
+            raise Error(f'{_("Cannot read file")}: "{norm_path(self.filePath)}".')
+
+        with f:
+            line = ''
+            for line in f:
+                if line.endswith('\n'):
+                    yield line[:-1]
+                else:
+                    yield line
+            if line.endswith('\n') or not line:
+                # this is for compatibility with str.split('\n')
+                yield ''
@@ -45,8 +45,11 @@ from mdnvlib.novx_globals import list_to_string
 class MdnovFile(PrjFile, MdFile):
     """mdnov file representation.
 
+    Public methods:
+        read_header() -- Read the project metadata and the word count log.
+
     Public instance variables:
-        wcLog: dict[str, list[str, str]] -- Daily word count logs.
+        wcLog: WordCountLog -- Daily word count logs.
         wcLogUpdate: dict[str, list[str, str]] -- Word counts missing in the log.
         timestamp: float -- Time of last file modification (number of seconds since the epoch).
     
@@ -292,6 +295,35 @@ $Desc
         self._get_timestamp()
         self._keep_word_count()
 
+    def read_header(self):
+        """Read the project metadata and the word count log, leaving the other data.
+        
+        Only the "@@book" block at the beginning
+        and the "@@Progress" block at the end of the file are parsed.
+        Overrides the superclass method.
+        """
+        self._collectedLines = None
+        self._range = None
+        with open(self.filePath, 'r', encoding='utf-8') as f:
+            isProject = False
+            for line in f:
+                self._line = line.rstrip('\n')
+                if self._line.startswith('@@'):
+                    if isProject:
+                        break
+
+                    isProject = self._line.startswith('@@book')
+                    continue
+
+                if isProject:
+                    self._read_project(self.novel)
+        fileEnd = self._get_file_end('\n@@')
+        if fileEnd.startswith('\n@@Progress'):
+            self._range = None
+            for self._line in fileEnd.split('\n')[2:]:
+                self._read_word_count_log(None)
+        self._get_timestamp()
+
     def write(self):
         self._update_word_count_log()
         self.adjust_section_types()
@@ -396,7 +428,7 @@ $Desc
 
                 wcLastCount = self.wcLog[wc][0]
                 wcLastTotalCount = self.wcLog[wc][1]
-            lines.append(f'- {list_to_string([wc, self.wcLog[wc][0], self.wcLog[wc][1]])}')
+            lines.append(f'- {list_to_string([wc, str(self.wcLog[wc][0]), str(self.wcLog[wc][1])])}')
         mapping['Wordcountlog'] = '\n'.join(lines)
         return mapping
 
@@ -577,5 +609,9 @@ $Desc
                 continue
 
             wc = (line.strip('- ').split(';'))
-            self.wcLog[wc[0]] = [int(wc[1]), int(wc[2])]
+            try:
+                self.wcLog[wc[0]] = [int(wc[1]), int(wc[2])]
+            except (ValueError, IndexError):
+                # Skip malformed entries rather than refusing the whole project.
+                continue
 
@@ -0,0 +1,237 @@
+"""Provide a class for measuring the memory retained by the application's subsystems.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from gc import get_referents
+import os
+import sys
+from types import FunctionType
+from types import ModuleType
+import tracemalloc
+
+from mdnvlib.novx_globals import _
+
+NOT_SIZED = (type, ModuleType, FunctionType)
+# Shared objects that are not attributed to a subsystem
+
+
+class MemoryReport:
+    """Measure the memory retained by subsystems, and compare tracemalloc snapshots.
+
+    Public methods:
+        compare_snapshots(oldSnapshot, newSnapshot, limit) -- Return the largest allocation differences.
+        get_size(*objects) -- Return the size of object graphs not measured yet.
+        measure(model, view, controller) -- Return the memory per subsystem.
+        take_snapshot() -- Return a tracemalloc snapshot.
+
+    The sizes are computed by walking the object graphs from the subsystems' roots.
+    An object reachable from several subsystems is attributed to the first one measured,
+    and the model, view, and controller are never walked into from elsewhere.
+    Memory held by Tk, such as tree rows and text, is not visible to Python;
+    it is reported by item and character counts instead.
+    """
+    TRACE_FRAMES = 1
+    # Number of frames stored per allocation when tracing is started.
+
+    def __init__(self):
+        """Initialize instance variables."""
+        self._seen = set()
+        # IDs of the objects measured, or excluded
+
+    def compare_snapshots(self, oldSnapshot, newSnapshot, limit=20):
+        """Return the largest allocation differences between two snapshots.
+
+        Positional arguments:
+            oldSnapshot: tracemalloc.Snapshot -- The reference.
+            newSnapshot: tracemalloc.Snapshot -- The snapshot to compare.
+
+        Optional arguments:
+            limit: int -- Maximum number of source lines returned.
+
+        Return a tuple of two lists:
+        - Tuples (package, size difference, count difference) for the packages,
+        - Tuples (file:line, size difference, count difference) for the source lines,
+        both with the largest growth first.
+        """
+        packages = {}
+        lines = []
+        for stat in newSnapshot.compare_to(oldSnapshot, 'lineno'):
+            frame = stat.traceback[0]
+            package = self._get_package(frame.filename)
+            sizeDiff, countDiff = packages.get(package, (0, 0))
+            packages[package] = (sizeDiff + stat.size_diff, countDiff + stat.count_diff)
+            lines.append((f'{frame.filename}:{frame.lineno}', stat.size_diff, stat.count_diff))
+        packageList = [(package, sizeDiff, countDiff) for package, (sizeDiff, countDiff) in packages.items()]
+        packageList.sort(key=lambda entry: entry[1], reverse=True)
+        lines.sort(key=lambda entry: entry[1], reverse=True)
+        return packageList, lines[:limit]
+
+    def get_size(self, *objects):
+        """Return the size in bytes of the object graphs not measured yet.
+
+        Positional arguments:
+            objects -- The roots of the object graphs.
+        """
+        size = 0
+        pending = list(objects)
+        while pending:
+            referrers = []
+            for obj in pending:
+                if isinstance(obj, NOT_SIZED) or id(obj) in self._seen:
+                    continue
+
+                self._seen.add(id(obj))
+                size += sys.getsizeof(obj)
+                referrers.append(obj)
+            pending = get_referents(*referrers)
+        return size
+
+    def measure(self, model, view=None, controller=None):
+        """Return the memory per subsystem.
+
+        Positional arguments:
+            model: NvModel -- The model with the open project, if any.
+
+        Optional arguments:
+            view: NvView -- The main view, if any.
+            controller: NvController -- The controller with the plugins, if any.
+
+        Return a list of tuples (subsystem, size in bytes, count, unit of count).
+        """
+        self._seen = {id(model), id(view), id(controller)}
+        if view is not None:
+            self._seen.add(id(view.root))
+        plugins = getattr(controller, 'plugins', None)
+        if plugins is not None:
+            self._seen.add(id(plugins))
+            for plugin in plugins:
+                self._seen.add(id(plugin))
+        report = []
+        novel = model.novel
+        prjFile = model.prjFile
+        if novel is not None:
+            self._seen.add(id(novel))
+            self._seen.add(id(novel.tree))
+            contents = []
+            for section in novel.sections.values():
+                attributes = vars(section)
+                contents.append(attributes.get('_sectionContent', None))
+                contents.append(attributes.get('_contentBuffer', None))
+            report.append((
+                _('Section contents'),
+                self.get_size(*contents),
+                len(novel.sections),
+                _('sections'),
+                ))
+            for collectionName in (
+                'chapters',
+                'sections',
+                'characters',
+                'locations',
+                'items',
+                'plotLines',
+                'plotPoints',
+                'projectNotes',
+            ):
+                collection = getattr(novel, collectionName)
+                report.append((
+                    f'Novel.{collectionName}',
+                    self.get_size(collection),
+                    len(collection),
+                    _('elements'),
+                    ))
+            report.append((
+                _('Other project data'),
+                self.get_size(*vars(novel).values()),
+                0,
+                '',
+                ))
+        if prjFile is not None:
+            self._seen.add(id(prjFile))
+            report.append((
+                _('Word count log'),
+                self.get_size(prjFile.wcLog, prjFile.wcLogUpdate),
+                len(prjFile.wcLog),
+                _('days'),
+                ))
+            report.append((
+                _('Project file'),
+                self.get_size(*vars(prjFile).values()),
+                0,
+                '',
+                ))
+        if view is not None:
+            tree = view.tv.tree
+            self._seen.add(id(view.tv))
+            self._seen.add(id(tree))
+            report.append((
+                _('Tree view'),
+                self.get_size(*vars(view.tv).values()) + self.get_size(*vars(tree).values()),
+                self._count_tree_items(tree, ''),
+                _('rows in Tk'),
+                ))
+            contentsView = view.contentsView
+            self._seen.add(id(contentsView))
+            characters = contentsView.count('1.0', 'end', 'chars')
+            if characters is None:
+                characters = (0,)
+            report.append((
+                _('Contents viewer'),
+                self.get_size(*vars(contentsView).values()),
+                characters[0],
+                _('characters in Tk'),
+                ))
+        if plugins is not None:
+            for plugin in plugins:
+                report.append((
+                    f'{type(plugin).__name__}',
+                    self.get_size(*vars(plugin).values()),
+                    self._count_widgets(plugin),
+                    _('widgets'),
+                    ))
+        return report
+
+    def take_snapshot(self):
+        """Return a tracemalloc snapshot, starting tracing if necessary.
+
+        Only allocations made after tracing has started are recorded.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.TRACE_FRAMES)
+        snapshot = tracemalloc.take_snapshot()
+        return snapshot.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+
+    def _count_tree_items(self, tree, item):
+        """Return the number of rows in the Tk tree below item."""
+        count = 0
+        pending = [item]
+        while pending:
+            children = tree.tk.splitlist(tree.tk.call(tree._w, 'children', pending.pop()))
+            count += len(children)
+            pending.extend(children)
+        return count
+
+    def _count_widgets(self, plugin):
+        """Return the number of Tk widgets in the plugin's open windows."""
+        count = 0
+        for value in vars(plugin).values():
+            if getattr(value, 'isOpen', False) and hasattr(value, 'winfo_children'):
+                pending = [value]
+                while pending:
+                    widget = pending.pop()
+                    count += 1
+                    pending.extend(widget.winfo_children())
+        return count
+
+    def _get_package(self, filePath):
+        """Return the package name of a source file, e.g. "mdnvlib.model"."""
+        normPath = os.path.normpath(filePath)
+        parts = normPath.split(os.sep)
+        for rootPackage in ('mdnvlib', 'apptk'):
+            if rootPackage in parts:
+                i = parts.index(rootPackage)
+                return '.'.join(parts[i:-1])
+
+        return os.path.dirname(normPath)
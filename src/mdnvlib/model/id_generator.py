@@ -17,3 +17,18 @@ def create_id(elements, prefix=''):
         i += 1
     return f'{prefix}{i}'
 
+
+def id_sequence(elements, prefix=''):
+    """Generate unused IDs for new elements in ascending order.
+    
+    Positional arguments:
+        elements -- list or dictionary containing all existing IDs
+        
+    Unlike repeated create_id() calls, this does not probe 
+    the existing IDs from the beginning for each new element.
+    """
+    i = 1
+    while True:
+        if not f'{prefix}{i}' in elements:
+            yield f'{prefix}{i}'
+        i += 1
@@ -5,6 +5,7 @@ For further information see https://github.com/peter88213/mdnovel
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
 from mdnvlib.json.json_file import JsonFile
+from mdnvlib.lazy_class import LazyClass
 from mdnvlib.model.basic_element import BasicElement
 from mdnvlib.model.chapter import Chapter
 from mdnvlib.model.character import Character
@@ -15,6 +16,9 @@ from mdnvlib.model.plot_point import PlotPoint
 from mdnvlib.model.section import Section
 from mdnvlib.model.world_element import WorldElement
 
+SqliteFile = LazyClass('mdnvlib.sqlite.sqlite_file', 'SqliteFile', EXTENSION='.mdnvdb')
+# imported on first use
+
 
 class MdnovService:
     """Getters and factory methods for mdnov  model objects."""
@@ -32,7 +36,8 @@ class MdnovService:
         return Character(**kwargs)
 
     def make_novel(self, **kwargs):
-        kwargs['tree'] = kwargs.get('tree', NvTree())
+        if not 'tree' in kwargs:
+            kwargs['tree'] = NvTree()
         return Novel(**kwargs)
 
     def make_nv_tree(self, **kwargs):
@@ -51,5 +56,8 @@ class MdnovService:
         return WorldElement(**kwargs)
 
     def make_prj_file(self, filePath, **kwargs):
+        if filePath.endswith(SqliteFile.EXTENSION):
+            return SqliteFile(filePath, **kwargs)
+
         return JsonFile(filePath, **kwargs)
 
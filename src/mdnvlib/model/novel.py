@@ -7,10 +7,17 @@ License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 from datetime import date
 
 from mdnvlib.model.basic_element import BasicElement
+from mdnvlib.model.novel_query import NovelQuery
+from mdnvlib.model.story_time import StoryTime
 
 
 class Novel(BasicElement):
-    """Novel representation."""
+    """Novel representation.
+
+    Public instance variables:
+        storyTime: StoryTime -- Index of the sections' start and end in story time.
+        query: NovelQuery -- Indexed queries over the chapters, sections, and world elements.
+    """
 
     def __init__(self,
         authorName=None,
@@ -91,6 +98,8 @@ class Novel(BasicElement):
             self.referenceWeekDay = None
             self._referenceDate = None
         self.tree = tree
+        self.storyTime = StoryTime(self)
+        self.query = NovelQuery(self)
 
     @property
     def authorName(self):
@@ -0,0 +1,369 @@
+"""Provide a class for indexed queries over a novel's elements.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from datetime import datetime
+
+from mdnvlib.novx_globals import CH_ROOT
+from mdnvlib.novx_globals import CR_ROOT
+from mdnvlib.novx_globals import IT_ROOT
+from mdnvlib.novx_globals import LC_ROOT
+
+
+class NovelQuery:
+    """Indexed queries over the chapters, sections, and world elements of a novel.
+
+    Public methods:
+        get_chapter(scId) -- Return the ID of the chapter containing a section.
+        get_chapters(chType, chLevel, **sectionCriteria) -- Iterate over the matching chapters.
+        get_characters(tag, isMajor) -- Iterate over the matching characters.
+        get_items(tag) -- Iterate over the matching items.
+        get_locations(tag) -- Iterate over the matching locations.
+        get_sections(scType, status, viewpoint, character, location, item, tag, plotLine, start, end) -- Iterate over the matching sections.
+        invalidate() -- Mark the indexes as outdated.
+        update() -- Index the elements changed since the last update.
+
+    Public instance variables:
+        isOutdated: bool -- True if the novel may have changed since the last update.
+
+    The query methods return iterators over element IDs in tree order;
+    a criterion that is None is not applied.
+
+    The elements are indexed by the values of the query criteria.
+    A query intersects the ID sets of its criteria, so its cost depends
+    on the number of matches rather than on the size of the novel.
+    The elements do not tell which of them has changed, so the update 
+    compares each element's indexed values with the ones last seen,
+    and re-indexes only the elements that have changed.
+    The indexes are updated with the first query after invalidate() is called. 
+    Code that changes the novel without change notifications being 
+    connected must call invalidate() before querying again.
+    Only elements placed in the tree are found.
+    """
+    SECTION_CRITERIA = ('scType', 'status', 'viewpoint', 'character', 'location', 'item', 'tag', 'plotLine')
+    CHAPTER_CRITERIA = ('chType', 'chLevel')
+    CHARACTER_CRITERIA = ('tag', 'isMajor')
+    WORLD_ELEMENT_CRITERIA = ('tag',)
+
+    def __init__(self, novel):
+        """Initialize instance variables.
+
+        Positional arguments:
+            novel: Novel -- The project data queried.
+        """
+        self._novel = novel
+        self.isOutdated = True
+        self._structure = None
+        # tuple of (chapter ID, tuple of section IDs) in tree order
+        self._chapterOrder = []
+        self._chapterPositions = {}
+        self._sectionOrder = []
+        self._sectionPositions = {}
+        # key: element ID; value: position in the order list
+        self._chapterOf = {}
+        # key: section ID; value: chapter ID
+        self._sectionIndex = ElementIndex(self.SECTION_CRITERIA, self._get_section_key, self._get_section_values)
+        self._chapterIndex = ElementIndex(self.CHAPTER_CRITERIA, self._get_chapter_key)
+        self._characterIndex = ElementIndex(self.CHARACTER_CRITERIA, self._get_character_key)
+        self._locationIndex = ElementIndex(self.WORLD_ELEMENT_CRITERIA, self._get_world_element_key)
+        self._itemIndex = ElementIndex(self.WORLD_ELEMENT_CRITERIA, self._get_world_element_key)
+
+    def get_chapter(self, scId):
+        """Return the ID of the chapter containing a section, or None.
+
+        Positional arguments:
+            scId: str -- Section ID.
+        """
+        if self.isOutdated:
+            self.update()
+        return self._chapterOf.get(scId, None)
+
+    def get_chapters(self, chType=None, chLevel=None, **sectionCriteria):
+        """Return an iterator over the IDs of the matching chapters.
+
+        Optional arguments:
+            chType: int -- Chapter type.
+            chLevel: int -- Chapter level.
+            sectionCriteria -- Any criteria of get_sections().
+              If given, only the chapters containing a matching section are found.
+        """
+        if self.isOutdated:
+            self.update()
+        chIds = self._chapterIndex.find(dict(chType=chType, chLevel=chLevel))
+        if any(value is not None for value in sectionCriteria.values()):
+            withSections = {self._chapterOf[scId] for scId in self._find_sections(**sectionCriteria)}
+            if chIds is None:
+                chIds = withSections
+            else:
+                chIds &= withSections
+        return self._iterate(chIds, self._chapterOrder, self._chapterPositions)
+
+    def get_characters(self, tag=None, isMajor=None):
+        """Return an iterator over the IDs of the matching characters.
+
+        Optional arguments:
+            tag: str -- A tag of the character.
+            isMajor: bool -- True for major characters, False for minor ones.
+        """
+        if self.isOutdated:
+            self.update()
+        return self._characterIndex.get(dict(tag=tag, isMajor=isMajor))
+
+    def get_items(self, tag=None):
+        """Return an iterator over the IDs of the matching items.
+
+        Optional arguments:
+            tag: str -- A tag of the item.
+        """
+        if self.isOutdated:
+            self.update()
+        return self._itemIndex.get(dict(tag=tag))
+
+    def get_locations(self, tag=None):
+        """Return an iterator over the IDs of the matching locations.
+
+        Optional arguments:
+            tag: str -- A tag of the location.
+        """
+        if self.isOutdated:
+            self.update()
+        return self._locationIndex.get(dict(tag=tag))
+
+    def get_sections(self,
+            scType=None,
+            status=None,
+            viewpoint=None,
+            character=None,
+            location=None,
+            item=None,
+            tag=None,
+            plotLine=None,
+            start=None,
+            end=None,
+            ):
+        """Return an iterator over the IDs of the matching sections in reading order.
+
+        Optional arguments:
+            scType: int -- Section type.
+            status: int -- Completion status.
+            viewpoint: str -- ID of the viewpoint character.
+            character: str -- ID of a character in the section.
+            location: str -- ID of a location of the section.
+            item: str -- ID of an item in the section.
+            tag: str -- A tag of the section.
+            plotLine: str -- ID of a plot line the section belongs to.
+            start: datetime -- Beginning of a period in story time.
+            end: datetime -- End of a period in story time, excluded.
+
+        With start or end, only the sections taking place within the period are found,
+        as resolved by the story time index (see StoryTime.get_sections_between).
+        """
+        if self.isOutdated:
+            self.update()
+        scIds = self._find_sections(
+            scType=scType,
+            status=status,
+            viewpoint=viewpoint,
+            character=character,
+            location=location,
+            item=item,
+            tag=tag,
+            plotLine=plotLine,
+            start=start,
+            end=end,
+            )
+        return self._iterate(scIds, self._sectionOrder, self._sectionPositions)
+
+    def invalidate(self):
+        """Mark the indexes as outdated.
+
+        This is meant as a callback for change notifications.
+        The changed elements are re-indexed with the next query.
+        """
+        self.isOutdated = True
+
+    def update(self):
+        """Index the elements changed since the last update."""
+        novel = self._novel
+        tree = novel.tree
+        structure = tuple((chId, tuple(tree.get_children(chId))) for chId in tree.get_children(CH_ROOT))
+        if structure != self._structure:
+            self._structure = structure
+            self._chapterOrder = [chId for chId, __ in structure]
+            self._chapterPositions = {chId: i for i, chId in enumerate(self._chapterOrder)}
+            self._sectionOrder = []
+            self._chapterOf = {}
+            for chId, scIds in structure:
+                self._sectionOrder.extend(scIds)
+                for scId in scIds:
+                    self._chapterOf[scId] = chId
+            self._sectionPositions = {scId: i for i, scId in enumerate(self._sectionOrder)}
+        self._sectionIndex.update(self._sectionOrder, novel.sections)
+        self._chapterIndex.update(self._chapterOrder, novel.chapters)
+        self._characterIndex.update(tree.get_children(CR_ROOT), novel.characters)
+        self._locationIndex.update(tree.get_children(LC_ROOT), novel.locations)
+        self._itemIndex.update(tree.get_children(IT_ROOT), novel.items)
+        self.isOutdated = False
+
+    def _find_sections(self, start=None, end=None, **criteria):
+        """Return a set of the matching section IDs, or None if all sections match."""
+        scIds = self._sectionIndex.find(criteria)
+        if start is None and end is None:
+            return scIds
+
+        if start is None:
+            start = datetime.min
+        if end is None:
+            end = datetime.max
+        inPeriod = set(self._novel.storyTime.get_sections_between(start, end))
+        if scIds is None:
+            return inPeriod
+
+        return scIds & inPeriod
+
+    def _get_chapter_key(self, chapter):
+        return ((chapter.chType,), (chapter.chLevel,))
+
+    def _get_character_key(self, character):
+        return (tuple(character.tags or ()), (character.isMajor,))
+
+    def _get_section_key(self, section):
+        return (
+            section.scType,
+            section.status,
+            section.characters,
+            section.locations,
+            section.items,
+            tuple(section.tags or ()),
+            tuple(section.scPlotLines),
+        )
+
+    def _get_section_values(self, key):
+        scType, status, characters, locations, items, tags, plotLines = key
+        characters = characters or ()
+        return (
+            (scType,),
+            (status,),
+            characters[:1],
+            characters,
+            locations or (),
+            items or (),
+            tags,
+            plotLines,
+        )
+
+    def _get_world_element_key(self, element):
+        return (tuple(element.tags or ()),)
+
+    def _iterate(self, elemIds, order, positions):
+        """Generate the IDs in tree order; all of them if elemIds is None."""
+        if elemIds is None:
+            yield from order
+            return
+
+        yield from sorted(elemIds, key=positions.__getitem__)
+
+
+class ElementIndex:
+    """Reverse index of elements by the values of their query criteria.
+
+    Public methods:
+        find(criteria) -- Return a set of the matching element IDs.
+        get(criteria) -- Return an iterator over the matching element IDs in order.
+        update(elemIds, elements) -- Index the elements changed since the last update.
+    """
+
+    def __init__(self, criteria, get_key, get_values=None):
+        """Initialize instance variables.
+
+        Positional arguments:
+            criteria: tuple of str -- Names of the criteria.
+            get_key -- Function returning a comparable snapshot of an element's indexed data.
+        
+        Optional arguments:
+            get_values -- Function returning a tuple with a sequence of values per criterion for a key.
+              Default: The key already is such a tuple.
+        """
+        self._criteria = criteria
+        self._get_key = get_key
+        self._get_values = get_values
+        self._keys = {}
+        # key: element ID; value: tuple returned by get_key
+        self._elemIds = {}
+        # key: tuple (criterion, value); value: set of element IDs
+        self._order = []
+        # IDs of the indexed elements in tree order
+
+    def find(self, criteria):
+        """Return a set of the IDs of the elements matching all criteria.
+
+        Positional arguments:
+            criteria: dict -- key: criterion; value: value to match, or None.
+
+        Return None if no criterion is given, i.e. all elements match.
+        """
+        matches = [self._elemIds.get((criterion, value), set()) for criterion, value in criteria.items() if value is not None]
+        if not matches:
+            return None
+
+        matches.sort(key=len)
+        return matches[0].intersection(*matches[1:])
+
+    def get(self, criteria):
+        """Return an iterator over the IDs of the elements matching all criteria, in tree order.
+
+        Positional arguments:
+            criteria: dict -- key: criterion; value: value to match, or None.
+        """
+        elemIds = self.find(criteria)
+        if elemIds is None:
+            return iter(self._order)
+
+        positions = {elemId: i for i, elemId in enumerate(self._order)}
+        return iter(sorted(elemIds, key=positions.__getitem__))
+
+    def update(self, elemIds, elements):
+        """Index the elements changed since the last update, and drop the ones removed.
+
+        Positional arguments:
+            elemIds: list of str -- IDs of the elements to index, in tree order.
+            elements: dict -- key: element ID; value: element.
+        """
+        self._order = list(elemIds)
+        keys = self._keys
+        for elemId in elemIds:
+            key = self._get_key(elements[elemId])
+            oldKey = keys.get(elemId, None)
+            if oldKey != key:
+                if oldKey is not None:
+                    self._remove(elemId, oldKey)
+                self._add(elemId, key)
+        if len(keys) > len(self._order):
+            for elemId in keys.keys() - set(self._order):
+                self._remove(elemId, keys[elemId])
+
+    def _add(self, elemId, key):
+        self._keys[elemId] = key
+        for criterion, values in zip(self._criteria, self._get_criteria_values(key)):
+            for value in values:
+                self._elemIds.setdefault((criterion, value), set()).add(elemId)
+
+    def _get_criteria_values(self, key):
+        if self._get_values is None:
+            return key
+
+        return self._get_values(key)
+
+    def _remove(self, elemId, key):
+        del self._keys[elemId]
+        for criterion, values in zip(self._criteria, self._get_criteria_values(key)):
+            for value in values:
+                elemIds = self._elemIds.get((criterion, value), None)
+                if elemIds is None:
+                    continue
+
+                elemIds.discard(elemId)
+                if not elemIds:
+                    del self._elemIds[(criterion, value)]
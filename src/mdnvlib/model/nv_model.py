@@ -5,9 +5,12 @@ For further information see https://github.com/peter88213/mdnovel
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
 from apptk.model.model_base import ModelBase
+from mdnvlib.json.merkle_tree import MerkleTree
 from mdnvlib.model.id_generator import create_id
 from mdnvlib.model.nv_service import NvService
+from mdnvlib.model.nv_tree import NvTree
 from mdnvlib.model.nv_work_file import NvWorkFile
+from mdnvlib.model.reading_order import ReadingOrder
 from mdnvlib.novx_globals import CHAPTER_PREFIX
 from mdnvlib.novx_globals import CHARACTER_PREFIX
 from mdnvlib.novx_globals import CH_ROOT
@@ -24,6 +27,7 @@ from mdnvlib.novx_globals import PN_ROOT
 from mdnvlib.novx_globals import PRJ_NOTE_PREFIX
 from mdnvlib.novx_globals import SECTION_PREFIX
 from mdnvlib.novx_globals import _
+from mdnvlib.profiler import profiler
 
 
 class NvModel(ModelBase):
@@ -42,6 +46,11 @@ class NvModel(ModelBase):
         self.wordCount = 0
 
         self.nvService = NvService()
+        self._readingOrder = ReadingOrder()
+        self._isBatch = False
+        # True while change notifications are collected
+        self._isBatchModified = False
+        # True if a change has been notified during the batch
 
     def add_chapter(self, **kwargs):
         """Add a chapter to the novel.
@@ -394,6 +403,7 @@ class NvModel(ModelBase):
     def close_project(self):
         self.isModified = False
         self.tree.on_element_change = self.tree.do_nothing
+        self._readingOrder.invalidate()
         self.novel = None
         self.prjFile = None
 
@@ -415,134 +425,51 @@ class NvModel(ModelBase):
         - Delete plot points and remove their section references.
         - Delete project notes.
         """
+        self.delete_elements([elemId], trash=trash)
 
-        def waste_sections(elemId):
-            """Move all sections under the element specified by elemId to the 'trash bin'."""
-            if elemId.startswith(SECTION_PREFIX):
-                if self.novel.sections[elemId].scType < 2:
-                    # Remove plot point and plot line references.
-                    arcReferences = self.novel.sections[elemId].scPlotLines
-                    tpReferences = self.novel.sections[elemId].scPlotPoints
-                    self.novel.sections[elemId].scPlotLines = []
-                    self.novel.sections[elemId].scPlotPoints = {}
-                    for plId in arcReferences:
-                        sections = self.novel.plotLines[plId].sections
-                        sections.remove(elemId)
-                        self.novel.plotLines[plId].sections = sections
-                    for ppId in tpReferences:
-                        self.novel.plotPoints[ppId].sectionAssoc = None
-                    if trash:
-                        # Move the section to the trash bin.
-                        self.tree.move(elemId, self.trashBin, 0)
-                        self.novel.sections[elemId].scType = 1
-                    else:
-                        # Delete the section.
-                        del self.novel.sections[elemId]
-                        self.tree.delete(elemId)
-                else:
-                    # Delete the stage.
-                    del self.novel.sections[elemId]
-                    self.tree.delete(elemId)
-            else:
-                # Delete chapter and go one level down.
-                for childNode in self.tree.get_children(elemId):
-                    waste_sections(childNode)
-                del self.novel.chapters[elemId]
-
-        if elemId == self.trashBin:
-            # Remove the "trash bin".
-            for scId in self.tree.get_children(elemId):
-                del self.novel.sections[scId]
-            del self.novel.chapters[elemId]
-            self.tree.delete(elemId)
-            self.trashBin = None
-        elif elemId.startswith(CHARACTER_PREFIX):
-            # Delete a character and remove references.
-            del self.novel.characters[elemId]
-            self.tree.delete(elemId)
-            for scId in self.novel.sections:
-                try:
-                    scCharacters = self.novel.sections[scId].characters
-                    scCharacters.remove(elemId)
-                    self.novel.sections[scId].characters = scCharacters
-                except:
-                    pass
-        elif elemId.startswith(LOCATION_PREFIX):
-            # Delete a location and remove references.
-            del self.novel.locations[elemId]
-            self.tree.delete(elemId)
-            for scId in self.novel.sections:
-                try:
-                    scLocations = self.novel.sections[scId].locations
-                    scLocations.remove(elemId)
-                    self.novel.sections[scId].locations = scLocations
-                except:
-                    pass
-        elif elemId.startswith(ITEM_PREFIX):
-            # Delete an item and remove references.
-            del self.novel.items[elemId]
-            self.tree.delete(elemId)
-            for scId in self.novel.sections:
-                try:
-                    scItems = self.novel.sections[scId].items
-                    scItems.remove(elemId)
-                    self.novel.sections[scId].items = scItems
-                except:
-                    pass
-        elif elemId.startswith(PLOT_LINE_PREFIX):
-            # Delete a plot line and remove references.
-            if self.novel.plotLines[elemId].sections:
-                for scId in self.novel.plotLines[elemId].sections:
-                    self.novel.sections[scId].scPlotLines.remove(elemId)
-                for ppId in self.tree.get_children(elemId):
-                    scId = self.novel.plotPoints[ppId].sectionAssoc
-                    if scId is not None:
-                        del(self.novel.sections[scId].scPlotPoints[ppId])
-                    del self.novel.plotPoints[ppId]
-            del self.novel.plotLines[elemId]
-            self.tree.delete(elemId)
-        elif elemId.startswith(PLOT_POINT_PREFIX):
-            # Delete a plot point and remove references.
-            scId = self.novel.plotPoints[elemId].sectionAssoc
-            if scId is not None:
-                del(self.novel.sections[scId].scPlotPoints[elemId])
-            del self.novel.plotPoints[elemId]
-            self.tree.delete(elemId)
-        elif elemId.startswith(PRJ_NOTE_PREFIX):
-            # Delete a project note.
-            del self.novel.projectNotes[elemId]
-            self.tree.delete(elemId)
-        else:
-            # Part/chapter/section selected.
-            if trash and self.trashBin is None:
-                # Create a "trash bin"; use the first free chapter ID.
-                self.trashBin = create_id(self.novel.chapters, prefix=CHAPTER_PREFIX)
-                self.novel.chapters[self.trashBin] = self.nvService.make_chapter(
-                    title=_('Trash'),
-                    desc='',
-                    chLevel=2,
-                    chType=3,
-                    noNumber=True,
-                    isTrash=True,
-                    on_element_change=self.on_element_change,
-                )
-                self.tree.append(CH_ROOT, self.trashBin)
-            if elemId.startswith(SECTION_PREFIX):
-                if self.tree.parent(elemId) == self.trashBin:
-                    # Remove section, if already in trash bin.
-                    del self.novel.sections[elemId]
-                    self.tree.delete(elemId)
-                else:
-                    # Move section to the "trash bin".
-                    waste_sections(elemId)
-            else:
-                # Delete part/chapter and move child sections to the "trash bin".
-                waste_sections(elemId)
-                self.tree.delete(elemId)
-            if trash:
-                # Make sure the whole "trash bin" is unused.
-                self.set_type(3, [self.trashBin])
-
+    def delete_elements(self, elemIds, trash=True):
+        """Delete elements and their children, notifying the change once.
+        
+        Positional arguments:
+            elemIds: list of str -- IDs of the elements to delete, processed in order.
+        
+        Optional arguments:
+            trash: Boolean -- If True, move elements to the "Trash Bin" 
+                              instead of deleting them.
+        
+        The elements are deleted as described for delete_element().
+        The sections referring to characters, locations, and items
+        are looked up in the novel's query indexes before anything is changed,
+        and the plot lines' section lists are rewritten once at the end,
+        so the cost depends on the number of references rather than
+        on the number of sections.
+        """
+        sectionRefs = {}
+        # key: ID of a character, location, or item; value: list of referring section IDs
+        for elemId in elemIds:
+            if elemId.startswith(CHARACTER_PREFIX):
+                sectionRefs[elemId] = list(self.novel.query.get_sections(character=elemId))
+            elif elemId.startswith(LOCATION_PREFIX):
+                sectionRefs[elemId] = list(self.novel.query.get_sections(location=elemId))
+            elif elemId.startswith(ITEM_PREFIX):
+                sectionRefs[elemId] = list(self.novel.query.get_sections(item=elemId))
+        plotLineRefs = {}
+        # key: plot line ID; value: set of the section IDs to remove from the plot line
+        self._isBatch = True
+        try:
+            for elemId in elemIds:
+                self._delete_element(elemId, trash, sectionRefs.get(elemId, []), plotLineRefs)
+            for plId, scIds in plotLineRefs.items():
+                plotLine = self.novel.plotLines.get(plId, None)
+                if plotLine is not None:
+                    plotLine.sections = [scId for scId in plotLine.sections if not scId in scIds]
+        finally:
+            self._isBatch = False
+        if self._isBatchModified:
+            self._isBatchModified = False
+            self.on_element_change()
+
+    @profiler.timed('NvModel.get_counts')
     def get_counts(self):
         """Return a tuple with total numbers:
         
@@ -568,6 +495,28 @@ class NvModel(ModelBase):
         self.wordCount = wordCount
         return wordCount, sectionCount, chapterCount, partCount
 
+    def get_next_node(self, elemId):
+        """Return the ID of the next element of the same type in reading order, or None.
+        
+        Positional arguments:
+            elemId: str -- ID of the reference element.
+            
+        Chapters are of the same type if they have the same level.
+        Stage sections are of the same type if they have the same level.
+        Normal and unused sections are considered as of the same type.
+        """
+        return self._readingOrder.get_next(self.novel, elemId)
+
+    def get_prev_node(self, elemId):
+        """Return the ID of the previous element of the same type in reading order, or None.
+        
+        Positional arguments:
+            elemId: str -- ID of the reference element.
+            
+        See get_next_node() for the element types.
+        """
+        return self._readingOrder.get_prev(self.novel, elemId)
+
     def get_status_counts(self):
         """Return a list with word count totals depending of section status.
         
@@ -635,10 +584,7 @@ class NvModel(ModelBase):
         self.novel.sections[ScId0].title = joinedTitles
 
         # Join content.
-        content0 = self.novel.sections[ScId0].sectionContent
-        content1 = self.novel.sections[ScId1].sectionContent
-        # this is because sectionContent is a property
-        self.novel.sections[ScId0].sectionContent = join_str(content0, content1, newline='')
+        self.novel.sections[ScId0].join_content(self.novel.sections[ScId1])
 
         # Join description, goal, conflict, outcome, notes.
         self.novel.sections[ScId0].desc = join_str(self.novel.sections[ScId0].desc, self.novel.sections[ScId1].desc)
@@ -753,21 +699,137 @@ class NvModel(ModelBase):
         self.prjFile.novel = self.novel
         self._initialize_tree(self.on_element_change)
 
+    def load_project(self, prjFile):
+        """Make a project file that has been read headless the current project.
+        
+        Positional arguments:
+            prjFile: NvWorkFile -- Project file returned by read_project().
+
+        Copy the headless tree structure to the model's tree in one pass.
+        """
+        self.novel = prjFile.novel
+        headlessTree = self.novel.tree
+        for root in headlessTree.roots:
+            for elemId in headlessTree.get_children(root):
+                self.tree.append(root, elemId)
+                for childId in headlessTree.get_children(elemId):
+                    self.tree.append(elemId, childId)
+        self.novel.tree = self.tree
+        self.prjFile = prjFile
+        if self.prjFile.wcLogUpdate and self.novel.saveWordCount:
+            self.isModified = True
+        else:
+            self.isModified = False
+        self._initialize_tree(self.on_element_change)
+
+    def on_element_change(self):
+        """Mark the novel's query indexes as outdated, and report the change.
+
+        During delete_elements(), the change is reported once at the end.
+        Extends the superclass method.
+        """
+        if self.novel is not None:
+            self.novel.query.invalidate()
+        if self._isBatch:
+            self._isBatchModified = True
+            return
+
+        super().on_element_change()
+
     def open_project(self, filePath):
         """Initialize instance variables.
         
         Positional arguments:
             filePath: str -- path to the prjFile file.
         """
-        self.novel = self.nvService.make_novel(tree=self.tree, links={})
-        self.prjFile = NvWorkFile(filePath)
-        self.prjFile.novel = self.novel
-        self.prjFile.read()
+        self.load_project(self.read_project(filePath))
+
+    def read_project(self, filePath):
+        """Return a project file instance with a novel read into a headless tree.
+        
+        Positional arguments:
+            filePath: str -- path to the prjFile file.
+
+        This method does not touch the model's state, 
+        so it can run in a worker thread.
+        Raise the "Error" exception in case of error. 
+        """
+        prjFile = NvWorkFile(filePath)
+        prjFile.novel = self.nvService.make_novel(tree=NvTree(), links={})
+        prjFile.read()
+        return prjFile
+
+    def refresh_clients(self):
+        """Notify the registered clients of changes, timing each client.
+        
+        Overrides the superclass method.
+        """
+        if not profiler.enabled:
+            super().refresh_clients()
+            return
+
+        for client in self._clients:
+            with profiler.span(f'{type(client).__name__}.refresh'):
+                client.refresh()
+
+    def reload_project(self, prjFile):
+        """Update the current project with a project file that has been read headless.
+        
+        Positional arguments:
+            prjFile: NvWorkFile -- Project file returned by read_project().
+
+        Compare the content hashes, and replace only the elements that differ. 
+        Unchanged elements and tree nodes are kept, 
+        so the tree view state is preserved.
+        Return the number of elements added, removed, or changed.
+        """
+        newNovel = prjFile.novel
+        newJsonRoot = prjFile.get_json_data()[prjFile.ROOT]
+        newTree = MerkleTree(newJsonRoot)
+        oldTree = self.prjFile.get_merkle_tree()
+        projectChanged, elemIds, branchIds = newTree.diff(oldTree)
+
+        # Replace the changed elements, and add the new ones.
+        removedIds = set()
+        for elemId in elemIds:
+            newCollection = self._get_collection(newNovel, elemId)
+            if elemId in newCollection:
+                self._get_collection(self.novel, elemId)[elemId] = newCollection[elemId]
+            else:
+                removedIds.add(elemId)
+
+        # Rearrange the branches whose children differ.
+        for parentId in branchIds:
+            for index, elemId in enumerate(newTree.children.get(parentId, [])):
+                if not elemId in oldTree.elementHashes:
+                    self.tree.insert(parentId, index, elemId)
+                elif self.tree.parent(elemId) != parentId or self.tree.index(elemId) != index:
+                    self.tree.move(elemId, parentId, index)
+
+        # Delete the removed elements; their children go with them.
+        topRemovedIds = [elemId for elemId in removedIds if not self.tree.parent(elemId) in removedIds]
+        for elemId in topRemovedIds:
+            self.tree.delete(elemId)
+        for elemId in removedIds:
+            del self._get_collection(self.novel, elemId)[elemId]
+
+        # Update the plot line back references of the sections kept.
+        for scId, section in self.novel.sections.items():
+            newSection = newNovel.sections[scId]
+            if section is not newSection:
+                section.scPlotLines = newSection.scPlotLines
+                section.scPlotPoints = newSection.scPlotPoints
+
+        if projectChanged:
+            prjFile.novelCnv.import_data(self.novel, newJsonRoot.get('PROJECT', {}))
+        prjFile.novel = self.novel
+        self.prjFile = prjFile
         if self.prjFile.wcLogUpdate and self.novel.saveWordCount:
             self.isModified = True
         else:
             self.isModified = False
         self._initialize_tree(self.on_element_change)
+        return len(elemIds) + projectChanged
 
     def renumber_chapters(self):
         """Modify chapter headings."""
@@ -851,6 +913,7 @@ class NvModel(ModelBase):
         """Clear the tree."""
         self.tree.reset()
         self.trashBin = None
+        self._readingOrder.invalidate()
 
     def save_project(self, filePath=None):
         """Write the mdnovel project file, and set "unchanged" status."""
@@ -866,6 +929,7 @@ class NvModel(ModelBase):
             newLevel: int -- New level to be set.
             elemIds: list of IDs to process.
         """
+        self._readingOrder.invalidate()
         for elemId in elemIds:
             if elemId.startswith(CHAPTER_PREFIX):
                 self.novel.chapters[elemId].chLevel = newLevel
@@ -909,6 +973,7 @@ class NvModel(ModelBase):
             newType: int -- New type to be set.
             elemIds: list of IDs to process.
         """
+        self._readingOrder.invalidate()
         for elemId in elemIds:
             if elemId.startswith(SECTION_PREFIX):
                 if self.novel.sections[elemId].scType < 2:
@@ -925,9 +990,184 @@ class NvModel(ModelBase):
                     self.set_type(newType, self.tree.get_children(elemId))
                     # going one level down
 
+    def _delete_element(self, elemId, trash, sectionRefs, plotLineRefs):
+        """Delete an element and its children; see delete_element().
+        
+        Positional arguments:
+            elemId: str -- ID of the element to delete.
+            trash: Boolean -- If True, move sections to the "Trash Bin".
+            sectionRefs: list of str -- IDs of the sections referring to a character, location, or item.
+            plotLineRefs: dict -- key: plot line ID; value: set of the section IDs to remove.
+        """
+
+        def waste_sections(elemId):
+            """Move all sections under the element specified by elemId to the 'trash bin'."""
+            if elemId.startswith(SECTION_PREFIX):
+                if self.novel.sections[elemId].scType < 2:
+                    # Remove plot point and plot line references.
+                    arcReferences = self.novel.sections[elemId].scPlotLines
+                    tpReferences = self.novel.sections[elemId].scPlotPoints
+                    self.novel.sections[elemId].scPlotLines = []
+                    self.novel.sections[elemId].scPlotPoints = {}
+                    for plId in arcReferences:
+                        plotLineRefs.setdefault(plId, set()).add(elemId)
+                    for ppId in tpReferences:
+                        self.novel.plotPoints[ppId].sectionAssoc = None
+                    if trash:
+                        # Move the section to the trash bin.
+                        self.tree.move(elemId, self.trashBin, 0)
+                        self.novel.sections[elemId].scType = 1
+                    else:
+                        # Delete the section.
+                        del self.novel.sections[elemId]
+                        self.tree.delete(elemId)
+                else:
+                    # Delete the stage.
+                    del self.novel.sections[elemId]
+                    self.tree.delete(elemId)
+            else:
+                # Delete chapter and go one level down.
+                for childNode in list(self.tree.get_children(elemId)):
+                    waste_sections(childNode)
+                del self.novel.chapters[elemId]
+
+        if elemId == self.trashBin:
+            # Remove the "trash bin".
+            for scId in self.tree.get_children(elemId):
+                del self.novel.sections[scId]
+            del self.novel.chapters[elemId]
+            self.tree.delete(elemId)
+            self.trashBin = None
+        elif elemId.startswith(CHARACTER_PREFIX):
+            # Delete a character and remove references.
+            del self.novel.characters[elemId]
+            self.tree.delete(elemId)
+            for scId in sectionRefs:
+                section = self.novel.sections.get(scId, None)
+                if section is None:
+                    continue
+
+                scCharacters = section.characters
+                if elemId in scCharacters:
+                    scCharacters.remove(elemId)
+                    section.characters = scCharacters
+        elif elemId.startswith(LOCATION_PREFIX):
+            # Delete a location and remove references.
+            del self.novel.locations[elemId]
+            self.tree.delete(elemId)
+            for scId in sectionRefs:
+                section = self.novel.sections.get(scId, None)
+                if section is None:
+                    continue
+
+                scLocations = section.locations
+                if elemId in scLocations:
+                    scLocations.remove(elemId)
+                    section.locations = scLocations
+        elif elemId.startswith(ITEM_PREFIX):
+            # Delete an item and remove references.
+            del self.novel.items[elemId]
+            self.tree.delete(elemId)
+            for scId in sectionRefs:
+                section = self.novel.sections.get(scId, None)
+                if section is None:
+                    continue
+
+                scItems = section.items
+                if elemId in scItems:
+                    scItems.remove(elemId)
+                    section.items = scItems
+        elif elemId.startswith(PLOT_LINE_PREFIX):
+            # Delete a plot line and remove references.
+            if self.novel.plotLines[elemId].sections:
+                for scId in self.novel.plotLines[elemId].sections:
+                    section = self.novel.sections.get(scId, None)
+                    if section is not None and elemId in section.scPlotLines:
+                        section.scPlotLines.remove(elemId)
+                for ppId in self.tree.get_children(elemId):
+                    scId = self.novel.plotPoints[ppId].sectionAssoc
+                    if scId is not None:
+                        del(self.novel.sections[scId].scPlotPoints[ppId])
+                    del self.novel.plotPoints[ppId]
+            del self.novel.plotLines[elemId]
+            self.tree.delete(elemId)
+        elif elemId.startswith(PLOT_POINT_PREFIX):
+            # Delete a plot point and remove references.
+            scId = self.novel.plotPoints[elemId].sectionAssoc
+            if scId is not None:
+                del(self.novel.sections[scId].scPlotPoints[elemId])
+            del self.novel.plotPoints[elemId]
+            self.tree.delete(elemId)
+        elif elemId.startswith(PRJ_NOTE_PREFIX):
+            # Delete a project note.
+            del self.novel.projectNotes[elemId]
+            self.tree.delete(elemId)
+        else:
+            # Part/chapter/section selected.
+            if trash and self.trashBin is None:
+                # Create a "trash bin"; use the first free chapter ID.
+                self.trashBin = create_id(self.novel.chapters, prefix=CHAPTER_PREFIX)
+                self.novel.chapters[self.trashBin] = self.nvService.make_chapter(
+                    title=_('Trash'),
+                    desc='',
+                    chLevel=2,
+                    chType=3,
+                    noNumber=True,
+                    isTrash=True,
+                    on_element_change=self.on_element_change,
+                )
+                self.tree.append(CH_ROOT, self.trashBin)
+                # Make sure the whole "trash bin" is unused.
+                # The sections moved there are set "unused" one by one.
+                self.set_type(3, [self.trashBin])
+            if elemId.startswith(SECTION_PREFIX):
+                if self.tree.parent(elemId) == self.trashBin:
+                    # Remove section, if already in trash bin.
+                    del self.novel.sections[elemId]
+                    self.tree.delete(elemId)
+                else:
+                    # Move section to the "trash bin".
+                    waste_sections(elemId)
+            else:
+                # Delete part/chapter and move child sections to the "trash bin".
+                waste_sections(elemId)
+                self.tree.delete(elemId)
+
+    def _get_collection(self, novel, elemId):
+        """Return the novel's dictionary holding the element with elemId."""
+        if elemId.startswith(SECTION_PREFIX):
+            return novel.sections
+
+        if elemId.startswith(CHAPTER_PREFIX):
+            return novel.chapters
+
+        if elemId.startswith(CHARACTER_PREFIX):
+            return novel.characters
+
+        if elemId.startswith(LOCATION_PREFIX):
+            return novel.locations
+
+        if elemId.startswith(ITEM_PREFIX):
+            return novel.items
+
+        if elemId.startswith(PLOT_LINE_PREFIX):
+            return novel.plotLines
+
+        if elemId.startswith(PLOT_POINT_PREFIX):
+            return novel.plotPoints
+
+        if elemId.startswith(PRJ_NOTE_PREFIX):
+            return novel.projectNotes
+
+        raise Error(f'{_("Unknown element ID")}: "{elemId}".')
+
     def _initialize_tree(self, on_element_change):
         """Iterate the tree and configure the elements."""
 
+        def on_tree_change():
+            self._readingOrder.invalidate()
+            on_element_change()
+
         def initialize_branch(node):
             """Recursive tree walker.
             
@@ -959,5 +1199,7 @@ class NvModel(ModelBase):
         self.trashBin = None
         initialize_branch('')
         self.novel.on_element_change = on_element_change
-        self.tree.on_element_change = on_element_change
+        self.tree.on_element_change = on_tree_change
+        self._readingOrder.invalidate()
+        self.novel.query.invalidate()
 
@@ -22,7 +22,8 @@ class NvService(MdnovService):
 
     def make_novel(self, **kwargs):
         """Overrides the superclass method."""
-        kwargs['tree'] = kwargs.get('tree', NvTreeview())
+        if not 'tree' in kwargs:
+            kwargs['tree'] = NvTreeview()
         return Novel(**kwargs)
 
     def make_nv_tree(self, **kwargs):
@@ -21,6 +21,7 @@ class NvTree:
     """
 
     def __init__(self):
+        self.on_element_change = self.do_nothing
         self.roots = {
             CH_ROOT:[],
             CR_ROOT:[],
@@ -45,6 +46,7 @@ class NvTree:
                 self.srtSections[iid] = []
             elif parent == PL_ROOT:
                 self.srtTurningPoints[iid] = []
+            self.on_element_change()
             return
 
         if parent.startswith(CHAPTER_PREFIX):
@@ -52,6 +54,7 @@ class NvTree:
                 self.srtSections[parent].append(iid)
             else:
                 self.srtSections[parent] = [iid]
+            self.on_element_change()
             return
 
         if parent.startswith(PLOT_LINE_PREFIX):
@@ -59,14 +62,30 @@ class NvTree:
                 self.srtTurningPoints[parent].append(iid)
             else:
                 self.srtTurningPoints[parent] = [iid]
+            self.on_element_change()
 
     def delete(self, *items):
         """Delete all specified items and all their descendants. The root
         item may not be deleted."""
-        raise NotImplementedError
+        for item in items:
+            for children in self.roots.values():
+                if item in children:
+                    children.remove(item)
+                    self.srtSections.pop(item, None)
+                    self.srtTurningPoints.pop(item, None)
+                    break
+
+            else:
+                for branches in (self.srtSections, self.srtTurningPoints):
+                    for children in branches.values():
+                        if item in children:
+                            children.remove(item)
+                            break
+        self.on_element_change()
 
     def delete_children(self, parent):
         """Delete all parent's descendants."""
+        self.on_element_change()
         if parent in self.roots:
             self.roots[parent] = []
             if parent == CH_ROOT:
@@ -86,6 +105,9 @@ class NvTree:
 
     def get_children(self, item):
         """Returns the list of children belonging to item."""
+        if not item:
+            return list(self.roots)
+
         if item in self.roots:
             return self.roots[item]
 
@@ -95,10 +117,12 @@ class NvTree:
         if item.startswith(PLOT_LINE_PREFIX):
             return self.srtTurningPoints.get(item, [])
 
+        return []
+
     def index(self, item):
         """Return the integer index of item within its parent's list
         of children."""
-        raise NotImplementedError
+        return self.get_children(self.parent(item)).index(item)
 
     def insert(self, parent, index, iid):
         """Create a new item with identifier iid."""
@@ -108,6 +132,7 @@ class NvTree:
                 self.srtSections[iid] = []
             elif parent == PL_ROOT:
                 self.srtTurningPoints[iid] = []
+            self.on_element_change()
             return
 
         if parent.startswith(CHAPTER_PREFIX):
@@ -115,6 +140,7 @@ class NvTree:
                 self.srtSections[parent].insert(index, iid)
             else:
                 self.srtSections[parent] = [iid]
+            self.on_element_change()
             return
 
         if parent.startswith(PLOT_LINE_PREFIX):
@@ -122,6 +148,7 @@ class NvTree:
                 self.srtTurningPoints[parent].insert(index, iid)
             else:
                 self.srtTurningPoints[parent] = [iid]
+            self.on_element_change()
 
     def move(self, item, parent, index):
         """Move item to position index in parent's list of children.
@@ -131,25 +158,55 @@ class NvTree:
         beginning, if greater than or equal to the number of children,
         it is moved to the end. If item was detached it is reattached.
         """
-        raise NotImplementedError
+        oldParent = self.parent(item)
+        if oldParent:
+            self.get_children(oldParent).remove(item)
+        children = self._get_branch(parent)
+        if index == 'end':
+            index = len(children)
+        children.insert(max(0, index), item)
+        self.on_element_change()
 
     def next(self, item):
         """Return the identifier of item's next sibling, or '' if item
         is the last child of its parent."""
-        raise NotImplementedError
+        siblings = self.get_children(self.parent(item))
+        i = siblings.index(item) + 1
+        if i < len(siblings):
+            return siblings[i]
+
+        return ''
 
     def parent(self, item):
         """Return the ID of the parent of item, or '' if item is at the
         top level of the hierarchy."""
-        raise NotImplementedError
+        if item in self.roots:
+            return ''
+
+        for root, children in self.roots.items():
+            if item in children:
+                return root
+
+        for branches in (self.srtSections, self.srtTurningPoints):
+            for parent, children in branches.items():
+                if item in children:
+                    return parent
+
+        return ''
 
     def prev(self, item):
         """Return the identifier of item's previous sibling, or '' if
         item is the first child of its parent."""
-        raise NotImplementedError
+        siblings = self.get_children(self.parent(item))
+        i = siblings.index(item) - 1
+        if i >= 0:
+            return siblings[i]
+
+        return ''
 
     def reset(self):
         """Clear the tree."""
+        self.on_element_change = self.do_nothing
         for item in self.roots:
             self.roots[item] = []
         self.srtSections = {}
@@ -174,3 +231,18 @@ class NvTree:
         if item.startswith(PLOT_LINE_PREFIX):
             self.srtTurningPoints[item] = newchildren[:]
 
+    def do_nothing(self):
+        pass
+
+    def _get_branch(self, parent):
+        """Return the list of parent's children, creating it if necessary."""
+        if parent in self.roots:
+            return self.roots[parent]
+
+        if parent.startswith(CHAPTER_PREFIX):
+            return self.srtSections.setdefault(parent, [])
+
+        if parent.startswith(PLOT_LINE_PREFIX):
+            return self.srtTurningPoints.setdefault(parent, [])
+
+        raise ValueError(f'Invalid parent: {parent}')
@@ -6,6 +6,8 @@ License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
 from tkinter import ttk
 
+from mdnvlib.novx_globals import CHAPTER_PREFIX
+from mdnvlib.novx_globals import PLOT_LINE_PREFIX
 from mdnvlib.novx_globals import PL_ROOT
 from mdnvlib.novx_globals import CH_ROOT
 from mdnvlib.novx_globals import CR_ROOT
@@ -15,11 +17,31 @@ from mdnvlib.novx_globals import PN_ROOT
 
 
 class NvTreeview(ttk.Treeview):
-    """mdnovel project tree, defining the novel structure."""
+    """mdnovel project tree, defining the novel structure.
+
+    Public instance variables:
+        lazyBranches: bool -- If True, new chapters and plot lines
+                              keep their children out of the widget.
+        on_element_change -- Callback for structural changes.
+        on_materialize -- Callback with the branch ID, after a branch has been filled.
+
+    Lazy branches hold a placeholder child, so that they can be expanded.
+    Their children are inserted into the widget ("materialized")
+    when the branch is opened, or when a child is shown or selected.
+    The tree methods hide the difference, so the model sees the
+    complete structure at any time.
+    """
+    _PLACEHOLDER_SUFFIX = '~'
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.on_element_change = self.do_nothing
+        self.on_materialize = self.do_nothing
+        self.lazyBranches = False
+        self._detached = {}
+        # key: lazy branch ID; value: list of child IDs
+        self._detachedParents = {}
+        # key: child ID; value: lazy branch ID
 
         #--- Build the toplevel  structure.
         self.append('', CH_ROOT)
@@ -34,28 +56,199 @@ class NvTreeview(ttk.Treeview):
             text = iid
         self.insert(parent, 'end', iid, text=text)
 
+    def count_resident_rows(self):
+        """Return the number of materialized section and plot point rows."""
+        count = 0
+        for root in (CH_ROOT, PL_ROOT):
+            for branch in super().get_children(root):
+                if not branch in self._detached:
+                    count += len(super().get_children(branch))
+        return count
+
     def delete(self, *items):
-        super().delete(*items)
+        for item in items:
+            parent = self._detachedParents.pop(item, None)
+            if parent is not None:
+                self._detached[parent].remove(item)
+                if not self._detached[parent]:
+                    super().delete(f'{parent}{self._PLACEHOLDER_SUFFIX}')
+                continue
+
+            for child in self._detached.pop(item, []):
+                del self._detachedParents[child]
+            super().delete(item)
         self.on_element_change()
 
     def delete_children(self, parent):
         for child in self.get_children(parent):
             self.delete(child)
 
+    def exists(self, item):
+        if item in self._detachedParents:
+            return True
+
+        return super().exists(item)
+
+    def focus(self, item=None):
+        if item is not None:
+            self._materialize_parent(item)
+        return super().focus(item)
+
+    def get_children(self, item=None):
+        if item in self._detached:
+            return tuple(self._detached[item])
+
+        if item in self._detachedParents:
+            return ()
+
+        return super().get_children(item)
+
+    def index(self, item):
+        parent = self._detachedParents.get(item, None)
+        if parent is not None:
+            return self._detached[parent].index(item)
+
+        return super().index(item)
+
     def insert(self, parent, index, iid=None, **kw):
-        super().insert(parent, index, iid, **kw)
+        if parent in self._detached:
+            children = self._detached[parent]
+            if index == 'end':
+                children.append(iid)
+            else:
+                children.insert(index, iid)
+            self._detachedParents[iid] = parent
+            if len(children) == 1:
+                super().insert(parent, 'end', f'{parent}{self._PLACEHOLDER_SUFFIX}', text='')
+        else:
+            super().insert(parent, index, iid, **kw)
+            if self.lazyBranches and parent in (CH_ROOT, PL_ROOT):
+                self._detached[iid] = []
         self.on_element_change()
+        return iid
+
+    def is_detached(self, item):
+        """Return True if item belongs to a lazy branch and has no widget row."""
+        return item in self._detachedParents
+
+    def item(self, item, option=None, **kw):
+        self._materialize_parent(item)
+        if kw.get('open', False):
+            self.materialize(item)
+        return super().item(item, option, **kw)
+
+    def materialize(self, parent):
+        """Insert the children of a lazy branch into the widget.
+
+        Positional arguments:
+            parent: str -- Branch ID.
+        """
+        children = self._detached.pop(parent, None)
+        if children is None:
+            return
+
+        if children:
+            super().delete(f'{parent}{self._PLACEHOLDER_SUFFIX}')
+        for child in children:
+            del self._detachedParents[child]
+            super().insert(parent, 'end', child, text=child)
+        self.on_materialize(parent)
 
     def move(self, item, parent, index):
+        self._materialize_parent(item)
+        self.materialize(parent)
         super().move(item, parent, index)
         self.on_element_change()
 
+    def next(self, item):
+        parent = self._detachedParents.get(item, None)
+        if parent is not None:
+            children = self._detached[parent]
+            i = children.index(item) + 1
+            if i < len(children):
+                return children[i]
+
+            return ''
+
+        return super().next(item)
+
+    def parent(self, item):
+        parent = self._detachedParents.get(item, None)
+        if parent is not None:
+            return parent
+
+        return super().parent(item)
+
+    def prev(self, item):
+        parent = self._detachedParents.get(item, None)
+        if parent is not None:
+            children = self._detached[parent]
+            i = children.index(item) - 1
+            if i >= 0:
+                return children[i]
+
+            return ''
+
+        return super().prev(item)
+
+    def release(self, parent):
+        """Remove the children of a collapsed branch from the widget.
+
+        Positional arguments:
+            parent: str -- Chapter or plot line ID.
+
+        The branch becomes a lazy branch again.
+        Branches with selected children are kept.
+        """
+        if parent in self._detached:
+            return
+
+        if not (parent.startswith(CHAPTER_PREFIX) or parent.startswith(PLOT_LINE_PREFIX)):
+            return
+
+        children = list(super().get_children(parent))
+        for child in self.selection():
+            if child in children:
+                return
+
+        self._detached[parent] = children
+        if not children:
+            return
+
+        super().delete(*children)
+        for child in children:
+            self._detachedParents[child] = parent
+        super().insert(parent, 'end', f'{parent}{self._PLACEHOLDER_SUFFIX}', text='')
+
     def reset(self):
         """Clear the tree, keeping the root elements."""
         self.on_element_change = self.do_nothing
         for rootElement in self.get_children(''):
             for child in self.get_children(rootElement):
                 self.delete(child)
+        self._detached.clear()
+        self._detachedParents.clear()
 
-    def do_nothing(self):
+    def see(self, item):
+        self._materialize_parent(item)
+        super().see(item)
+
+    def selection_set(self, *items):
+        for item in self._flatten(items):
+            self._materialize_parent(item)
+        super().selection_set(*items)
+
+    def do_nothing(self, *args):
         pass
+
+    def _flatten(self, items):
+        for item in items:
+            if isinstance(item, (list, tuple)):
+                yield from item
+            else:
+                yield item
+
+    def _materialize_parent(self, item):
+        parent = self._detachedParents.get(item, None)
+        if parent is not None:
+            self.materialize(parent)
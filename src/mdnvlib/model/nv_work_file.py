@@ -5,9 +5,11 @@ For further information see https://github.com/peter88213/mdnovel
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
 from datetime import datetime
+import json
 import os
 
 from mdnvlib.json.json_file import JsonFile
+from mdnvlib.json.merkle_tree import MerkleTree
 from mdnvlib.novx_globals import CH_ROOT
 from mdnvlib.novx_globals import _
 
@@ -15,6 +17,9 @@ from mdnvlib.novx_globals import _
 class NvWorkFile(JsonFile):
     """mdnovel project file representation.
     
+    Public instance variables:
+        fileTree: MerkleTree -- Content hashes of the file, as last read or written.
+
     Public properties:
         fileDate: str -- Localized file date/time.
 
@@ -24,6 +29,20 @@ class NvWorkFile(JsonFile):
     _LOCKFILE_PREFIX = '.LOCK.'
     _LOCKFILE_SUFFIX = '#'
 
+    def __init__(self, filePath, **kwargs):
+        """Initialize instance variables.
+        
+        Positional arguments:
+            filePath: str -- path to the project file.
+            
+        Optional arguments:
+            kwargs -- keyword arguments (not used here).            
+        
+        Extends the superclass constructor.
+        """
+        super().__init__(filePath, **kwargs)
+        self.fileTree = None
+
     @property
     def fileDate(self):
         if self.timestamp is None:
@@ -43,17 +62,43 @@ class NvWorkFile(JsonFile):
                 return
 
     def has_changed_on_disk(self):
-        """Return True if the yw project file has changed since last opened."""
+        """Return True if the project file has changed since last read or written.
+        
+        If the modification time differs, compare the content hashes,
+        so that rewriting the same content does not count as change.
+        The word count log is not compared.
+        """
         try:
-            if self.timestamp != os.path.getmtime(self.filePath):
-                return True
-            else:
-                return False
-
+            timestamp = os.path.getmtime(self.filePath)
         except:
             # this is for newly created projects
             return False
 
+        if self.timestamp == timestamp:
+            return False
+
+        if self.fileTree is None:
+            return True
+
+        try:
+            with open(self.filePath, 'r', encoding='utf-8') as f:
+                jsonRoot = json.load(f)[self.ROOT]
+        except:
+            return True
+
+        if MerkleTree(jsonRoot).rootHash != self.fileTree.rootHash:
+            return True
+
+        self.timestamp = timestamp
+        return False
+
+    def _update_file_tree(self, jsonRoot):
+        """Keep the content hashes of the data just read or written.
+        
+        Overrides the superclass method.
+        """
+        self.fileTree = MerkleTree(jsonRoot)
+
     def _split_file_path(self):
         head, tail = os.path.split(self.filePath)
         if head:
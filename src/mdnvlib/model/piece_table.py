@@ -0,0 +1,231 @@
+"""Provide a piece table class for editing long texts.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+
+
+class PieceTable:
+    """Text buffer made of slices of immutable strings.
+
+    Public methods:
+        delete(start, end) -- Remove a range of text.
+        extend(other) -- Append the text of another buffer.
+        get_line_range(start, end) -- Return the range of the lines touching a range of text.
+        get_text(start, end) -- Return the text, or a part of it.
+        insert(offset, text) -- Insert text at an offset.
+        replace(start, end, text) -- Replace a range of text.
+        split(offset) -- Cut the text at an offset, and return the rest as a new buffer.
+        strip(chars) -- Remove leading and trailing characters.
+
+    Editing only changes the list of pieces; the strings are never modified,
+    so pieces can be shared between buffers, and splitting or joining
+    does not copy the text. The whole text is joined on request,
+    and then kept until the next change.
+    """
+
+    def __init__(self, text=''):
+        """Initialize instance variables.
+
+        Optional arguments:
+            text: str -- The initial text.
+        """
+        self._pieces = []
+        # list of tuples (string, start offset, end offset)
+        if text:
+            self._pieces.append((text, 0, len(text)))
+        self._length = len(text)
+        self._text = text
+        # The whole text, or None if it has changed since joined
+
+    def __len__(self):
+        return self._length
+
+    def __str__(self):
+        return self.get_text()
+
+    def delete(self, start, end):
+        """Remove a range of text.
+
+        Positional arguments:
+            start: int -- Offset of the first character to remove.
+            end: int -- Offset after the last character to remove.
+        """
+        self.replace(start, end, '')
+
+    def extend(self, other):
+        """Append the text of another buffer.
+
+        Positional arguments:
+            other: PieceTable -- The buffer to append; it is not changed.
+        """
+        if not other._length:
+            return
+
+        self._pieces.extend(other._pieces)
+        self._length += other._length
+        self._text = None
+
+    def get_line_range(self, start, end):
+        """Return the range of the lines touching a range of text.
+
+        Positional arguments:
+            start: int -- Offset of the first character.
+            end: int -- Offset after the last character.
+
+        Return a tuple (offset of the first line's start, offset of the last line's end),
+        where a line's end is the offset of its newline character, or the text length.
+        """
+        lineStart = 0
+        lineEnd = self._length
+        pieceStart = 0
+        for text, first, last in self._pieces:
+            pieceEnd = pieceStart + last - first
+            if pieceStart < start:
+                i = text.rfind('\n', first, first + min(start, pieceEnd) - pieceStart)
+                if i >= 0:
+                    lineStart = pieceStart + i - first + 1
+            if pieceEnd > end:
+                i = text.find('\n', first + max(end, pieceStart) - pieceStart, last)
+                if i >= 0:
+                    lineEnd = pieceStart + i - first
+                    break
+
+            pieceStart = pieceEnd
+        return lineStart, lineEnd
+
+    def get_text(self, start=0, end=None):
+        """Return the text, or a part of it.
+
+        Optional arguments:
+            start: int -- Offset of the first character.
+            end: int -- Offset after the last character. Default: the text length.
+        """
+        if end is None or end > self._length:
+            end = self._length
+        if start <= 0 and end == self._length:
+            if self._text is None:
+                self._text = ''.join(text[first:last] for text, first, last in self._pieces)
+                self._pieces = [(self._text, 0, self._length)] if self._length else []
+            return self._text
+
+        if self._text is not None:
+            return self._text[start:end]
+
+        parts = []
+        pieceStart = 0
+        for text, first, last in self._pieces:
+            pieceEnd = pieceStart + last - first
+            if pieceEnd > start and pieceStart < end:
+                parts.append(text[first + max(start - pieceStart, 0):first + min(end, pieceEnd) - pieceStart])
+            if pieceEnd >= end:
+                break
+
+            pieceStart = pieceEnd
+        return ''.join(parts)
+
+    def insert(self, offset, text):
+        """Insert text at an offset.
+
+        Positional arguments:
+            offset: int -- Offset of the character before which the text is inserted.
+            text: str -- The text to insert.
+        """
+        self.replace(offset, offset, text)
+
+    def replace(self, start, end, text):
+        """Replace a range of text.
+
+        Positional arguments:
+            start: int -- Offset of the first character to replace.
+            end: int -- Offset after the last character to replace.
+            text: str -- The replacement.
+        """
+        start = max(0, min(start, self._length))
+        end = max(start, min(end, self._length))
+        if start == end and not text:
+            return
+
+        head = self._cut(start)
+        tail = self._cut(end)
+        pieces = self._pieces[:head]
+        if text:
+            pieces.append((text, 0, len(text)))
+        pieces.extend(self._pieces[tail:])
+        self._pieces = pieces
+        self._length += len(text) - (end - start)
+        self._text = None
+
+    def split(self, offset):
+        """Cut the text at an offset, and return the rest as a new buffer.
+
+        Positional arguments:
+            offset: int -- Offset of the first character of the rest.
+        """
+        offset = max(0, min(offset, self._length))
+        i = self._cut(offset)
+        rest = PieceTable()
+        rest._pieces = self._pieces[i:]
+        rest._length = self._length - offset
+        if rest._length:
+            rest._text = None
+        self._pieces = self._pieces[:i]
+        self._length = offset
+        self._text = None
+        return rest
+
+    def strip(self, chars=None):
+        """Remove leading and trailing characters, like str.strip().
+
+        Optional arguments:
+            chars: str -- The characters to remove. Default: whitespace.
+        """
+        length = self._length
+        while self._pieces:
+            text, first, last = self._pieces[-1]
+            end = last
+            while end > first and self._is_stripped(text[end - 1], chars):
+                end -= 1
+            self._length -= last - end
+            if end > first:
+                self._pieces[-1] = (text, first, end)
+                break
+
+            del self._pieces[-1]
+        while self._pieces:
+            text, first, last = self._pieces[0]
+            start = first
+            while start < last and self._is_stripped(text[start], chars):
+                start += 1
+            self._length -= start - first
+            if start < last:
+                self._pieces[0] = (text, start, last)
+                break
+
+            del self._pieces[0]
+        if self._length != length:
+            self._text = None
+
+    def _cut(self, offset):
+        """Make sure that a piece begins at offset, and return its index."""
+        pieceStart = 0
+        for i, (text, first, last) in enumerate(self._pieces):
+            if pieceStart == offset:
+                return i
+
+            pieceEnd = pieceStart + last - first
+            if pieceEnd > offset:
+                middle = first + offset - pieceStart
+                self._pieces[i:i + 1] = [(text, first, middle), (text, middle, last)]
+                return i + 1
+
+            pieceStart = pieceEnd
+        return len(self._pieces)
+
+    def _is_stripped(self, character, chars):
+        """Return True if strip() removes the character."""
+        if chars is None:
+            return character.isspace()
+
+        return character in chars
@@ -0,0 +1,199 @@
+"""Provide a class for an index of the projects in a set of folders.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import json
+import os
+from threading import Thread
+
+from mdnvlib.file.backup_store import BackupStore
+from mdnvlib.model.novel import Novel
+from mdnvlib.model.nv_tree import NvTree
+
+
+class ProjectLibrary:
+    """Index of the project metadata found in a set of folders.
+
+    Public methods:
+        get_entries() -- Return the metadata of the projects found.
+        read_cache() -- Read the metadata from the cache file.
+        scan(folders) -- Search the folders for projects and read the new or changed ones.
+        start_scan(folders) -- Scan the folders in a background thread.
+        write_cache() -- Write the metadata to the cache file.
+
+    Public instance variables:
+        isScanning: bool -- True while a background scan is running.
+
+    An entry is a dictionary with the keys:
+    filePath, title, authorName, wordCount, totalWordCount, wcDate, timestamp.
+    The word counts and their date are taken from the latest word count log entry;
+    they are None if the project has no log.
+
+    Only the project metadata and the word count log are read from the files.
+    The cache keeps the metadata with the file's modification time and size,
+    so a rescan reads only the files that have changed.
+    Files that are not readable projects are cached as well, so they are not read again.
+    """
+    CACHE_VERSION = 1
+
+    def __init__(self, fileTypes, cachePath=None):
+        """Initialize instance variables.
+
+        Positional arguments:
+            fileTypes: list -- Project file classes to look for.
+
+        Optional arguments:
+            cachePath: str -- Path of the cache file, if any.
+        """
+        self._fileTypes = {fileType.EXTENSION:fileType for fileType in fileTypes}
+        self._cachePath = cachePath
+        self._cache = {}
+        # key: file path; value: [modification time in ns, size, entry or None]
+        self._thread = None
+
+    @property
+    def isScanning(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_entries(self):
+        """Return a list with the metadata entries of the projects found by the last scan."""
+        self._wait()
+        return [entry for __, __, entry in self._cache.values() if entry is not None]
+
+    def read_cache(self):
+        """Read the metadata from the cache file.
+
+        Return True on success, otherwise return False.
+        """
+        self._wait()
+        if not self._cachePath:
+            return False
+
+        try:
+            with open(self._cachePath, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('version') != self.CACHE_VERSION:
+                return False
+
+            self._cache = cache['projects']
+        except:
+            return False
+
+        return True
+
+    def scan(self, folders):
+        """Search the folders for projects and read the new or changed ones.
+
+        Positional arguments:
+            folders: list of str -- Paths of the folders to search, including subfolders.
+
+        Return the number of files read.
+        Files no longer found are removed from the index.
+        """
+        self._wait()
+        return self._scan(folders)
+
+    def start_scan(self, folders):
+        """Scan the folders in a background thread.
+
+        Positional arguments:
+            folders: list of str -- Paths of the folders to search, including subfolders.
+        """
+        self._wait()
+        self._thread = Thread(target=self._scan, args=(list(folders),), daemon=True)
+        self._thread.start()
+
+    def write_cache(self):
+        """Write the metadata to the cache file.
+
+        Return True on success, otherwise return False.
+        """
+        self._wait()
+        if not self._cachePath:
+            return False
+
+        try:
+            with open(self._cachePath, 'w', encoding='utf-8') as f:
+                json.dump(
+                    {'version': self.CACHE_VERSION, 'projects': self._cache},
+                    f,
+                    ensure_ascii=False,
+                    separators=(',', ':')
+                    )
+        except:
+            return False
+
+        return True
+
+    def _find_files(self, folder):
+        """Generate the path, modification time, and size of the project files in folder."""
+        pending = [folder]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.name.startswith('.'):
+                            continue
+
+                        if entry.is_dir():
+                            if not entry.name.endswith(BackupStore.DIRECTORY_SUFFIX):
+                                pending.append(entry.path)
+                            continue
+
+                        __, extension = os.path.splitext(entry.name)
+                        if extension in self._fileTypes:
+                            stat = entry.stat()
+                            yield entry.path.replace('\\', '/'), stat.st_mtime_ns, stat.st_size
+            except OSError:
+                continue
+
+    def _read_entry(self, filePath):
+        """Return the metadata entry of a project file, or None if it cannot be read."""
+        __, extension = os.path.splitext(filePath)
+        try:
+            prjFile = self._fileTypes[extension](filePath)
+            prjFile.novel = Novel(tree=NvTree())
+            prjFile.read_header()
+        except Exception:
+            return None
+
+        entry = dict(
+            filePath=filePath,
+            title=prjFile.novel.title,
+            authorName=prjFile.novel.authorName,
+            wordCount=None,
+            totalWordCount=None,
+            wcDate=None,
+            timestamp=prjFile.timestamp,
+        )
+        if prjFile.wcLog:
+            wcDate = prjFile.wcLog.latest()
+            entry['wcDate'] = wcDate
+            entry['wordCount'], entry['totalWordCount'] = prjFile.wcLog[wcDate]
+        return entry
+
+    def _scan(self, folders):
+        cache = {}
+        filesRead = 0
+        for folder in folders:
+            for filePath, mtime, size in self._find_files(folder):
+                if filePath in cache:
+                    continue
+
+                cached = self._cache.get(filePath, None)
+                if cached is not None and cached[0] == mtime and cached[1] == size:
+                    cache[filePath] = cached
+                    continue
+
+                cache[filePath] = [mtime, size, self._read_entry(filePath)]
+                filesRead += 1
+        self._cache = cache
+        return filesRead
+
+    def _wait(self):
+        """Wait for the background scan to finish."""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
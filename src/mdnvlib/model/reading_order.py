@@ -0,0 +1,129 @@
+"""Provide a class for a reading order navigation index.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from mdnvlib.novx_globals import CHAPTER_PREFIX
+from mdnvlib.novx_globals import CH_ROOT
+from mdnvlib.novx_globals import CR_ROOT
+from mdnvlib.novx_globals import IT_ROOT
+from mdnvlib.novx_globals import LC_ROOT
+from mdnvlib.novx_globals import PLOT_LINE_PREFIX
+from mdnvlib.novx_globals import PL_ROOT
+from mdnvlib.novx_globals import PN_ROOT
+from mdnvlib.novx_globals import SECTION_PREFIX
+
+
+class ReadingOrder:
+    """Index of the project tree elements in reading order.
+
+    Public methods:
+        get_next(novel, elemId) -- Return the ID of the next element of the same class.
+        get_prev(novel, elemId) -- Return the ID of the previous element of the same class.
+        invalidate() -- Discard the index.
+
+    The elements are grouped into classes:
+    - Chapters by level,
+    - normal and unused sections,
+    - stage sections by level,
+    - plot lines, plot points, characters, locations, items, and project notes.
+
+    The index is built on demand, so neighbour lookups are O(1)
+    until the tree structure or an element type changes.
+    Lookups of elements whose class has changed since the index was built
+    cause a rebuild, even if the owner has missed to invalidate the index.
+    """
+    _ROOTS = (CH_ROOT, CR_ROOT, LC_ROOT, IT_ROOT, PL_ROOT, PN_ROOT)
+
+    def __init__(self):
+        self._order = None
+        # key: element class; value: list of element IDs
+        self._positions = None
+        # key: element ID; value: tuple (element class, list index)
+
+    def get_next(self, novel, elemId):
+        """Return the ID of the next element of the same class, or None.
+
+        Positional arguments:
+            novel: Novel -- The project with the tree to navigate.
+            elemId: str -- ID of the reference element.
+        """
+        return self._get_neighbour(novel, elemId, 1)
+
+    def get_prev(self, novel, elemId):
+        """Return the ID of the previous element of the same class, or None.
+
+        Positional arguments:
+            novel: Novel -- The project with the tree to navigate.
+            elemId: str -- ID of the reference element.
+        """
+        return self._get_neighbour(novel, elemId, -1)
+
+    def invalidate(self):
+        """Discard the index, so that it will be rebuilt with the next lookup."""
+        self._order = None
+        self._positions = None
+
+    def _build(self, novel):
+        """Walk the tree and create the index."""
+
+        def index_branch(parent):
+            for elemId in novel.tree.get_children(parent):
+                elemClass = self._get_class(novel, elemId)
+                if not elemClass in self._order:
+                    self._order[elemClass] = []
+                self._positions[elemId] = (elemClass, len(self._order[elemClass]))
+                self._order[elemClass].append(elemId)
+                if elemId.startswith(CHAPTER_PREFIX) or elemId.startswith(PLOT_LINE_PREFIX):
+                    index_branch(elemId)
+
+        self._order = {}
+        self._positions = {}
+        for root in self._ROOTS:
+            index_branch(root)
+
+    def _get_class(self, novel, elemId):
+        """Return a hashable key for the navigation class of the element."""
+        try:
+            if elemId.startswith(CHAPTER_PREFIX):
+                return (CHAPTER_PREFIX, novel.chapters[elemId].chLevel)
+
+            if elemId.startswith(SECTION_PREFIX):
+                scType = novel.sections[elemId].scType
+                if scType is not None and scType > 1:
+                    return (SECTION_PREFIX, scType)
+
+                return (SECTION_PREFIX, 0)
+
+        except KeyError:
+            return None
+
+        return elemId[:2]
+
+    def _get_neighbour(self, novel, elemId, step):
+        """Return the ID of the element step positions away from elemId, or None."""
+        if self._order is None:
+            self._build(novel)
+        neighbour, isConsistent = self._look_up(novel, elemId, step)
+        if not isConsistent:
+            self._build(novel)
+            neighbour, __ = self._look_up(novel, elemId, step)
+        return neighbour
+
+    def _look_up(self, novel, elemId, step):
+        """Return a tuple: (neighbour ID or None, False if the index is outdated)."""
+        elemClass = self._get_class(novel, elemId)
+        position = self._positions.get(elemId, None)
+        if position is None or position[0] != elemClass:
+            return None, False
+
+        i = position[1] + step
+        if i < 0 or i >= len(self._order[elemClass]):
+            return None, True
+
+        neighbour = self._order[elemClass][i]
+        if self._get_class(novel, neighbour) != elemClass:
+            return None, False
+
+        return neighbour, True
@@ -0,0 +1,279 @@
+"""Provide a class for finding repeated phrases and duplicate passages.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha1
+import os
+import re
+from zlib import crc32
+
+from mdnvlib.novx_globals import CH_ROOT
+
+WORD = re.compile(r"\w+(?:['’]\w+)*")
+HASH_BASE = 1000003
+HASH_MODULUS = (1 << 61) - 1
+
+
+def get_fingerprint(text, phraseLength):
+    """Return the n-gram hashes of a text.
+
+    Positional arguments:
+        text: str -- Section content.
+        phraseLength: int -- Number of words per n-gram.
+
+    Return a tuple of three arrays:
+    - starts: start offset of each word,
+    - ends: end offset of each word,
+    - hashes: rolling hash of the n-gram beginning at each word.
+    The word hashes are stable across processes, so the function
+    can run in a process pool.
+    """
+    starts = array('l')
+    ends = array('l')
+    hashes = array('q')
+    wordHashes = []
+    for match in WORD.finditer(text):
+        starts.append(match.start())
+        ends.append(match.end())
+        wordHashes.append(crc32(match.group().lower().encode('utf-8')))
+    if len(wordHashes) < phraseLength:
+        return starts, ends, hashes
+
+    highestPower = pow(HASH_BASE, phraseLength - 1, HASH_MODULUS)
+    ngramHash = 0
+    for wordHash in wordHashes[:phraseLength]:
+        ngramHash = (ngramHash * HASH_BASE + wordHash) % HASH_MODULUS
+    hashes.append(ngramHash)
+    for i in range(phraseLength, len(wordHashes)):
+        ngramHash = ((ngramHash - wordHashes[i - phraseLength] * highestPower) * HASH_BASE + wordHashes[i]) % HASH_MODULUS
+        hashes.append(ngramHash)
+    return starts, ends, hashes
+
+
+def get_fingerprints(texts, phraseLength):
+    """Return a list with the fingerprints of several texts (see get_fingerprint)."""
+    return [get_fingerprint(text, phraseLength) for text in texts]
+
+
+class RepetitionFinder:
+    """Repetition analysis across the section contents of a novel.
+
+    Public methods:
+        find_duplicates(threshold) -- Return pairs of sections with similar passages.
+        find_echoes(distance) -- Return phrases repeated within a distance.
+        update(novel, workers) -- Fingerprint the changed sections.
+
+    Each section's text is fingerprinted with rolling hashes of its word n-grams.
+    The fingerprints are cached by the hash of the section content,
+    so after an edit only the changed section is hashed again.
+    Hits refer to section IDs and character offsets in the section content.
+    Words are compared case-insensitively.
+    """
+    POOL_MIN_SECTIONS = 200
+    # Number of sections to fingerprint from which a process pool is used.
+
+    DUPLICATE_SAMPLING = 4
+    # Only n-gram hashes divisible by this number are used for duplicate detection.
+
+    DUPLICATE_MAX_SECTIONS = 20
+    # N-grams occurring in more sections are considered common phrases.
+
+    DUPLICATE_MIN_PHRASES = 5
+    # Sections with fewer sampled n-grams are too short to be compared.
+
+    def __init__(self, phraseLength=5):
+        """Initialize instance variables.
+
+        Optional arguments:
+            phraseLength: int -- Number of words of a phrase.
+        """
+        self.phraseLength = phraseLength
+        self._novel = None
+        self._scIds = []
+        # IDs of the sections analyzed for echoes, in reading order
+        self._fingerprints = {}
+        # key: section ID; value: fingerprint tuple (see get_fingerprint)
+        self._cache = {}
+        # key: content hash; value: fingerprint tuple
+
+    def find_duplicates(self, threshold=0.5):
+        """Return pairs of sections with similar passages.
+
+        Optional arguments:
+            threshold: float -- Minimum share of the shorter section's
+                                sampled phrases found in the other section.
+
+        Return a list of tuples (section ID, section ID, similarity),
+        most similar first. All sections are compared, including
+        unused sections and sections in unused chapters.
+        """
+        sampledPhrases = {}
+        # key: section ID; value: set of sampled n-gram hashes
+        sectionsPerPhrase = {}
+        # key: n-gram hash; value: list of section IDs
+        for scId, (__, __, hashes) in self._fingerprints.items():
+            phrases = {ngramHash for ngramHash in hashes if ngramHash % self.DUPLICATE_SAMPLING == 0}
+            if len(phrases) < self.DUPLICATE_MIN_PHRASES:
+                continue
+
+            sampledPhrases[scId] = phrases
+            for ngramHash in phrases:
+                sectionsPerPhrase.setdefault(ngramHash, []).append(scId)
+        sharedPhrases = {}
+        # key: tuple of two section IDs; value: number of common sampled n-grams
+        for scIds in sectionsPerPhrase.values():
+            if len(scIds) < 2 or len(scIds) > self.DUPLICATE_MAX_SECTIONS:
+                continue
+
+            for i, scId1 in enumerate(scIds):
+                for scId2 in scIds[i + 1:]:
+                    pair = (scId1, scId2)
+                    sharedPhrases[pair] = sharedPhrases.get(pair, 0) + 1
+        duplicates = []
+        for (scId1, scId2), count in sharedPhrases.items():
+            similarity = count / min(len(sampledPhrases[scId1]), len(sampledPhrases[scId2]))
+            if similarity >= threshold:
+                duplicates.append((scId1, scId2, similarity))
+        duplicates.sort(key=lambda duplicate: duplicate[2], reverse=True)
+        return duplicates
+
+    def find_echoes(self, distance=2000):
+        """Return phrases repeated within a distance.
+
+        Optional arguments:
+            distance: int -- Maximum number of words between the occurrences.
+
+        Return a list of tuples (phrase, first occurrence, repetition),
+        in reading order of the repetitions.
+        An occurrence is a tuple (section ID, start offset, end offset).
+        Overlapping phrases are merged, so a repeated passage is reported once.
+        Only "normal" sections in "normal" chapters are analyzed,
+        across section boundaries.
+        """
+        lastOccurrences = {}
+        # key: n-gram hash; value: tuple (word position in the book, section ID, word index)
+        echoes = []
+        openEchoes = {}
+        # key: tuple (first section ID, first word index, section ID, word index)
+        #      of the phrase that would extend the echo
+        # value: echo as a list [first section ID, first start word, first end word,
+        #                        section ID, start word, end word]
+        position = 0
+        for scId in self._scIds:
+            starts, ends, hashes = self._fingerprints[scId]
+            text = self._novel.sections[scId].sectionContent or ''
+            for i, ngramHash in enumerate(hashes):
+                occurrence = lastOccurrences.get(ngramHash, None)
+                lastOccurrences[ngramHash] = (position + i, scId, i)
+                if occurrence is None:
+                    continue
+
+                firstPosition, firstScId, firstIndex = occurrence
+                gap = position + i - firstPosition
+                if gap < self.phraseLength or gap > distance:
+                    continue
+
+                echo = openEchoes.pop((firstScId, firstIndex, scId, i), None)
+                if echo is not None:
+                    echo[2] = firstIndex + self.phraseLength - 1
+                    echo[5] = i + self.phraseLength - 1
+                else:
+                    if not self._is_same_phrase(firstScId, firstIndex, text, starts, ends, i):
+                        # hash collision
+                        continue
+
+                    echo = [firstScId, firstIndex, firstIndex + self.phraseLength - 1, scId, i, i + self.phraseLength - 1]
+                    echoes.append(echo)
+                openEchoes[(firstScId, firstIndex + 1, scId, i + 1)] = echo
+            position += len(starts)
+            openEchoes = {}
+
+        result = []
+        for firstScId, firstStart, firstEnd, scId, start, end in echoes:
+            firstStarts, firstEnds, __ = self._fingerprints[firstScId]
+            starts, ends, __ = self._fingerprints[scId]
+            text = self._novel.sections[scId].sectionContent
+            result.append((
+                text[starts[start]:ends[end]],
+                (firstScId, firstStarts[firstStart], firstEnds[firstEnd]),
+                (scId, starts[start], ends[end]),
+            ))
+        return result
+
+    def update(self, novel, workers=1):
+        """Fingerprint the changed sections.
+
+        Positional arguments:
+            novel: Novel -- The project data.
+
+        Optional arguments:
+            workers: int -- Number of worker processes. None means number of CPUs.
+              A process pool is used only if many sections need fingerprinting.
+        """
+        self._novel = novel
+        self._scIds = []
+        for chId in novel.tree.get_children(CH_ROOT):
+            if novel.chapters[chId].chType != 0:
+                continue
+
+            for scId in novel.tree.get_children(chId):
+                if novel.sections[scId].scType == 0:
+                    self._scIds.append(scId)
+
+        textHashes = {}
+        missing = {}
+        # key: content hash; value: text
+        for scId, section in novel.sections.items():
+            text = section.sectionContent or ''
+            textHash = sha1(text.encode('utf-8')).hexdigest()
+            textHashes[scId] = textHash
+            if not textHash in self._cache:
+                missing[textHash] = text
+        if missing:
+            self._cache.update(self._get_fingerprints(missing, workers))
+
+        # Keep only the cache entries of the current contents.
+        self._cache = {textHash: self._cache[textHash] for textHash in textHashes.values()}
+        self._fingerprints = {scId: self._cache[textHash] for scId, textHash in textHashes.items()}
+
+    def _get_fingerprints(self, texts, workers):
+        """Return a dictionary with the fingerprints of the texts.
+
+        Positional arguments:
+            texts: dict -- key: content hash; value: text.
+            workers: int -- Number of worker processes, or None.
+        """
+        textHashes = list(texts)
+        if workers == 1 or len(texts) < self.POOL_MIN_SECTIONS:
+            fingerprints = get_fingerprints(texts.values(), self.phraseLength)
+            return dict(zip(textHashes, fingerprints))
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        chunkSize = max(1, len(textHashes) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = [textHashes[i:i + chunkSize] for i in range(0, len(textHashes), chunkSize)]
+            futures = [
+                executor.submit(get_fingerprints, [texts[textHash] for textHash in chunk], self.phraseLength)
+                for chunk in chunks
+            ]
+            fingerprints = {}
+            for chunk, future in zip(chunks, futures):
+                fingerprints.update(zip(chunk, future.result()))
+        return fingerprints
+
+    def _is_same_phrase(self, firstScId, firstIndex, text, starts, ends, index):
+        """Return True if the words of two n-grams are equal."""
+        firstStarts, firstEnds, __ = self._fingerprints[firstScId]
+        firstText = self._novel.sections[firstScId].sectionContent
+        for i in range(self.phraseLength):
+            firstWord = firstText[firstStarts[firstIndex + i]:firstEnds[firstIndex + i]]
+            word = text[starts[index + i]:ends[index + i]]
+            if firstWord.lower() != word.lower():
+                return False
+
+        return True
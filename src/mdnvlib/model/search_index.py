@@ -0,0 +1,297 @@
+"""Provide a full-text search index class for mdnovel projects.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from bisect import bisect_left
+from hashlib import sha1
+import json
+import re
+from threading import Thread
+
+
+class SearchIndex:
+    """Inverted index over the text fields of the novel's elements.
+
+    Public methods:
+        invalidate() -- Mark the index as outdated.
+        read_cache(filePath) -- Read the index from a cache file.
+        search(query, maxHits) -- Return a list of hits.
+        start_build(novel, cachePath) -- Build the index in a background thread.
+        update(novel) -- Re-index the changed text fields.
+        write_cache(filePath) -- Write the index to a cache file.
+
+    Public instance variables:
+        isOutdated: bool -- True if the novel may have changed since the last update.
+
+    A hit is a tuple (element ID, field name, start offset, end offset).
+    A query is a sequence of words that must occur as a phrase.
+    A word ending with "*" matches all words beginning with it.
+    The search is case-insensitive.
+    """
+    FIELDS = {
+        'chapters': ('title', 'desc', 'notes'),
+        'sections': ('title', 'desc', 'notes', 'goal', 'conflict', 'outcome', 'sectionContent'),
+        'characters': ('title', 'desc', 'notes', 'aka', 'fullName', 'bio', 'goals'),
+        'locations': ('title', 'desc', 'notes', 'aka'),
+        'items': ('title', 'desc', 'notes', 'aka'),
+        'plotLines': ('title', 'desc', 'notes'),
+        'plotPoints': ('title', 'desc', 'notes'),
+        'projectNotes': ('title', 'desc'),
+    }
+    # key: Novel attribute name, value: indexed element properties
+
+    CACHE_VERSION = 1
+    _WORD = re.compile(r'\w+')
+    _QUERY_WORD = re.compile(r'(\w+)(\*?)')
+
+    def __init__(self):
+        """Initialize instance variables."""
+        self.isOutdated = False
+        self._docs = {}
+        # key: (element ID, field name)
+        # value: [indexed text, text hash, list of word offsets, set of words]
+        self._postings = {}
+        # key: word (lower case)
+        # value: dict (key: (element ID, field name), value: list of word positions)
+        self._words = None
+        # sorted list of the indexed words, created on demand for prefix queries
+        self._thread = None
+
+    def invalidate(self):
+        """Mark the index as outdated.
+
+        This is meant as a callback for change notifications.
+        The changed fields are re-indexed with the next query.
+        """
+        self.isOutdated = True
+
+    def read_cache(self, filePath):
+        """Read the index from a cache file.
+
+        Positional arguments:
+            filePath: str -- Path of the cache file.
+
+        Return True on success, otherwise return False.
+        The cached entries are used only if their text hash
+        matches the text when the index is updated.
+        """
+        try:
+            with open(filePath, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('version') != self.CACHE_VERSION:
+                return False
+
+            docs = {}
+            postings = {}
+            for elemId, field, textHash, offsets, docPostings in cache['docs']:
+                key = (elemId, field)
+                docs[key] = [None, textHash, offsets, set(docPostings)]
+                for word in docPostings:
+                    postings.setdefault(word, {})[key] = docPostings[word]
+        except:
+            return False
+
+        self._docs = docs
+        self._postings = postings
+        self._words = None
+        return True
+
+    def search(self, query, maxHits=None):
+        """Return a list of hits for the query.
+
+        Positional arguments:
+            query: str -- One or more words, optionally ending with "*".
+
+        Optional arguments:
+            maxHits: int -- Maximum number of hits to return.
+        """
+        self._wait()
+        queryWords = self._QUERY_WORD.findall(query)
+        if not queryWords:
+            return []
+
+        # Get the postings for each word of the phrase.
+        wordPostings = []
+        for word, wildcard in queryWords:
+            word = word.lower()
+            if wildcard:
+                merged = {}
+                for match in self._get_prefix_matches(word):
+                    for key, positions in self._postings[match].items():
+                        merged.setdefault(key, []).extend(positions)
+                wordPostings.append(merged)
+            else:
+                wordPostings.append(self._postings.get(word, {}))
+
+        # Check only the fields containing all words, beginning with the rarest word.
+        candidates = min(wordPostings, key=len)
+        hits = []
+        for key in list(candidates):
+            if not all(key in postings for postings in wordPostings):
+                continue
+
+            positionSets = [set(postings[key]) for postings in wordPostings[1:]]
+            for position in sorted(wordPostings[0][key]):
+                for i, positions in enumerate(positionSets, 1):
+                    if not position + i in positions:
+                        break
+
+                else:
+                    hits.append(self._get_hit(key, position, len(wordPostings)))
+                    if maxHits and len(hits) >= maxHits:
+                        return hits
+
+        return hits
+
+    def start_build(self, novel, cachePath=None):
+        """Build the index in a background thread.
+
+        Positional arguments:
+            novel: Novel -- The novel to index.
+
+        Optional arguments:
+            cachePath: str -- Path of a cache file to read, if any.
+
+        The texts are collected before the thread starts,
+        so the thread does not access the model.
+        """
+        self._wait()
+        texts = list(self._get_texts(novel))
+        self._thread = Thread(target=self._build, args=(texts, cachePath), daemon=True)
+        self._thread.start()
+
+    def update(self, novel):
+        """Re-index the changed text fields.
+
+        Positional arguments:
+            novel: Novel -- The indexed novel.
+
+        A field is considered changed, if its text object
+        differs from the one that was indexed.
+        """
+        self._wait()
+        self._update(list(self._get_texts(novel)))
+        self.isOutdated = False
+
+    def write_cache(self, filePath):
+        """Write the index to a cache file.
+
+        Positional arguments:
+            filePath: str -- Path of the cache file.
+
+        Return True on success, otherwise return False.
+        """
+        self._wait()
+        docs = []
+        for key, doc in self._docs.items():
+            __, textHash, offsets, words = doc
+            docPostings = {}
+            for word in words:
+                docPostings[word] = self._postings[word][key]
+            docs.append([key[0], key[1], textHash, offsets, docPostings])
+        try:
+            with open(filePath, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.CACHE_VERSION, 'docs': docs}, f, ensure_ascii=False, separators=(',', ':'))
+        except:
+            return False
+
+        return True
+
+    def _add_doc(self, key, text, textHash):
+        offsets = []
+        words = set()
+        for i, match in enumerate(self._WORD.finditer(text)):
+            word = match.group().lower()
+            offsets.append(match.start())
+            words.add(word)
+            docPostings = self._postings.get(word)
+            if docPostings is None:
+                docPostings = self._postings[word] = {}
+                self._words = None
+            positions = docPostings.get(key)
+            if positions is None:
+                docPostings[key] = [i]
+            else:
+                positions.append(i)
+        self._docs[key] = [text, textHash, offsets, words]
+
+    def _build(self, texts, cachePath):
+        if cachePath:
+            self.read_cache(cachePath)
+        self._update(texts)
+
+    def _get_hash(self, text):
+        return sha1(text.encode('utf-8')).hexdigest()
+
+    def _get_hit(self, key, position, length):
+        text, __, offsets, __ = self._docs[key]
+        start = offsets[position]
+        lastStart = offsets[position + length - 1]
+        end = self._WORD.match(text, lastStart).end()
+        return key[0], key[1], start, end
+
+    def _get_prefix_matches(self, prefix):
+        if self._words is None:
+            self._words = sorted(self._postings)
+        i = bisect_left(self._words, prefix)
+        matches = []
+        while i < len(self._words) and self._words[i].startswith(prefix):
+            matches.append(self._words[i])
+            i += 1
+        return matches
+
+    def _get_texts(self, novel):
+        """Generate ((element ID, field name), text) tuples for all non-empty fields."""
+        for collectionName, fields in self.FIELDS.items():
+            collection = getattr(novel, collectionName)
+            for elemId in collection:
+                element = collection[elemId]
+                for field in fields:
+                    text = getattr(element, field, None)
+                    if text:
+                        yield (elemId, field), text
+
+    def _remove_doc(self, key):
+        __, __, __, words = self._docs.pop(key)
+        for word in words:
+            docPostings = self._postings[word]
+            del docPostings[key]
+            if not docPostings:
+                del self._postings[word]
+                self._words = None
+
+    def _update(self, texts):
+        """Synchronize the index with a list of ((element ID, field name), text) tuples."""
+        current = set()
+        for key, text in texts:
+            current.add(key)
+            doc = self._docs.get(key)
+            if doc is not None:
+                if doc[0] is text:
+                    continue
+
+                if doc[0] == text:
+                    doc[0] = text
+                    continue
+
+                textHash = self._get_hash(text)
+                if doc[0] is None and doc[1] == textHash:
+                    # Unchanged text read from the cache.
+                    doc[0] = text
+                    continue
+
+                self._remove_doc(key)
+            else:
+                textHash = self._get_hash(text)
+            self._add_doc(key, text, textHash)
+        for key in list(self._docs):
+            if not key in current:
+                self._remove_doc(key)
+
+    def _wait(self):
+        """Wait for the background build to finish."""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -13,6 +13,7 @@ import re
 from mdnvlib.model.basic_element_tags import BasicElementTags
 from mdnvlib.model.date_time_tools import get_specific_date
 from mdnvlib.model.date_time_tools import get_unspecific_date
+from mdnvlib.model.piece_table import PieceTable
 from mdnvlib.novx_globals import _
 
 # Regular expressions for counting words and characters like in LibreOffice.
@@ -24,6 +25,16 @@ NO_WORD_LIMITS = re.compile(r'\<note\>.*?\<\/note\>|\<comment\>.*?\<\/comment\>|
 # this is to be replaced by empty strings when counting words
 
 
+def count_words(text):
+    """Return the number of words in text, counted like in LibreOffice."""
+    if not text:
+        return 0
+
+    text = ADDITIONAL_WORD_LIMITS.sub(' ', text)
+    text = NO_WORD_LIMITS.sub('', text)
+    return len(text.split())
+
+
 class Section(BasicElementTags):
     """mdnovel section representation."""
 
@@ -62,12 +73,21 @@ class Section(BasicElementTags):
         characters=None,
         locations=None,
         items=None,
+        sectionContent=None,
+        wordCount=None,
         **kwargs
     ):
-        """Extends the superclass constructor."""
+        """Extends the superclass constructor.
+        
+        If sectionContent is given without wordCount, the words are counted.
+        """
         super().__init__(**kwargs)
-        self._sectionContent = None
-        self.wordCount = 0
+        self._sectionContent = sectionContent
+        self._contentBuffer = None
+        # PieceTable holding the content while it is edited in place
+        if wordCount is None:
+            wordCount = count_words(sectionContent)
+        self.wordCount = wordCount
         # To be updated by the sectionContent setter
 
         # Initialize properties.
@@ -106,6 +126,9 @@ class Section(BasicElementTags):
 
     @property
     def sectionContent(self):
+        if self._contentBuffer is not None:
+            return self._contentBuffer.get_text()
+
         return self._sectionContent
 
     @sectionContent.setter
@@ -113,16 +136,20 @@ class Section(BasicElementTags):
         """Set sectionContent updating word count and letter count."""
         if text is not None:
             assert type(text) == str
-        if self._sectionContent != text:
+        if self.sectionContent != text:
             self._sectionContent = text
-            if text is not None:
-                text = ADDITIONAL_WORD_LIMITS.sub(' ', text)
-                text = NO_WORD_LIMITS.sub('', text)
-                self.wordCount = len(text.split())
-            else:
-                self.wordCount = 0
+            self._contentBuffer = None
+            self.wordCount = count_words(text)
             self.on_element_change()
 
+    @property
+    def contentBuffer(self):
+        """Return the section content as a PieceTable, for editing in place."""
+        if self._contentBuffer is None:
+            self._contentBuffer = PieceTable(self._sectionContent or '')
+            self._sectionContent = None
+        return self._contentBuffer
+
     @property
     def scType(self):
         # 0 = Normal
@@ -449,6 +476,25 @@ class Section(BasicElementTags):
             self._day = None
             return False
 
+    def edit_content(self, start, end, text):
+        """Replace a range of the section content.
+        
+        Positional arguments:
+            start: int -- Offset of the first character to replace.
+            end: int -- Offset after the last character to replace.
+            text: str -- The replacement.
+        
+        Only the words of the lines touched are counted again.
+        """
+        contentBuffer = self.contentBuffer
+        lineStart, lineEnd = contentBuffer.get_line_range(start, end)
+        wordsBefore = count_words(contentBuffer.get_text(lineStart, lineEnd))
+        contentBuffer.replace(start, end, text)
+        __, lineEnd = contentBuffer.get_line_range(start, start + len(text))
+        wordsAfter = count_words(contentBuffer.get_text(lineStart, lineEnd))
+        self.wordCount += wordsAfter - wordsBefore
+        self.on_element_change()
+
     def get_end_date_time(self):
         """Return the end (date, time, day) tuple calculated from start and duration."""
         endDate = None
@@ -489,3 +535,59 @@ class Section(BasicElementTags):
                     pass
         return endDate, endTime, endDay
 
+    def join_content(self, section):
+        """Append the content of another section, and strip the result.
+        
+        Positional arguments:
+            section: Section -- The section whose content is appended; it is not changed.
+        
+        The pieces of the other section's content are shared, not copied. 
+        Only the words of the joined lines are counted again.
+        """
+        contentBuffer = self.contentBuffer
+        otherBuffer = section.contentBuffer
+        junction = len(contentBuffer)
+        lineStart, __ = contentBuffer.get_line_range(junction, junction)
+        __, otherLineEnd = otherBuffer.get_line_range(0, 0)
+        wordsBefore = count_words(contentBuffer.get_text(lineStart, junction)) + count_words(otherBuffer.get_text(0, otherLineEnd))
+        contentBuffer.extend(otherBuffer)
+        __, lineEnd = contentBuffer.get_line_range(junction, junction)
+        wordsAfter = count_words(contentBuffer.get_text(lineStart, lineEnd))
+        contentBuffer.strip()
+        self.wordCount += section.wordCount + wordsAfter - wordsBefore
+        self.on_element_change()
+
+    def split_content(self, offset, section):
+        """Move the section content from an offset to the end to another section.
+        
+        Positional arguments:
+            offset: int -- Offset of the first character to move.
+            section: Section -- The section receiving the content.
+        
+        The content moved is stripped of spaces and newlines. 
+        The content kept is stripped, and ends with a newline, if not empty.
+        The pieces of the content are moved, not copied. 
+        Only the shorter part's words are counted.
+        """
+        contentBuffer = self.contentBuffer
+        lineStart, lineEnd = contentBuffer.get_line_range(offset, offset)
+        wordsBefore = count_words(contentBuffer.get_text(lineStart, lineEnd))
+        otherBuffer = contentBuffer.split(offset)
+        __, otherLineEnd = otherBuffer.get_line_range(0, 0)
+        wordsAfter = count_words(contentBuffer.get_text(lineStart)) + count_words(otherBuffer.get_text(0, otherLineEnd))
+        contentBuffer.strip()
+        if len(contentBuffer):
+            contentBuffer.insert(len(contentBuffer), '\n')
+        otherBuffer.strip(' \n')
+        wordCount = self.wordCount - wordsBefore + wordsAfter
+        if len(otherBuffer) < len(contentBuffer):
+            otherWordCount = count_words(otherBuffer.get_text())
+            self.wordCount = wordCount - otherWordCount
+        else:
+            self.wordCount = count_words(contentBuffer.get_text())
+            otherWordCount = wordCount - self.wordCount
+        self.on_element_change()
+        section.sectionContent = None
+        section._contentBuffer = otherBuffer
+        section.wordCount = otherWordCount
+        section.on_element_change()
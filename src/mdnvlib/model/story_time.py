@@ -0,0 +1,313 @@
+"""Provide a class for an index of the sections' story time.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from array import array
+from bisect import bisect_left
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from heapq import heappop
+from heapq import heappush
+
+from mdnvlib.model.section import Section
+from mdnvlib.novx_globals import CH_ROOT
+
+SECONDS_PER_DAY = 86400
+MAX_SECONDS = (datetime.max - datetime.min).days * SECONDS_PER_DAY + SECONDS_PER_DAY - 1
+# Latest point in time that can be converted to a datetime.
+
+
+class StoryTime:
+    """Index of the sections' absolute start and end in story time.
+
+    Public methods:
+        get_chronological_order() -- Return the IDs of the sections in story-time order.
+        get_end(scId) -- Return the end of a section.
+        get_gaps(minGap) -- Return the periods between sections not covered by any section.
+        get_overlaps() -- Return the pairs of sections that overlap in story time.
+        get_sections_between(start, end) -- Return the IDs of the sections within a period.
+        get_span(scId) -- Return the start and end of a section.
+        get_start(scId) -- Return the start of a section.
+        invalidate() -- Discard the index.
+        update() -- Resolve the sections changed since the last update.
+
+    A section with a date starts at its date and time.
+    A section with a day starts at its time on the reference date plus the day;
+    without a reference date, today is the reference, like in the Timeline export.
+    Sections with neither date nor day, and "BC" sections, are not resolved.
+
+    The date/time strings are parsed once per section.
+    The per-section lookups check only the section concerned for changes.
+    The queries over all sections check all sections, resolve the changed ones,
+    and sort again only if a start or the reading order has changed.
+    Only normal sections in normal chapters take part in these queries;
+    sections starting at the same time are in reading order.
+    """
+
+    def __init__(self, novel):
+        """Initialize instance variables.
+
+        Positional arguments:
+            novel: Novel -- The project data indexed.
+        """
+        self._novel = novel
+        self._keys = {}
+        # key: section ID; value: tuple of the date/time strings resolved
+        self._spans = {}
+        # key: section ID; value: tuple (start, end) in seconds since 0001-01-01, or None
+        self._readingOrder = []
+        # IDs of the sections taking part in the queries
+        self._order = []
+        # IDs of the resolved sections in chronological order
+        self._starts = array('q')
+        self._ends = array('q')
+        # start and end in seconds of the sections in chronological order
+        self._maxEnds = array('q')
+        # running maximum of the ends, for range lookups
+        self._isSorted = False
+
+    def get_chronological_order(self):
+        """Return a list with the IDs of the resolved sections in story-time order."""
+        self.update()
+        return self._order[:]
+
+    def get_end(self, scId):
+        """Return the end of a section as a datetime, or None if not resolved.
+
+        Positional arguments:
+            scId: str -- Section ID.
+        """
+        span = self.get_span(scId)
+        if span is None:
+            return None
+
+        return span[1]
+
+    def get_gaps(self, minGap=None):
+        """Return the periods between sections that are not covered by any section.
+
+        Optional arguments:
+            minGap: timedelta -- Minimum duration of a gap. Default: any gap.
+
+        Return a list of tuples (ID of the section ending last before the gap,
+        ID of the section after the gap, duration of the gap as timedelta),
+        in chronological order.
+        """
+        self.update()
+        if minGap is None:
+            minSeconds = 1
+        else:
+            minSeconds = max(1, int(minGap.total_seconds()))
+        gaps = []
+        lastIndex = None
+        for i in range(len(self._order)):
+            if lastIndex is not None:
+                gapSeconds = self._starts[i] - self._ends[lastIndex]
+                if gapSeconds >= minSeconds:
+                    gaps.append((self._order[lastIndex], self._order[i], timedelta(seconds=gapSeconds)))
+            if lastIndex is None or self._ends[i] > self._ends[lastIndex]:
+                lastIndex = i
+        return gaps
+
+    def get_overlaps(self):
+        """Return the pairs of sections that overlap in story time.
+
+        Return a list of tuples (ID of the section starting first, ID of the other section),
+        in chronological order of the later start.
+        Sections starting at the same moment overlap, even if they have no duration.
+        A section ending when another starts does not overlap with it.
+        """
+        self.update()
+        overlaps = []
+        active = []
+        # heap of (end, chronological index) of the sections not yet ended
+        moment = []
+        # chronological indexes of the sections without duration starting at the current moment
+        for i, scId in enumerate(self._order):
+            start = self._starts[i]
+            if i and start != self._starts[i - 1]:
+                moment = []
+            while active and active[0][0] <= start:
+                heappop(active)
+            partners = [j for __, j in active]
+            partners.extend(moment)
+            for j in sorted(partners):
+                overlaps.append((self._order[j], scId))
+            if self._ends[i] > start:
+                heappush(active, (self._ends[i], i))
+            else:
+                moment.append(i)
+        return overlaps
+
+    def get_sections_between(self, start, end):
+        """Return the IDs of the sections taking place within a period, in chronological order.
+
+        Positional arguments:
+            start: datetime -- Beginning of the period.
+            end: datetime -- End of the period.
+
+        The end of the period is excluded.
+        Sections that begin before the period or end after it are included
+        if they overlap with it.
+        """
+        self.update()
+        startSeconds = self._get_seconds(start)
+        endSeconds = self._get_seconds(end)
+        first = bisect_left(self._maxEnds, startSeconds)
+        last = bisect_left(self._starts, endSeconds)
+        scIds = []
+        for i in range(first, last):
+            if self._ends[i] > startSeconds or self._starts[i] >= startSeconds:
+                scIds.append(self._order[i])
+        return scIds
+
+    def get_span(self, scId):
+        """Return a tuple (start, end) of datetimes, or None if the section is not resolved.
+
+        Positional arguments:
+            scId: str -- Section ID.
+        """
+        section = self._novel.sections[scId]
+        key = self._get_key(section, self._get_reference())
+        if self._keys.get(scId, None) != key:
+            self._resolve(scId, key)
+        span = self._spans[scId]
+        if span is None:
+            return None
+
+        return self._get_datetime(span[0]), self._get_datetime(span[1])
+
+    def get_start(self, scId):
+        """Return the start of a section as a datetime, or None if not resolved.
+
+        Positional arguments:
+            scId: str -- Section ID.
+        """
+        span = self.get_span(scId)
+        if span is None:
+            return None
+
+        return span[0]
+
+    def invalidate(self):
+        """Discard the index, so that all sections are resolved again with the next query."""
+        self._keys = {}
+        self._spans = {}
+        self._isSorted = False
+
+    def update(self):
+        """Resolve the sections changed since the last update, and sort them, if necessary."""
+        novel = self._novel
+        readingOrder = []
+        for chId in novel.tree.get_children(CH_ROOT):
+            if novel.chapters[chId].chType != 0:
+                continue
+
+            for scId in novel.tree.get_children(chId):
+                if novel.sections[scId].scType == 0:
+                    readingOrder.append(scId)
+        if readingOrder != self._readingOrder:
+            self._readingOrder = readingOrder
+            self._isSorted = False
+
+        reference = self._get_reference()
+        for scId, section in novel.sections.items():
+            key = self._get_key(section, reference)
+            if self._keys.get(scId, None) != key:
+                self._resolve(scId, key)
+        for scId in self._keys.keys() - novel.sections.keys():
+            del self._keys[scId]
+            del self._spans[scId]
+        if self._isSorted:
+            return
+
+        spans = self._spans
+        self._order = [scId for scId in self._readingOrder if spans[scId] is not None]
+        self._order.sort(key=lambda scId: spans[scId][0])
+        self._starts = array('q', [spans[scId][0] for scId in self._order])
+        self._ends = array('q', [spans[scId][1] for scId in self._order])
+        self._maxEnds = array('q')
+        maxEnd = 0
+        for end in self._ends:
+            if end > maxEnd:
+                maxEnd = end
+            self._maxEnds.append(maxEnd)
+        self._isSorted = True
+
+    def _get_datetime(self, seconds):
+        """Return a datetime from seconds since 0001-01-01."""
+        return datetime.min + timedelta(seconds=seconds)
+
+    def _get_key(self, section, reference):
+        """Return a tuple of the section's date/time strings.
+
+        The reference date is included only for sections with a day,
+        so that changing it does not resolve the dated sections again.
+        """
+        if section.date is None and section.day is not None:
+            dayReference = reference
+        else:
+            dayReference = None
+        return (
+            section.date,
+            section.time,
+            section.day,
+            section.lastsDays,
+            section.lastsHours,
+            section.lastsMinutes,
+            dayReference,
+        )
+
+    def _get_reference(self):
+        """Return the ISO formatted date that the sections' days refer to."""
+        if self._novel.referenceDate:
+            return self._novel.referenceDate
+
+        return date.today().isoformat()
+
+    def _get_seconds(self, dateTime):
+        """Return the seconds since 0001-01-01 of a datetime."""
+        return (dateTime.toordinal() - 1) * SECONDS_PER_DAY + dateTime.hour * 3600 + dateTime.minute * 60 + dateTime.second
+
+    def _resolve(self, scId, key):
+        """Calculate the span of a section, and store it with its key."""
+        scDate, scTime, scDay, lastsDays, lastsHours, lastsMinutes, reference = key
+        self._keys[scId] = key
+        self._spans[scId] = None
+        self._isSorted = False
+        try:
+            if scDate is not None:
+                if scDate == Section.NULL_DATE:
+                    return
+
+                ordinal = date.fromisoformat(scDate).toordinal()
+            elif scDay is not None:
+                ordinal = date.fromisoformat(reference).toordinal() + int(scDay)
+                if ordinal < 1:
+                    return
+
+            else:
+                return
+
+            start = (ordinal - 1) * SECONDS_PER_DAY
+            if scTime:
+                hours, minutes, seconds = scTime.split(':')
+                start += int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+            duration = 0
+            if lastsDays:
+                duration += int(lastsDays) * SECONDS_PER_DAY
+            if lastsHours:
+                duration += int(lastsHours) * 3600
+            if lastsMinutes:
+                duration += int(lastsMinutes) * 60
+        except ValueError:
+            return
+
+        if start > MAX_SECONDS:
+            return
+
+        end = min(start + max(duration, 0), MAX_SECONDS)
+        self._spans[scId] = (start, end)
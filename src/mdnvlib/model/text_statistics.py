@@ -0,0 +1,281 @@
+"""Provide a class for text statistics of a manuscript.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from array import array
+from bisect import bisect_left
+from hashlib import sha1
+from itertools import compress
+import re
+
+from mdnvlib.model.section import count_words
+from mdnvlib.novx_globals import CH_ROOT
+
+
+class TextStatistics:
+    """Statistics computed across the section contents of a novel.
+
+    Public methods:
+        get_section_statistics(scId) -- Return the statistics of a single section.
+        get_sections(chId, viewpoint, status) -- Return the IDs of the selected sections.
+        get_statistics(chId, viewpoint, status) -- Return the statistics of the selected sections.
+        get_viewpoint_shares() -- Return the words per viewpoint character.
+        update(novel) -- Re-analyze the changed sections.
+
+    Public instance variables:
+        columns: dict -- key: metric name; value: array with a row per section.
+
+    Only "normal" sections in "normal" chapters are analyzed, in reading order.
+    Each section's counts are cached by the hash of its content,
+    so after an edit only the changed section is tokenized again.
+    The metrics are stored column-wise, and aggregated with array slices
+    and masks instead of looping over section objects.
+
+    Words are counted like the section word count.
+    Syllables and adverbs are counted with heuristics for English text:
+    vowel groups, and words ending with "ly".
+    """
+    SENTENCE_LENGTH_BINS = (5, 10, 15, 20, 30, 40)
+    # Upper limits of the sentence length classes in words; the last class is open.
+
+    COUNTS = (
+        'words',
+        'sentences',
+        'paragraphs',
+        'syllables',
+        'dialogueWords',
+        'adverbs',
+        )
+    HISTOGRAM = tuple(f'sentences{i}' for i in range(len(SENTENCE_LENGTH_BINS) + 1))
+    METRICS = COUNTS + HISTOGRAM
+
+    _WORD = re.compile(r'[^\W_]')
+    _SENTENCE_END = re.compile(r'[.!?…]+(?=[\s"”“»«’)*_]|$)')
+    _VOWEL_GROUP = re.compile(r'[aeiouyäöüàâéèêëîïôûù]+')
+    _SILENT_E = re.compile(r'[^\W\d_aeiouy]es?\b')
+    _ADVERB = re.compile(r'\Bly\b')
+    _DIALOGUE = re.compile(r'"[^"\n]*"|“[^”\n]*”|„[^“\n]*“|«[^»\n]*»|»[^«\n]*«')
+
+    def __init__(self):
+        """Initialize instance variables."""
+        self.columns = {metric: array('l') for metric in self.METRICS}
+        self._scIds = []
+        self._rows = {}
+        # key: section ID; value: row
+        self._texts = []
+        # The section content analyzed, for each row
+        self._hashes = []
+        # The hash of the section content, for each row
+        self._chapterRows = {}
+        # key: chapter ID; value: (first row, end row)
+        self._viewpoints = []
+        self._status = []
+        self._cache = {}
+        # key: content hash; value: tuple of counts in METRICS order
+
+    def get_section_statistics(self, scId):
+        """Return the statistics of a single section, or None if it is not analyzed.
+
+        Positional arguments:
+            scId: str -- Section ID.
+
+        See get_statistics() for the dictionary returned.
+        """
+        row = self._rows.get(scId, None)
+        if row is None:
+            return None
+
+        totals = {metric: self.columns[metric][row] for metric in self.METRICS}
+        return self._get_statistics(totals, 1)
+
+    def get_sections(self, chId=None, viewpoint=None, status=None):
+        """Return the IDs of the selected sections in reading order.
+
+        Optional arguments:
+            chId: str -- Chapter ID.
+            viewpoint: str -- Character ID of the viewpoint.
+            status: int -- Completion status.
+        """
+        start, end, mask = self._get_selection(chId, viewpoint, status)
+        scIds = self._scIds[start:end]
+        if mask is None:
+            return scIds
+
+        return list(compress(scIds, mask))
+
+    def get_statistics(self, chId=None, viewpoint=None, status=None):
+        """Return the statistics of the selected sections.
+
+        Optional arguments:
+            chId: str -- Chapter ID.
+            viewpoint: str -- Character ID of the viewpoint.
+            status: int -- Completion status.
+
+        Return a dictionary with the metric totals, the sentence length
+        distribution as a list of counts, and the derived values:
+            meanSentenceLength: float -- Words per sentence.
+            readingEase: float -- Flesch reading ease score.
+            gradeLevel: float -- Flesch-Kincaid grade level.
+            dialogueRatio: float -- Share of words in quotation marks.
+            adverbDensity: float -- Adverbs per 1000 words.
+        """
+        start, end, mask = self._get_selection(chId, viewpoint, status)
+        totals = {}
+        for metric in self.METRICS:
+            column = self.columns[metric][start:end]
+            if mask is None:
+                totals[metric] = sum(column)
+            else:
+                totals[metric] = sum(compress(column, mask))
+        if mask is None:
+            sections = end - start
+        else:
+            sections = sum(mask)
+        return self._get_statistics(totals, sections)
+
+    def get_viewpoint_shares(self):
+        """Return the words per viewpoint character.
+
+        Return a dictionary (key: character ID, or None for sections
+        without viewpoint; value: tuple (words, share of all words)).
+        """
+        wordsPerViewpoint = {}
+        for viewpoint, words in zip(self._viewpoints, self.columns['words']):
+            wordsPerViewpoint[viewpoint] = wordsPerViewpoint.get(viewpoint, 0) + words
+        wordsTotal = sum(self.columns['words'])
+        shares = {}
+        for viewpoint, words in wordsPerViewpoint.items():
+            if wordsTotal:
+                shares[viewpoint] = (words, words / wordsTotal)
+            else:
+                shares[viewpoint] = (words, 0.0)
+        return shares
+
+    def update(self, novel):
+        """Re-analyze the changed sections.
+
+        Positional arguments:
+            novel: Novel -- The project data.
+
+        Unchanged sections are recognized by their content,
+        so only new or edited sections are tokenized.
+        """
+        columns = {metric: array('l') for metric in self.METRICS}
+        scIds = []
+        texts = []
+        hashes = []
+        chapterRows = {}
+        viewpoints = []
+        status = []
+        for chId in novel.tree.get_children(CH_ROOT):
+            if novel.chapters[chId].chType != 0:
+                continue
+
+            firstRow = len(scIds)
+            for scId in novel.tree.get_children(chId):
+                section = novel.sections[scId]
+                if section.scType != 0:
+                    continue
+
+                text = section.sectionContent or ''
+                row = self._rows.get(scId, None)
+                if row is not None and self._texts[row] is text:
+                    textHash = self._hashes[row]
+                    counts = self._cache[textHash]
+                else:
+                    textHash = sha1(text.encode('utf-8')).hexdigest()
+                    counts = self._cache.get(textHash, None)
+                    if counts is None:
+                        counts = self._tokenize(text)
+                        self._cache[textHash] = counts
+                for metric, count in zip(self.METRICS, counts):
+                    columns[metric].append(count)
+                scIds.append(scId)
+                texts.append(text)
+                hashes.append(textHash)
+                if section.characters:
+                    viewpoints.append(section.characters[0])
+                else:
+                    viewpoints.append(None)
+                status.append(section.status)
+            chapterRows[chId] = (firstRow, len(scIds))
+
+        self.columns = columns
+        self._scIds = scIds
+        self._rows = {scId: i for i, scId in enumerate(scIds)}
+        self._texts = texts
+        self._hashes = hashes
+        self._chapterRows = chapterRows
+        self._viewpoints = viewpoints
+        self._status = status
+
+        # Keep only the cache entries of the current contents.
+        if len(self._cache) > len(hashes):
+            self._cache = {textHash: self._cache[textHash] for textHash in hashes}
+
+    def _get_selection(self, chId, viewpoint, status):
+        """Return a tuple (first row, end row, mask or None)."""
+        if chId is None:
+            start, end = 0, len(self._scIds)
+        else:
+            start, end = self._chapterRows.get(chId, (0, 0))
+        if viewpoint is None and status is None:
+            return start, end, None
+
+        mask = bytearray(end - start)
+        for i in range(start, end):
+            if viewpoint is not None and self._viewpoints[i] != viewpoint:
+                continue
+
+            if status is not None and self._status[i] != status:
+                continue
+
+            mask[i - start] = 1
+        return start, end, mask
+
+    def _get_statistics(self, totals, sections):
+        """Return a statistics dictionary with the derived values."""
+        statistics = {metric: totals[metric] for metric in self.COUNTS}
+        statistics['sections'] = sections
+        statistics['sentenceLengths'] = [totals[metric] for metric in self.HISTOGRAM]
+        words = totals['words']
+        sentences = totals['sentences']
+        if words and sentences:
+            wordsPerSentence = words / sentences
+            syllablesPerWord = totals['syllables'] / words
+            statistics['meanSentenceLength'] = wordsPerSentence
+            statistics['readingEase'] = 206.835 - 1.015 * wordsPerSentence - 84.6 * syllablesPerWord
+            statistics['gradeLevel'] = 0.39 * wordsPerSentence + 11.8 * syllablesPerWord - 15.59
+            statistics['dialogueRatio'] = totals['dialogueWords'] / words
+            statistics['adverbDensity'] = 1000 * totals['adverbs'] / words
+        else:
+            statistics['meanSentenceLength'] = 0.0
+            statistics['readingEase'] = 0.0
+            statistics['gradeLevel'] = 0.0
+            statistics['dialogueRatio'] = 0.0
+            statistics['adverbDensity'] = 0.0
+        return statistics
+
+    def _tokenize(self, text):
+        """Return a tuple of counts in METRICS order."""
+        words = count_words(text)
+        paragraphs = 0
+        for paragraph in text.split('\n'):
+            if self._WORD.search(paragraph):
+                paragraphs += 1
+        histogram = [0] * (len(self.SENTENCE_LENGTH_BINS) + 1)
+        sentences = 0
+        for sentence in self._SENTENCE_END.split(text):
+            sentenceLength = len(sentence.split())
+            if sentenceLength:
+                sentences += 1
+                histogram[bisect_left(self.SENTENCE_LENGTH_BINS, sentenceLength)] += 1
+        lowerText = text.lower()
+        syllables = max(len(self._VOWEL_GROUP.findall(lowerText)) - len(self._SILENT_E.findall(lowerText)), words)
+        dialogueWords = 0
+        for quote in self._DIALOGUE.findall(text):
+            dialogueWords += len(quote.split())
+        adverbs = len(self._ADVERB.findall(lowerText))
+        return (words, sentences, paragraphs, syllables, dialogueWords, adverbs, *histogram)
@@ -0,0 +1,269 @@
+"""Provide a time series class for the daily word count log.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from bisect import bisect_left
+from bisect import bisect_right
+from datetime import date
+from datetime import timedelta
+from math import ceil
+
+
+class WordCountLog:
+    """Chronologically sorted daily word count log.
+
+    The log can be used like a dictionary with ISO formatted dates as keys,
+    and [word count, with unused] lists as values.
+    The dates are kept in ascending order, so date ranges can be
+    looked up by binary search.
+
+    Public methods:
+        clear_modified() -- Mark all entries as processed.
+        copy() -- Return a copy of the log.
+        get_changes(start) -- Generate the entries with changed word count.
+        get_date(index) -- Return the date of the entry at index.
+        get_entries(first, last) -- Return a list of entries by index.
+        get_forecast(wordTarget, days) -- Return the estimated date of reaching the target.
+        get_index_range(startDate, endDate) -- Return the index range of a date range.
+        get_pace(days) -- Return the average number of words per day.
+        get_range(startDate, endDate) -- Return a list of entries within a date range.
+        items() -- Generate (ISO date, [word count, with unused]) tuples.
+        latest() -- Return the ISO date of the latest entry.
+        roll_up(period) -- Return a list of weekly or monthly entries.
+        update(wcLog) -- Add entries from a dictionary or another log.
+
+    Public instance variables:
+        firstModified: int -- Index of the first entry changed since the last clear_modified() call.
+
+    An entry is a tuple (date: datetime.date, word count: int, with unused: int).
+    """
+
+    def __init__(self, wcLog=None):
+        """Initialize instance variables.
+
+        Optional arguments:
+            wcLog -- dict (key: ISO date, value: [word count, with unused]).
+        """
+        self._days = []
+        # date ordinals, sorted in ascending order
+        self._counts = []
+        self._totalCounts = []
+        self.firstModified = 0
+        if wcLog:
+            self.update(wcLog)
+
+    def __bool__(self):
+        return bool(self._days)
+
+    def __contains__(self, isoDate):
+        day = date.fromisoformat(isoDate).toordinal()
+        i = bisect_left(self._days, day)
+        return i < len(self._days) and self._days[i] == day
+
+    def __getitem__(self, isoDate):
+        day = date.fromisoformat(isoDate).toordinal()
+        i = bisect_left(self._days, day)
+        if i == len(self._days) or self._days[i] != day:
+            raise KeyError(isoDate)
+
+        return [self._counts[i], self._totalCounts[i]]
+
+    def __iter__(self):
+        for day in self._days:
+            yield date.fromordinal(day).isoformat()
+
+    def __len__(self):
+        return len(self._days)
+
+    def __setitem__(self, isoDate, counts):
+        day = date.fromisoformat(isoDate).toordinal()
+        count = int(counts[0])
+        totalCount = int(counts[1])
+        if self._days and day > self._days[-1]:
+            # Appending is the common case.
+            i = len(self._days)
+        else:
+            i = bisect_left(self._days, day)
+        if i < len(self._days) and self._days[i] == day:
+            if self._counts[i] == count and self._totalCounts[i] == totalCount:
+                return
+
+            self._counts[i] = count
+            self._totalCounts[i] = totalCount
+        else:
+            self._days.insert(i, day)
+            self._counts.insert(i, count)
+            self._totalCounts.insert(i, totalCount)
+        self.firstModified = min(self.firstModified, i)
+
+    def clear_modified(self):
+        """Mark all entries as processed."""
+        self.firstModified = len(self._days)
+
+    def copy(self):
+        """Return a copy of the log."""
+        wcLog = WordCountLog()
+        wcLog._days = self._days[:]
+        wcLog._counts = self._counts[:]
+        wcLog._totalCounts = self._totalCounts[:]
+        return wcLog
+
+    def get_changes(self, start=0):
+        """Generate the entries whose word counts differ from the preceding ones.
+
+        Optional arguments:
+            start: int -- Index of the first entry to check.
+
+        Yield tuples (ISO date, word count, with unused).
+        """
+        for i in range(start, len(self._days)):
+            if (
+                i > 0
+                and self._counts[i] == self._counts[i - 1]
+                and self._totalCounts[i] == self._totalCounts[i - 1]
+            ):
+                continue
+
+            yield date.fromordinal(self._days[i]).isoformat(), self._counts[i], self._totalCounts[i]
+
+    def get_date(self, index):
+        """Return the date of the entry at index."""
+        return date.fromordinal(self._days[index])
+
+    def get_entries(self, first, last):
+        """Return a list of entries with indices from first to last (exclusive)."""
+        return [
+            (date.fromordinal(self._days[i]), self._counts[i], self._totalCounts[i])
+            for i in range(max(first, 0), min(last, len(self._days)))
+        ]
+
+    def get_forecast(self, wordTarget, days=30):
+        """Return the estimated date of reaching the word target.
+
+        Positional arguments:
+            wordTarget: int -- Number of words to reach.
+
+        Optional arguments:
+            days: int -- Number of days for calculating the pace.
+
+        Return a datetime.date instance, or None if the target
+        cannot be reached at the current pace.
+        """
+        if not self._days or not wordTarget:
+            return None
+
+        if self._counts[-1] >= wordTarget:
+            return date.fromordinal(self._days[-1])
+
+        pace = self.get_pace(days)
+        if not pace or pace <= 0:
+            return None
+
+        daysLeft = ceil((wordTarget - self._counts[-1]) / pace)
+        return date.fromordinal(self._days[-1]) + timedelta(days=daysLeft)
+
+    def get_index_range(self, startDate=None, endDate=None):
+        """Return a tuple (first, last) of entry indices within a date range.
+
+        Optional arguments:
+            startDate: datetime.date -- First day of the range.
+            endDate: datetime.date -- Last day of the range.
+
+        The last index is exclusive.
+        """
+        if startDate is None:
+            first = 0
+        else:
+            first = bisect_left(self._days, startDate.toordinal())
+        if endDate is None:
+            last = len(self._days)
+        else:
+            last = bisect_right(self._days, endDate.toordinal())
+        return first, max(first, last)
+
+    def get_pace(self, days=30):
+        """Return the average number of words per day.
+
+        Optional arguments:
+            days: int -- Number of days before the latest entry to consider.
+
+        Return a float, or None if there are not enough entries.
+        """
+        if len(self._days) < 2:
+            return None
+
+        i = bisect_right(self._days, self._days[-1] - days) - 1
+        if i < 0:
+            i = 0
+        elapsed = self._days[-1] - self._days[i]
+        if elapsed <= 0:
+            return None
+
+        return (self._counts[-1] - self._counts[i]) / elapsed
+
+    def get_range(self, startDate=None, endDate=None):
+        """Return a list of entries within a date range.
+
+        Optional arguments:
+            startDate: datetime.date -- First day of the range.
+            endDate: datetime.date -- Last day of the range.
+        """
+        return self.get_entries(*self.get_index_range(startDate, endDate))
+
+    def items(self):
+        """Generate (ISO date, [word count, with unused]) tuples."""
+        for i, day in enumerate(self._days):
+            yield date.fromordinal(day).isoformat(), [self._counts[i], self._totalCounts[i]]
+
+    def latest(self):
+        """Return the ISO date of the latest entry, or None if the log is empty."""
+        if not self._days:
+            return None
+
+        return date.fromordinal(self._days[-1]).isoformat()
+
+    def roll_up(self, period='week'):
+        """Return a list of the word counts at the end of each period.
+
+        Optional arguments:
+            period: str -- 'week' or 'month'.
+
+        Return a list of entries, with the first day of the period as date.
+        Periods without entries are omitted.
+        """
+        rollUp = []
+        if not self._days:
+            return rollUp
+
+        periodStart = date.fromordinal(self._days[0])
+        lastDay = date.fromordinal(self._days[-1])
+        if period == 'month':
+            periodStart = periodStart.replace(day=1)
+        else:
+            periodStart -= timedelta(days=periodStart.weekday())
+        lastIndex = -1
+        while periodStart <= lastDay:
+            if period == 'month':
+                if periodStart.month == 12:
+                    nextStart = periodStart.replace(year=periodStart.year + 1, month=1)
+                else:
+                    nextStart = periodStart.replace(month=periodStart.month + 1)
+            else:
+                nextStart = periodStart + timedelta(days=7)
+            i = bisect_left(self._days, nextStart.toordinal()) - 1
+            if i > lastIndex:
+                rollUp.append((periodStart, self._counts[i], self._totalCounts[i]))
+                lastIndex = i
+            periodStart = nextStart
+        return rollUp
+
+    def update(self, wcLog):
+        """Add entries from a dictionary or another log.
+
+        Positional arguments:
+            wcLog -- dict (key: ISO date, value: [word count, with unused]).
+        """
+        for isoDate in wcLog:
+            self[isoDate] = wcLog[isoDate]
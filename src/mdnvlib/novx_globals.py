@@ -49,6 +49,7 @@ PROJECTNOTES_SUFFIX = '_projectnote_report'
 SECTIONLIST_SUFFIX = '_sectionlist'
 SECTIONS_SUFFIX = '_sections'
 STAGES_SUFFIX = '_structure'
+STATISTICS_SUFFIX = '_statistics'
 
 
 class Error(Exception):
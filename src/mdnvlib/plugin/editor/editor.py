@@ -8,13 +8,16 @@ import os
 from pathlib import Path
 import sys
 
+from mdnvlib.lazy_class import LazyClass
 from mdnvlib.novx_globals import SECTION_PREFIX
 from mdnvlib.nv_globals import SC_EDITOR_ICON
 from mdnvlib.nv_globals import _
-from mdnvlib.plugin.editor.editor_window import EditorWindow
 from apptk.plugin.plugin_base import PluginBase
 import tkinter as tk
 
+EditorWindow = LazyClass('mdnvlib.plugin.editor.editor_window', 'EditorWindow')
+# imported on first use
+
 
 class Editor(PluginBase):
     """mdnovel multi-section "plain text" editor class."""
@@ -83,10 +86,10 @@ class Editor(PluginBase):
             self._icon = None
 
         # Configure the editor box.
-        EditorWindow.colorMode = tk.IntVar(
+        self.colorMode = tk.IntVar(
             value=int(self.kwargs['ed_color_mode'])
             )
-        EditorWindow.liveWordCount = tk.BooleanVar(
+        self.liveWordCount = tk.BooleanVar(
             value=self.kwargs['ed_live_wordcount']
             )
 
@@ -102,6 +105,24 @@ class Editor(PluginBase):
             self.sectionEditors[nodeId].on_quit()
             del self.sectionEditors[nodeId]
 
+    def edit_section(self, scId, start=None, end=None):
+        """Open a section editor window and optionally select a part of the text.
+        
+        Positional arguments:
+            scId: str -- ID of the section to edit.
+            
+        Optional arguments:
+            start: int -- Offset of the first character to select.
+            end: int -- Offset after the last character to select.
+        """
+        self._ui.tv.go_to_node(scId)
+        self.open_editor_window()
+        if start is None or end is None:
+            return
+
+        if scId in self.sectionEditors and self.sectionEditors[scId].isOpen:
+            self.sectionEditors[scId].show_range(start, end)
+
     def on_close(self, event=None):
         """Actions to be performed when a project is closed.
         
@@ -120,8 +141,8 @@ class Editor(PluginBase):
         self.on_close()
 
         #--- Save project specific configuration
-        self.kwargs['ed_color_mode'] = EditorWindow.colorMode.get()
-        self.kwargs['ed_live_wordcount'] = EditorWindow.liveWordCount.get()
+        self.kwargs['ed_color_mode'] = self.colorMode.get()
+        self.kwargs['ed_live_wordcount'] = self.liveWordCount.get()
         for keyword in self.kwargs:
             if keyword in self.configuration.options:
                 self.configuration.options[keyword] = self.kwargs[keyword]
@@ -25,11 +25,6 @@ class EditorWindow(tk.Toplevel):
         show_status(message=None) -- Display a message on the status bar.
         show_wordcount()-- Display the word count on the status bar.
     """
-    liveWordCount = None
-    # to be overwritten by the client with tk.BooleanVar()
-    colorMode = None
-    # to be overwritten by the client with tk.IntVar()
-
     def __init__(self, manager, model, view, controller, scId, size, icon=None):
         self._mdl = model
         self._ui = view
@@ -127,7 +122,7 @@ class EditorWindow(tk.Toplevel):
         self._viewMenu = tk.Menu(self._mainMenu, tearoff=0)
         self._mainMenu.add_cascade(label=_('View'), menu=self._viewMenu)
         for i, cm in enumerate(self.colorModes):
-            self._viewMenu.add_radiobutton(label=cm[0], variable=EditorWindow.colorMode, command=self._set_editor_colors, value=i)
+            self._viewMenu.add_radiobutton(label=cm[0], variable=self._manager.colorMode, command=self._set_editor_colors, value=i)
         self._viewMenu.add_separator()
         self._viewMenu.add_command(label=_('Toggle full screen mode'), accelerator=KEYS.TOGGLE_FULLSCREEN[1], command=self._toggle_fullscreen)
 
@@ -152,7 +147,7 @@ class EditorWindow(tk.Toplevel):
         self._wcMenu = tk.Menu(self._mainMenu, tearoff=0)
         self._mainMenu.add_cascade(label=_('Word count'), menu=self._wcMenu)
         self._wcMenu.add_command(label=_('Update'), accelerator=KEYS.UPDATE_WORDCOUNT[1], command=self.show_wordcount)
-        self._wcMenu.add_checkbutton(label=_('Live update'), variable=EditorWindow.liveWordCount, command=self._set_wc_mode)
+        self._wcMenu.add_checkbutton(label=_('Live update'), variable=self._manager.liveWordCount, command=self._set_wc_mode)
 
         # Help
         self.helpMenu = tk.Menu(self._mainMenu, tearoff=0)
@@ -204,6 +199,18 @@ class EditorWindow(tk.Toplevel):
         self.destroy()
         self.isOpen = False
 
+    def show_range(self, start, end):
+        """Select and show a part of the section text.
+        
+        Positional arguments:
+            start: int -- Offset of the first character.
+            end: int -- Offset after the last character.
+        """
+        self._sectionEditor.tag_remove('sel', '1.0', 'end')
+        self._sectionEditor.tag_add('sel', f'1.0 + {start} chars', f'1.0 + {end} chars')
+        self._sectionEditor.mark_set('insert', f'1.0 + {start} chars')
+        self._sectionEditor.see('insert')
+
     def show_status(self, message=None):
         """Display a message on the status bar."""
         self._statusBar.config(text=message)
@@ -280,6 +287,31 @@ class EditorWindow(tk.Toplevel):
         self._sectionEditor['padx'] = self._manager.kwargs['ed_margin_x']
         return "break"
 
+    def _get_changed_range(self, oldText, newText):
+        """Return a tuple (start, end in oldText, end in newText) of the changed range.
+        
+        The common prefix and suffix are found by bisection, comparing slices
+        that shrink by half, so the texts are copied only about twice.
+        """
+        low = 0
+        high = min(len(oldText), len(newText))
+        while low < high:
+            middle = (low + high + 1) // 2
+            if oldText[low:middle] == newText[low:middle]:
+                low = middle
+            else:
+                high = middle - 1
+        start = low
+        low = 0
+        high = min(len(oldText), len(newText)) - start
+        while low < high:
+            middle = (low + high + 1) // 2
+            if oldText[len(oldText) - middle:len(oldText) - low] == newText[len(newText) - middle:len(newText) - low]:
+                low = middle
+            else:
+                high = middle - 1
+        return start, len(oldText) - low, len(newText) - low
+
     def _load_next(self, event=None):
         """Load the next section in the tree."""
         if not self._apply_changes_after_asking():
@@ -313,13 +345,13 @@ class EditorWindow(tk.Toplevel):
         open_help(f'editor')
 
     def _set_editor_colors(self):
-        cm = EditorWindow.colorMode.get()
+        cm = self._manager.colorMode.get()
         self._sectionEditor['fg'] = self.colorModes[cm][1]
         self._sectionEditor['bg'] = self.colorModes[cm][2]
         self._sectionEditor['insertbackground'] = self.colorModes[cm][1]
 
     def _set_wc_mode(self, *args):
-        if EditorWindow.liveWordCount.get():
+        if self._manager.liveWordCount.get():
             self.bind('<KeyRelease>', self.show_wordcount)
             self.show_wordcount()
         else:
@@ -361,13 +393,15 @@ class EditorWindow(tk.Toplevel):
             )
         if newId:
 
-            # Cut the actual section's content from the cursor position to the end.
-            newContent = self._sectionEditor.get_text('insert', 'end').strip(' \n')
-            self._sectionEditor.delete('insert', 'end')
+            # Move the section content from the cursor position to the end to the new section.
+            # The offset is counted from the first character that is not stripped when applying changes.
             self._apply_changes()
-
-            # Copy the section content to the new section.
-            self._mdl.novel.sections[newId].sectionContent = newContent
+            offset = 0
+            firstIndex = self._sectionEditor.search(r'\S', '1.0', stopindex='end', regexp=True)
+            if firstIndex:
+                offset = max((self._sectionEditor.count(firstIndex, 'insert', 'chars') or (0,))[0], 0)
+            self._section.split_content(offset, self._mdl.novel.sections[newId])
+            self._sectionEditor.delete('insert', 'end')
 
             # Copy the viewpoint character.
             if self._mdl.novel.sections[self._scId].characters:
@@ -401,7 +435,10 @@ class EditorWindow(tk.Toplevel):
             self.lift()
             return
 
-        self._section.sectionContent = sectionText
+        # Apply only the changed range, so the words of the other lines are not counted again.
+        oldText = self._section.sectionContent or ''
+        start, end, newEnd = self._get_changed_range(oldText, sectionText)
+        self._section.edit_content(start, end, sectionText[start:newEnd])
 
     def _toggle_fullscreen(self, event=None):
         if self.attributes('-fullscreen'):
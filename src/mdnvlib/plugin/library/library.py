@@ -0,0 +1,122 @@
+"""A project library manager class for mdnovel.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+from pathlib import Path
+
+from apptk.plugin.plugin_base import PluginBase
+from mdnvlib.lazy_class import LazyClass
+from mdnvlib.model.project_library import ProjectLibrary
+from mdnvlib.novx_globals import _
+from mdnvlib.view.icons.set_icon_tk import set_icon
+
+LibraryWindow = LazyClass('mdnvlib.plugin.library.library_window', 'LibraryWindow')
+# imported on first use
+
+
+class Library(PluginBase):
+    """mdnovel project library manager class.
+
+    Public methods:
+        get_folders() -- Return the list of library folders.
+        set_folders(folders) -- Set the library folders.
+
+    Public instance variables:
+        projectLibrary: ProjectLibrary -- Metadata of the projects in the library folders.
+
+    The library folders are searched for projects in the background
+    when the library window is opened.
+    The project metadata are cached in the configuration directory,
+    so that only new and changed project files are read.
+    """
+    FEATURE = _('Project library')
+    SETTINGS = dict(
+        library_window_geometry='800x500',
+        library_folders='',
+    )
+    OPTIONS = {}
+    CACHE_FILE = 'library_cache.json'
+
+    def __init__(self, model, view, controller):
+        """Add an entry to the 'File' menu.
+
+        Positional arguments:
+            model -- reference to the main model instance of the application.
+            view -- reference to the main view instance of the application.
+            controller -- reference to the main controller instance of the application.
+        """
+        super().__init__(model, view, controller)
+        self._libraryWindow = None
+        self._isCacheRead = False
+
+        #--- Load configuration.
+        try:
+            homeDir = str(Path.home()).replace('\\', '/')
+            configDir = f'{homeDir}/.mdnovel/config'
+        except:
+            configDir = '.'
+        self.iniFile = f'{configDir}/library.ini'
+        self.configuration = self._mdl.nvService.make_configuration(
+            settings=self.SETTINGS,
+            options=self.OPTIONS
+            )
+        self.configuration.read(self.iniFile)
+        self.kwargs = {}
+        self.kwargs.update(self.configuration.settings)
+        self.kwargs.update(self.configuration.options)
+        self.projectLibrary = ProjectLibrary(self._ctrl.FILE_TYPES, cachePath=f'{configDir}/{self.CACHE_FILE}')
+
+        # Create an entry in the File menu, after "Open...".
+        # The library is available without a project open.
+        self._ui.fileMenu.insert_command(
+            self._ui.fileMenu.index(_('Open...')) + 1,
+            label=f'{self.FEATURE}...',
+            command=self._start_library,
+            )
+
+    def get_folders(self):
+        """Return a list with the paths of the library folders."""
+        return [folder for folder in self.kwargs['library_folders'].split(os.pathsep) if folder]
+
+    def on_quit(self):
+        """Close the window, and write back the cache and the configuration file."""
+        if self._libraryWindow:
+            if self._libraryWindow.isOpen:
+                self._libraryWindow.on_quit()
+        if self._isCacheRead:
+            self.projectLibrary.write_cache()
+
+        #--- Save configuration
+        for keyword in self.kwargs:
+            if keyword in self.configuration.options:
+                self.configuration.options[keyword] = self.kwargs[keyword]
+            elif keyword in self.configuration.settings:
+                self.configuration.settings[keyword] = self.kwargs[keyword]
+        self.configuration.write(self.iniFile)
+
+    def set_folders(self, folders):
+        """Set the library folders.
+
+        Positional arguments:
+            folders: list of str -- Paths of the folders to search for projects.
+        """
+        self.kwargs['library_folders'] = os.pathsep.join(folders)
+
+    def _start_library(self):
+        if self._libraryWindow:
+            if self._libraryWindow.isOpen:
+                if self._libraryWindow.state() == 'iconic':
+                    self._libraryWindow.state('normal')
+                self._libraryWindow.lift()
+                self._libraryWindow.focus()
+                return
+
+        if not self._isCacheRead:
+            self.projectLibrary.read_cache()
+            self._isCacheRead = True
+        self._libraryWindow = LibraryWindow(self._mdl, self._ui, self._ctrl, self)
+        self._libraryWindow.title(f'mdnovel - {self.FEATURE}')
+        set_icon(self._libraryWindow, icon='wLogo32', default=False)
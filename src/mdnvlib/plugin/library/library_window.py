@@ -0,0 +1,202 @@
+"""Provide a tkinter window for browsing the project library.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from datetime import datetime
+from tkinter import filedialog
+from tkinter import ttk
+
+from apptk.view.view_component_base import ViewComponentBase
+from mdnvlib.novx_globals import _
+from mdnvlib.novx_globals import norm_path
+from mdnvlib.view.platform.platform_settings import KEYS
+from mdnvlib.view.platform.platform_settings import PLATFORM
+import tkinter as tk
+
+
+class LibraryWindow(ViewComponentBase, tk.Toplevel):
+    """Project library window with a folder list, a filter entry, and a project list.
+
+    The project list is filtered by title, author, and path while typing,
+    and sorted by clicking on a column heading.
+    Double-clicking a project opens it.
+    """
+    COLUMNS = {
+        'title': _('Title'),
+        'authorName': _('Author'),
+        'wordCount': _('Words'),
+        'wcDate': _('Last logged'),
+        'timestamp': _('Modified'),
+        'filePath': _('Path'),
+    }
+    # key: entry key; value: column heading
+    _POLL_INTERVAL = 100
+
+    def __init__(self, model, view, controller, manager, **kwargs):
+        ViewComponentBase.__init__(self, model, view, controller)
+        tk.Toplevel.__init__(self)
+        self._manager = manager
+        self._entries = []
+        self._sortKey = 'title'
+        self._sortReverse = False
+
+        self.geometry(self._manager.kwargs['library_window_geometry'])
+        self.lift()
+        self.focus()
+        self.protocol("WM_DELETE_WINDOW", self.on_quit)
+        if PLATFORM != 'win':
+            self.bind(KEYS.QUIT_PROGRAM[0], self.on_quit)
+
+        #--- Folder list.
+        folderFrame = ttk.Frame(self)
+        folderFrame.pack(side='top', fill='x')
+        self._folders = tk.Listbox(folderFrame, height=3)
+        self._folders.pack(side='left', fill='x', expand=True, padx=5, pady=5)
+        for folder in self._manager.get_folders():
+            self._folders.insert('end', norm_path(folder))
+        buttonFrame = ttk.Frame(folderFrame)
+        buttonFrame.pack(side='left', fill='y')
+        ttk.Button(buttonFrame, text=_('Add folder'), command=self._add_folder).pack(fill='x', padx=5, pady=2)
+        ttk.Button(buttonFrame, text=_('Remove folder'), command=self._remove_folder).pack(fill='x', padx=5, pady=2)
+
+        #--- Filter entry.
+        filterFrame = ttk.Frame(self)
+        filterFrame.pack(side='top', fill='x')
+        ttk.Label(filterFrame, text=_('Filter')).pack(side='left', padx=5, pady=5)
+        self._filter = tk.StringVar()
+        self._filter.trace_add('write', self._show_entries)
+        filterEntry = ttk.Entry(filterFrame, textvariable=self._filter)
+        filterEntry.pack(side='left', fill='x', expand=True, padx=5, pady=5)
+        filterEntry.focus()
+
+        #--- Bottom line.
+        bottomFrame = ttk.Frame(self)
+        bottomFrame.pack(side='bottom', fill='x')
+        ttk.Button(bottomFrame, text=_('Close'), command=self.on_quit).pack(side='right', padx=5, pady=5)
+        ttk.Button(bottomFrame, text=_('Open'), command=self._open_project).pack(side='right', padx=5, pady=5)
+        self._statusLabel = ttk.Label(self, anchor='w')
+        self._statusLabel.pack(side='bottom', fill='x', padx=5)
+
+        #--- Project list.
+        self.tree = ttk.Treeview(self, selectmode='browse', columns=tuple(self.COLUMNS), show='headings')
+        scrollY = ttk.Scrollbar(self.tree, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollY.set)
+        scrollY.pack(side='right', fill='y')
+        self.tree.pack(fill='both', expand=True)
+        for column, heading in self.COLUMNS.items():
+            self.tree.heading(column, text=heading, command=lambda c=column: self._sort(c))
+        self.tree.column('title', width=180, stretch=False)
+        self.tree.column('authorName', width=120, stretch=False)
+        self.tree.column('wordCount', width=70, stretch=False, anchor='e')
+        self.tree.column('wcDate', width=90, stretch=False)
+        self.tree.column('timestamp', width=120, stretch=False)
+        self.tree.bind('<Double-1>', self._open_project)
+        self.tree.bind('<Return>', self._open_project)
+        self.isOpen = True
+        self._start_scan()
+
+    def on_quit(self, event=None):
+        self._manager.kwargs['library_window_geometry'] = self.winfo_geometry()
+        self.destroy()
+        self.isOpen = False
+
+    def _add_folder(self):
+        folder = filedialog.askdirectory(parent=self)
+        if not folder:
+            return
+
+        folders = self._manager.get_folders()
+        if folder in folders:
+            return
+
+        folders.append(folder)
+        self._manager.set_folders(folders)
+        self._folders.insert('end', norm_path(folder))
+        self._start_scan()
+
+    def _get_sort_value(self, entry):
+        value = entry[self._sortKey]
+        if value is None:
+            return (0, '')
+
+        if isinstance(value, str):
+            return (1, value.lower())
+
+        return (1, value)
+
+    def _open_project(self, event=None):
+        try:
+            filePath = self.tree.selection()[0]
+        except IndexError:
+            return
+
+        if self._ctrl.open_project(filePath=filePath):
+            self.on_quit()
+
+    def _poll_scan(self):
+        if not self.isOpen:
+            return
+
+        if self._manager.projectLibrary.isScanning:
+            self.after(self._POLL_INTERVAL, self._poll_scan)
+            return
+
+        self._entries = self._manager.projectLibrary.get_entries()
+        self._manager.projectLibrary.write_cache()
+        self._show_entries()
+
+    def _remove_folder(self):
+        try:
+            index = self._folders.curselection()[0]
+        except IndexError:
+            return
+
+        folders = self._manager.get_folders()
+        del folders[index]
+        self._manager.set_folders(folders)
+        self._folders.delete(index)
+        self._start_scan()
+
+    def _show_entries(self, *args):
+        self.tree.delete(*self.tree.get_children(''))
+        filterText = self._filter.get().lower()
+        entries = self._entries
+        if filterText:
+            entries = [
+                entry for entry in entries
+                if filterText in f"{entry['title']}\t{entry['authorName']}\t{entry['filePath']}".lower()
+            ]
+        entries = sorted(entries, key=self._get_sort_value, reverse=self._sortReverse)
+        for entry in entries:
+            if entry['wordCount'] is None:
+                wordCount = ''
+            else:
+                wordCount = entry['wordCount']
+            if entry['timestamp'] is None:
+                modified = ''
+            else:
+                modified = datetime.fromtimestamp(entry['timestamp']).strftime('%Y-%m-%d %H:%M')
+            self.tree.insert('', 'end', iid=entry['filePath'], values=(
+                entry['title'] or '',
+                entry['authorName'] or '',
+                wordCount,
+                entry['wcDate'] or '',
+                modified,
+                norm_path(entry['filePath']),
+                ))
+        self._statusLabel.configure(text=f'{len(entries)} {_("projects")}')
+
+    def _sort(self, column):
+        if column == self._sortKey:
+            self._sortReverse = not self._sortReverse
+        else:
+            self._sortKey = column
+            self._sortReverse = False
+        self._show_entries()
+
+    def _start_scan(self):
+        self._statusLabel.configure(text=_('Searching the library folders...'))
+        self._manager.projectLibrary.start_scan(self._manager.get_folders())
+        self.after(self._POLL_INTERVAL, self._poll_scan)
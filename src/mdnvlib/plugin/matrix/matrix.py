@@ -9,13 +9,16 @@ from pathlib import Path
 import sys
 from tkinter import ttk
 
+from mdnvlib.lazy_class import LazyClass
 from mdnvlib.novx_globals import _
-from mdnvlib.plugin.matrix.table_manager import TableManager
 from apptk.plugin.plugin_base import PluginBase
 from mdnvlib.view.icons.set_icon_tk import set_icon
 from apptk.widgets.tooltip import Hovertip
 import tkinter as tk
 
+TableManager = LazyClass('mdnvlib.plugin.matrix.table_manager', 'TableManager')
+# imported on first use
+
 
 class Matrix(PluginBase):
     """mdnovel relationship matrix view class."""
@@ -6,11 +6,16 @@ License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
 from apptk.plugin.plugin_collection import PluginCollection
 from mdnvlib.plugin.editor.editor import Editor
+from mdnvlib.plugin.library.library import Library
 from mdnvlib.plugin.matrix.matrix import Matrix
+from mdnvlib.plugin.profiling.profiling import Profiling
 from mdnvlib.plugin.progress.progress import Progress
+from mdnvlib.plugin.repetitions.repetitions import Repetitions
+from mdnvlib.plugin.search.search import Search
 from mdnvlib.plugin.templates.templates import Templates
 from mdnvlib.plugin.themes.themes import Themes
 from mdnvlib.plugin.timeline.timeline import Timeline
+from mdnvlib.profiler import profiler
 
 
 class NvPluginCollection(PluginCollection):
@@ -21,6 +26,69 @@ class NvPluginCollection(PluginCollection):
         Timeline,
         Matrix,
         Progress,
+        Search,
+        Repetitions,
         Themes,
+        Profiling,
+        Library,
     ]
 
+    def __init__(self, model, view, controller):
+        """Instantiate the plugin objects and put them on the list, timing each.
+
+        Positional arguments:
+            model -- reference to the main model instance of the application.
+            view -- reference to the main view instance of the application.
+            controller -- reference to the main controller instance of the application.
+            
+        Overrides the superclass constructor.
+        """
+        list.__init__(self)
+        for plugin in self.PLUGINS:
+            with profiler.span(f'{plugin.__name__}.__init__'):
+                self.append(plugin(model, view, controller))
+
+    def disable_menu(self):
+        """Disable UI widgets when no project is open.
+        
+        Overrides the superclass method.
+        """
+        self._pass_down('disable_menu')
+
+    def enable_menu(self):
+        """Enable UI widgets when a project is open.
+        
+        Overrides the superclass method.
+        """
+        self._pass_down('enable_menu')
+
+    def lock(self):
+        """Prevent the plugins from changing the model.
+        
+        Overrides the superclass method.
+        """
+        self._pass_down('lock')
+
+    def on_close(self):
+        """Perform actions before a project is closed.
+        
+        Overrides the superclass method.
+        """
+        self._pass_down('on_close')
+
+    def on_quit(self):
+        """Perform actions before the application is closed.
+        
+        Overrides the superclass method.
+        """
+        self._pass_down('on_quit')
+
+    def unlock(self):
+        """Allow the plugins to change the model."""
+        self._pass_down('unlock')
+
+    def _pass_down(self, methodName):
+        """Call a method of all plugins, timing each call."""
+        for plugin in self:
+            with profiler.span(f'{type(plugin).__name__}.{methodName}'):
+                getattr(plugin, methodName)()
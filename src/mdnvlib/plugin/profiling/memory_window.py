@@ -0,0 +1,120 @@
+"""Provide a tkinter window showing the memory report.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from tkinter import ttk
+
+from apptk.view.view_component_base import ViewComponentBase
+from mdnvlib.memory_report import MemoryReport
+from mdnvlib.novx_globals import _
+from mdnvlib.view.platform.platform_settings import KEYS
+from mdnvlib.view.platform.platform_settings import PLATFORM
+import tkinter as tk
+
+
+class MemoryWindow(ViewComponentBase, tk.Toplevel):
+    """Memory report window with a list of subsystems and a list of allocation growth.
+
+    "Take snapshot" records the allocations traced from now on;
+    "Compare" lists the growth since then, per package and per source line.
+    """
+
+    def __init__(self, model, view, controller, manager, **kwargs):
+        ViewComponentBase.__init__(self, model, view, controller)
+        tk.Toplevel.__init__(self)
+        self._manager = manager
+        self._memoryReport = MemoryReport()
+
+        self.geometry(self._manager.kwargs['memory_window_geometry'])
+        self.lift()
+        self.focus()
+        self.protocol("WM_DELETE_WINDOW", self.on_quit)
+        if PLATFORM != 'win':
+            self.bind(KEYS.QUIT_PROGRAM[0], self.on_quit)
+
+        #--- Buttons.
+        buttonFrame = ttk.Frame(self)
+        buttonFrame.pack(side='top', fill='x')
+        ttk.Button(buttonFrame, text=_('Measure'), command=self._measure).pack(side='left', padx=5, pady=5)
+        ttk.Button(buttonFrame, text=_('Take snapshot'), command=self._take_snapshot).pack(side='left', padx=5, pady=5)
+        self._compareButton = ttk.Button(buttonFrame, text=_('Compare'), command=self._compare)
+        self._compareButton.pack(side='left', padx=5, pady=5)
+        if self._manager.memorySnapshot is None:
+            self._compareButton.state(['disabled'])
+
+        #--- Bottom line.
+        bottomFrame = ttk.Frame(self)
+        bottomFrame.pack(side='bottom', fill='x')
+        ttk.Button(bottomFrame, text=_('Close'), command=self.on_quit).pack(side='right', padx=5, pady=5)
+        self._statusLabel = ttk.Label(self, anchor='w')
+        self._statusLabel.pack(side='bottom', fill='x', padx=5)
+
+        #--- Growth list.
+        columns = (
+            'location',
+            'size',
+            'count',
+            )
+        self._growth = ttk.Treeview(self, selectmode='none', columns=columns, show='headings', height=10)
+        self._growth.pack(side='bottom', fill='x')
+        self._growth.heading('location', text=_('Growth since snapshot'))
+        self._growth.heading('size', text='KiB')
+        self._growth.heading('count', text=_('Objects'))
+        self._growth.column('size', width=90, stretch=False, anchor='e')
+        self._growth.column('count', width=90, stretch=False, anchor='e')
+
+        #--- Subsystem list.
+        columns = (
+            'subsystem',
+            'size',
+            'count',
+            )
+        self._subsystems = ttk.Treeview(self, selectmode='none', columns=columns, show='headings')
+        scrollY = ttk.Scrollbar(self._subsystems, orient='vertical', command=self._subsystems.yview)
+        self._subsystems.configure(yscrollcommand=scrollY.set)
+        scrollY.pack(side='right', fill='y')
+        self._subsystems.pack(fill='both', expand=True)
+        self._subsystems.heading('subsystem', text=_('Subsystem'))
+        self._subsystems.heading('size', text='KiB')
+        self._subsystems.heading('count', text=_('Count'))
+        self._subsystems.column('size', width=90, stretch=False, anchor='e')
+        self._subsystems.column('count', width=180, stretch=False, anchor='e')
+        self.isOpen = True
+        self._measure()
+
+    def on_quit(self, event=None):
+        self._manager.kwargs['memory_window_geometry'] = self.winfo_geometry()
+        self.destroy()
+        self.isOpen = False
+
+    def _compare(self):
+        self._growth.delete(*self._growth.get_children(''))
+        packages, lines = self._memoryReport.compare_snapshots(
+            self._manager.memorySnapshot,
+            self._memoryReport.take_snapshot(),
+            )
+        for location, sizeDiff, countDiff in packages + lines:
+            self._growth.insert('', 'end', values=(location, f'{sizeDiff / 1024:+.1f}', f'{countDiff:+d}'))
+
+    def _measure(self):
+        self._subsystems.delete(*self._subsystems.get_children(''))
+        self.config(cursor='watch')
+        self.update_idletasks()
+        report = self._memoryReport.measure(self._mdl, self._ui, self._ctrl)
+        self.config(cursor='')
+        total = 0
+        for subsystem, size, count, unit in report:
+            total += size
+            if unit:
+                countStr = f'{count} {unit}'
+            else:
+                countStr = ''
+            self._subsystems.insert('', 'end', values=(subsystem, f'{size / 1024:.1f}', countStr))
+        self._statusLabel.configure(text=f'{_("Total")}: {total / 1024 / 1024:.1f} MiB')
+
+    def _take_snapshot(self):
+        self._manager.memorySnapshot = self._memoryReport.take_snapshot()
+        self._compareButton.state(['!disabled'])
+        self._growth.delete(*self._growth.get_children(''))
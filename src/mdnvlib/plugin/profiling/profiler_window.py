@@ -0,0 +1,152 @@
+"""Provide a tkinter window showing the profiler statistics.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from datetime import datetime
+from tkinter import filedialog
+from tkinter import messagebox
+from tkinter import ttk
+
+from apptk.view.view_component_base import ViewComponentBase
+from mdnvlib.novx_globals import _
+from mdnvlib.nv_globals import prefs
+from mdnvlib.profiler import profiler
+from mdnvlib.view.platform.platform_settings import KEYS
+from mdnvlib.view.platform.platform_settings import PLATFORM
+import tkinter as tk
+
+
+class ProfilerWindow(ViewComponentBase, tk.Toplevel):
+    """Profiler window with a list of spans and a list of slow events.
+
+    The lists are updated periodically while the window is open.
+    """
+    UPDATE_INTERVAL = 1000
+    # Milliseconds between the list updates.
+
+    def __init__(self, model, view, controller, manager, **kwargs):
+        ViewComponentBase.__init__(self, model, view, controller)
+        tk.Toplevel.__init__(self)
+        self._manager = manager
+
+        self.geometry(self._manager.kwargs['profiler_window_geometry'])
+        self.lift()
+        self.focus()
+        self.protocol("WM_DELETE_WINDOW", self.on_quit)
+        if PLATFORM != 'win':
+            self.bind(KEYS.QUIT_PROGRAM[0], self.on_quit)
+
+        #--- Settings.
+        settingsFrame = ttk.Frame(self)
+        settingsFrame.pack(side='top', fill='x')
+        self._isEnabled = tk.BooleanVar(value=profiler.enabled)
+        ttk.Checkbutton(
+            settingsFrame,
+            text=_('Enable profiling'),
+            variable=self._isEnabled,
+            command=self._set_enabled,
+            ).pack(side='left', padx=5, pady=5)
+        ttk.Button(settingsFrame, text=_('Reset'), command=self._reset).pack(side='right', padx=5, pady=5)
+        ttk.Button(settingsFrame, text=_('Save trace'), command=self._save_trace).pack(side='right', padx=5, pady=5)
+
+        #--- Bottom line.
+        bottomFrame = ttk.Frame(self)
+        bottomFrame.pack(side='bottom', fill='x')
+        ttk.Button(bottomFrame, text=_('Close'), command=self.on_quit).pack(side='right', padx=5, pady=5)
+
+        #--- Slow event list.
+        columns = (
+            'time',
+            'span',
+            'duration',
+            )
+        self._slowEvents = ttk.Treeview(self, selectmode='none', columns=columns, show='headings', height=6)
+        self._slowEvents.pack(side='bottom', fill='x')
+        self._slowEvents.heading('time', text=_('Time'))
+        self._slowEvents.heading('span', text=_('Slow events'))
+        self._slowEvents.heading('duration', text=f'{_("Duration")} (ms)')
+        self._slowEvents.column('time', width=90, stretch=False)
+        self._slowEvents.column('duration', width=100, stretch=False, anchor='e')
+
+        #--- Span list.
+        columns = (
+            'span',
+            'calls',
+            'total',
+            'mean',
+            'p95',
+            'max',
+            )
+        self._spans = ttk.Treeview(self, selectmode='none', columns=columns, show='headings')
+        scrollY = ttk.Scrollbar(self._spans, orient='vertical', command=self._spans.yview)
+        self._spans.configure(yscrollcommand=scrollY.set)
+        scrollY.pack(side='right', fill='y')
+        self._spans.pack(fill='both', expand=True)
+        self._spans.heading('span', text=_('Span'))
+        self._spans.heading('calls', text=_('Calls'))
+        self._spans.heading('total', text=f'{_("Total")} (ms)')
+        self._spans.heading('mean', text=f'{_("Mean")} (ms)')
+        self._spans.heading('p95', text='p95 (ms)')
+        self._spans.heading('max', text=f'{_("Max")} (ms)')
+        for column in columns[1:]:
+            self._spans.column(column, width=80, stretch=False, anchor='e')
+        self.isOpen = True
+        self._update()
+
+    def on_quit(self, event=None):
+        self._manager.kwargs['profiler_window_geometry'] = self.winfo_geometry()
+        self.destroy()
+        self.isOpen = False
+
+    def _reset(self):
+        profiler.reset()
+        self._show_statistics()
+
+    def _save_trace(self):
+        filePath = filedialog.asksaveasfilename(
+            filetypes=[(_('Trace file'), '.json')],
+            defaultextension='.json',
+            parent=self,
+            )
+        if not filePath:
+            return
+
+        try:
+            profiler.write_trace(filePath)
+        except OSError as ex:
+            messagebox.showerror(_('Cannot save trace'), str(ex), parent=self)
+
+    def _set_enabled(self):
+        profiler.enabled = self._isEnabled.get()
+        prefs['enable_profiling'] = profiler.enabled
+
+    def _show_statistics(self):
+        """Fill the lists with the current data, sorted by total duration."""
+        self._spans.delete(*self._spans.get_children(''))
+        statistics = profiler.get_statistics()
+        for name in sorted(statistics, key=lambda name: statistics[name]['total'], reverse=True):
+            spanStatistics = statistics[name]
+            self._spans.insert('', 'end', values=(
+                name,
+                spanStatistics['calls'],
+                f"{spanStatistics['total'] * 1000:.1f}",
+                f"{spanStatistics['mean'] * 1000:.2f}",
+                f"{spanStatistics['p95'] * 1000:.2f}",
+                f"{spanStatistics['max'] * 1000:.2f}",
+                ))
+        self._slowEvents.delete(*self._slowEvents.get_children(''))
+        for timeStamp, name, duration in profiler.get_slow_events():
+            self._slowEvents.insert('', 'end', values=(
+                datetime.fromtimestamp(timeStamp).strftime('%H:%M:%S'),
+                name,
+                f'{duration * 1000:.1f}',
+                ))
+
+    def _update(self):
+        if not self.isOpen:
+            return
+
+        self._show_statistics()
+        self.after(self.UPDATE_INTERVAL, self._update)
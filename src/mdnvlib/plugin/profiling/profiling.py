@@ -0,0 +1,115 @@
+"""A profiler panel manager class for mdnovel.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from pathlib import Path
+
+from apptk.plugin.plugin_base import PluginBase
+from mdnvlib.lazy_class import LazyClass
+from mdnvlib.novx_globals import _
+from mdnvlib.profiler import profiler
+from mdnvlib.view.icons.set_icon_tk import set_icon
+
+MemoryWindow = LazyClass('mdnvlib.plugin.profiling.memory_window', 'MemoryWindow')
+ProfilerWindow = LazyClass('mdnvlib.plugin.profiling.profiler_window', 'ProfilerWindow')
+# imported on first use
+
+
+class Profiling(PluginBase):
+    """mdnovel profiler panel manager class.
+
+    Public instance variables:
+        memorySnapshot: tracemalloc.Snapshot -- Reference for finding leaks, or None.
+
+    The profiler panel shows the spans timed by the application's profiler.
+    Profiling is switched on and off with the "enable_profiling" option.
+    The memory report shows the memory retained per subsystem.
+    Its snapshot is kept when the window is closed, so that it can be
+    compared after opening and closing projects.
+    """
+    FEATURE = _('Profiler')
+    MEMORY_FEATURE = _('Memory report')
+    SETTINGS = dict(
+        memory_window_geometry='700x500',
+        profiler_window_geometry='700x500',
+        slow_threshold_ms=100,
+    )
+    OPTIONS = {}
+
+    def __init__(self, model, view, controller):
+        """Add an entry to the 'Tools' menu.
+
+        Positional arguments:
+            model -- reference to the main model instance of the application.
+            view -- reference to the main view instance of the application.
+            controller -- reference to the main controller instance of the application.
+        """
+        super().__init__(model, view, controller)
+        self._profilerWindow = None
+        self._memoryWindow = None
+        self.memorySnapshot = None
+
+        #--- Load configuration.
+        try:
+            homeDir = str(Path.home()).replace('\\', '/')
+            configDir = f'{homeDir}/.mdnovel/config'
+        except:
+            configDir = '.'
+        self.iniFile = f'{configDir}/profiling.ini'
+        self.configuration = self._mdl.nvService.make_configuration(
+            settings=self.SETTINGS,
+            options=self.OPTIONS
+            )
+        self.configuration.read(self.iniFile)
+        self.kwargs = {}
+        self.kwargs.update(self.configuration.settings)
+        self.kwargs.update(self.configuration.options)
+        profiler.slowThreshold = int(self.kwargs['slow_threshold_ms']) / 1000
+
+        # Create an entry in the Tools menu.
+        # The profiler is available without a project open.
+        self._ui.toolsMenu.add_command(label=self.FEATURE, command=self._start_panel)
+        self._ui.toolsMenu.add_command(label=self.MEMORY_FEATURE, command=self._start_memory_report)
+
+    def on_quit(self):
+        """Close the window and write back the configuration file."""
+        for window in (self._profilerWindow, self._memoryWindow):
+            if window:
+                if window.isOpen:
+                    window.on_quit()
+
+        #--- Save configuration
+        for keyword in self.kwargs:
+            if keyword in self.configuration.options:
+                self.configuration.options[keyword] = self.kwargs[keyword]
+            elif keyword in self.configuration.settings:
+                self.configuration.settings[keyword] = self.kwargs[keyword]
+        self.configuration.write(self.iniFile)
+
+    def _start_memory_report(self):
+        if self._memoryWindow:
+            if self._memoryWindow.isOpen:
+                if self._memoryWindow.state() == 'iconic':
+                    self._memoryWindow.state('normal')
+                self._memoryWindow.lift()
+                self._memoryWindow.focus()
+                return
+
+        self._memoryWindow = MemoryWindow(self._mdl, self._ui, self._ctrl, self)
+        self._memoryWindow.title(f'mdnovel - {self.MEMORY_FEATURE}')
+        set_icon(self._memoryWindow, icon='wLogo32', default=False)
+
+    def _start_panel(self):
+        if self._profilerWindow:
+            if self._profilerWindow.isOpen:
+                if self._profilerWindow.state() == 'iconic':
+                    self._profilerWindow.state('normal')
+                self._profilerWindow.lift()
+                self._profilerWindow.focus()
+                return
+
+        self._profilerWindow = ProfilerWindow(self._mdl, self._ui, self._ctrl, self)
+        self._profilerWindow.title(f'mdnovel - {self.FEATURE}')
+        set_icon(self._profilerWindow, icon='wLogo32', default=False)
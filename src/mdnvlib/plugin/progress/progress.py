@@ -6,11 +6,14 @@ License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
 from pathlib import Path
 
+from mdnvlib.lazy_class import LazyClass
 from mdnvlib.novx_globals import _
 from apptk.plugin.plugin_base import PluginBase
-from mdnvlib.plugin.progress.progress_viewer import ProgressViewer
 from mdnvlib.view.icons.set_icon_tk import set_icon
 
+ProgressViewer = LazyClass('mdnvlib.plugin.progress.progress_viewer', 'ProgressViewer')
+# imported on first use
+
 
 class Progress(PluginBase):
     """mdnovel daily progress log view manager class."""
@@ -22,6 +25,9 @@ class Progress(PluginBase):
         wordcount_delta_width=100,
         totalcount_width=100,
         totalcount_delta_width=100,
+        period='day',
+        rows_per_page=100,
+        pace_days=30,
     )
     OPTIONS = {}
 
@@ -88,7 +94,7 @@ class Progress(PluginBase):
                     self._progress_viewer.state('normal')
                 self._progress_viewer.lift()
                 self._progress_viewer.focus()
-                self._progress_viewer.build_tree()
+                self._progress_viewer.refresh()
                 return
 
         self._progress_viewer = ProgressViewer(self._mdl, self._ui, self._ctrl, self)
@@ -5,6 +5,7 @@ For further information see https://github.com/peter88213/mdnovel
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
 from datetime import date
+from math import ceil
 from tkinter import ttk
 
 from apptk.view.view_component_base import ViewComponentBase
@@ -15,6 +16,10 @@ import tkinter as tk
 
 
 class ProgressViewer(ViewComponentBase, tk.Toplevel):
+    """Daily progress log viewer.
+
+    The log is displayed page by page, with the latest entries first.
+    """
 
     def __init__(self, model, view, controller, manager, **kwargs):
         ViewComponentBase.__init__(self, model, view, controller)
@@ -30,6 +35,11 @@ class ProgressViewer(ViewComponentBase, tk.Toplevel):
         if PLATFORM != 'win':
             self.bind(KEYS.QUIT_PROGRAM[0], self.on_quit)
 
+        periodFrame = ttk.Frame(self)
+        periodFrame.pack(side='top', fill='x')
+        pageFrame = ttk.Frame(self)
+        pageFrame.pack(side='bottom', fill='x')
+
         #--- Tree for log view.
         columns = (
             'date',
@@ -43,7 +53,6 @@ class ProgressViewer(ViewComponentBase, tk.Toplevel):
         scrollY = ttk.Scrollbar(self.tree, orient='vertical', command=self.tree.yview)
         self.tree.configure(yscrollcommand=scrollY.set)
         scrollY.pack(side='right', fill='y')
-        self.tree.pack(fill='both', expand=True)
         self.tree.heading('date', text=_('Date'))
         self.tree.heading('wordCount', text=_('Words total'))
         self.tree.heading('wordCountDelta', text=_('Daily'))
@@ -58,41 +67,128 @@ class ProgressViewer(ViewComponentBase, tk.Toplevel):
 
         self.tree.tag_configure('positive', foreground='black')
         self.tree.tag_configure('negative', foreground='red')
-        self.isOpen = True
-        self._build_tree()
+
+        #--- Period selection.
+        self._period = tk.StringVar(value=self._manager.kwargs['period'])
+        for period, label in (
+            ('day', _('Daily')),
+            ('week', _('Weekly')),
+            ('month', _('Monthly')),
+        ):
+            ttk.Radiobutton(
+                periodFrame,
+                text=label,
+                variable=self._period,
+                value=period,
+                command=self._change_period,
+                ).pack(side='left', padx=5, pady=5)
+
+        #--- Paging.
+        self._page = 0
+        self._pageCount = 1
+        self._olderButton = ttk.Button(pageFrame, text=_('Older'), command=self._show_older)
+        self._olderButton.pack(side='left', padx=5, pady=5)
+        self._pageLabel = ttk.Label(pageFrame)
+        self._pageLabel.pack(side='left', padx=5, pady=5)
+        self._newerButton = ttk.Button(pageFrame, text=_('Newer'), command=self._show_newer)
+        self._newerButton.pack(side='left', padx=5, pady=5)
+
+        # Pace and forecast.
+        self._paceLabel = ttk.Label(self, anchor='w')
+        self._paceLabel.pack(side='bottom', fill='x', padx=5)
 
         # "Close" button.
-        ttk.Button(self, text=_('Close'), command=self.on_quit).pack(side='right', padx=5, pady=5)
+        ttk.Button(pageFrame, text=_('Close'), command=self.on_quit).pack(side='right', padx=5, pady=5)
 
-    def _build_tree(self):
-        self._reset_tree()
-        wcLog = {}
+        self.tree.pack(fill='both', expand=True)
+        self.isOpen = True
+        self._wcLog = None
+        self._build_tree()
 
+    def _build_tree(self):
+        """Collect the word count log and display the first page."""
         # Copy the read-in word count log.
-        for wcDate in self._mdl.prjFile.wcLog:
-            sessionDate = date.fromisoformat(wcDate).strftime('%x')
-            wcLog[sessionDate] = self._mdl.prjFile.wcLog[wcDate]
+        self._wcLog = self._mdl.prjFile.wcLog.copy()
 
         # Add the word count determined when opening the project.
-        for wcDate in self._mdl.prjFile.wcLogUpdate:
-            sessionDate = date.fromisoformat(wcDate).strftime('%x')
-            wcLog[sessionDate] = self._mdl.prjFile.wcLogUpdate[wcDate]
+        self._wcLog.update(self._mdl.prjFile.wcLogUpdate)
 
         # Add the actual word count.
-        newCountInt, newTotalCountInt = self._mdl.prjFile.count_words()
-        newCount = str(newCountInt)
-        newTotalCount = str(newTotalCountInt)
-        today = date.today().strftime('%x')
-        wcLog[today] = [newCount, newTotalCount]
-
-        lastCount = 0
-        lastTotalCount = 0
-        for wc in wcLog:
-            columns = []
-            nodeTags = ()
-            countInt = int(wcLog[wc][0])
+        self._wcLog[date.today().isoformat()] = self._mdl.prjFile.count_words()
+        self._page = 0
+        self._show_page()
+        self._show_pace()
+
+    def _change_period(self):
+        self._manager.kwargs['period'] = self._period.get()
+        self._page = 0
+        self._show_page()
+
+    def _get_page_rows(self):
+        """Return a list of entries for the current page, and the preceding entry."""
+        rowsPerPage = max(1, int(self._manager.kwargs['rows_per_page']))
+        period = self._period.get()
+        if period in ('week', 'month'):
+            entries = self._wcLog.roll_up(period)
+            entryCount = len(entries)
+        else:
+            entries = None
+            entryCount = len(self._wcLog)
+        self._pageCount = max(1, ceil(entryCount / rowsPerPage))
+        self._page = min(self._page, self._pageCount - 1)
+
+        # The latest entries are displayed on the first page.
+        last = entryCount - self._page * rowsPerPage
+        first = max(0, last - rowsPerPage)
+        if entries is None:
+            entries = self._wcLog.get_entries(first - 1, last)
+            if first == 0:
+                return entries, None
+
+            return entries[1:], entries[0]
+
+        if first == 0:
+            return entries[:last], None
+
+        return entries[first:last], entries[first - 1]
+
+    def _show_newer(self):
+        if self._page > 0:
+            self._page -= 1
+            self._show_page()
+
+    def _show_older(self):
+        if self._page < self._pageCount - 1:
+            self._page += 1
+            self._show_page()
+
+    def _show_pace(self):
+        """Display the average daily word count and the target forecast."""
+        paceDays = int(self._manager.kwargs['pace_days'])
+        pace = self._wcLog.get_pace(paceDays)
+        if pace is None:
+            self._paceLabel.configure(text='')
+            return
+
+        text = f'{_("Words per day")}: {round(pace)}'
+        wordTarget = self._mdl.novel.wordTarget
+        if wordTarget:
+            forecast = self._wcLog.get_forecast(wordTarget, paceDays)
+            if forecast is not None:
+                text = f'{text}  {_("Target reached")}: {forecast.strftime("%x")}'
+        self._paceLabel.configure(text=text)
+
+    def _show_page(self):
+        """Display the log entries of the current page."""
+        self._reset_tree()
+        entries, previous = self._get_page_rows()
+        if previous is None:
+            lastCount = 0
+            lastTotalCount = 0
+        else:
+            __, lastCount, lastTotalCount = previous
+        for wcDate, countInt, totalCountInt in entries:
             countDiffInt = countInt - lastCount
-            totalCountInt = int(wcLog[wc][1])
             totalCountDiffInt = totalCountInt - lastTotalCount
             if countDiffInt == 0 and totalCountDiffInt == 0:
                 continue
@@ -102,10 +198,10 @@ class ProgressViewer(ViewComponentBase, tk.Toplevel):
             else:
                 nodeTags = ('negative')
             columns = [
-                wc,
-                str(wcLog[wc][0]),
+                wcDate.strftime('%x'),
+                str(countInt),
                 str(countDiffInt),
-                str(wcLog[wc][1]),
+                str(totalCountInt),
                 str(totalCountDiffInt),
                 ]
             lastCount = countInt
@@ -114,7 +210,16 @@ class ProgressViewer(ViewComponentBase, tk.Toplevel):
             # chronological order
             startIndex = '0'
             # reverse order
-            self.tree.insert('', startIndex, iid=wc, values=columns, tags=nodeTags, open=True)
+            self.tree.insert('', startIndex, iid=wcDate.isoformat(), values=columns, tags=nodeTags, open=True)
+        self._pageLabel.configure(text=f'{self._page + 1}/{self._pageCount}')
+        if self._page > 0:
+            self._newerButton.configure(state='normal')
+        else:
+            self._newerButton.configure(state='disabled')
+        if self._page < self._pageCount - 1:
+            self._olderButton.configure(state='normal')
+        else:
+            self._olderButton.configure(state='disabled')
 
     def on_quit(self, event=None):
         self._ui.unregister_client(self)
@@ -0,0 +1,149 @@
+"""Provide a tkinter window for repeated phrases and duplicate passages.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from tkinter import ttk
+
+from apptk.view.view_component_base import ViewComponentBase
+from mdnvlib.novx_globals import _
+from mdnvlib.view.platform.platform_settings import KEYS
+from mdnvlib.view.platform.platform_settings import PLATFORM
+import tkinter as tk
+
+
+class RepetitionWindow(ViewComponentBase, tk.Toplevel):
+    """Repetition window with a list of echoes and duplicate sections.
+
+    Selecting a hit shows the section in the tree.
+    Double-clicking a hit opens the section editor.
+    """
+    CONTEXT_CHARS = 30
+
+    def __init__(self, model, view, controller, manager, **kwargs):
+        ViewComponentBase.__init__(self, model, view, controller)
+        tk.Toplevel.__init__(self)
+        self._manager = manager
+
+        self.geometry(self._manager.kwargs['repetitions_window_geometry'])
+        self.lift()
+        self.focus()
+        self.protocol("WM_DELETE_WINDOW", self.on_quit)
+        if PLATFORM != 'win':
+            self.bind(KEYS.QUIT_PROGRAM[0], self.on_quit)
+
+        #--- Settings.
+        settingsFrame = ttk.Frame(self)
+        settingsFrame.pack(side='top', fill='x')
+        self._phraseLength = tk.IntVar(value=int(self._manager.kwargs['phrase_length']))
+        ttk.Label(settingsFrame, text=_('Words per phrase')).pack(side='left', padx=5, pady=5)
+        ttk.Spinbox(settingsFrame, from_=2, to=20, width=4, textvariable=self._phraseLength).pack(side='left', pady=5)
+        self._echoDistance = tk.IntVar(value=int(self._manager.kwargs['echo_distance']))
+        ttk.Label(settingsFrame, text=_('Within words')).pack(side='left', padx=5, pady=5)
+        ttk.Spinbox(
+            settingsFrame,
+            from_=100,
+            to=100000,
+            increment=100,
+            width=7,
+            textvariable=self._echoDistance,
+            ).pack(side='left', pady=5)
+        ttk.Button(settingsFrame, text=_('Analyze'), command=self._analyze).pack(side='right', padx=5, pady=5)
+
+        #--- Bottom line.
+        bottomFrame = ttk.Frame(self)
+        bottomFrame.pack(side='bottom', fill='x')
+        ttk.Button(bottomFrame, text=_('Close'), command=self.on_quit).pack(side='right', padx=5, pady=5)
+        self._statusLabel = ttk.Label(self, anchor='w')
+        self._statusLabel.pack(side='bottom', fill='x', padx=5)
+
+        #--- Hit list.
+        columns = (
+            'kind',
+            'section',
+            'context',
+            )
+        self.tree = ttk.Treeview(self, selectmode='browse', columns=columns, show='headings')
+        scrollY = ttk.Scrollbar(self.tree, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollY.set)
+        scrollY.pack(side='right', fill='y')
+        self.tree.pack(fill='both', expand=True)
+        self.tree.heading('kind', text=_('Type'))
+        self.tree.heading('section', text=_('Section'))
+        self.tree.heading('context', text=_('Context'))
+        self.tree.column('kind', width=90, stretch=False)
+        self.tree.column('section', width=150, stretch=False)
+        self.tree.bind('<<TreeviewSelect>>', self._go_to_hit)
+        self.tree.bind('<Double-1>', self._edit_hit)
+        self._hits = []
+        # list of (section ID, start offset, end offset) tuples
+        self.isOpen = True
+
+    def on_quit(self, event=None):
+        self._manager.kwargs['repetitions_window_geometry'] = self.winfo_geometry()
+        self.destroy()
+        self.isOpen = False
+
+    def _analyze(self, event=None):
+        try:
+            self._manager.kwargs['phrase_length'] = self._phraseLength.get()
+            self._manager.kwargs['echo_distance'] = self._echoDistance.get()
+        except tk.TclError:
+            return
+
+        for child in self.tree.get_children(''):
+            self.tree.delete(child)
+        self._hits = []
+        self.config(cursor='watch')
+        self.update_idletasks()
+        echoes = self._manager.find_echoes()
+        duplicates = self._manager.find_duplicates()
+        self.config(cursor='')
+        for phrase, __, (scId, start, end) in echoes:
+            text = self._mdl.novel.sections[scId].sectionContent
+            context = (
+                f'{text[max(0, start - self.CONTEXT_CHARS):start]}'
+                f'[{text[start:end]}]'
+                f'{text[end:end + self.CONTEXT_CHARS]}'
+            ).replace('\n', ' ')
+            self._insert_hit(_('Echo'), scId, start, end, context)
+        for scId1, scId2, similarity in duplicates:
+            context = f'{similarity * 100:.0f}% {_("like")} "{self._mdl.novel.sections[scId1].title or scId1}"'
+            self._insert_hit(_('Duplicate'), scId2, None, None, context)
+        self._statusLabel.configure(text=f'{len(echoes)} {_("echoes")}, {len(duplicates)} {_("duplicates")}')
+
+    def _edit_hit(self, event=None):
+        """Open the section editor and select the repetition."""
+        hit = self._get_selected_hit()
+        if hit is None:
+            return
+
+        scId, start, end = hit
+        for plugin in self._ctrl.plugins:
+            if hasattr(plugin, 'edit_section'):
+                plugin.edit_section(scId, start, end)
+                return
+
+    def _get_selected_hit(self):
+        try:
+            return self._hits[int(self.tree.selection()[0])]
+
+        except IndexError:
+            return None
+
+    def _go_to_hit(self, event=None):
+        """Select the section of the hit in the project tree."""
+        hit = self._get_selected_hit()
+        if hit is not None:
+            self._ui.tv.go_to_node(hit[0])
+            self.lift()
+
+    def _insert_hit(self, kind, scId, start, end, context):
+        columns = [
+            kind,
+            self._mdl.novel.sections[scId].title or '',
+            context,
+            ]
+        self.tree.insert('', 'end', iid=str(len(self._hits)), values=columns)
+        self._hits.append((scId, start, end))
@@ -0,0 +1,134 @@
+"""A repetition finder manager class for mdnovel.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from pathlib import Path
+
+from apptk.plugin.plugin_base import PluginBase
+from mdnvlib.lazy_class import LazyClass
+from mdnvlib.novx_globals import _
+from mdnvlib.view.icons.set_icon_tk import set_icon
+
+RepetitionFinder = LazyClass('mdnvlib.model.repetition_finder', 'RepetitionFinder')
+RepetitionWindow = LazyClass('mdnvlib.plugin.repetitions.repetition_window', 'RepetitionWindow')
+# imported on first use
+
+
+class Repetitions(PluginBase):
+    """mdnovel repetition finder manager class.
+
+    The section fingerprints are kept while the project is open,
+    so after the model reports changes only the edited sections are hashed again.
+    """
+    FEATURE = _('Repetitions')
+    SETTINGS = dict(
+        repetitions_window_geometry='600x440',
+        phrase_length=5,
+        echo_distance=2000,
+        duplicate_threshold=0.5,
+    )
+    OPTIONS = {}
+
+    def __init__(self, model, view, controller):
+        """Add an entry to the 'Tools' menu.
+
+        Positional arguments:
+            model -- reference to the main model instance of the application.
+            view -- reference to the main view instance of the application.
+            controller -- reference to the main controller instance of the application.
+        """
+        super().__init__(model, view, controller)
+        self._repetitionWindow = None
+        self.repetitionFinder = None
+        self._isOutdated = True
+
+        #--- Load configuration.
+        try:
+            homeDir = str(Path.home()).replace('\\', '/')
+            configDir = f'{homeDir}/.mdnovel/config'
+        except:
+            configDir = '.'
+        self.iniFile = f'{configDir}/repetitions.ini'
+        self.configuration = self._mdl.nvService.make_configuration(
+            settings=self.SETTINGS,
+            options=self.OPTIONS
+            )
+        self.configuration.read(self.iniFile)
+        self.kwargs = {}
+        self.kwargs.update(self.configuration.settings)
+        self.kwargs.update(self.configuration.options)
+
+        # Create an entry in the Tools menu.
+        self._ui.toolsMenu.add_command(label=self.FEATURE, command=self._start_finder)
+        self._ui.toolsMenu.entryconfig(self.FEATURE, state='disabled')
+
+        # Register to be notified of model changes.
+        self._mdl.register_client(self)
+
+    def disable_menu(self):
+        """Disable menu entries when no project is open."""
+        self._ui.toolsMenu.entryconfig(self.FEATURE, state='disabled')
+
+    def enable_menu(self):
+        """Enable menu entries when a project is open."""
+        self._ui.toolsMenu.entryconfig(self.FEATURE, state='normal')
+
+    def find_duplicates(self):
+        """Return a list of (section ID, section ID, similarity) tuples."""
+        self._update()
+        return self.repetitionFinder.find_duplicates(threshold=float(self.kwargs['duplicate_threshold']))
+
+    def find_echoes(self):
+        """Return a list of (phrase, first occurrence, repetition) tuples."""
+        self._update()
+        return self.repetitionFinder.find_echoes(distance=int(self.kwargs['echo_distance']))
+
+    def on_close(self):
+        """Close the window and discard the fingerprints."""
+        if self._repetitionWindow:
+            if self._repetitionWindow.isOpen:
+                self._repetitionWindow.on_quit()
+        self.repetitionFinder = None
+        self._isOutdated = True
+
+    def on_quit(self):
+        """Write back the configuration file."""
+        self.on_close()
+
+        #--- Save configuration
+        for keyword in self.kwargs:
+            if keyword in self.configuration.options:
+                self.configuration.options[keyword] = self.kwargs[keyword]
+            elif keyword in self.configuration.settings:
+                self.configuration.settings[keyword] = self.kwargs[keyword]
+        self.configuration.write(self.iniFile)
+
+    def refresh(self):
+        """Mark the fingerprints as outdated when the model has changed."""
+        self._isOutdated = True
+
+    def _start_finder(self):
+        if self._repetitionWindow:
+            if self._repetitionWindow.isOpen:
+                if self._repetitionWindow.state() == 'iconic':
+                    self._repetitionWindow.state('normal')
+                self._repetitionWindow.lift()
+                self._repetitionWindow.focus()
+                return
+
+        self._repetitionWindow = RepetitionWindow(self._mdl, self._ui, self._ctrl, self)
+        self._repetitionWindow.title(f'{self._mdl.novel.title} - {self.FEATURE}')
+        set_icon(self._repetitionWindow, icon='wLogo32', default=False)
+
+    def _update(self):
+        """Fingerprint the sections changed since the last analysis."""
+        phraseLength = int(self.kwargs['phrase_length'])
+        if self.repetitionFinder is None or self.repetitionFinder.phraseLength != phraseLength:
+            self.repetitionFinder = RepetitionFinder(phraseLength=phraseLength)
+            self._isOutdated = True
+        if self._isOutdated:
+            # No process pool: forking the GUI process with its threads may deadlock.
+            self.repetitionFinder.update(self._mdl.novel, workers=1)
+            self._isOutdated = False
@@ -0,0 +1,139 @@
+"""A full-text search manager class for mdnovel.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+from pathlib import Path
+
+from apptk.plugin.plugin_base import PluginBase
+from mdnvlib.lazy_class import LazyClass
+from mdnvlib.model.search_index import SearchIndex
+from mdnvlib.novx_globals import _
+from mdnvlib.view.icons.set_icon_tk import set_icon
+
+SearchWindow = LazyClass('mdnvlib.plugin.search.search_window', 'SearchWindow')
+# imported on first use
+
+
+class Search(PluginBase):
+    """mdnovel full-text search manager class.
+
+    The search index is built in the background when a project is opened.
+    It is updated with the next query after the model reports changes.
+    """
+    FEATURE = _('Search')
+    SETTINGS = dict(
+        search_window_geometry='600x440',
+        max_hits=500,
+    )
+    OPTIONS = dict(
+        search_cache=False,
+    )
+    CACHE_EXTENSION = '.idx'
+
+    def __init__(self, model, view, controller):
+        """Add an entry to the 'Tools' menu.
+
+        Positional arguments:
+            model -- reference to the main model instance of the application.
+            view -- reference to the main view instance of the application.
+            controller -- reference to the main controller instance of the application.
+        """
+        super().__init__(model, view, controller)
+        self._searchWindow = None
+        self.searchIndex = SearchIndex()
+
+        #--- Load configuration.
+        try:
+            homeDir = str(Path.home()).replace('\\', '/')
+            configDir = f'{homeDir}/.mdnovel/config'
+        except:
+            configDir = '.'
+        self.iniFile = f'{configDir}/search.ini'
+        self.configuration = self._mdl.nvService.make_configuration(
+            settings=self.SETTINGS,
+            options=self.OPTIONS
+            )
+        self.configuration.read(self.iniFile)
+        self.kwargs = {}
+        self.kwargs.update(self.configuration.settings)
+        self.kwargs.update(self.configuration.options)
+
+        # Create an entry in the Tools menu.
+        self._ui.toolsMenu.add_command(label=self.FEATURE, command=self._start_search)
+        self._ui.toolsMenu.entryconfig(self.FEATURE, state='disabled')
+
+        # Register to be notified of model changes.
+        self._mdl.register_client(self)
+
+    def disable_menu(self):
+        """Disable menu entries when no project is open."""
+        self._ui.toolsMenu.entryconfig(self.FEATURE, state='disabled')
+
+    def enable_menu(self):
+        """Enable menu entries and start indexing when a project is open."""
+        self._ui.toolsMenu.entryconfig(self.FEATURE, state='normal')
+        self.searchIndex = SearchIndex()
+        self.searchIndex.start_build(self._mdl.novel, cachePath=self._get_cache_path())
+
+    def on_close(self):
+        """Close the window and write the index cache, if configured."""
+        if self._searchWindow:
+            if self._searchWindow.isOpen:
+                self._searchWindow.on_quit()
+        cachePath = self._get_cache_path()
+        if cachePath and self._mdl.novel is not None:
+            self.searchIndex.update(self._mdl.novel)
+            self.searchIndex.write_cache(cachePath)
+        self.searchIndex = SearchIndex()
+
+    def on_quit(self):
+        """Write back the configuration file."""
+        self.on_close()
+
+        #--- Save configuration
+        for keyword in self.kwargs:
+            if keyword in self.configuration.options:
+                self.configuration.options[keyword] = self.kwargs[keyword]
+            elif keyword in self.configuration.settings:
+                self.configuration.settings[keyword] = self.kwargs[keyword]
+        self.configuration.write(self.iniFile)
+
+    def refresh(self):
+        """Mark the index as outdated when the model has changed."""
+        self.searchIndex.invalidate()
+
+    def search(self, query):
+        """Return a list of (element ID, field name, start offset, end offset) hits."""
+        if self._mdl.novel is None:
+            return []
+
+        if self.searchIndex.isOutdated:
+            self.searchIndex.update(self._mdl.novel)
+        return self.searchIndex.search(query, maxHits=int(self.kwargs['max_hits']))
+
+    def _get_cache_path(self):
+        """Return the path of the index cache file, or None if not configured."""
+        if not self.kwargs['search_cache']:
+            return None
+
+        if self._mdl.prjFile is None or not self._mdl.prjFile.filePath:
+            return None
+
+        root, __ = os.path.splitext(self._mdl.prjFile.filePath)
+        return f'{root}{self.CACHE_EXTENSION}'
+
+    def _start_search(self):
+        if self._searchWindow:
+            if self._searchWindow.isOpen:
+                if self._searchWindow.state() == 'iconic':
+                    self._searchWindow.state('normal')
+                self._searchWindow.lift()
+                self._searchWindow.focus()
+                return
+
+        self._searchWindow = SearchWindow(self._mdl, self._ui, self._ctrl, self)
+        self._searchWindow.title(f'{self._mdl.novel.title} - {self.FEATURE}')
+        set_icon(self._searchWindow, icon='wLogo32', default=False)
@@ -0,0 +1,159 @@
+"""Provide a tkinter window for full-text search.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from tkinter import ttk
+
+from apptk.view.view_component_base import ViewComponentBase
+from mdnvlib.novx_globals import _
+from mdnvlib.view.platform.platform_settings import KEYS
+from mdnvlib.view.platform.platform_settings import PLATFORM
+import tkinter as tk
+
+
+class SearchWindow(ViewComponentBase, tk.Toplevel):
+    """Search window with a query entry and a list of hits.
+
+    Selecting a hit shows the element in the tree.
+    Double-clicking a hit in a section's text opens the section editor.
+    """
+    FIELD_NAMES = {
+        'title': _('Title'),
+        'desc': _('Description'),
+        'notes': _('Notes'),
+        'goal': _('Goal'),
+        'conflict': _('Conflict'),
+        'outcome': _('Outcome'),
+        'sectionContent': _('Text'),
+        'aka': _('AKA'),
+        'fullName': _('Full name'),
+        'bio': _('Bio'),
+        'goals': _('Goals'),
+    }
+    CONTEXT_CHARS = 30
+
+    def __init__(self, model, view, controller, manager, **kwargs):
+        ViewComponentBase.__init__(self, model, view, controller)
+        tk.Toplevel.__init__(self)
+        self._manager = manager
+
+        self.geometry(self._manager.kwargs['search_window_geometry'])
+        self.lift()
+        self.focus()
+        self.protocol("WM_DELETE_WINDOW", self.on_quit)
+        if PLATFORM != 'win':
+            self.bind(KEYS.QUIT_PROGRAM[0], self.on_quit)
+
+        #--- Query entry.
+        queryFrame = ttk.Frame(self)
+        queryFrame.pack(side='top', fill='x')
+        self._query = tk.StringVar()
+        queryEntry = ttk.Entry(queryFrame, textvariable=self._query)
+        queryEntry.pack(side='left', fill='x', expand=True, padx=5, pady=5)
+        queryEntry.bind('<Return>', self._search)
+        queryEntry.focus()
+        ttk.Button(queryFrame, text=_('Search'), command=self._search).pack(side='left', padx=5, pady=5)
+
+        #--- Bottom line.
+        bottomFrame = ttk.Frame(self)
+        bottomFrame.pack(side='bottom', fill='x')
+        self._useCache = tk.BooleanVar(value=self._manager.kwargs['search_cache'])
+        ttk.Checkbutton(
+            bottomFrame,
+            text=_('Keep the search index next to the project file'),
+            variable=self._useCache,
+            command=self._set_cache_option,
+            ).pack(side='left', padx=5, pady=5)
+        ttk.Button(bottomFrame, text=_('Close'), command=self.on_quit).pack(side='right', padx=5, pady=5)
+        self._statusLabel = ttk.Label(self, anchor='w')
+        self._statusLabel.pack(side='bottom', fill='x', padx=5)
+
+        #--- Hit list.
+        columns = (
+            'element',
+            'field',
+            'context',
+            )
+        self.tree = ttk.Treeview(self, selectmode='browse', columns=columns, show='headings')
+        scrollY = ttk.Scrollbar(self.tree, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollY.set)
+        scrollY.pack(side='right', fill='y')
+        self.tree.pack(fill='both', expand=True)
+        self.tree.heading('element', text=_('Element'))
+        self.tree.heading('field', text=_('Field'))
+        self.tree.heading('context', text=_('Context'))
+        self.tree.column('element', width=150, stretch=False)
+        self.tree.column('field', width=90, stretch=False)
+        self.tree.bind('<<TreeviewSelect>>', self._go_to_hit)
+        self.tree.bind('<Double-1>', self._edit_hit)
+        self._hits = []
+        self.isOpen = True
+
+    def on_quit(self, event=None):
+        self._manager.kwargs['search_window_geometry'] = self.winfo_geometry()
+        self.destroy()
+        self.isOpen = False
+
+    def _edit_hit(self, event=None):
+        """Open the section editor and select the hit."""
+        hit = self._get_selected_hit()
+        if hit is None:
+            return
+
+        elemId, field, start, end = hit
+        if field != 'sectionContent':
+            return
+
+        for plugin in self._ctrl.plugins:
+            if hasattr(plugin, 'edit_section'):
+                plugin.edit_section(elemId, start, end)
+                return
+
+    def _get_element(self, elemId):
+        for collectionName in self._manager.searchIndex.FIELDS:
+            collection = getattr(self._mdl.novel, collectionName)
+            if elemId in collection:
+                return collection[elemId]
+
+    def _get_selected_hit(self):
+        try:
+            return self._hits[int(self.tree.selection()[0])]
+
+        except IndexError:
+            return None
+
+    def _go_to_hit(self, event=None):
+        """Select the element of the hit in the project tree."""
+        hit = self._get_selected_hit()
+        if hit is not None:
+            self._ui.tv.go_to_node(hit[0])
+            self.lift()
+
+    def _search(self, event=None):
+        for child in self.tree.get_children(''):
+            self.tree.delete(child)
+        self._hits = self._manager.search(self._query.get())
+        for i, hit in enumerate(self._hits):
+            elemId, field, start, end = hit
+            element = self._get_element(elemId)
+            if element is None:
+                continue
+
+            text = getattr(element, field)
+            context = (
+                f'{text[max(0, start - self.CONTEXT_CHARS):start]}'
+                f'[{text[start:end]}]'
+                f'{text[end:end + self.CONTEXT_CHARS]}'
+            ).replace('\n', ' ')
+            columns = [
+                element.title or '',
+                self.FIELD_NAMES.get(field, field),
+                context,
+                ]
+            self.tree.insert('', 'end', iid=str(i), values=columns)
+        self._statusLabel.configure(text=f'{len(self._hits)} {_("hits")}')
+
+    def _set_cache_option(self):
+        self._manager.kwargs['search_cache'] = self._useCache.get()
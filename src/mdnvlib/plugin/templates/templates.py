@@ -13,13 +13,16 @@ from pathlib import Path
 from tkinter import filedialog
 from tkinter import messagebox
 
+from mdnvlib.lazy_class import LazyClass
 from mdnvlib.novx_globals import Error
 from mdnvlib.novx_globals import _
 from mdnvlib.novx_globals import norm_path
 from apptk.plugin.plugin_base import PluginBase
-from mdnvlib.plugin.templates.md_template import MdTemplate
 import tkinter as tk
 
+MdTemplate = LazyClass('mdnvlib.plugin.templates.md_template', 'MdTemplate')
+# imported on first use
+
 
 class Templates(PluginBase):
     """A 'Story Templates' manager class."""
@@ -55,7 +58,6 @@ class Templates(PluginBase):
 
         # Create Tools menu entry.
         self._ui.toolsMenu.add_cascade(label=self.FEATURE, menu=self._templatesMenu)
-        self._fileTypes = [(MdTemplate.DESCRIPTION, MdTemplate.EXTENSION)]
 
     def disable_menu(self):
         """Disable menu entries when no project is open."""
@@ -70,8 +72,8 @@ class Templates(PluginBase):
     def _load_template(self):
         """Create a structure of "Todo" chapters and scenes from a Markdown file."""
         fileName = filedialog.askopenfilename(
-            filetypes=self._fileTypes,
-            defaultextension=self._fileTypes[0][1],
+            filetypes=[(MdTemplate.DESCRIPTION, MdTemplate.EXTENSION)],
+            defaultextension=MdTemplate.EXTENSION,
             initialdir=self._templateDir
             )
         if fileName:
@@ -104,8 +106,8 @@ class Templates(PluginBase):
 
     def _save_template(self):
         """Save a structure of "Todo" chapters and scenes to a Markdown file."""
-        fileName = filedialog.asksaveasfilename(filetypes=self._fileTypes,
-                                              defaultextension=self._fileTypes[0][1],
+        fileName = filedialog.asksaveasfilename(filetypes=[(MdTemplate.DESCRIPTION, MdTemplate.EXTENSION)],
+                                              defaultextension=MdTemplate.EXTENSION,
                                               initialdir=self._templateDir)
         if not fileName:
             return
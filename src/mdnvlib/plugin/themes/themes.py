@@ -13,9 +13,9 @@ For further information see https://github.com/peter88213/mdnovel
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
 
+from mdnvlib.lazy_class import LazyClass
 from mdnvlib.novx_globals import _
 from apptk.plugin.plugin_base import PluginBase
-from mdnvlib.plugin.themes.settings_window import SettingsWindow
 
 try:
     from ttkthemes import ThemedStyle
@@ -23,6 +23,9 @@ try:
 except ModuleNotFoundError:
     extraThemes = False
 
+SettingsWindow = LazyClass('mdnvlib.plugin.themes.settings_window', 'SettingsWindow')
+# imported on first use
+
 
 class Themes(PluginBase):
     """A 'Theme Changer' class."""
@@ -110,7 +110,7 @@ class SectionEvent(Section):
                     self.day = None
                 self.date = None
 
-    def merge_date_time(self, source, defaultDay=0):
+    def merge_date_time(self, source, defaultDay=0, span=None):
         """Set date/time related variables from a mdnovel-generated source section.
                 
         Positional arguments:
@@ -118,7 +118,14 @@ class SectionEvent(Section):
         
         Optional arguments:
             defaultDay -- The day to be set if the section does not have a date or a day.
+            span -- Tuple of start and end datetime, if resolved by the story time index.
         """
+        if span is not None:
+            sectionStart, sectionEnd = span
+            self._startDateTime = sectionStart.isoformat(' ')
+            self._endDateTime = sectionEnd.isoformat(' ')
+            return
+
         #--- Set start date/time.
         if source.date is not None and source.date != self.NULL_DATE:
             # The date is not "BC", so synchronize it.
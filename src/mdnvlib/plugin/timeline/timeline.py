@@ -13,14 +13,17 @@ from tkinter import messagebox
 from tkinter import ttk
 
 from mdnvlib.file.doc_open import open_document
+from mdnvlib.lazy_class import LazyClass
 from mdnvlib.novx_globals import Error
 from mdnvlib.novx_globals import _
 from mdnvlib.novx_globals import norm_path
 from apptk.plugin.plugin_base import PluginBase
-from mdnvlib.plugin.timeline.tl_file import TlFile
 from apptk.widgets.tooltip import Hovertip
 import tkinter as tk
 
+TlFile = LazyClass('mdnvlib.plugin.timeline.tl_file', 'TlFile')
+# imported on first use
+
 
 class Timeline(PluginBase):
     """Class for synchronization with Timeline."""
@@ -294,7 +294,11 @@ class TlFile(File):
                     self.novel.sections[scId].title = title
                 self.novel.sections[scId].desc = source.sections[scId].desc
                 defaultDay += self._newEventSpacing
-                self.novel.sections[scId].merge_date_time(source.sections[scId], defaultDay=defaultDay)
+                self.novel.sections[scId].merge_date_time(
+                    source.sections[scId],
+                    defaultDay=defaultDay,
+                    span=source.storyTime.get_span(scId),
+                    )
                 self.novel.sections[scId].scType = source.sections[scId].scType
         sections = list(self.novel.sections)
         for scId in sections:
@@ -0,0 +1,249 @@
+"""Provide a lightweight profiler for timing named spans.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from collections import deque
+from functools import wraps
+import json
+import os
+from threading import Lock
+from threading import get_ident
+from time import perf_counter
+from time import time
+
+TRACE_VARIABLE = 'MDNOVEL_TRACE'
+# Environment variable with the path of a trace file to write at exit.
+
+
+class NoSpan:
+    """Context manager doing nothing, used while the profiler is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+class Span:
+    """Context manager recording the duration of a block."""
+    __slots__ = ('_profiler', '_name', '_start')
+
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+        self._start = None
+
+    def __enter__(self):
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self._profiler.add_event(self._name, self._start, perf_counter())
+        return False
+
+
+class Profiler:
+    """Collect the durations of named spans, and counters.
+
+    Public methods:
+        add_event(name, start, end) -- Record a finished span.
+        count(name, value) -- Add a value to a counter.
+        get_counters() -- Return a dictionary with the counter values.
+        get_slow_events() -- Return the most recent slow events.
+        get_statistics() -- Return a dictionary with the statistics per span.
+        reset() -- Discard the data collected.
+        span(name) -- Return a context manager timing a block.
+        timed(name) -- Return a decorator timing a function.
+        write_trace(filePath) -- Write the session trace to a JSON file.
+
+    Public instance variables:
+        enabled: bool -- If False, nothing is recorded.
+        slowThreshold: float -- Duration in seconds from which a span is a slow event.
+
+    While disabled, a span costs an attribute lookup.
+    The trace is written in the Trace Event Format,
+    which can be loaded e.g. into chrome://tracing or Perfetto.
+    """
+    MAX_EVENTS = 100000
+    # Number of trace events kept; older events are discarded.
+
+    MAX_SAMPLES = 10000
+    # Number of durations kept per span for the percentile.
+
+    MAX_SLOW_EVENTS = 20
+
+    def __init__(self):
+        """Initialize instance variables."""
+        self.enabled = False
+        self.slowThreshold = 0.1
+        self._lock = Lock()
+        self.reset()
+
+    def add_event(self, name, start, end):
+        """Record a finished span.
+
+        Positional arguments:
+            name: str -- Span name.
+            start: float -- perf_counter() value at the start.
+            end: float -- perf_counter() value at the end.
+        """
+        duration = end - start
+        with self._lock:
+            spanData = self._spans.get(name, None)
+            if spanData is None:
+                spanData = [0, 0.0, 0.0, deque(maxlen=self.MAX_SAMPLES)]
+                # calls, total duration, maximum duration, recent durations
+                self._spans[name] = spanData
+            spanData[0] += 1
+            spanData[1] += duration
+            if duration > spanData[2]:
+                spanData[2] = duration
+            spanData[3].append(duration)
+            self._events.append(('X', name, start, duration, get_ident()))
+            if duration >= self.slowThreshold:
+                self._slowEvents.append((self._startTime + start - self._startCounter, name, duration))
+
+    def count(self, name, value=1):
+        """Add a value to a counter.
+
+        Positional arguments:
+            name: str -- Counter name.
+
+        Optional arguments:
+            value: int -- Value to add.
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            total = self._counters.get(name, 0) + value
+            self._counters[name] = total
+            self._events.append(('C', name, perf_counter(), total, get_ident()))
+
+    def get_counters(self):
+        """Return a dictionary with the counter values."""
+        with self._lock:
+            return dict(self._counters)
+
+    def get_slow_events(self):
+        """Return the most recent slow events.
+
+        Return a list of tuples (time stamp, span name, duration in seconds),
+        most recent first.
+        """
+        with self._lock:
+            return list(reversed(self._slowEvents))
+
+    def get_statistics(self):
+        """Return a dictionary with the statistics per span.
+
+        key: span name;
+        value: dictionary with calls, and total, mean, p95, and max duration in seconds.
+        The 95th percentile refers to the most recent calls.
+        """
+        with self._lock:
+            spans = {name: (spanData[0], spanData[1], spanData[2], sorted(spanData[3])) for name, spanData in self._spans.items()}
+        statistics = {}
+        for name, (calls, total, maximum, durations) in spans.items():
+            statistics[name] = dict(
+                calls=calls,
+                total=total,
+                mean=total / calls,
+                p95=durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+                max=maximum,
+                )
+        return statistics
+
+    def reset(self):
+        """Discard the data collected."""
+        with self._lock:
+            self._spans = {}
+            # key: span name; value: list [calls, total, max, recent durations]
+            self._counters = {}
+            self._events = deque(maxlen=self.MAX_EVENTS)
+            # Trace events as tuples (phase, name, start, duration or value, thread ID)
+            self._slowEvents = deque(maxlen=self.MAX_SLOW_EVENTS)
+            self._startCounter = perf_counter()
+            self._startTime = time()
+
+    def span(self, name):
+        """Return a context manager timing a block.
+
+        Positional arguments:
+            name: str -- Span name.
+        """
+        if not self.enabled:
+            return NO_SPAN
+
+        return Span(self, name)
+
+    def timed(self, name):
+        """Return a decorator timing a function.
+
+        Positional arguments:
+            name: str -- Span name.
+        """
+
+        def decorator(function):
+
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+
+                start = perf_counter()
+                try:
+                    return function(*args, **kwargs)
+
+                finally:
+                    self.add_event(name, start, perf_counter())
+
+            return wrapper
+
+        return decorator
+
+    def write_trace(self, filePath):
+        """Write the session trace to a JSON file.
+
+        Positional arguments:
+            filePath: str -- Path of the trace file.
+
+        Besides the trace events, the file contains the span statistics
+        and the counter values.
+        """
+        with self._lock:
+            events = list(self._events)
+        processId = os.getpid()
+        traceEvents = []
+        for phase, name, start, value, threadId in events:
+            traceEvent = dict(
+                name=name,
+                ph=phase,
+                ts=round((start - self._startCounter) * 1e6, 1),
+                pid=processId,
+                tid=threadId,
+                )
+            if phase == 'X':
+                traceEvent['dur'] = round(value * 1e6, 1)
+            else:
+                traceEvent['args'] = {name: value}
+            traceEvents.append(traceEvent)
+        traceData = dict(
+            traceEvents=traceEvents,
+            displayTimeUnit='ms',
+            otherData=dict(
+                startTime=self._startTime,
+                statistics=self.get_statistics(),
+                counters=self.get_counters(),
+                ),
+            )
+        with open(filePath, 'w', encoding='utf-8') as f:
+            json.dump(traceData, f)
+
+
+NO_SPAN = NoSpan()
+profiler = Profiler()
+# The application's profiler
@@ -0,0 +1,485 @@
+"""Provide a class for the SQLite project database.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from contextlib import closing
+import json
+import os
+import sqlite3
+
+from mdnvlib.json.json_file import JsonFile
+from mdnvlib.novx_globals import CH_ROOT
+from mdnvlib.novx_globals import CR_ROOT
+from mdnvlib.novx_globals import Error
+from mdnvlib.novx_globals import IT_ROOT
+from mdnvlib.novx_globals import LC_ROOT
+from mdnvlib.novx_globals import PL_ROOT
+from mdnvlib.novx_globals import PN_ROOT
+from mdnvlib.novx_globals import _
+from mdnvlib.novx_globals import intersection
+from mdnvlib.novx_globals import norm_path
+from mdnvlib.sqlite.sqlite_section import SqliteSection
+
+
+class SqliteFile(JsonFile):
+    """SQLite project database representation.
+
+    Public methods:
+        get_related_sections(elemId) -- Return the IDs of the sections related to an element.
+        get_sections_by_date(startDate, endDate) -- Return the IDs of the sections within a date range.
+        read_header() -- Read the project metadata and the word count log.
+
+    Each element is a table row holding the element's JSON data,
+    so the database converts losslessly to and from the JSON project file.
+    Section references, links, and the word count log have their own tables.
+    The section content is read on first access.
+    Saving writes only the rows that have changed since the database
+    was last read or written, in one transaction.
+    """
+    DESCRIPTION = _('mdnovel database')
+    EXTENSION = '.mdnvdb'
+
+    _TABLES = {
+        'project': ('key', 'value'),
+        'chapters': ('id', 'position', 'data'),
+        'sections': ('id', 'chapter', 'position', 'date', 'day', 'word_count', 'data'),
+        'section_contents': ('id', 'content'),
+        'world_elements': ('id', 'kind', 'position', 'data'),
+        'plot_lines': ('id', 'position', 'data'),
+        'plot_points': ('id', 'plot_line', 'position', 'data'),
+        'project_notes': ('id', 'position', 'data'),
+        'relations': ('owner', 'kind', 'position', 'related'),
+        'links': ('element', 'position', 'path', 'full_path'),
+        'word_count_log': ('date', 'count', 'total_count'),
+    }
+    # key: table name; value: columns.
+    # The first column is the key for changing rows.
+
+    _SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS project (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE IF NOT EXISTS chapters (id TEXT PRIMARY KEY, position INTEGER, data TEXT);
+        CREATE TABLE IF NOT EXISTS sections (id TEXT PRIMARY KEY, chapter TEXT, position INTEGER,
+            date TEXT, day TEXT, word_count INTEGER, data TEXT);
+        CREATE INDEX IF NOT EXISTS sections_chapter ON sections (chapter, position);
+        CREATE INDEX IF NOT EXISTS sections_date ON sections (date);
+        CREATE TABLE IF NOT EXISTS section_contents (id TEXT PRIMARY KEY, content TEXT);
+        CREATE TABLE IF NOT EXISTS world_elements (id TEXT PRIMARY KEY, kind TEXT, position INTEGER, data TEXT);
+        CREATE TABLE IF NOT EXISTS plot_lines (id TEXT PRIMARY KEY, position INTEGER, data TEXT);
+        CREATE TABLE IF NOT EXISTS plot_points (id TEXT PRIMARY KEY, plot_line TEXT, position INTEGER, data TEXT);
+        CREATE TABLE IF NOT EXISTS project_notes (id TEXT PRIMARY KEY, position INTEGER, data TEXT);
+        CREATE TABLE IF NOT EXISTS relations (owner TEXT, kind TEXT, position INTEGER, related TEXT,
+            PRIMARY KEY (owner, kind, position));
+        CREATE INDEX IF NOT EXISTS relations_related ON relations (related);
+        CREATE TABLE IF NOT EXISTS links (element TEXT, position INTEGER, path TEXT, full_path TEXT,
+            PRIMARY KEY (element, position));
+        CREATE TABLE IF NOT EXISTS word_count_log (date TEXT PRIMARY KEY, count INTEGER, total_count INTEGER);
+        '''
+
+    _WORLD_ELEMENTS = {
+        'CHARACTERS': CR_ROOT,
+        'LOCATIONS': LC_ROOT,
+        'ITEMS': IT_ROOT,
+    }
+    # key: JSON collection and value of the "kind" column; value: tree root.
+
+    _SECTION_RELATIONS = ('Characters', 'Locations', 'Items')
+    _PLOT_LINE_RELATIONS = ('Sections',)
+    # JSON keys of the lists stored in the relations table.
+
+    _PROJECT_ID = 'PROJECT'
+    # Element ID of the project level links.
+
+    def __init__(self, filePath, **kwargs):
+        """Initialize instance variables.
+
+        Positional arguments:
+            filePath: str -- path to the database file.
+
+        Optional arguments:
+            kwargs -- keyword arguments (not used here).
+
+        Extends the superclass constructor.
+        """
+        super().__init__(filePath, **kwargs)
+        self._dbPath = None
+        # Path of the database the rows have been read from or written to.
+        self._rows = {}
+        # key: table name; value: dict (key: first column value; value: tuple of rows)
+        self._wordCounts = {}
+        # key: section ID; value: word count read from the database
+        self._pendingContents = 0
+        # Number of section contents not yet read
+        self._contentConnection = None
+        # Database connection for reading section contents
+
+    def get_related_sections(self, elemId):
+        """Return the IDs of the sections related to an element, in book order.
+
+        Positional arguments:
+            elemId: str -- ID of a character, location, item, or plot line.
+
+        The query refers to the database as last written.
+        Raise the "Error" exception in case of error.
+        """
+        return self._query_sections(
+            '''WHERE sections.id IN (
+                SELECT owner FROM relations WHERE related = ?
+                UNION SELECT related FROM relations WHERE owner = ? AND kind = 'Sections'
+            ) ORDER BY chapters.position, sections.position''',
+            (elemId, elemId)
+        )
+
+    def get_sections_by_date(self, startDate, endDate):
+        """Return the IDs of the sections within a date range, in chronological order.
+
+        Positional arguments:
+            startDate: str -- ISO formatted first date.
+            endDate: str -- ISO formatted last date.
+
+        The query refers to the database as last written.
+        Raise the "Error" exception in case of error.
+        """
+        return self._query_sections(
+            '''WHERE sections.date BETWEEN ? AND ?
+            ORDER BY sections.date, chapters.position, sections.position''',
+            (startDate, endDate)
+        )
+
+    def read(self):
+        """Read the database, leaving the section contents for later.
+
+        Raise the "Error" exception in case of error.
+        Overrides the superclass method.
+        """
+        if not os.path.isfile(self.filePath):
+            raise Error(f'{_("File not found")}: "{norm_path(self.filePath)}".')
+
+        self._pendingContents = 0
+        try:
+            with closing(sqlite3.connect(self.filePath)) as connection:
+                self._rows = self._select_rows(connection)
+            jsonRoot = self._get_json_root()
+            self._dbPath = self.filePath
+            self._check_version({self.ROOT:jsonRoot})
+            self._read_project(jsonRoot)
+            self._read_locations(jsonRoot)
+            self._read_items(jsonRoot)
+            self._read_characters(jsonRoot)
+            self._read_chapters_and_sections(jsonRoot)
+            self._read_plot_lines_and_points(jsonRoot)
+            self._read_project_notes(jsonRoot)
+            self.adjust_section_types()
+            self._read_word_count_log(jsonRoot)
+        except Exception as ex:
+            raise Error(f"{_('Corrupt project data')} ({str(ex)})")
+
+        self._get_timestamp()
+        self._keep_word_count()
+
+    def read_header(self):
+        """Read the project metadata and the word count log, leaving the other data.
+
+        Only the project, the project links, and the word count log tables are queried.
+        Raise the "Error" exception in case of error.
+        Overrides the superclass method.
+        """
+        if not os.path.isfile(self.filePath):
+            raise Error(f'{_("File not found")}: "{norm_path(self.filePath)}".')
+
+        try:
+            with closing(sqlite3.connect(self.filePath)) as connection:
+                project = dict(connection.execute('SELECT key, value FROM project'))
+                links = connection.execute(
+                    'SELECT path, full_path FROM links WHERE element = ? ORDER BY position',
+                    (self._PROJECT_ID,)
+                    ).fetchall()
+                wcLog = connection.execute('SELECT date, count, total_count FROM word_count_log ORDER BY date').fetchall()
+            jsonRoot = {}
+            jsonRoot['version'] = project.get('version', '')
+            jsonRoot['PROJECT'] = json.loads(project.get('data', '{}'))
+            if links:
+                jsonRoot['PROJECT']['Links'] = dict(links)
+            if wcLog:
+                jsonRoot['PROGRESS'] = {wcDate:[count, totalCount] for wcDate, count, totalCount in wcLog}
+            self._check_version({self.ROOT:jsonRoot})
+            self._read_project(jsonRoot)
+            self._read_word_count_log(jsonRoot)
+        except Exception as ex:
+            raise Error(f"{_('Corrupt project data')} ({str(ex)})")
+
+        self._get_timestamp()
+
+    def write(self):
+        """Write the rows changed since the database was last read or written.
+
+        Raise the "Error" exception in case of error.
+        Overrides the superclass method.
+        """
+        self._update_word_count_log()
+        self.adjust_section_types()
+        if self.filePath != self._dbPath:
+            # Start a new database, with all section contents.
+            for section in self.novel.sections.values():
+                if isinstance(section, SqliteSection):
+                    section.load_content()
+            if os.path.isfile(self.filePath):
+                try:
+                    os.replace(self.filePath, f'{self.filePath}.bak')
+                except:
+                    raise Error(f'{_("Cannot overwrite file")}: "{norm_path(self.filePath)}".')
+
+            self._rows = {}
+        rows = self._get_rows()
+        try:
+            with closing(sqlite3.connect(self.filePath)) as connection:
+                connection.executescript(self._SCHEMA)
+                with connection:
+                    self._write_rows(connection, rows)
+        except sqlite3.Error as ex:
+            raise Error(f'{_("Cannot write file")}: "{norm_path(self.filePath)}" ({str(ex)}).')
+
+        self._rows = rows
+        self._dbPath = self.filePath
+        self._get_timestamp()
+
+    def _add_links(self, rows, elemId, jsonElement):
+        """Move the element's links from the JSON data to the links table rows."""
+        links = jsonElement.pop('Links', {})
+        if links:
+            rows['links'][elemId] = tuple(
+                (elemId, position, path, fullPath) for position, (path, fullPath) in enumerate(links.items())
+            )
+
+    def _add_relations(self, rows, elemId, jsonElement, keys):
+        """Move the element's reference lists from the JSON data to the relations table rows."""
+        relations = []
+        for kind in keys:
+            for position, related in enumerate(jsonElement.pop(kind, [])):
+                relations.append((elemId, kind, position, related))
+        if relations:
+            rows['relations'][elemId] = tuple(sorted(relations))
+
+    def _dumps(self, jsonElement):
+        return json.dumps(jsonElement, ensure_ascii=False)
+
+    def _get_content_reader(self, scId):
+        """Return a callback reading the section content from the database.
+
+        The callbacks share a connection that is closed
+        when the last pending content has been read.
+        """
+        self._pendingContents += 1
+
+        def read_content():
+            if self._contentConnection is None:
+                self._contentConnection = sqlite3.connect(self._dbPath, check_same_thread=False)
+            row = self._contentConnection.execute('SELECT content FROM section_contents WHERE id = ?', (scId,)).fetchone()
+            self._pendingContents -= 1
+            if not self._pendingContents:
+                self._contentConnection.close()
+                self._contentConnection = None
+            if row is None:
+                return None
+
+            self._rows['section_contents'][scId] = ((scId, row[0]),)
+            return row[0]
+
+        return read_content
+
+    def _get_json_root(self):
+        """Return the project data read from the table rows, without section contents."""
+        rows = self._rows
+        jsonRoot = {}
+        project = dict(row for value in rows['project'].values() for row in value)
+        jsonRoot['version'] = project.get('version', '')
+        jsonRoot['PROJECT'] = json.loads(project.get('data', '{}'))
+
+        links = {}
+        for value in rows['links'].values():
+            for elemId, __, path, fullPath in value:
+                links.setdefault(elemId, {})[path] = fullPath
+        relations = {}
+        for value in rows['relations'].values():
+            for owner, kind, __, related in value:
+                relations.setdefault(owner, {}).setdefault(kind, []).append(related)
+
+        def get_element(elemId, data):
+            jsonElement = json.loads(data)
+            if elemId in links:
+                jsonElement['Links'] = links[elemId]
+            jsonElement.update(relations.get(elemId, {}))
+            return jsonElement
+
+        if self._PROJECT_ID in links:
+            jsonRoot['PROJECT']['Links'] = links[self._PROJECT_ID]
+        for ((chId, __, data),) in self._sorted(rows['chapters'], 1):
+            jsonRoot.setdefault('CHAPTERS', {})[chId] = get_element(chId, data)
+        self._wordCounts = {}
+        for ((scId, chId, __, __, __, wordCount, data),) in self._sorted(rows['sections'], 2):
+            jsonRoot['CHAPTERS'][chId].setdefault('SECTIONS', {})[scId] = get_element(scId, data)
+            self._wordCounts[scId] = wordCount
+        for ((elemId, kind, __, data),) in self._sorted(rows['world_elements'], 2):
+            jsonRoot.setdefault(kind, {})[elemId] = get_element(elemId, data)
+        for ((plId, __, data),) in self._sorted(rows['plot_lines'], 1):
+            jsonRoot.setdefault('ARCS', {})[plId] = get_element(plId, data)
+        for ((ppId, plId, __, data),) in self._sorted(rows['plot_points'], 2):
+            jsonRoot['ARCS'][plId].setdefault('POINTS', {})[ppId] = get_element(ppId, data)
+        for ((pnId, __, data),) in self._sorted(rows['project_notes'], 1):
+            jsonRoot.setdefault('PROJECTNOTES', {})[pnId] = get_element(pnId, data)
+
+        if rows['word_count_log']:
+            jsonRoot['PROGRESS'] = {}
+            for wcDate in sorted(rows['word_count_log']):
+                ((__, count, totalCount),) = rows['word_count_log'][wcDate]
+                jsonRoot['PROGRESS'][wcDate] = [count, totalCount]
+        return jsonRoot
+
+    def _get_rows(self):
+        """Return the table rows of the project, without the section contents not read."""
+        rows = {table:{} for table in self._TABLES}
+        jsonProject = self.novelCnv.export_data(self.novel, {})
+        self._add_links(rows, self._PROJECT_ID, jsonProject)
+        rows['project']['version'] = (('version', f'{self.MAJOR_VERSION}.{self.MINOR_VERSION}'),)
+        rows['project']['data'] = (('data', self._dumps(jsonProject)),)
+
+        for chPosition, chId in enumerate(self.novel.tree.get_children(CH_ROOT)):
+            jsonChapter = self.chapterCnv.export_data(self.novel.chapters[chId], {})
+            self._add_links(rows, chId, jsonChapter)
+            rows['chapters'][chId] = ((chId, chPosition, self._dumps(jsonChapter)),)
+            for scPosition, scId in enumerate(self.novel.tree.get_children(chId)):
+                section = self.novel.sections[scId]
+                if isinstance(section, SqliteSection) and not section.contentLoaded:
+                    # Export the other data without reading the content.
+                    readContent = section.read_content
+                    section.read_content = None
+                    jsonSection = self.sectionCnv.export_data(section, {})
+                    section.read_content = readContent
+                else:
+                    jsonSection = self.sectionCnv.export_data(section, {})
+                    rows['section_contents'][scId] = ((scId, jsonSection.pop('Content', None)),)
+                self._add_links(rows, scId, jsonSection)
+                self._add_relations(rows, scId, jsonSection, self._SECTION_RELATIONS)
+                rows['sections'][scId] = ((
+                    scId,
+                    chId,
+                    scPosition,
+                    jsonSection.get('Date', None),
+                    jsonSection.get('Day', None),
+                    section.wordCount,
+                    self._dumps(jsonSection),
+                ),)
+
+        for kind, root in self._WORLD_ELEMENTS.items():
+            if kind == 'CHARACTERS':
+                elements = self.novel.characters
+                converter = self.characterCnv
+            elif kind == 'LOCATIONS':
+                elements = self.novel.locations
+                converter = self.worldElementCnv
+            else:
+                elements = self.novel.items
+                converter = self.worldElementCnv
+            for position, elemId in enumerate(self.novel.tree.get_children(root)):
+                jsonElement = converter.export_data(elements[elemId], {})
+                self._add_links(rows, elemId, jsonElement)
+                rows['world_elements'][elemId] = ((elemId, kind, position, self._dumps(jsonElement)),)
+
+        for plPosition, plId in enumerate(self.novel.tree.get_children(PL_ROOT)):
+            jsonPlotLine = self.plotLineCnv.export_data(self.novel.plotLines[plId], {})
+            self._add_links(rows, plId, jsonPlotLine)
+            self._add_relations(rows, plId, jsonPlotLine, self._PLOT_LINE_RELATIONS)
+            rows['plot_lines'][plId] = ((plId, plPosition, self._dumps(jsonPlotLine)),)
+            for ppPosition, ppId in enumerate(self.novel.tree.get_children(plId)):
+                jsonPlotPoint = self.plotPointCnv.export_data(self.novel.plotPoints[ppId], {})
+                self._add_links(rows, ppId, jsonPlotPoint)
+                rows['plot_points'][ppId] = ((ppId, plId, ppPosition, self._dumps(jsonPlotPoint)),)
+
+        for position, pnId in enumerate(self.novel.tree.get_children(PN_ROOT)):
+            jsonProjectNote = self.basicElementCnv.export_data(self.novel.projectNotes[pnId], {})
+            self._add_links(rows, pnId, jsonProjectNote)
+            rows['project_notes'][pnId] = ((pnId, position, self._dumps(jsonProjectNote)),)
+
+        # Like the JSON file, keep only the entries with changed word counts.
+        if self.wcLog and self.novel.saveWordCount:
+            for wcDate, wcCount, wcTotalCount in self.wcLog.get_changes():
+                rows['word_count_log'][wcDate] = ((wcDate, wcCount, wcTotalCount),)
+        return rows
+
+    def _query_sections(self, condition, parameters):
+        """Return the IDs of the sections selected by condition."""
+        try:
+            with closing(sqlite3.connect(self.filePath)) as connection:
+                result = connection.execute(
+                    f'''SELECT sections.id FROM sections
+                    JOIN chapters ON chapters.id = sections.chapter
+                    {condition}''',
+                    parameters
+                ).fetchall()
+        except sqlite3.Error as ex:
+            raise Error(f'{_("Cannot read file")}: "{norm_path(self.filePath)}" ({str(ex)}).')
+
+        return [row[0] for row in result]
+
+    def _read_section(self, jsonSection, scId):
+        """Read data at section level from the json element tree.
+
+        Create a section that reads its content on first access.
+        Overrides the superclass method.
+        """
+        section = SqliteSection(on_element_change=self.on_element_change)
+        self.novel.sections[scId] = section
+        self.sectionCnv.import_data(section, jsonSection)
+        section.wordCount = self._wordCounts.get(scId, 0)
+        section.read_content = self._get_content_reader(scId)
+
+        # Remove dead references.
+        section.characters = intersection(section.characters, self.novel.characters)
+        section.locations = intersection(section.locations, self.novel.locations)
+        section.items = intersection(section.items, self.novel.items)
+
+    def _select_rows(self, connection):
+        """Return the rows of all tables, grouped by the first column.
+
+        The rows of a group are sorted, like the rows built for writing.
+        """
+        rows = {}
+        for table, columns in self._TABLES.items():
+            rows[table] = {}
+            if table == 'section_contents':
+                continue
+
+            for row in connection.execute(f'SELECT {", ".join(columns)} FROM {table}'):
+                rows[table].setdefault(row[0], []).append(row)
+            for key, value in rows[table].items():
+                rows[table][key] = tuple(sorted(value))
+        return rows
+
+    def _sorted(self, tableRows, positionIndex):
+        """Return the rows of a table with one row per key, ordered by position."""
+        return sorted(tableRows.values(), key=lambda value: value[0][positionIndex])
+
+    def _write_rows(self, connection, rows):
+        """Replace the rows that differ from the rows last read or written."""
+        removedSections = []
+        for table, columns in self._TABLES.items():
+            oldRows = self._rows.get(table, {})
+            newRows = rows[table]
+            if table == 'section_contents':
+                # Contents not read are missing, so compare only the contents read.
+                removedKeys = removedSections
+            else:
+                removedKeys = [key for key in oldRows if not key in newRows]
+            changedKeys = [key for key, value in newRows.items() if oldRows.get(key, None) != value]
+            if table == 'sections':
+                removedSections = removedKeys
+            if removedKeys or changedKeys:
+                connection.executemany(
+                    f'DELETE FROM {table} WHERE {columns[0]} = ?',
+                    [(key,) for key in removedKeys + changedKeys]
+                )
+                connection.executemany(
+                    f'INSERT INTO {table} VALUES ({", ".join("?" * len(columns))})',
+                    [row for key in changedKeys for row in newRows[key]]
+                )
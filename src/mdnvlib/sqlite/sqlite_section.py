@@ -0,0 +1,55 @@
+"""Provide a class for a section with its content read on demand.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from mdnvlib.model.section import Section
+
+
+class SqliteSection(Section):
+    """Section representation with the content read on first access.
+
+    Public methods:
+        load_content() -- Read the content, if not done yet.
+
+    Public instance variables:
+        read_content -- Callback returning the section content, or None if the content is loaded.
+
+    Public properties:
+        contentLoaded: bool -- True if the content has been read.
+
+    The word count is set when reading the section,
+    so it is available without loading the content.
+    """
+
+    def __init__(self, read_content=None, **kwargs):
+        """Extends the superclass constructor."""
+        super().__init__(**kwargs)
+        self.read_content = read_content
+
+    @property
+    def contentLoaded(self):
+        return self.read_content is None
+
+    @property
+    def contentBuffer(self):
+        self.load_content()
+        return Section.contentBuffer.fget(self)
+
+    @property
+    def sectionContent(self):
+        self.load_content()
+        return Section.sectionContent.fget(self)
+
+    @sectionContent.setter
+    def sectionContent(self, text):
+        """Set sectionContent, discarding the content not yet read."""
+        self.read_content = None
+        Section.sectionContent.fset(self, text)
+
+    def load_content(self):
+        """Read the content, if not done yet."""
+        if self.read_content is not None:
+            self._sectionContent = self.read_content()
+            self.read_content = None
@@ -9,6 +9,7 @@ import re
 from mdnvlib.novx_globals import CH_ROOT
 from mdnvlib.novx_globals import _
 from mdnvlib.nv_globals import prefs
+from mdnvlib.profiler import profiler
 from mdnvlib.view.contents_window.rich_text_nv import RichTextNv
 import tkinter as tk
 from apptk.view.view_component_base import ViewComponentBase
@@ -73,6 +74,7 @@ class ContentsViewer(ViewComponentBase, RichTextNv):
             except KeyError:
                 pass
 
+    @profiler.timed('ContentsViewer.view_text')
     def view_text(self):
         """Build a list of "tagged text" tuples and send it to the text box."""
 
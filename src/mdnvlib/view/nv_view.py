@@ -32,6 +32,7 @@ from mdnvlib.novx_globals import PN_ROOT
 from mdnvlib.novx_globals import SECTIONLIST_SUFFIX
 from mdnvlib.novx_globals import SECTIONS_SUFFIX
 from mdnvlib.novx_globals import STAGES_SUFFIX
+from mdnvlib.novx_globals import STATISTICS_SUFFIX
 from mdnvlib.novx_globals import _
 from mdnvlib.nv_globals import HOME_URL
 from mdnvlib.nv_globals import open_help
@@ -43,6 +44,7 @@ from mdnvlib.view.platform.platform_settings import KEYS
 from mdnvlib.view.platform.platform_settings import MOUSE
 from mdnvlib.view.platform.platform_settings import PLATFORM
 from mdnvlib.view.pop_up.export_options_window import ExportOptionsWindow
+from mdnvlib.view.pop_up.snapshot_window import SnapshotWindow
 from mdnvlib.view.pop_up.view_options_window import ViewOptionsWindow
 from mdnvlib.view.properties_window.properties_viewer import PropertiesViewer
 from mdnvlib.view.toolbar.toolbar import Toolbar
@@ -62,6 +64,9 @@ class NvView(ViewBase):
     _INI_NR_NEW_SECTIONS = 1
     # initial value when asking for the number of sections to add
 
+    _POLL_INTERVAL = 50
+    # milliseconds between checks whether a worker thread has finished
+
     def __init__(self, model, controller, title):
         """Extends the superclass constructor."""
         super().__init__(model, controller, title)
@@ -199,6 +204,7 @@ class NvView(ViewBase):
         self.mainMenu.entryconfig(_('Export'), state='disabled')
         self.fileMenu.entryconfig(_('Reload'), state='disabled')
         self.fileMenu.entryconfig(_('Restore backup'), state='disabled')
+        self.fileMenu.entryconfig(_('Restore snapshot...'), state='disabled')
         self.fileMenu.entryconfig(_('Refresh Tree'), state='disabled')
         self.fileMenu.entryconfig(_('Open Project folder'), state='disabled')
         self.fileMenu.entryconfig(_('Save'), state='disabled')
@@ -261,6 +267,7 @@ class NvView(ViewBase):
         self.mainMenu.entryconfig(_('Export'), state='normal')
         self.fileMenu.entryconfig(_('Reload'), state='normal')
         self.fileMenu.entryconfig(_('Restore backup'), state='normal')
+        self.fileMenu.entryconfig(_('Restore snapshot...'), state='normal')
         self.fileMenu.entryconfig(_('Refresh Tree'), state='normal')
         self.fileMenu.entryconfig(_('Open Project folder'), state='normal')
         self.fileMenu.entryconfig(_('Save'), state='normal')
@@ -384,6 +391,51 @@ class NvView(ViewBase):
         self.statusBar.config(fg='black')
         self.statusBar.config(text=message)
 
+    def wait_for_thread(self, thread, message):
+        """Keep the user interface responsive while a worker thread is running.
+        
+        Positional arguments:
+            thread: Thread -- Worker thread that has been started.
+            message: str -- Text to display next to the progress bar.
+            
+        Show a progress bar and a "Stop waiting" button below the status bar.
+        Other user input is blocked while waiting.
+        Return True if the thread has finished, or False if the user has stopped waiting.
+        The thread cannot be interrupted, so it keeps running after the user has stopped waiting;
+        the caller is expected to discard its result.
+        """
+
+        def poll():
+            if state['isAbandoned']:
+                return
+
+            if thread.is_alive():
+                self.root.after(self._POLL_INTERVAL, poll)
+                return
+
+            state['isFinished'] = True
+            isDone.set(True)
+
+        def stop_waiting():
+            state['isAbandoned'] = True
+            isDone.set(True)
+
+        state = dict(isFinished=False, isAbandoned=False)
+        isDone = tk.BooleanVar(value=False)
+        progressFrame = ttk.Frame(self.root)
+        progressFrame.pack(before=self.pathBar, expand=False, fill='x')
+        ttk.Label(progressFrame, text=message).pack(side='left', padx=5)
+        ttk.Button(progressFrame, text=_('Stop waiting'), command=stop_waiting).pack(side='right', padx=5, pady=2)
+        progressBar = ttk.Progressbar(progressFrame, mode='indeterminate')
+        progressBar.pack(side='left', expand=True, fill='x', padx=5)
+        progressBar.start()
+        progressFrame.grab_set()
+        self.root.after(self._POLL_INTERVAL, poll)
+        self.root.wait_variable(isDone)
+        progressFrame.grab_release()
+        progressFrame.destroy()
+        return state['isFinished']
+
     def toggle_contents_view(self, event=None):
         """Show/hide the contents viewer text box."""
         if self.middleFrame.winfo_manager():
@@ -466,6 +518,7 @@ class NvView(ViewBase):
         self.fileMenu.add_command(label=_('Open...'), accelerator=KEYS.OPEN_PROJECT[1], command=self._ctrl.open_project)
         self.fileMenu.add_command(label=_('Reload'), accelerator=KEYS.RELOAD_PROJECT[1], command=self._ctrl.reload_project)
         self.fileMenu.add_command(label=_('Restore backup'), accelerator=KEYS.RESTORE_BACKUP[1], command=self._ctrl.restore_backup)
+        self.fileMenu.add_command(label=_('Restore snapshot...'), command=self._open_snapshots)
         self.fileMenu.add_separator()
         self.fileMenu.add_command(label=_('Refresh Tree'), accelerator=KEYS.REFRESH_TREE[1], command=self._ctrl.refresh_views)
         self.fileMenu.add_separator()
@@ -604,6 +657,7 @@ class NvView(ViewBase):
         self.mainMenu.add_cascade(label=_('Export'), menu=self.exportMenu)
         self.exportMenu.add_command(label=_('Manuscript'), command=lambda: self._ctrl.export_document(''))
         self.exportMenu.add_command(label=_('Brief synopsis'), command=lambda: self._ctrl.export_document(BRF_SYNOPSIS_SUFFIX))
+        self.exportMenu.add_command(label=_('Text statistics'), command=lambda: self._ctrl.export_document(STATISTICS_SUFFIX))
         self.exportMenu.add_separator()
         self.exportMenu.add_command(label=_('Options'), command=self._open_export_options)
 
@@ -628,6 +682,11 @@ class NvView(ViewBase):
     def _open_help(self, event=None):
         open_help('')
 
+    def _open_snapshots(self, event=None):
+        """Open a toplevel window to select a snapshot to restore."""
+        SnapshotWindow(self._mdl, self, self._ctrl)
+        return 'break'
+
     def _open_view_options(self, event=None):
         """Open a toplevel window to edit the view options."""
         ViewOptionsWindow(self._mdl, self, self._ctrl)
@@ -6,6 +6,9 @@ License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
 from tkinter import ttk
 
+from mdnvlib.exporter.nv_auto_exporter import NvAutoExporter
+from mdnvlib.exporter.nv_doc_exporter import NvDocExporter
+from mdnvlib.exporter.nv_html_reporter import NvHtmlReporter
 from mdnvlib.novx_globals import _
 from mdnvlib.nv_globals import open_help
 from mdnvlib.nv_globals import prefs
@@ -38,6 +41,24 @@ class ExportOptionsWindow(ModalDialog):
             ).pack(padx=5, pady=5, anchor='w')
         self._askDocOpen.trace('w', self._change_ask_doc_open)
 
+        # Checkboxes: Documents to keep up to date when saving.
+        frame2 = ttk.LabelFrame(window, text=_('Update when saving'))
+        frame2.pack(fill='both', side='left', padx=5)
+        autoExport = NvAutoExporter.get_suffixes(prefs['auto_export'])
+        self._autoExport = {}
+        for fileClass in NvDocExporter.EXPORT_TARGET_CLASSES + NvHtmlReporter.EXPORT_TARGET_CLASSES:
+            if fileClass.SUFFIX:
+                label = fileClass.DESCRIPTION
+            else:
+                label = _('Manuscript')
+            self._autoExport[fileClass.SUFFIX] = tk.BooleanVar(frame2, value=fileClass.SUFFIX in autoExport)
+            ttk.Checkbutton(
+                frame2,
+                text=label,
+                variable=self._autoExport[fileClass.SUFFIX],
+                command=self._change_auto_export,
+                ).pack(padx=5, anchor='w')
+
         ttk.Separator(self, orient='horizontal').pack(fill='x')
 
         # "Close" button.
@@ -60,5 +81,9 @@ class ExportOptionsWindow(ModalDialog):
     def _change_ask_doc_open(self, *args):
         prefs['ask_doc_open'] = self._askDocOpen.get()
 
+    def _change_auto_export(self, *args):
+        suffixes = [suffix for suffix, var in self._autoExport.items() if var.get()]
+        prefs['auto_export'] = NvAutoExporter.get_setting(suffixes)
+
     def _open_help(self, event=None):
         open_help('export_menu#options')
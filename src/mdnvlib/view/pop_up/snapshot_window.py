@@ -0,0 +1,91 @@
+"""Provide a class for a project snapshot browser.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from tkinter import ttk
+
+from mdnvlib.novx_globals import _
+from mdnvlib.nv_globals import prefs
+from apptk.view.modal_dialog import ModalDialog
+import tkinter as tk
+
+
+class SnapshotWindow(ModalDialog):
+    """A pop-up window listing the snapshots of the project."""
+
+    def __init__(self, model, view, controller, **kw):
+        ModalDialog.__init__(self, model, view, controller, **kw)
+        self.title(_('Snapshots'))
+        window = ttk.Frame(self)
+        window.pack(
+            fill='both',
+            expand=True,
+            padx=5,
+            pady=5
+            )
+
+        # List of snapshots, newest first.
+        listFrame = ttk.Frame(window)
+        listFrame.pack(fill='both', expand=True)
+        self._snapshotList = ttk.Treeview(
+            listFrame,
+            columns=('size',),
+            selectmode='browse',
+            height=12,
+            )
+        scrollY = ttk.Scrollbar(listFrame, orient='vertical', command=self._snapshotList.yview)
+        self._snapshotList.configure(yscrollcommand=scrollY.set)
+        scrollY.pack(side='right', fill='y')
+        self._snapshotList.pack(side='left', fill='both', expand=True)
+        self._snapshotList.heading('#0', text=_('Saved'))
+        self._snapshotList.heading('size', text=_('New data'))
+        self._snapshotList.column('#0', width=180)
+        self._snapshotList.column('size', width=100, anchor='e')
+        for snapshot in self._ctrl.get_snapshots():
+            self._snapshotList.insert(
+                '',
+                'end',
+                snapshot['id'],
+                text=snapshot['created'],
+                values=(f"{snapshot['newBytes'] / 1024:.1f} KiB",),
+                )
+        self._snapshotList.bind('<Double-1>', self._restore)
+
+        # Checkbox: Take a snapshot with each save.
+        self._saveSnapshots = tk.BooleanVar(window, value=prefs['save_snapshots'])
+        ttk.Checkbutton(
+            window,
+            text=_('Take a snapshot with each save'),
+            variable=self._saveSnapshots,
+            command=self._change_save_snapshots,
+            ).pack(padx=5, pady=5, anchor='w')
+
+        ttk.Separator(self, orient='horizontal').pack(fill='x')
+
+        # "Close" button.
+        ttk.Button(
+            self,
+            text=_('Close'),
+            command=self.destroy
+            ).pack(padx=5, pady=5, side='right')
+
+        # "Restore" button.
+        ttk.Button(
+            self,
+            text=_('Restore'),
+            command=self._restore
+            ).pack(padx=5, pady=5, side='right')
+
+    def _change_save_snapshots(self, *args):
+        prefs['save_snapshots'] = self._saveSnapshots.get()
+
+    def _restore(self, event=None):
+        try:
+            snapshotId = self._snapshotList.selection()[0]
+        except IndexError:
+            return
+
+        self.destroy()
+        self._ctrl.restore_snapshot(snapshotId)
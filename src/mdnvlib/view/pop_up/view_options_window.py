@@ -69,6 +69,15 @@ class ViewOptionsWindow(ModalDialog):
             command=self._change_localize_date,
             ).pack(padx=5, pady=5, anchor='w')
 
+        # Checkbox for lazy tree branches.
+        self._lazyTree = tk.BooleanVar(frame1, value=prefs['lazy_tree'])
+        ttk.Checkbutton(
+            frame1,
+            text=_('Load collapsed tree branches on demand'),
+            variable=self._lazyTree,
+            command=self._change_lazy_tree,
+            ).pack(padx=5, pady=5, anchor='w')
+
         # Listbox for column reordering.
         ttk.Label(
             frame2,
@@ -126,6 +135,10 @@ class ViewOptionsWindow(ModalDialog):
         prefs['large_icons'] = self._largeIcons.get()
         self._ui.show_info(_('The change takes effect after next startup.'), title=f'{_("Change icon size")}')
 
+    def _change_lazy_tree(self, *args):
+        prefs['lazy_tree'] = self._lazyTree.get()
+        self._ui.show_info(_('The change takes effect after reopening the project.'), title=f'{_("Load collapsed tree branches on demand")}')
+
     def _change_localize_date(self, *args):
         prefs['localize_date'] = self._localizeDate.get()
         self._ui.tv.refresh()
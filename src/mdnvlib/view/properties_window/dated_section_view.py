@@ -7,7 +7,6 @@ License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 from datetime import date
 from datetime import datetime
 from datetime import time
-from datetime import timedelta
 from tkinter import ttk
 
 from mdnvlib.model.date_time_tools import get_specific_date
@@ -425,11 +424,6 @@ class DatedSectionView(RelatedSectionView):
 
     def _auto_set_duration(self):
         """Calculate section duration from the start of the next section."""
-
-        def day_to_date(day, refDate):
-            deltaDays = timedelta(days=int(day))
-            return date.isoformat(refDate + deltaDays)
-
         nextScId = self._ui.tv.next_node(self._elementId)
         if not nextScId:
             return
@@ -450,29 +444,16 @@ class DatedSectionView(RelatedSectionView):
                 )
             return
 
-        try:
-            refDateIso = self._mdl.novel.referenceDate
-            refDate = date.fromisoformat(refDateIso)
-        except:
-            refDate = date.today()
-            refDateIso = date.isoformat(refDate)
-        if self._mdl.novel.sections[nextScId].date:
-            nextDateIso = self._mdl.novel.sections[nextScId].date
-        elif self._mdl.novel.sections[nextScId].day:
-            nextDateIso = day_to_date(self._mdl.novel.sections[nextScId].day, refDate)
-        elif self._element.day:
-            nextDateIso = self._element.day
-        else:
-            nextDateIso = refDateIso
-        if self._element.date:
-            thisDateIso = self._element.date
-        elif self._element.day:
-            thisDateIso = day_to_date(self._element.day, refDate)
-        else:
-            thisDateIso = nextDateIso
-
-        StartDateTime = datetime.fromisoformat(f'{thisDateIso}T{thisTimeIso}')
-        endDateTime = datetime.fromisoformat(f'{nextDateIso}T{nextTimeIso}')
+        # A section without date or day is assumed to take place on the other section's date.
+        StartDateTime = self._mdl.novel.storyTime.get_start(self._elementId)
+        endDateTime = self._mdl.novel.storyTime.get_start(nextScId)
+        if StartDateTime is None and endDateTime is None:
+            StartDateTime = datetime.combine(date.today(), time.fromisoformat(thisTimeIso))
+            endDateTime = datetime.combine(date.today(), time.fromisoformat(nextTimeIso))
+        elif StartDateTime is None:
+            StartDateTime = datetime.combine(endDateTime.date(), time.fromisoformat(thisTimeIso))
+        elif endDateTime is None:
+            endDateTime = datetime.combine(StartDateTime.date(), time.fromisoformat(nextTimeIso))
         sectionDuration = endDateTime - StartDateTime
         lastsHours = sectionDuration.seconds // 3600
         lastsMinutes = (sectionDuration.seconds % 3600) // 60
@@ -29,6 +29,7 @@ from mdnvlib.model.nv_treeview import NvTreeview
 from mdnvlib.nv_globals import get_section_date_str
 from mdnvlib.nv_globals import prefs
 from mdnvlib.nv_globals import to_string
+from mdnvlib.profiler import profiler
 from mdnvlib.view.platform.platform_settings import KEYS
 from mdnvlib.view.platform.platform_settings import MOUSE
 from mdnvlib.view.tree_window.history_list import HistoryList
@@ -89,9 +90,13 @@ class TreeViewer(ViewComponentBase, ttk.Frame):
         ttk.Frame.__init__(self, parent, **kw)
         self._wordsTotal = None
         self.skipUpdate = False
+        self._chapterPositions = {}
+        # key: chapter ID; value: accumulated word count at chapter beginning
 
         # Create a novel tree.
         self.tree = NvTreeview(self)
+        self.tree.lazyBranches = prefs['lazy_tree']
+        self.tree.on_materialize = self._on_materialize_branch
         scrollX = ttk.Scrollbar(self, orient='horizontal', command=self.tree.xview)
         scrollY = ttk.Scrollbar(self.tree, orient='vertical', command=self.tree.yview)
         self.tree.configure(xscrollcommand=scrollX.set)
@@ -150,7 +155,8 @@ class TreeViewer(ViewComponentBase, ttk.Frame):
         self.tree.item(parent, open=False)
         self._update_node_values(parent, collect=True)
         for child in self.tree.get_children(parent):
-            self.close_children(child)
+            if not self.tree.is_detached(child):
+                self.close_children(child)
 
     def collapse_all(self, event=None):
         self.close_children('')
@@ -235,42 +241,7 @@ class TreeViewer(ViewComponentBase, ttk.Frame):
         Positional arguments: 
             thisNode: str -- node ID
         """
-
-        def search_tree(parent, result, flag):
-            """Search the tree for the node ID after thisNode."""
-            for child in self.tree.get_children(parent):
-                if result:
-                    break
-                if child.startswith(prefix):
-                    if prefix == CHAPTER_PREFIX:
-                        if self._mdl.novel.chapters[child].chLevel != self._mdl.novel.chapters[thisNode].chLevel:
-                            continue
-
-                    elif prefix == SECTION_PREFIX:
-                        if self._mdl.novel.sections[thisNode].scType > 1:
-                            if self._mdl.novel.sections[child].scType != self._mdl.novel.sections[thisNode].scType:
-                                continue
-
-                        elif self._mdl.novel.sections[thisNode].scType < 2:
-                            if self._mdl.novel.sections[child].scType > 1:
-                                continue
-
-                    if flag:
-                        result = child
-                        break
-
-                    elif child == thisNode:
-                        flag = True
-                else:
-                    result, flag = search_tree(child, result, flag)
-            return result, flag
-
-        prefix = thisNode[:2]
-        root = self.tree.parent(thisNode)
-        while not root.startswith(ROOT_PREFIX):
-            root = self.tree.parent(root)
-        nextNode, __ = search_tree(root, None, False)
-        return nextNode
+        return self._mdl.get_next_node(thisNode)
 
     def on_quit(self):
         """Write the applicaton's keyword arguments."""
@@ -298,46 +269,13 @@ class TreeViewer(ViewComponentBase, ttk.Frame):
         Positional arguments: 
             thisNode: str -- node ID
         """
-
-        def search_tree(parent, result, prevNode):
-            """Search the tree for the node ID before thisNode."""
-            for child in self.tree.get_children(parent):
-                if result:
-                    break
-
-                if child.startswith(prefix):
-                    if prefix == CHAPTER_PREFIX:
-                        if self._mdl.novel.chapters[child].chLevel != self._mdl.novel.chapters[thisNode].chLevel:
-                            continue
-
-                    elif prefix == SECTION_PREFIX:
-                        if self._mdl.novel.sections[thisNode].scType > 1:
-                            if self._mdl.novel.sections[child].scType != self._mdl.novel.sections[thisNode].scType:
-                                continue
-
-                        elif self._mdl.novel.sections[thisNode].scType < 2:
-                            if self._mdl.novel.sections[child].scType > 1:
-                                continue
-
-                    if child == thisNode:
-                        result = prevNode
-                        break
-                    else:
-                        prevNode = child
-                else:
-                    result, prevNode = search_tree(child, result, prevNode)
-            return result, prevNode
-
-        prefix = thisNode[:2]
-        root = self.tree.parent(thisNode)
-        while not root.startswith(ROOT_PREFIX):
-            root = self.tree.parent(root)
-        prevNode, __ = search_tree(root, None, None)
-        return prevNode
+        return self._mdl.get_prev_node(thisNode)
 
     def reset_view(self):
         """Clear the displayed tree, and reset the browsing history."""
         self._history.reset()
+        self._chapterPositions = {}
+        self.tree.lazyBranches = prefs['lazy_tree']
         for rootElement in self.tree.get_children(''):
             self.tree.item(rootElement, text='')
             # Make the root element "invisible".
@@ -395,6 +333,7 @@ class TreeViewer(ViewComponentBase, ttk.Frame):
         self.collapse_all()
         self.show_branch(PN_ROOT)
 
+    @profiler.timed('TreeViewer.refresh')
     def refresh(self, event=None):
         """Update the tree display to view changes.
         
@@ -413,9 +352,15 @@ class TreeViewer(ViewComponentBase, ttk.Frame):
             """
             for elemId in self.tree.get_children(node):
                 if elemId.startswith(SECTION_PREFIX):
-                    title, nodeValues, nodeTags = self._get_section_row_data(elemId, position=scnPos)
+                    isDetached = self.tree.is_detached(elemId)
+                    if not isDetached:
+                        title, nodeValues, nodeTags = self._get_section_row_data(elemId, position=scnPos)
                     if self._mdl.novel.sections[elemId].scType == 0:
                         scnPos += self._mdl.novel.sections[elemId].wordCount
+                    if isDetached:
+                        # There is no row to update.
+                        continue
+
                 elif elemId.startswith(CHARACTER_PREFIX):
                     title, nodeValues, nodeTags = self._get_character_row_data(elemId)
                 elif elemId.startswith(LOCATION_PREFIX):
@@ -424,6 +369,7 @@ class TreeViewer(ViewComponentBase, ttk.Frame):
                     title, nodeValues, nodeTags = self._get_item_row_data(elemId)
                 elif elemId.startswith(CHAPTER_PREFIX):
                     chpPos = scnPos
+                    self._chapterPositions[elemId] = chpPos
                     # save chapter start position, because the positions of the
                     # chapters sections will now be added to scnPos.
                     scnPos = update_branch(elemId, scnPos)
@@ -434,6 +380,9 @@ class TreeViewer(ViewComponentBase, ttk.Frame):
                     isCollapsed = not self.tree.item(elemId, 'open')
                     title, nodeValues, nodeTags = self._get_plot_line_row_data(elemId, collect=isCollapsed)
                 elif elemId.startswith(PLOT_POINT_PREFIX):
+                    if self.tree.is_detached(elemId):
+                        continue
+
                     title, nodeValues, nodeTags = self._get_plot_point_row_data(elemId)
                 elif elemId.startswith(PRJ_NOTE_PREFIX):
                     title, nodeValues, nodeTags = self._get_prj_note_row_data(elemId)
@@ -988,8 +937,33 @@ class TreeViewer(ViewComponentBase, ttk.Frame):
         return to_string(self._mdl.novel.sections[scId].title), nodeValues, tuple(nodeTags)
 
     def _on_close_branch(self, event):
-        """Event handler for manually collapsing a branch."""
+        """Event handler for manually collapsing a branch.
+        
+        In lazy branch mode, release the branch's rows 
+        if there are more rows than the configured maximum.
+        """
         self._update_node_values(self.tree.selection()[0], collect=True)
+        if self.tree.lazyBranches:
+            if self.tree.count_resident_rows() > int(prefs['max_resident_rows']):
+                self.tree.release(self.tree.focus())
+
+    def _on_materialize_branch(self, parent):
+        """Fill the rows of a lazy branch that has just been inserted into the tree.
+        
+        Positional arguments:
+            parent: str -- Chapter or plot line ID.
+        """
+        if parent.startswith(CHAPTER_PREFIX):
+            scnPos = self._chapterPositions.get(parent, 0)
+            for scId in self.tree.get_children(parent):
+                title, nodeValues, nodeTags = self._get_section_row_data(scId, position=scnPos)
+                if self._mdl.novel.sections[scId].scType == 0:
+                    scnPos += self._mdl.novel.sections[scId].wordCount
+                self.tree.item(scId, text=title, values=nodeValues, tags=nodeTags)
+        elif parent.startswith(PLOT_LINE_PREFIX):
+            for ppId in self.tree.get_children(parent):
+                title, nodeValues, nodeTags = self._get_plot_point_row_data(ppId)
+                self.tree.item(ppId, text=title, values=nodeValues, tags=nodeTags)
 
     def _on_move_node(self, event):
         """Event handler for manually moving a node."""
@@ -1000,6 +974,7 @@ class TreeViewer(ViewComponentBase, ttk.Frame):
 
     def _on_open_branch(self, event):
         """Event handler for manually expanding a branch."""
+        self.tree.materialize(self.tree.focus())
         self._update_node_values(self.tree.selection()[0], collect=False)
 
     def _on_open_context_menu(self, event):
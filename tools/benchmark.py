@@ -0,0 +1,518 @@
+"""Run performance benchmarks on a synthetic mdnovel project.
+
+usage: benchmark.py [-h] [--baseline FILE] [--save-baseline] [--threshold T]
+                    [--repeat N] [--scenario NAME] [--output FILE] [--list]
+                    [--size KEYWORD=VALUE]
+
+Each scenario is timed (best of N runs) and its peak memory allocation
+is measured with tracemalloc. The results can be saved as a JSON baseline.
+When compared with a baseline, the script exits with code 1 if any
+scenario is slower or needs more memory than the threshold allows.
+
+Scenarios requiring a display are skipped if there is none,
+so the suite runs headless on Linux.
+
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from time import perf_counter
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synthetic_project import SyntheticProject
+from mdnvlib.converter.batch_converter import BatchConverter
+from mdnvlib.file.backup_store import BackupStore
+from mdnvlib.file.fragment_cache import FragmentCache
+from mdnvlib.json.json_file import JsonFile
+from mdnvlib.md.md_import import MdImport
+from mdnvlib.mdnov.mdnov_file import MdnovFile
+from mdnvlib.model.novel import Novel
+from mdnvlib.model.nv_model import NvModel
+from mdnvlib.model.nv_tree import NvTree
+from mdnvlib.model.project_library import ProjectLibrary
+from mdnvlib.model.repetition_finder import RepetitionFinder
+from mdnvlib.model.splitter import Splitter
+from mdnvlib.model.text_statistics import TextStatistics
+from mdnvlib.novx_globals import CH_ROOT
+from mdnvlib.novx_globals import CR_ROOT
+from mdnvlib.sqlite.sqlite_file import SqliteFile
+
+DEFAULT_SIZE = dict(
+    parts=3,
+    chapters=30,
+    sections=8,
+    words=600,
+    wcLogDays=1000,
+)
+# 216k words; the other generator defaults apply.
+
+LIBRARY_PROJECTS = 500
+LIBRARY_FILE_TYPES = [JsonFile, MdnovFile, SqliteFile]
+
+
+class Skip(Exception):
+    """Raised by a scenario that cannot run in this environment."""
+    pass
+
+
+class Benchmark:
+    """Benchmark scenarios running on a synthetic project.
+
+    Public methods:
+        get_scenarios() -- Return a list of scenario names.
+        run(name, repeat) -- Return the result of a scenario.
+
+    A scenario consists of an optional setup method "_setup_<name>",
+    which is not measured, and a method "_run_<name>".
+    The setup method returns the argument passed to the run method.
+    """
+
+    def __init__(self, workDir, size):
+        """Generate the synthetic project files.
+
+        Positional arguments:
+            workDir: str -- Directory for the generated files.
+            size: dict -- Keyword arguments for the project generator.
+        """
+        self._workDir = workDir
+        self._generator = SyntheticProject(**size)
+        self._prjPath = os.path.join(workDir, 'benchmark.json')
+        self._mdnovPath = os.path.join(workDir, 'benchmark.mdnov')
+        self._sqlitePath = os.path.join(workDir, 'benchmark.mdnvdb')
+        prjFile = self._generator.write(self._prjPath)
+        mdnovFile = MdnovFile(self._mdnovPath)
+        mdnovFile.novel = prjFile.novel
+        mdnovFile.wcLog = prjFile.wcLog
+        mdnovFile.write()
+        sqliteFile = SqliteFile(self._sqlitePath)
+        sqliteFile.novel = prjFile.novel
+        sqliteFile.wcLog = prjFile.wcLog
+        sqliteFile.write()
+        self._exportTargets = {}
+        for fileClass in BatchConverter.EXPORT_TARGET_CLASSES:
+            if fileClass.SUFFIX:
+                name = f'export{fileClass.SUFFIX}'
+            else:
+                name = 'export_manuscript'
+            self._exportTargets[name] = fileClass
+
+    def get_scenarios(self):
+        """Return a list of scenario names."""
+        names = [name[5:] for name in dir(self) if name.startswith('_run_')]
+        names.extend(self._exportTargets)
+        return sorted(names)
+
+    def run(self, name, repeat=3):
+        """Return the result of a scenario.
+
+        Positional arguments:
+            name: str -- Scenario name.
+
+        Optional arguments:
+            repeat: int -- Number of timed runs. The fastest run counts.
+
+        Return a dictionary with the keys "seconds" and "peakKiB".
+        Raise Skip if the scenario cannot run here.
+        """
+        if name in self._exportTargets:
+            setup = self._setup_export
+            run = self._get_export_runner(self._exportTargets[name])
+        else:
+            setup = getattr(self, f'_setup_{name}', lambda: None)
+            run = getattr(self, f'_run_{name}')
+
+        # Measure the peak memory in a separate run, since tracemalloc slows things down.
+        arg = setup()
+        tracemalloc.start()
+        run(arg)
+        __, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        times = []
+        for __ in range(repeat):
+            arg = setup()
+            startTime = perf_counter()
+            run(arg)
+            times.append(perf_counter() - startTime)
+        return dict(seconds=min(times), peakKiB=round(peak / 1024))
+
+    def _get_export_runner(self, fileClass):
+
+        def run_export(novel):
+            if fileClass.SUFFIX:
+                suffix = fileClass.SUFFIX
+            else:
+                suffix = ''
+            target = fileClass(os.path.join(self._workDir, f'benchmark{suffix}{fileClass.EXTENSION}'))
+            target.novel = novel
+            target.write()
+
+        return run_export
+
+    def _get_library_dir(self):
+        """Return a directory with LIBRARY_PROJECTS project files in subfolders.
+
+        The files are links to the benchmark project files, if possible.
+        """
+        libraryDir = os.path.join(self._workDir, 'library')
+        if os.path.isdir(libraryDir):
+            return libraryDir
+
+        sources = [self._prjPath] * 8 + [self._mdnovPath, self._sqlitePath]
+        for i in range(LIBRARY_PROJECTS):
+            folder = os.path.join(libraryDir, f'folder{i // 50}')
+            os.makedirs(folder, exist_ok=True)
+            source = sources[i % len(sources)]
+            __, extension = os.path.splitext(source)
+            target = os.path.join(folder, f'project{i}{extension}')
+            try:
+                os.link(source, target)
+            except OSError:
+                shutil.copyfile(source, target)
+        return libraryDir
+
+    def _read_project(self):
+        prjFile = JsonFile(self._prjPath)
+        prjFile.novel = Novel(tree=NvTree())
+        prjFile.read()
+        return prjFile
+
+    def _run_delete(self, arg):
+        model, elemIds = arg
+        model.delete_elements(elemIds)
+
+    def _run_export_cached(self, arg):
+        novel, fragmentCache = arg
+        target = BatchConverter.EXPORT_TARGET_CLASSES[0](os.path.join(self._workDir, 'benchmark_cached.md'))
+        target.novel = novel
+        target.fragmentCache = fragmentCache
+        target.write()
+
+    def _run_get_counts(self, model):
+        model.get_counts()
+
+    def _run_import(self, mdPath):
+        source = MdImport(mdPath)
+        source.novel = Novel(tree=NvTree())
+        source.read()
+
+    def _run_join(self, model):
+        # Join the first two sections of each chapter.
+        for chId in model.tree.get_children(CH_ROOT):
+            scIds = model.tree.get_children(chId)
+            if len(scIds) > 1:
+                model.join_sections(scIds[0], scIds[1])
+
+    def _run_library(self, libraryDir):
+        ProjectLibrary(LIBRARY_FILE_TYPES).scan([libraryDir])
+
+    def _run_library_rescan(self, arg):
+        libraryDir, cachePath = arg
+        projectLibrary = ProjectLibrary(LIBRARY_FILE_TYPES, cachePath=cachePath)
+        projectLibrary.read_cache()
+        projectLibrary.scan([libraryDir])
+
+    def _run_open(self, arg):
+        self._read_project()
+
+    def _run_open_mdnov(self, arg):
+        prjFile = MdnovFile(self._mdnovPath)
+        prjFile.novel = Novel(tree=NvTree())
+        prjFile.read()
+
+    def _run_open_sqlite(self, arg):
+        prjFile = SqliteFile(self._sqlitePath)
+        prjFile.novel = Novel(tree=NvTree())
+        prjFile.read()
+
+    def _run_reload(self, arg):
+        model, filePath = arg
+        model.reload_project(model.read_project(filePath))
+
+    def _run_repetitions(self, novel):
+        repetitionFinder = RepetitionFinder()
+        repetitionFinder.update(novel)
+        repetitionFinder.find_echoes()
+        repetitionFinder.find_duplicates()
+
+    def _run_repetitions_update(self, arg):
+        repetitionFinder, novel = arg
+        repetitionFinder.update(novel)
+        repetitionFinder.find_echoes()
+
+    def _run_save(self, prjFile):
+        prjFile.write()
+
+    def _run_save_sqlite(self, prjFile):
+        prjFile.write()
+
+    def _run_snapshot(self, backupStore):
+        backupStore.take_snapshot()
+
+    def _run_split(self, novel):
+        Splitter().split_sections(novel)
+
+    def _run_story_time(self, novel):
+        novel.storyTime.get_overlaps()
+        novel.storyTime.get_gaps()
+
+    def _run_story_time_update(self, novel):
+        novel.storyTime.get_overlaps()
+
+    def _run_text_statistics(self, novel):
+        TextStatistics().update(novel)
+
+    def _run_text_statistics_update(self, arg):
+        textStatistics, novel = arg
+        textStatistics.update(novel)
+        textStatistics.get_statistics()
+
+    def _run_tree_refresh(self, ui):
+        ui.tv.refresh()
+
+    def _setup_delete(self):
+        # Delete the minor characters, and move the first chapter to the trash bin.
+        model = NvModel()
+        model.tree = NvTree()
+        model.load_project(model.read_project(self._prjPath))
+        elemIds = [crId for crId in model.tree.get_children(CR_ROOT) if not model.novel.characters[crId].isMajor]
+        elemIds.append(model.tree.get_children(CH_ROOT)[0])
+        return model, elemIds
+
+    def _setup_export(self):
+        return self._read_project().novel
+
+    def _setup_export_cached(self):
+        # Export the manuscript, and then change one section.
+        novel = self._read_project().novel
+        fragmentCache = FragmentCache()
+        self._run_export_cached((novel, fragmentCache))
+        section = next(iter(novel.sections.values()))
+        section.sectionContent = f'{section.sectionContent}Typo fixed.\n'
+        return novel, fragmentCache
+
+    def _setup_get_counts(self):
+        return self._setup_join()
+
+    def _setup_import(self):
+        mdPath = os.path.join(self._workDir, 'benchmark_import.md')
+        target = BatchConverter.EXPORT_TARGET_CLASSES[0](mdPath)
+        target.novel = self._read_project().novel
+        target.write()
+        return mdPath
+
+    def _setup_join(self):
+        model = NvModel()
+        prjFile = self._read_project()
+        model.prjFile = prjFile
+        model.novel = prjFile.novel
+        model.tree = prjFile.novel.tree
+
+        # Sections can only be joined if they have the same viewpoint.
+        for chId in model.tree.get_children(CH_ROOT):
+            scIds = model.tree.get_children(chId)
+            if len(scIds) > 1:
+                model.novel.sections[scIds[1]].characters = model.novel.sections[scIds[0]].characters[:]
+        return model
+
+    def _setup_library(self):
+        return self._get_library_dir()
+
+    def _setup_library_rescan(self):
+        # Scan the library once and write the cache.
+        libraryDir = self._get_library_dir()
+        cachePath = os.path.join(self._workDir, 'library_cache.json')
+        projectLibrary = ProjectLibrary(LIBRARY_FILE_TYPES, cachePath=cachePath)
+        projectLibrary.scan([libraryDir])
+        projectLibrary.write_cache()
+        return libraryDir, cachePath
+
+    def _setup_reload(self):
+        # Open the project, and then change one section on disk.
+        model = NvModel()
+        model.tree = NvTree()
+        model.load_project(model.read_project(self._prjPath))
+        prjFile = self._read_project()
+        prjFile.filePath = os.path.join(self._workDir, 'benchmark_reload.json')
+        section = next(iter(prjFile.novel.sections.values()))
+        section.sectionContent = f'{section.sectionContent}\nChanged.'
+        prjFile.write()
+        return model, prjFile.filePath
+
+    def _setup_repetitions(self):
+        return self._read_project().novel
+
+    def _setup_repetitions_update(self):
+        # Analyze the project, and then change one section.
+        novel = self._read_project().novel
+        repetitionFinder = RepetitionFinder()
+        repetitionFinder.update(novel)
+        section = next(iter(novel.sections.values()))
+        section.sectionContent = f'{section.sectionContent}\nChanged.'
+        return repetitionFinder, novel
+
+    def _setup_save(self):
+        prjFile = self._read_project()
+        prjFile.filePath = os.path.join(self._workDir, 'benchmark_save.json')
+        return prjFile
+
+    def _setup_save_sqlite(self):
+        # Change one section of the database read.
+        prjFile = SqliteFile(self._sqlitePath)
+        prjFile.novel = Novel(tree=NvTree())
+        prjFile.read()
+        section = next(iter(prjFile.novel.sections.values()))
+        section.sectionContent = f'{section.sectionContent}\nChanged.'
+        return prjFile
+
+    def _setup_snapshot(self):
+        # Record a snapshot, and then change one section.
+        prjFile = self._read_project()
+        prjFile.filePath = os.path.join(self._workDir, 'benchmark_snapshot.json')
+        prjFile.write()
+        backupStore = BackupStore(prjFile.filePath)
+        backupStore.take_snapshot()
+        section = next(iter(prjFile.novel.sections.values()))
+        section.sectionContent = f'{section.sectionContent}\nChanged.'
+        prjFile.write()
+        return backupStore
+
+    def _setup_split(self):
+        # Insert a section divider in the middle of each section.
+        novel = self._read_project().novel
+        for section in novel.sections.values():
+            paragraphs = section.sectionContent.split('\n')
+            middle = len(paragraphs) // 2
+            paragraphs.insert(middle, f'{Splitter.SCENE_SEPARATOR} New section')
+            section.sectionContent = '\n'.join(paragraphs)
+        return novel
+
+    def _setup_story_time(self):
+        return self._read_project().novel
+
+    def _setup_story_time_update(self):
+        # Index the project, and then change one section's time.
+        novel = self._read_project().novel
+        novel.storyTime.update()
+        section = next(iter(novel.sections.values()))
+        section.time = '23:00:00'
+        return novel
+
+    def _setup_text_statistics(self):
+        return self._read_project().novel
+
+    def _setup_text_statistics_update(self):
+        # Analyze the project, and then change one section.
+        novel = self._read_project().novel
+        textStatistics = TextStatistics()
+        textStatistics.update(novel)
+        section = next(iter(novel.sections.values()))
+        section.sectionContent = f'{section.sectionContent}\nChanged.'
+        return textStatistics, novel
+
+    def _setup_tree_refresh(self):
+        if getattr(self, '_app', None) is None:
+            try:
+                import tkinter as tk
+                tk.Tk().destroy()
+            except Exception:
+                raise Skip('no display')
+
+            sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+            from mdnovel_ import OPTIONS
+            from mdnovel_ import SETTINGS
+            from mdnvlib.controller.nv_controller import NvController
+            from mdnvlib.nv_globals import prefs
+            prefs.update(SETTINGS)
+            prefs.update(OPTIONS)
+            self._app = NvController('benchmark', self._workDir)
+            self._app.open_project(filePath=self._prjPath)
+        return self._app.get_view()
+
+
+def compare(results, baseline, threshold):
+    """Return a list of regression messages.
+
+    Positional arguments:
+        results: dict -- Actual results (key: scenario name).
+        baseline: dict -- Baseline results (key: scenario name).
+        threshold: float -- Allowed relative increase, e.g. 0.2 for 20%.
+    """
+    regressions = []
+    for name, result in results.items():
+        if not name in baseline:
+            continue
+
+        for key in ('seconds', 'peakKiB'):
+            reference = baseline[name][key]
+            if reference and result[key] > reference * (1 + threshold):
+                regressions.append(f'{name}: {key} {result[key]:.4g} > {reference:.4g} (+{threshold:.0%})')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run performance benchmarks on a synthetic mdnovel project.')
+    parser.add_argument('--baseline', help='JSON file with baseline results.')
+    parser.add_argument('--save-baseline', action='store_true', help='Write the results to the baseline file.')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed relative regression. Default: 0.2')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of timed runs per scenario. Default: 3')
+    parser.add_argument('--scenario', action='append', help='Scenario to run. Can be repeated. Default: all.')
+    parser.add_argument('--output', help='JSON file for the results.')
+    parser.add_argument('--list', action='store_true', help='List the scenarios and exit.')
+    parser.add_argument('--size', action='append', default=[], metavar='KEYWORD=VALUE', help='Project generator setting.')
+    args = parser.parse_args()
+
+    size = DEFAULT_SIZE.copy()
+    for setting in args.size:
+        keyword, value = setting.split('=')
+        size[keyword] = int(value)
+    with tempfile.TemporaryDirectory() as workDir:
+        benchmark = Benchmark(workDir, size)
+        if args.list:
+            print('\n'.join(benchmark.get_scenarios()))
+            return 0
+
+        results = {}
+        for name in args.scenario or benchmark.get_scenarios():
+            try:
+                results[name] = benchmark.run(name, repeat=args.repeat)
+            except Skip as ex:
+                print(f'{name:<28} skipped ({ex})')
+                continue
+
+            print(f'{name:<28} {results[name]["seconds"]:9.4f} s {results[name]["peakKiB"]:9d} KiB')
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(dict(size=size, results=results), f, indent=2)
+    if not args.baseline:
+        return 0
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(dict(size=size, results=results), f, indent=2)
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('size') != size:
+        print('The baseline was recorded with a different project size.')
+        return 1
+
+    regressions = compare(results, baseline['results'], args.threshold)
+    for message in regressions:
+        print(f'REGRESSION {message}')
+    if regressions:
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Compare the export latency of the batch command with the export server.
+
+usage: export_latency.py [-h] [--repeat N] [--suffix SUFFIX]
+                         [--size KEYWORD=VALUE]
+
+A synthetic project is exported
+- cold: by running mdnovel_batch.py, i.e. with interpreter start,
+  imports, and reading the project,
+- first request: by a running server that has not read the project yet,
+- warm: by the server with the project cached, measured both in-process
+  and by running mdnovel_batch.py as client,
+- touched: by the server after the file's modification time has changed,
+  but not its content.
+The median wall clock time of N runs is printed for each case.
+
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from time import perf_counter
+from time import sleep
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synthetic_project import SyntheticProject
+from mdnvlib.converter.export_client import ExportClient
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+BATCH_SCRIPT = os.path.join(SRC_DIR, 'mdnovel_batch.py')
+DEFAULT_SIZE = dict(
+    parts=3,
+    chapters=30,
+    sections=8,
+    words=600,
+)
+
+
+def measure(run, repeat):
+    """Return the median time in seconds of calling run() repeat times."""
+    times = []
+    for __ in range(repeat):
+        startTime = perf_counter()
+        run()
+        times.append(perf_counter() - startTime)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the export latency of the batch command with the export server.')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs per case. Default: 5')
+    parser.add_argument('--suffix', default='', help='Target file name suffix. Default: "" (manuscript)')
+    parser.add_argument('--size', action='append', default=[], metavar='KEYWORD=VALUE', help='Project generator setting.')
+    args = parser.parse_args()
+
+    size = DEFAULT_SIZE.copy()
+    for setting in args.size:
+        keyword, value = setting.split('=')
+        size[keyword] = int(value)
+    with tempfile.TemporaryDirectory() as workDir:
+        prjPath = os.path.join(workDir, 'latency.json')
+        SyntheticProject(**size).write(prjPath)
+        address = os.path.join(workDir, 'export.sock')
+        if sys.platform == 'win32':
+            address = r'\\.\pipe\mdnovel-export-latency'
+        batchCommand = [sys.executable, BATCH_SCRIPT, '-s', args.suffix, '-j', '1', prjPath]
+        clientCommand = [sys.executable, BATCH_SCRIPT, '-s', args.suffix, '--server', address, prjPath]
+
+        def run_batch(command):
+            subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+
+        server = subprocess.Popen([sys.executable, BATCH_SCRIPT, '--serve', address])
+        try:
+            client = ExportClient(address)
+            while True:
+                try:
+                    client.status()
+                    break
+
+                except OSError:
+                    if server.poll() is not None:
+                        print('The server could not be started.')
+                        return 1
+
+                    sleep(0.05)
+
+            results = {}
+            results['cold (batch command)'] = measure(lambda: run_batch(batchCommand), args.repeat)
+
+            def run_first_request():
+                client.drop([prjPath])
+                client.export([prjPath], [args.suffix])
+
+            results['server, first request'] = measure(run_first_request, args.repeat)
+            results['server, warm'] = measure(lambda: client.export([prjPath], [args.suffix]), args.repeat)
+            results['server, warm (client command)'] = measure(lambda: run_batch(clientCommand), args.repeat)
+
+            def run_touched():
+                os.utime(prjPath)
+                client.export([prjPath], [args.suffix])
+
+            results['server, touched'] = measure(run_touched, args.repeat)
+            client.shutdown()
+        finally:
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    for name, seconds in results.items():
+        print(f'{name:<32} {seconds * 1000:9.1f} ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""Check the cold start import time of mdnovel.
+
+usage: import_time.py [-h] [--baseline FILE] [--save-baseline] [--threshold T]
+                      [--repeat N]
+
+Each run starts a new Python interpreter with "-X importtime",
+imports the application, and builds the main window, if there is a display.
+The import time is the sum of the "self" times of all imported modules;
+the fastest run counts.
+
+The script exits with code 1
+- if a module meant to be imported on first use is loaded at start,
+- if the import time exceeds the baseline by more than the threshold,
+- if modules have been added to the start sequence since the baseline was saved.
+
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+DEFERRED_MODULES = [
+    'concurrent.futures.process',
+    'mdnvlib.csv.csv_grid',
+    'mdnvlib.csv.csv_statistics',
+    'mdnvlib.html.html_report',
+    'mdnvlib.md.md_export',
+    'mdnvlib.md.md_import',
+    'mdnvlib.md.md_outline',
+    'mdnvlib.memory_report',
+    'mdnvlib.model.repetition_finder',
+    'mdnvlib.plugin.editor.editor_window',
+    'mdnvlib.plugin.library.library_window',
+    'mdnvlib.plugin.matrix.table_manager',
+    'mdnvlib.plugin.profiling.memory_window',
+    'mdnvlib.plugin.profiling.profiler_window',
+    'mdnvlib.plugin.progress.progress_viewer',
+    'mdnvlib.plugin.repetitions.repetition_window',
+    'mdnvlib.plugin.search.search_window',
+    'mdnvlib.plugin.templates.md_template',
+    'mdnvlib.plugin.themes.settings_window',
+    'mdnvlib.plugin.timeline.tl_file',
+    'mdnvlib.sqlite.sqlite_file',
+    'multiprocessing',
+    'sqlite3',
+    'xml.etree.ElementTree',
+]
+# Modules that must not be imported before the user needs them.
+
+START_SCRIPT = '''
+import json
+import sys
+import mdnovel_
+window = False
+try:
+    import tkinter as tk
+    tk.Tk().destroy()
+except Exception:
+    pass
+else:
+    from mdnvlib.controller.nv_controller import NvController
+    from mdnvlib.nv_globals import prefs
+    prefs.update(mdnovel_.SETTINGS)
+    prefs.update(mdnovel_.OPTIONS)
+    app = NvController('import_time', '.')
+    app.get_view().root.update()
+    window = True
+print(json.dumps(dict(window=window, modules=sorted(sys.modules))))
+'''
+
+
+def measure():
+    """Start the application in a new interpreter.
+
+    Return a dictionary with the keys
+    "microseconds", "window", and "modules".
+    """
+    env = os.environ.copy()
+    env['PYTHONPATH'] = SRC_DIR
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', START_SCRIPT],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=SRC_DIR,
+        )
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr)
+
+    microseconds = 0
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+
+        selfTime = line[12:].split('|')[0].strip()
+        if selfTime.isdigit():
+            microseconds += int(selfTime)
+    result = json.loads(process.stdout.splitlines()[-1])
+    result['microseconds'] = microseconds
+    return result
+
+
+def check(result, baseline, threshold):
+    """Return a list of regression messages.
+
+    Positional arguments:
+        result: dict -- Actual measurement.
+        baseline: dict or None -- Saved measurement.
+        threshold: float -- Allowed relative increase of the import time, e.g. 0.2 for 20%.
+    """
+    regressions = []
+    for moduleName in DEFERRED_MODULES:
+        if moduleName in result['modules']:
+            regressions.append(f'{moduleName} is imported at start')
+    if baseline is None:
+        return regressions
+
+    if result['window'] != baseline['window']:
+        regressions.append('The baseline was recorded with a different display setting')
+        return regressions
+
+    reference = baseline['microseconds']
+    if result['microseconds'] > reference * (1 + threshold):
+        regressions.append(f'import time {result["microseconds"]} µs > {reference} µs (+{threshold:.0%})')
+    for moduleName in sorted(set(result['modules']) - set(baseline['modules'])):
+        regressions.append(f'{moduleName} has been added to the start sequence')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the cold start import time of mdnovel.')
+    parser.add_argument('--baseline', help='JSON file with the baseline measurement.')
+    parser.add_argument('--save-baseline', action='store_true', help='Write the measurement to the baseline file.')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed relative regression. Default: 0.2')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs. Default: 5')
+    args = parser.parse_args()
+
+    result = None
+    for __ in range(args.repeat):
+        run = measure()
+        if result is None or run['microseconds'] < result['microseconds']:
+            result = run
+    print(f'{len(result["modules"])} modules imported in {result["microseconds"] / 1000:.1f} ms')
+    if not result['window']:
+        print('No display: the main window was not built.')
+
+    baseline = None
+    if args.baseline:
+        if args.save_baseline:
+            with open(args.baseline, 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2)
+        else:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+
+    regressions = check(result, baseline, args.threshold)
+    for message in regressions:
+        print(f'REGRESSION {message}')
+    if regressions:
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
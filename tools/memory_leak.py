@@ -0,0 +1,94 @@
+"""Report the memory per subsystem, and the growth after reopening a project.
+
+usage: memory_leak.py [-h] [--cycles N] [--limit N] [--size KEYWORD=VALUE]
+                      [project]
+
+A project (by default a synthetic one) is opened and closed N times
+with the headless model, as the application does with
+NvModel.open_project and NvModel.close_project.
+The memory retained per subsystem is printed while the project is open.
+A tracemalloc snapshot is taken after the first cycle, and compared
+with a snapshot after the last cycle, so allocations that grow with
+each cycle show up as a leak.
+
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synthetic_project import SyntheticProject
+from mdnvlib.memory_report import MemoryReport
+from mdnvlib.model.nv_model import NvModel
+from mdnvlib.model.nv_tree import NvTree
+
+DEFAULT_SIZE = dict(
+    parts=3,
+    chapters=30,
+    sections=8,
+    words=600,
+    wcLogDays=1000,
+)
+
+
+def run_cycle(model, filePath):
+    """Open and close the project."""
+    model.open_project(filePath)
+    model.close_project()
+    model.reset_tree()
+    gc.collect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report the memory per subsystem, and the growth after reopening a project.')
+    parser.add_argument('project', nargs='?', help='Project file. Default: a synthetic project')
+    parser.add_argument('--cycles', type=int, default=10, help='Number of open/close cycles. Default: 10')
+    parser.add_argument('--limit', type=int, default=10, help='Number of source lines listed. Default: 10')
+    parser.add_argument('--size', action='append', default=[], metavar='KEYWORD=VALUE', help='Project generator setting.')
+    args = parser.parse_args()
+
+    memoryReport = MemoryReport()
+    model = NvModel()
+    model.tree = NvTree()
+    with tempfile.TemporaryDirectory() as workDir:
+        filePath = args.project
+        if filePath is None:
+            size = DEFAULT_SIZE.copy()
+            for setting in args.size:
+                keyword, value = setting.split('=')
+                size[keyword] = int(value)
+            filePath = os.path.join(workDir, 'memory.json')
+            SyntheticProject(**size).write(filePath)
+
+        model.open_project(filePath)
+        total = 0
+        for subsystem, size, count, unit in memoryReport.measure(model):
+            total += size
+            print(f'{subsystem:<24} {size / 1024:10.1f} KiB {count:>10} {unit}')
+        print(f'{"Total":<24} {total / 1024:10.1f} KiB')
+        model.close_project()
+        model.reset_tree()
+
+        memoryReport.take_snapshot()
+        # Tracing starts here; the first cycle fills caches.
+        run_cycle(model, filePath)
+        firstSnapshot = memoryReport.take_snapshot()
+        for __ in range(args.cycles):
+            run_cycle(model, filePath)
+        packages, lines = memoryReport.compare_snapshots(firstSnapshot, memoryReport.take_snapshot(), limit=args.limit)
+
+    print(f'\nGrowth after {args.cycles} more cycles:')
+    for location, sizeDiff, countDiff in packages[:args.limit]:
+        print(f'{location:<40} {sizeDiff / 1024:+10.1f} KiB {countDiff:+8d} objects')
+    print()
+    for location, sizeDiff, countDiff in lines:
+        print(f'{location:<60} {sizeDiff / 1024:+10.1f} KiB {countDiff:+8d} objects')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
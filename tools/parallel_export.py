@@ -0,0 +1,109 @@
+"""Compare the serial and the chapter-parallel export of a project.
+
+usage: parallel_export.py [-h] [--workers N] [--repeat N]
+                          [--size KEYWORD=VALUE] [project]
+
+A project (by default a synthetic 1M-word one) is written to each
+export target and to the mdnov format, once rendered in this process,
+and once rendered by N worker processes. The output files must be
+byte-identical; unfiltered, and filtered by a viewpoint character.
+The best time of each mode is printed per target.
+The script exits with code 1 if any output differs.
+
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import argparse
+import filecmp
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synthetic_project import SyntheticProject
+from mdnvlib.converter.batch_converter import BatchConverter
+from mdnvlib.exporter.filter_factory import FilterFactory
+from mdnvlib.json.json_file import JsonFile
+from mdnvlib.mdnov.mdnov_file import MdnovFile
+from mdnvlib.model.novel import Novel
+from mdnvlib.model.nv_tree import NvTree
+from mdnvlib.novx_globals import CR_ROOT
+
+DEFAULT_SIZE = dict(
+    parts=5,
+    chapters=40,
+    sections=8,
+    words=625,
+    wcLogDays=100,
+)
+# 1M words; the other generator defaults apply.
+
+
+def write(fileClass, prjFile, filePath, workers, filterElementId):
+    """Write the project to filePath, and return the time in seconds."""
+    target = fileClass(filePath)
+    target.novel = prjFile.novel
+    target.wcLog = prjFile.wcLog
+    target.workers = workers
+    target.sectionFilter = FilterFactory.get_section_filter(filterElementId)
+    target.chapterFilter = FilterFactory.get_chapter_filter(filterElementId)
+    startTime = perf_counter()
+    target.write()
+    return perf_counter() - startTime
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the serial and the chapter-parallel export of a project.')
+    parser.add_argument('project', nargs='?', help='Project file. Default: a synthetic project')
+    parser.add_argument('--workers', type=int, default=max(2, os.cpu_count() or 1), help='Number of worker processes. Default: number of CPUs, at least 2')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of timed runs per mode. Default: 3')
+    parser.add_argument('--size', action='append', default=[], metavar='KEYWORD=VALUE', help='Project generator setting.')
+    args = parser.parse_args()
+
+    differences = 0
+    with tempfile.TemporaryDirectory() as workDir:
+        filePath = args.project
+        if filePath is None:
+            size = DEFAULT_SIZE.copy()
+            for setting in args.size:
+                keyword, value = setting.split('=')
+                size[keyword] = int(value)
+            filePath = os.path.join(workDir, 'parallel.json')
+            SyntheticProject(**size).write(filePath)
+        prjFile = JsonFile(filePath)
+        prjFile.novel = Novel(tree=NvTree())
+        prjFile.read()
+        wordCount = sum(section.wordCount for section in prjFile.novel.sections.values())
+        print(f'{len(prjFile.novel.chapters)} chapters, {wordCount} words, {args.workers} workers\n')
+
+        filterElementIds = ['']
+        crIds = prjFile.novel.tree.get_children(CR_ROOT)
+        if crIds:
+            filterElementIds.append(crIds[0])
+
+        for filterElementId in filterElementIds:
+            for fileClass in [MdnovFile] + BatchConverter.EXPORT_TARGET_CLASSES:
+                name = f'{fileClass.__name__} {filterElementId}'.strip()
+                paths = {}
+                times = {}
+                for workers in (1, args.workers):
+                    paths[workers] = os.path.join(workDir, f'export_{workers}{fileClass.SUFFIX}{fileClass.EXTENSION}')
+                    times[workers] = min(
+                        write(fileClass, prjFile, paths[workers], workers, filterElementId)
+                        for __ in range(args.repeat)
+                        )
+                if filecmp.cmp(paths[1], paths[args.workers], shallow=False):
+                    result = 'identical'
+                else:
+                    result = 'DIFFERENT'
+                    differences += 1
+                print(f'{name:<28} {times[1]:8.3f} s {times[args.workers]:8.3f} s  {result}')
+    if differences:
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,326 @@
+"""Generate deterministic synthetic mdnovel projects for benchmarking.
+
+usage: synthetic_project.py [-h] [--chapters N] [--sections N] ... project
+
+All sizes are configurable. The same seed always generates the same project.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/mdnovel
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import argparse
+from datetime import date
+from datetime import timedelta
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from mdnvlib.json.json_file import JsonFile
+from mdnvlib.model.basic_element import BasicElement
+from mdnvlib.model.chapter import Chapter
+from mdnvlib.model.character import Character
+from mdnvlib.model.novel import Novel
+from mdnvlib.model.nv_tree import NvTree
+from mdnvlib.model.plot_line import PlotLine
+from mdnvlib.model.plot_point import PlotPoint
+from mdnvlib.model.section import Section
+from mdnvlib.model.world_element import WorldElement
+from mdnvlib.novx_globals import CHAPTER_PREFIX
+from mdnvlib.novx_globals import CHARACTER_PREFIX
+from mdnvlib.novx_globals import CH_ROOT
+from mdnvlib.novx_globals import CR_ROOT
+from mdnvlib.novx_globals import Error
+from mdnvlib.novx_globals import ITEM_PREFIX
+from mdnvlib.novx_globals import IT_ROOT
+from mdnvlib.novx_globals import LC_ROOT
+from mdnvlib.novx_globals import LOCATION_PREFIX
+from mdnvlib.novx_globals import PLOT_LINE_PREFIX
+from mdnvlib.novx_globals import PLOT_POINT_PREFIX
+from mdnvlib.novx_globals import PL_ROOT
+from mdnvlib.novx_globals import PN_ROOT
+from mdnvlib.novx_globals import PRJ_NOTE_PREFIX
+from mdnvlib.novx_globals import SECTION_PREFIX
+from mdnvlib.novx_globals import _
+from mdnvlib.novx_globals import norm_path
+
+DEFAULTS = dict(
+    seed=1,
+    parts=3,
+    chapters=30,
+    sections=8,
+    words=600,
+    paragraphs=6,
+    characters=40,
+    locations=30,
+    items=20,
+    tags=25,
+    plotLines=5,
+    plotPoints=6,
+    links=2,
+    projectNotes=10,
+    wcLogDays=365,
+)
+# chapters: chapters per part, sections: sections per chapter,
+# words: words per section, plotPoints: plot points per plot line,
+# links: links per world element.
+
+VOCABULARY = (
+    'a about above across after again against all almost alone along already also although always among an and '
+    'another any anyone anything anywhere are around as ask asked at away back be because been before began behind '
+    'being below beside between beyond both brought but by call came can cannot carry city close cold come could '
+    'dark day did do does door down during each early earth end enough even evening ever every eye face far father '
+    'feel felt few find first follow for found friend from gave get give go gone good great green had half hand '
+    'happy hard has have he head hear heard heart help her here high him his hold home house how however idea if '
+    'in into is it just keep kept kind knew know land large last late laugh leave left less letter light like '
+    'little live long look lost love made make man many may me mean might mind moment more morning most mother '
+    'move much must my name near never new next night no not nothing now of off often old on once one only open '
+    'or other our out over own page paper part past people perhaps place point quick quiet rain read ready real '
+    'remember rest right river road room round run said same saw say sea second see seem seen set shall she short '
+    'should show side since sky small so some something sometimes soon sound speak stand start still stood stop '
+    'story street strong such sun sure take talk tell than that the their them then there these they thing think '
+    'this those though thought three through time to together told too took toward tree true try turn two under '
+    'until up upon us very voice wait walk wall want warm was watch water way we well went were what when where '
+    'which while white who whole why wide will wind window with within without woman word work world would write '
+    'year yes yet you young'
+).split()
+
+
+class SyntheticProject:
+    """Generator for deterministic synthetic novels.
+
+    Public methods:
+        make_novel() -- Return a new Novel instance.
+        make_word_count_log() -- Return a word count log dictionary.
+        write(filePath) -- Write a project file.
+    """
+
+    def __init__(self, **kwargs):
+        """Set the project sizes.
+
+        Optional arguments:
+            See DEFAULTS for the keywords and their default values.
+        """
+        self.config = DEFAULTS.copy()
+        for keyword in kwargs:
+            if not keyword in self.config:
+                raise ValueError(f'Unknown keyword: {keyword}')
+
+            self.config[keyword] = kwargs[keyword]
+
+    def make_novel(self):
+        """Return a new Novel instance with a headless tree."""
+        rnd = random.Random(self.config['seed'])
+        novel = Novel(
+            title='Synthetic novel',
+            desc=self._get_text(rnd, 80, 1),
+            authorName='Benchmark',
+            wordTarget=self.config['parts'] * self.config['chapters'] * self.config['sections'] * self.config['words'],
+            wordCountStart=0,
+            renumberChapters=False,
+            renumberParts=False,
+            renumberWithinParts=False,
+            romanChapterNumbers=False,
+            romanPartNumbers=False,
+            saveWordCount=True,
+            chapterHeadingPrefix='Chapter ',
+            chapterHeadingSuffix='',
+            partHeadingPrefix='Part ',
+            partHeadingSuffix='',
+            links={},
+            tree=NvTree(),
+            )
+        tags = [f'tag{i}' for i in range(self.config['tags'])]
+
+        # World elements.
+        crIds = self._add_world_elements(rnd, novel, 'characters', CR_ROOT, CHARACTER_PREFIX, self.config['characters'], tags)
+        lcIds = self._add_world_elements(rnd, novel, 'locations', LC_ROOT, LOCATION_PREFIX, self.config['locations'], tags)
+        itIds = self._add_world_elements(rnd, novel, 'items', IT_ROOT, ITEM_PREFIX, self.config['items'], tags)
+
+        # Parts, chapters, and sections.
+        scIds = []
+        chNumber = 0
+        for partNumber in range(1, self.config['parts'] + 1):
+            chNumber += 1
+            chId = f'{CHAPTER_PREFIX}{chNumber}'
+            novel.chapters[chId] = Chapter(
+                title=f'Part {partNumber}',
+                desc=self._get_text(rnd, 40, 1),
+                chLevel=1,
+                chType=0,
+                noNumber=False,
+                isTrash=False,
+                links={},
+                )
+            novel.tree.append(CH_ROOT, chId)
+            for __ in range(self.config['chapters']):
+                chNumber += 1
+                chId = f'{CHAPTER_PREFIX}{chNumber}'
+                novel.chapters[chId] = Chapter(
+                    title=f'Chapter {chNumber}',
+                    desc=self._get_text(rnd, 40, 1),
+                    chLevel=2,
+                    chType=0,
+                    noNumber=False,
+                    isTrash=False,
+                    links={},
+                    )
+                novel.tree.append(CH_ROOT, chId)
+                for __ in range(self.config['sections']):
+                    scId = f'{SECTION_PREFIX}{len(scIds) + 1}'
+                    scIds.append(scId)
+                    sectionCharacters = rnd.sample(crIds, min(3, len(crIds)))
+                    sectionDate = date(2024, 1, 1) + timedelta(days=len(scIds) // 3)
+                    novel.sections[scId] = Section(
+                        title=f'Section {len(scIds)}',
+                        desc=self._get_text(rnd, 30, 1),
+                        scType=0,
+                        scene=rnd.randint(0, 3),
+                        status=rnd.randint(1, 5),
+                        appendToPrev=False,
+                        goal=self._get_text(rnd, 15, 1),
+                        conflict=self._get_text(rnd, 15, 1),
+                        outcome=self._get_text(rnd, 15, 1),
+                        notes=self._get_text(rnd, 20, 1),
+                        scDate=sectionDate.isoformat(),
+                        scTime='12:00:00',
+                        lastsMinutes='30',
+                        lastsHours='1',
+                        lastsDays='0',
+                        characters=sectionCharacters,
+                        locations=rnd.sample(lcIds, min(2, len(lcIds))),
+                        items=rnd.sample(itIds, min(1, len(itIds))),
+                        tags=rnd.sample(tags, min(2, len(tags))),
+                        sectionContent=self._get_text(rnd, self.config['words'], self.config['paragraphs']),
+                        links={},
+                        )
+                    novel.tree.append(chId, scId)
+
+        # Plot lines and plot points.
+        ppNumber = 0
+        for i in range(1, self.config['plotLines'] + 1):
+            plId = f'{PLOT_LINE_PREFIX}{i}'
+            plSections = sorted(rnd.sample(scIds, min(len(scIds) // 3, len(scIds))), key=lambda scId: int(scId[2:]))
+            novel.plotLines[plId] = PlotLine(
+                title=f'Plot line {i}',
+                desc=self._get_text(rnd, 30, 1),
+                shortName=f'P{i}',
+                sections=plSections,
+                links={},
+                )
+            novel.tree.append(PL_ROOT, plId)
+            for scId in plSections:
+                novel.sections[scId].scPlotLines.append(plId)
+            for j in range(self.config['plotPoints']):
+                ppNumber += 1
+                ppId = f'{PLOT_POINT_PREFIX}{ppNumber}'
+                scId = None
+                if plSections:
+                    scId = plSections[j * len(plSections) // self.config['plotPoints']]
+                    novel.sections[scId].scPlotPoints[ppId] = plId
+                novel.plotPoints[ppId] = PlotPoint(
+                    title=f'Plot point {ppNumber}',
+                    desc=self._get_text(rnd, 20, 1),
+                    sectionAssoc=scId,
+                    links={},
+                    )
+                novel.tree.append(plId, ppId)
+
+        # Project notes.
+        for i in range(1, self.config['projectNotes'] + 1):
+            pnId = f'{PRJ_NOTE_PREFIX}{i}'
+            novel.projectNotes[pnId] = BasicElement(
+                title=f'Note {i}',
+                desc=self._get_text(rnd, 100, 2),
+                links={},
+                )
+            novel.tree.append(PN_ROOT, pnId)
+        return novel
+
+    def make_word_count_log(self):
+        """Return a word count log dictionary (key: ISO date, value: [count, total count])."""
+        rnd = random.Random(self.config['seed'])
+        wcLog = {}
+        count = 0
+        startDate = date(2020, 1, 1)
+        for day in range(self.config['wcLogDays']):
+            count += rnd.randint(0, 1500)
+            wcLog[(startDate + timedelta(days=day)).isoformat()] = [count, count + rnd.randint(0, 500)]
+        return wcLog
+
+    def write(self, filePath):
+        """Generate a novel and write it to a project file.
+
+        Positional arguments:
+            filePath: str -- Path of the project file to write.
+
+        Return the project file instance.
+        Raise the "Error" exception if the path has not the project file extension.
+        """
+        if not filePath.endswith(JsonFile.EXTENSION):
+            raise Error(f'{_("File type is not supported")}: "{norm_path(filePath)}".')
+
+        prjFile = JsonFile(filePath)
+        prjFile.novel = self.make_novel()
+        prjFile.wcLog.update(self.make_word_count_log())
+        prjFile.write()
+        return prjFile
+
+    def _add_world_elements(self, rnd, novel, collectionName, root, prefix, number, tags):
+        collection = getattr(novel, collectionName)
+        elemIds = []
+        for i in range(1, number + 1):
+            elemId = f'{prefix}{i}'
+            links = {}
+            for j in range(self.config['links']):
+                links[f'../images/{elemId}_{j}.png'] = f'/home/user/images/{elemId}_{j}.png'
+            kwargs = dict(
+                title=f'{collectionName[:-1].capitalize()} {i}',
+                desc=self._get_text(rnd, 60, 1),
+                notes=self._get_text(rnd, 20, 1),
+                aka='',
+                tags=rnd.sample(tags, min(2, len(tags))),
+                links=links,
+                )
+            if collectionName == 'characters':
+                collection[elemId] = Character(
+                    bio=self._get_text(rnd, 80, 2),
+                    goals=self._get_text(rnd, 20, 1),
+                    fullName=f'Character {i} Fullname',
+                    isMajor=(i <= number // 4),
+                    **kwargs
+                    )
+            else:
+                collection[elemId] = WorldElement(**kwargs)
+            novel.tree.append(root, elemId)
+            elemIds.append(elemId)
+        return elemIds
+
+    def _get_text(self, rnd, words, paragraphs):
+        """Return random text with the given number of words and paragraphs."""
+        paragraphs = max(1, paragraphs)
+        lines = []
+        for i in range(paragraphs):
+            paragraphWords = words // paragraphs
+            if i < words % paragraphs:
+                paragraphWords += 1
+            text = ' '.join(rnd.choices(VOCABULARY, k=paragraphWords))
+            lines.append(f'{text.capitalize()}.')
+        return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic mdnovel project.')
+    parser.add_argument('project', help='Path of the project file to write.')
+    for keyword, value in DEFAULTS.items():
+        parser.add_argument(f'--{keyword}', type=int, default=value)
+    args = vars(parser.parse_args())
+    filePath = args.pop('project')
+    try:
+        SyntheticProject(**args).write(filePath)
+    except Error as ex:
+        sys.exit(str(ex))
+
+
+if __name__ == '__main__':
+    main()